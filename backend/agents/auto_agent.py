@@ -10,6 +10,7 @@ Design decisions:
 
 from __future__ import annotations
 
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Type
@@ -136,6 +137,7 @@ class AutoAgent:
         resume: bool = False,
         on_blueprint_ready: Optional[Callable[[Dict[str, Any]], bool]] = None,
         num_refine_loops: int = 3,
+        cancel_event: Optional[threading.Event] = None,
     ) -> Path:
         """Run the full pipeline. Returns project_root Path on completion.
 
@@ -146,6 +148,8 @@ class AutoAgent:
                     Receives the blueprint dict; return False to abort the pipeline.
                     The callback may mutate the dict to adjust the plan.
             num_refine_loops: Max improvement rounds in PatchPhase (1–10).
+            cancel_event: When set, the run stops before its next LLM call or
+                    phase by raising PipelineCancelledError.
         """
         if project_root is None:
             project_root = self.generated_projects_dir / project_name
@@ -160,6 +164,7 @@ class AutoAgent:
             logger=self.logger,
             on_blueprint_ready=on_blueprint_ready,
             num_refine_loops=max(1, num_refine_loops),
+            cancel_event=cancel_event,
         )
 
         # Determine tier before importing phases (ctx.is_small() is fast)
@@ -183,7 +188,9 @@ class AutoAgent:
         # Attach run logger to ctx for all phases to use
         from backend.utils.core.run_log.pipeline_run_logger import PipelineRunLogger
 
-        ctx.run_logger = PipelineRunLogger(project_root, project_name, description)
+        ctx.run_logger = PipelineRunLogger(
+            project_root, project_name, description, background_writer=True, compress_prompts="gzip"
+        )
         try:
             model_name = getattr(ctx.llm_manager.get_client("coder"), "model", "unknown")
         except Exception:
@@ -213,6 +220,7 @@ class AutoAgent:
         start = time.monotonic()
         try:
             for phase in phases:
+                ctx.check_cancelled()
                 # Skip already-completed phases when resuming (#1)
                 # Only active when resume=True was passed — not for fresh runs.
                 if resume and getattr(phase, "phase_id", None) in completed_phases:
@@ -238,7 +246,11 @@ class AutoAgent:
                 phase_id = getattr(phase, "phase_id", None)
                 if phase_id:
                     completed_phases.append(phase_id)
-                    ctx.save_checkpoint(completed_phases)
+                    diff = ctx.save_checkpoint(completed_phases)
+                    ctx.metrics.setdefault("phase_file_changes", {})[phase_id] = {k: len(v) for k, v in diff.items()}
+                    if ctx.run_logger:
+                        ctx.run_logger.log_phase_diff(phase_id, diff)
+                    ctx.event_publisher.publish_sync("phase_diff", phase=phase_id, **diff)
 
                 # #9 — Interactive pause: invoke callback after BlueprintPhase
                 if phase_id == "2" and on_blueprint_ready is not None:
@@ -14,7 +14,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Optional, Type
 
 from backend.agents.auto_agent_phases.phase_context import PhaseContext
-from backend.utils.core.exceptions import PipelinePhaseError
+from backend.utils.core.exceptions import PipelineCancelledError, PipelinePhaseError
 
 # Token budget constants for 4B / 8K context window
 # 1 token ≈ 4 characters (English text / code)
@@ -57,6 +57,12 @@ class BasePhase(ABC):
             ctx.logger.info(f"[{ctx.project_name}] PHASE {self.phase_id} done ({elapsed:.1f}s)")
             if ctx.run_logger:
                 ctx.run_logger.log_phase_end(self.phase_id, self.phase_label, elapsed, "success")
+        except PipelineCancelledError:
+            elapsed = ctx.end_phase_timer(self.phase_id)
+            ctx.event_publisher.publish_sync("phase_complete", phase=self.phase_id, status="cancelled")
+            if ctx.run_logger:
+                ctx.run_logger.log_phase_end(self.phase_id, self.phase_label, elapsed, "cancelled")
+            raise
         except PipelinePhaseError as e:
             elapsed = ctx.end_phase_timer(self.phase_id)
             ctx.event_publisher.publish_sync("phase_complete", phase=self.phase_id, status="error")
@@ -100,6 +106,7 @@ class BasePhase(ABC):
         """
         from backend.utils.core.llm.llm_response_parser import LLMResponseParser
 
+        ctx.check_cancelled()
         system = self._truncate_to_tokens(system, _SYSTEM_TOKEN_BUDGET)
         user = self._truncate_to_tokens(user, _USER_TOKEN_BUDGET)
 
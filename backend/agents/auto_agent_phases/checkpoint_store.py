@@ -0,0 +1,221 @@
+"""Content-addressed checkpoint store for AutoAgent runs.
+
+Layout under ``<project_root>/.ollash/``:
+    objects/<aa>/<sha256[2:]>   — one blob per distinct file content (deduped across phases and runs)
+    manifests/<NNNN>_<phase>.json — {phase_id, created_at, files: {rel_path: sha256}}
+
+A checkpoint after a phase writes only the blobs that do not exist yet plus a
+small manifest of hashes, so the cost is O(changed files).  Resuming restores
+``generated_files`` from the blobs referenced by the manifest (hash-verified),
+independently of whatever is currently on disk.  Two manifests can be diffed
+without reading any file content.
+
+Retention: only the newest ``keep_manifests`` manifests are kept (default 10,
+``OLLASH_CHECKPOINT_KEEP``); blobs no longer referenced by any kept manifest
+are deleted when older manifests are pruned.  ``gc()`` does a full sweep.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class CheckpointStore:
+    """Blob + manifest store rooted at ``<project_root>/.ollash``."""
+
+    DEFAULT_KEEP_MANIFESTS = 10
+
+    def __init__(self, project_root: Path, keep_manifests: Optional[int] = None) -> None:
+        self.root = Path(project_root) / ".ollash"
+        if keep_manifests is None:
+            keep_manifests = int(os.environ.get("OLLASH_CHECKPOINT_KEEP", self.DEFAULT_KEEP_MANIFESTS))
+        self.keep_manifests = max(1, keep_manifests)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        # rel_path -> (content object, digest): skips re-hashing unchanged strings
+        self._hash_cache: Dict[str, Tuple[str, str]] = {}
+        self._known_objects: set[str] = set()
+        # File hashes of the most recent manifest written or loaded (diff baseline)
+        self.last_file_hashes: Dict[str, str] = {}
+
+    # ----------------------------------------------------------------
+    # Blobs
+    # ----------------------------------------------------------------
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put(self, content: str, digest: Optional[str] = None) -> Tuple[str, bool]:
+        """Store *content* if not present. Returns (digest, written)."""
+        digest = digest or self.content_hash(content)
+        if digest in self._known_objects:
+            return digest, False
+        path = self._object_path(digest)
+        if path.exists():
+            self._known_objects.add(digest)
+            return digest, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(content.encode("utf-8"))
+        os.replace(str(tmp), str(path))
+        self._known_objects.add(digest)
+        return digest, True
+
+    def get(self, digest: str) -> Optional[str]:
+        """Return blob content, or None if missing or corrupted."""
+        try:
+            data = self._object_path(digest).read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            return None
+        return data.decode("utf-8")
+
+    def snapshot(self, files: Dict[str, str]) -> Tuple[Dict[str, str], int]:
+        """Store every file's content. Returns ({rel_path: digest}, blobs_written)."""
+        hashes: Dict[str, str] = {}
+        written = 0
+        for rel_path, content in files.items():
+            cached = self._hash_cache.get(rel_path)
+            if cached is not None and cached[0] is content:
+                digest = cached[1]
+            else:
+                digest = self.content_hash(content)
+                self._hash_cache[rel_path] = (content, digest)
+            _, was_written = self.put(content, digest)
+            written += int(was_written)
+            hashes[rel_path] = digest
+        return hashes, written
+
+    def restore(self, file_hashes: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+        """Load contents for a manifest's files. Returns (files, missing_paths)."""
+        files: Dict[str, str] = {}
+        missing: List[str] = []
+        for rel_path, digest in file_hashes.items():
+            content = self.get(digest)
+            if content is None:
+                missing.append(rel_path)
+                continue
+            files[rel_path] = content
+            self._hash_cache[rel_path] = (content, digest)
+            self._known_objects.add(digest)
+        return files, missing
+
+    # ----------------------------------------------------------------
+    # Manifests
+    # ----------------------------------------------------------------
+
+    def write_manifest(self, phase_id: str, file_hashes: Dict[str, str]) -> str:
+        """Write a manifest for *phase_id* and return its file name."""
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        existing = self.list_manifests()
+        seq = int(existing[-1].split("_", 1)[0]) + 1 if existing else 1
+        safe_phase = "".join(c if c.isalnum() else "_" for c in str(phase_id)) or "phase"
+        name = f"{seq:04d}_{safe_phase}.json"
+        manifest = {
+            "phase_id": phase_id,
+            "created_at": datetime.now().isoformat(),
+            "files": file_hashes,
+        }
+        path = self.manifests_dir / name
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+        os.replace(str(tmp), str(path))
+        self.last_file_hashes = dict(file_hashes)
+        return name
+
+    def load_manifest(self, name: str) -> Optional[Dict]:
+        try:
+            return json.loads((self.manifests_dir / name).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def list_manifests(self) -> List[str]:
+        """Manifest file names, oldest first."""
+        if not self.manifests_dir.exists():
+            return []
+        return sorted(p.name for p in self.manifests_dir.glob("*.json"))
+
+    # ----------------------------------------------------------------
+    # Retention
+    # ----------------------------------------------------------------
+
+    def _referenced(self, names: List[str]) -> set[str]:
+        digests: set[str] = set()
+        for name in names:
+            manifest = self.load_manifest(name)
+            if manifest is not None:
+                digests.update(manifest.get("files", {}).values())
+        return digests
+
+    def _delete_blobs(self, digests: set[str]) -> int:
+        deleted = 0
+        for digest in digests:
+            self._known_objects.discard(digest)
+            try:
+                self._object_path(digest).unlink()
+                deleted += 1
+            except OSError:
+                pass
+        return deleted
+
+    def prune(self, keep: Optional[int] = None) -> Tuple[int, int]:
+        """Drop all but the newest *keep* manifests and the blobs only they referenced.
+
+        Returns (manifests_removed, blobs_deleted).
+        """
+        keep = max(1, keep or self.keep_manifests)
+        names = self.list_manifests()
+        if len(names) <= keep:
+            return 0, 0
+        old, kept = names[:-keep], names[-keep:]
+        candidates = self._referenced(old)
+        for name in old:
+            try:
+                (self.manifests_dir / name).unlink()
+            except OSError:
+                pass
+        return len(old), self._delete_blobs(candidates - self._referenced(kept))
+
+    def gc(self) -> int:
+        """Delete every blob (and stale temp file) not referenced by a manifest. Returns files deleted."""
+        if not self.objects_dir.exists():
+            return 0
+        referenced = self._referenced(self.list_manifests())
+        deleted = 0
+        for path in self.objects_dir.glob("*/*"):
+            digest = path.parent.name + path.name
+            if digest in referenced:
+                continue
+            self._known_objects.discard(digest)
+            try:
+                path.unlink()
+                deleted += 1
+            except OSError:
+                pass
+        return deleted
+
+    @staticmethod
+    def diff(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+        """Compare two {path: digest} maps without reading file contents."""
+        return {
+            "added": sorted(p for p in new if p not in old),
+            "removed": sorted(p for p in old if p not in new),
+            "modified": sorted(p for p in new if p in old and old[p] != new[p]),
+        }
+
+    def diff_manifests(self, old_name: str, new_name: str) -> Optional[Dict[str, List[str]]]:
+        old = self.load_manifest(old_name)
+        new = self.load_manifest(new_name)
+        if old is None or new is None:
+            return None
+        return self.diff(old.get("files", {}), new.get("files", {}))
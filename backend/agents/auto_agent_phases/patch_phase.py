@@ -29,6 +29,7 @@ from typing import Dict, List, Optional
 
 from backend.agents.auto_agent_phases.base_phase import BasePhase
 from backend.agents.auto_agent_phases.phase_context import PhaseContext
+from backend.agents.auto_agent_phases.repair_engine import RepairEngine
 
 _MAX_PASSES = 2
 _MAX_FIXES_PER_PASS = 25  # I6: was 10 — ruff emits up to 50 errors; fix more per pass
@@ -574,7 +575,7 @@ class PatchPhase(BasePhase):
     # ----------------------------------------------------------------
 
     def _fix_errors(self, ctx: PhaseContext, errors: List[Dict[str, str]]) -> int:
-        """Apply targeted fixes. Returns count of files patched."""
+        """Apply targeted fixes (concurrently, via RepairEngine). Returns count of files patched."""
         fixed = 0
         from backend.utils.domains.auto_generation.utilities.code_patcher import CodePatcher
 
@@ -585,38 +586,33 @@ class PatchPhase(BasePhase):
             if fp:
                 by_file.setdefault(fp, []).append(e.get("error", ""))
 
-        for file_path, file_errors in by_file.items():
-            current_content = ctx.generated_files.get(file_path, "")
-            if not current_content:
-                abs_path = ctx.project_root / file_path
-                if abs_path.exists():
-                    current_content = abs_path.read_text(encoding="utf-8", errors="replace")
-                else:
-                    continue
-
+        def fix(file_path: str, current_content: str, file_errors: List[str]) -> Optional[str]:
             issues = [{"description": err} for err in file_errors[:5]]
-            try:
-                patcher = CodePatcher(
-                    llm_client=ctx.llm_manager.get_client("coder"),
-                    logger=ctx.logger,
-                )
-                patched = patcher.edit_existing_file(
-                    file_path=file_path,
-                    current_content=current_content,
-                    readme=self._build_patch_context(ctx, file_path, current_content),  # M9
-                    issues_to_fix=issues,
-                    edit_strategy="search_replace",
-                )
-                if patched and patched != current_content:
-                    self._write_file(ctx, file_path, patched)
-                    if ctx.run_logger:
-                        ctx.run_logger.log_file_written(self.phase_id, file_path, len(patched), "ok")
-                    fixed += 1
-                else:
-                    ctx.logger.warning(f"[Patch] Fix produced no change: {file_path} | {file_errors[0][:80]}")
-                    ctx.metrics.setdefault("patch_noop_fixes", []).append(file_path)
-            except Exception as e:
-                ctx.logger.warning(f"[Patch] Failed to patch {file_path}: {e}")
+            patcher = CodePatcher(
+                llm_client=ctx.llm_manager.get_client("coder"),
+                logger=ctx.logger,
+            )
+            return patcher.edit_existing_file(
+                file_path=file_path,
+                current_content=current_content,
+                readme=self._build_patch_context(ctx, file_path, current_content),  # M9
+                issues_to_fix=issues,
+                edit_strategy="search_replace",
+            )
+
+        for outcome in RepairEngine(ctx, label="patch_fix").run(by_file, fix, self._write_file):
+            file_path = outcome.file_path
+            if outcome.missing:
+                continue
+            if outcome.error:
+                ctx.logger.warning(f"[Patch] Failed to patch {file_path}: {outcome.error}")
+            elif outcome.changed:
+                if ctx.run_logger:
+                    ctx.run_logger.log_file_written(self.phase_id, file_path, len(outcome.repaired), "ok")
+                fixed += 1
+            else:
+                ctx.logger.warning(f"[Patch] Fix produced no change: {file_path} | {by_file[file_path][0][:80]}")
+                ctx.metrics.setdefault("patch_noop_fixes", []).append(file_path)
 
         return fixed
 
@@ -641,7 +637,9 @@ class PatchPhase(BasePhase):
         is_small = ctx.is_small()
         repaired = 0
 
-        for file_path, content in list(ctx.generated_files.items()):
+        # path -> first stub hits, for every source file that still contains stubs
+        jobs: Dict[str, List[str]] = {}
+        for file_path, content in ctx.generated_files.items():
             ext = Path(file_path).suffix.lower()
             if ext not in self._STUB_SCAN_EXTS:
                 continue
@@ -650,12 +648,15 @@ class PatchPhase(BasePhase):
 
             stub_hits = [m.group(0)[:60] for m in _STUB_PATTERNS.finditer(content)][:3]
             ctx.logger.warning(f"[Patch] Stub repair needed in {file_path}: {stub_hits}")
+            jobs[file_path] = stub_hits
 
-            system = (
-                "You are a code repair agent. The file below contains stub or placeholder code. "
-                "Replace EVERY stub with a complete, working implementation. "
-                "Return ONLY the complete fixed file content. No markdown fences, no explanations."
-            )
+        system = (
+            "You are a code repair agent. The file below contains stub or placeholder code. "
+            "Replace EVERY stub with a complete, working implementation. "
+            "Return ONLY the complete fixed file content. No markdown fences, no explanations."
+        )
+
+        def rewrite(file_path: str, content: str, stub_hits: List[str]) -> Optional[str]:
             user = (
                 f"Project: {ctx.project_description[:600]}\n\n"
                 f"File: {file_path}\n"
@@ -668,20 +669,26 @@ class PatchPhase(BasePhase):
             fixed_raw = self._llm_call(ctx, system, user, role="coder", no_think=is_small, max_tokens=3000)
             if not fixed_raw or not fixed_raw.strip():
                 ctx.logger.warning(f"[Patch] Stub repair returned empty content for {file_path} — skipping")
-                continue
+                return None
 
             # Strip fences if present
             fixed = re.sub(r"^```[a-zA-Z0-9_\-]*\n", "", fixed_raw.strip())
             fixed = re.sub(r"\n```\s*$", "", fixed)
+            if not fixed.strip():
+                ctx.logger.warning(f"[Patch] Stub repair produced empty result for {file_path} — skipping")
+                return None
+            return fixed.strip()
 
-            if fixed.strip():
-                self._write_file(ctx, file_path, fixed.strip())
+        for outcome in RepairEngine(ctx, label="patch_stubs").run(jobs, rewrite, self._write_file):
+            if outcome.error:
+                ctx.logger.warning(f"[Patch] Stub repair failed for {outcome.file_path}: {outcome.error}")
+            elif outcome.changed:
                 if ctx.run_logger:
-                    ctx.run_logger.log_file_written(self.phase_id, file_path, len(fixed), "stub_repair")
-                ctx.logger.info(f"[Patch] Stub repair applied to {file_path} ({len(fixed)} chars)")
+                    ctx.run_logger.log_file_written(
+                        self.phase_id, outcome.file_path, len(outcome.repaired), "stub_repair"
+                    )
+                ctx.logger.info(f"[Patch] Stub repair applied to {outcome.file_path} ({len(outcome.repaired)} chars)")
                 repaired += 1
-            else:
-                ctx.logger.warning(f"[Patch] Stub repair produced empty result for {file_path} — skipping")
 
         return repaired
 
@@ -9,13 +9,16 @@ from __future__ import annotations
 
 import dataclasses
 import json
+import os
 import re
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 if TYPE_CHECKING:
+    from backend.agents.auto_agent_phases.checkpoint_store import CheckpointStore
     from backend.interfaces.imodel_provider import IModelProvider
     from backend.utils.core.system.agent_logger import AgentLogger
     from backend.utils.core.system.event_publisher import EventPublisher
@@ -93,6 +96,10 @@ class PhaseContext:
     # --- User-configurable pipeline knobs ---
     num_refine_loops: int = 3
     # Max improvement rounds in PatchPhase. Overridden from wizard's "Refinement Loops" slider.
+    repair_concurrency: int = 4
+    # Max concurrent per-file LLM repairs in PatchPhase / SeniorReviewPhase (see repair_engine.py).
+    test_shards: int = 4
+    # Max concurrent pytest processes in TestRunPhase.
 
     # --- Internal ---
     _phase_start_times: Dict[str, float] = field(default_factory=dict, repr=False)
@@ -105,6 +112,12 @@ class PhaseContext:
     # All phases check `if ctx.run_logger:` before calling it.
     run_logger: Optional["PipelineRunLogger"] = field(default=None, repr=False)
 
+    # Content-addressed checkpoint store — created lazily by save/apply checkpoint.
+    _checkpoint_store: Optional["CheckpointStore"] = field(default=None, repr=False)
+
+    # Set by the project job manager to stop the run before the next LLM call / phase.
+    cancel_event: Optional[threading.Event] = field(default=None, repr=False)
+
     # ----------------------------------------------------------------
     # Model-size helpers
     # ----------------------------------------------------------------
@@ -129,6 +142,17 @@ class PhaseContext:
         """True if model <=2B (true nano)."""
         return self._model_size_b(role) <= 2.0
 
+    # ----------------------------------------------------------------
+    # Cancellation
+    # ----------------------------------------------------------------
+
+    def check_cancelled(self) -> None:
+        """Raise PipelineCancelledError if the run has been cancelled."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            from backend.utils.core.exceptions import PipelineCancelledError
+
+            raise PipelineCancelledError(self.project_name)
+
     # ----------------------------------------------------------------
     # Metrics helpers
     # ----------------------------------------------------------------
@@ -265,10 +289,21 @@ class PhaseContext:
             "completed_phases": completed_phases,
         }
 
+    def checkpoint_store(self) -> "CheckpointStore":
+        """Return the content-addressed store under .ollash/ (created on first use)."""
+        if self._checkpoint_store is None:
+            from backend.agents.auto_agent_phases.checkpoint_store import CheckpointStore
+
+            self._checkpoint_store = CheckpointStore(self.project_root)
+        return self._checkpoint_store
+
     def apply_checkpoint_dict(self, data: Dict[str, Any]) -> None:
         """Restore pipeline state from checkpoint dict.
 
-        Re-reads generated file contents from disk (content not stored in checkpoint).
+        When the checkpoint references a manifest, generated file contents are
+        restored from hash-verified blobs — exactly as they were after the last
+        completed phase, regardless of edits on disk. Legacy checkpoints (paths
+        only) and missing blobs fall back to re-reading the file from disk.
         """
         self.project_type = data.get("project_type", self.project_type)
         self.tech_stack = data.get("tech_stack", self.tech_stack)
@@ -276,25 +311,76 @@ class PhaseContext:
         self.errors = data.get("errors", [])
         self.metrics = data.get("metrics", {})
 
+        rel_paths: List[str] = list(data.get("generated_file_paths", []))
+        manifest_name = data.get("manifest")
+        if manifest_name:
+            store = self.checkpoint_store()
+            manifest = store.load_manifest(manifest_name)
+            if manifest is None:
+                self.logger.warning(f"[Checkpoint] Manifest {manifest_name} missing — re-reading files from disk")
+            else:
+                file_hashes: Dict[str, str] = manifest.get("files", {})
+                restored, missing = store.restore(file_hashes)
+                self.generated_files.update(restored)
+                store.last_file_hashes = dict(file_hashes)
+                if missing:
+                    self.logger.warning(f"[Checkpoint] {len(missing)} blob(s) missing — re-reading from disk")
+                drifted = [p for p, content in restored.items() if self._read_disk_file(p) != content]
+                if drifted:
+                    self.logger.warning(
+                        f"[Checkpoint] {len(drifted)} file(s) differ on disk; resuming from checkpointed content"
+                    )
+                rel_paths = missing
+
         # Re-read generated files from disk
-        for rel_path in data.get("generated_file_paths", []):
-            abs_path = self.project_root / rel_path
-            if abs_path.exists():
-                try:
-                    self.generated_files[rel_path] = abs_path.read_text(encoding="utf-8", errors="replace")
-                except OSError:
-                    pass
-
-    def save_checkpoint(self, completed_phases: List[str]) -> None:
-        """Write checkpoint JSON to .ollash/checkpoint.json inside the project root."""
+        for rel_path in rel_paths:
+            content = self._read_disk_file(rel_path)
+            if content is not None:
+                self.generated_files[rel_path] = content
+
+    def _read_disk_file(self, rel_path: str) -> Optional[str]:
+        abs_path = self.project_root / rel_path
+        if not abs_path.exists():
+            return None
+        try:
+            return abs_path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+
+    def save_checkpoint(self, completed_phases: List[str]) -> Dict[str, List[str]]:
+        """Checkpoint the pipeline state after a phase.
+
+        File contents go to the content-addressed store (only new blobs are
+        written) plus a per-phase manifest; .ollash/checkpoint.json holds the
+        remaining state and points at the manifest.
+
+        Returns:
+            Diff against the previous manifest: {"added", "removed", "modified"} path lists.
+        """
         checkpoint_dir = self.project_root / ".ollash"
         checkpoint_dir.mkdir(parents=True, exist_ok=True)
         checkpoint_path = checkpoint_dir / "checkpoint.json"
         data = self.to_checkpoint_dict(completed_phases)
+        diff: Dict[str, List[str]] = {"added": [], "removed": [], "modified": []}
         try:
-            checkpoint_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            store = self.checkpoint_store()
+            previous = store.last_file_hashes
+            file_hashes, blobs_written = store.snapshot(self.generated_files)
+            diff = store.diff(previous, file_hashes)
+            phase_id = completed_phases[-1] if completed_phases else ""
+            data["manifest"] = store.write_manifest(phase_id, file_hashes)
+            store.prune()
+            self.logger.debug(
+                f"[Checkpoint] Phase {phase_id}: {blobs_written} new blob(s), "
+                f"{len(diff['added'])} added / {len(diff['modified'])} modified / {len(diff['removed'])} removed"
+            )
+
+            tmp_path = checkpoint_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(str(tmp_path), str(checkpoint_path))
         except OSError as e:
             self.logger.warning(f"[Checkpoint] Could not save: {e}")
+        return diff
 
     @staticmethod
     def load_checkpoint(project_root: Path) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,258 @@
+"""Shared per-file repair engine for PatchPhase and SeniorReviewPhase.
+
+Repair passes make one LLM call per broken file.  ``RepairEngine`` fans those
+calls out over a bounded thread pool (``ctx.repair_concurrency``) instead of
+running them one by one:
+
+- Files that import each other are *conflicting*: the importer's fix should see
+  the imported file's repaired API.  The job set is split into waves with the
+  project import graph (blueprint ``imports`` plus Python and relative JS/TS
+  imports found in the sources) so a file is only repaired after the files it
+  imports.  Cycles are broken by releasing one file at a time, in job order.
+- Workers only compute new content.  Results are merged into
+  ``ctx.generated_files`` (via the phase's ``_write_file``) on the calling
+  thread, wave by wave and in job order, so the outcome never depends on which
+  LLM call finishes first.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import posixpath
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from backend.agents.auto_agent_phases.phase_context import PhaseContext
+from backend.utils.core.exceptions import PipelineCancelledError
+
+_PY_FROM_IMPORT = re.compile(r"^\s*from\s+(\.*)([\w.]*)\s+import[ \t]+([\w \t,*()]+)", re.MULTILINE)
+_PY_IMPORT = re.compile(r"^\s*import\s+([\w.]+(?:\s*,\s*[\w.]+)*)", re.MULTILINE)
+_JS_IMPORT = re.compile(
+    r"(?:\bimport\s+(?:[\w*{}\s,]+\s+from\s+)?|\bexport\s+[\w*{}\s,]+\s+from\s+|\brequire\s*\(\s*)"
+    r"""['"](\.{1,2}/[^'"]+)['"]"""
+)
+_JS_EXTS = (".js", ".ts", ".tsx", ".jsx", ".mjs", ".cjs")
+
+
+@dataclass
+class RepairOutcome:
+    """Result of repairing one file."""
+
+    file_path: str
+    original: str
+    repaired: Optional[str] = None
+    error: Optional[str] = None
+    missing: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.repaired) and self.repaired != self.original
+
+
+# ----------------------------------------------------------------
+# Import graph
+# ----------------------------------------------------------------
+
+
+def _python_module_index(paths: Iterable[str]) -> Dict[str, str]:
+    """Map every dotted-name suffix of each .py path to the path (``a/b/c.py`` → ``a.b.c``, ``b.c``, ``c``)."""
+    index: Dict[str, str] = {}
+    for path in sorted(paths):
+        if not path.endswith(".py"):
+            continue
+        parts = path[:-3].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        for i in range(len(parts)):
+            index.setdefault(".".join(parts[i:]), path)
+    return index
+
+
+def _python_imports(path: str, content: str, index: Dict[str, str]) -> Set[str]:
+    found: Set[str] = set()
+    package = posixpath.dirname(path).split("/") if "/" in path else []
+    for dots, module, names in _PY_FROM_IMPORT.findall(content):
+        if dots:
+            base = package[: len(package) - (len(dots) - 1)] if len(dots) > 1 else package
+            prefix = ".".join(base + ([module] if module else []))
+        else:
+            prefix = module
+        candidates = [prefix] if prefix else []
+        for name in re.split(r"[\s,()]+", names):
+            if name and name != "*":
+                candidates.append(f"{prefix}.{name}" if prefix else name)
+        for candidate in candidates:
+            if candidate in index:
+                found.add(index[candidate])
+    for modules in _PY_IMPORT.findall(content):
+        for module in re.split(r"\s*,\s*", modules):
+            if module in index:
+                found.add(index[module])
+    return found
+
+
+def _js_imports(path: str, content: str, known: Set[str]) -> Set[str]:
+    found: Set[str] = set()
+    base = posixpath.dirname(path)
+    for spec in _JS_IMPORT.findall(content):
+        target = posixpath.normpath(posixpath.join(base, spec))
+        candidates = [target] + [target + ext for ext in _JS_EXTS] + [f"{target}/index{ext}" for ext in _JS_EXTS]
+        for candidate in candidates:
+            if candidate in known:
+                found.add(candidate)
+                break
+    return found
+
+
+def build_import_graph(ctx: PhaseContext, paths: Iterable[str]) -> Dict[str, Set[str]]:
+    """Return ``path → project files it imports`` for *paths*, from the blueprint and the sources."""
+    known = set(ctx.generated_files) | {fp.path for fp in ctx.blueprint}
+    index = _python_module_index(known)
+    declared = {fp.path: set(fp.imports) for fp in ctx.blueprint}
+    graph: Dict[str, Set[str]] = {}
+    for path in paths:
+        deps = {dep for dep in declared.get(path, ()) if dep in known}
+        content = ctx.generated_files.get(path, "")
+        if path.endswith(".py"):
+            deps |= _python_imports(path, content, index)
+        elif path.endswith(_JS_EXTS):
+            deps |= _js_imports(path, content, known)
+        deps.discard(path)
+        graph[path] = deps
+    return graph
+
+
+def repair_waves(paths: List[str], graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """Split *paths* into waves so every file comes after the files it imports.
+
+    Only imports between files in *paths* matter.  Order within a wave follows
+    *paths*; an import cycle is broken by releasing its first file on its own.
+    """
+    selected = set(paths)
+    deps = {p: graph.get(p, set()) & selected for p in paths}
+    done: Set[str] = set()
+    remaining = list(paths)
+    waves: List[List[str]] = []
+    while remaining:
+        wave = [p for p in remaining if deps[p] <= done] or remaining[:1]
+        waves.append(wave)
+        done.update(wave)
+        remaining = [p for p in remaining if p not in done]
+    return waves
+
+
+# ----------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------
+
+
+class RepairEngine:
+    """Runs per-file repairs concurrently, in import-graph order, with deterministic merging.
+
+    Args:
+        ctx: Pipeline context whose ``generated_files`` receive the repaired content.
+        max_workers: Concurrency bound; defaults to ``ctx.repair_concurrency``.
+        label: Name recorded in ``ctx.metrics["repair_engine"]``.
+    """
+
+    def __init__(self, ctx: PhaseContext, max_workers: Optional[int] = None, label: str = "repair"):
+        self.ctx = ctx
+        self.max_workers = max(1, max_workers or ctx.repair_concurrency)
+        self.label = label
+
+    def run(
+        self,
+        jobs: Dict[str, Any],
+        repair_fn: Callable[[str, str, Any], Optional[str]],
+        write_fn: Callable[[PhaseContext, str, str], None],
+    ) -> List[RepairOutcome]:
+        """Repair every file in *jobs* (``path → payload``) and merge the results.
+
+        ``repair_fn(path, current_content, payload)`` runs on a worker thread and
+        returns the new content (or ``None``); it sees the merged output of all
+        earlier waves.  ``write_fn(ctx, path, content)`` is called on this thread
+        for every changed file.  Outcomes are returned in job order; files with no
+        content in ``ctx.generated_files`` or on disk are reported as ``missing``.
+        """
+        ctx = self.ctx
+        paths = list(jobs)
+        if not paths:
+            return []
+
+        start = time.monotonic()
+        waves = repair_waves(paths, build_import_graph(ctx, paths))
+        workers = min(self.max_workers, max(len(wave) for wave in waves))
+        outcomes: Dict[str, RepairOutcome] = {}
+
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for wave in waves:
+                pending: Dict[str, Any] = {}
+                for path in wave:
+                    content = self._current_content(path)
+                    if not content:
+                        outcomes[path] = RepairOutcome(path, "", missing=True)
+                    elif pool is None:
+                        pending[path] = self._repair_one(repair_fn, path, content, jobs[path])
+                    else:
+                        pending[path] = pool.submit(self._repair_one, repair_fn, path, content, jobs[path])
+
+                for path in wave:
+                    if path not in pending:
+                        continue
+                    result = pending[path]
+                    outcome = result.result() if pool is not None else result
+                    outcomes[path] = outcome
+                    if outcome.changed:
+                        write_fn(ctx, path, outcome.repaired)
+        except PipelineCancelledError:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+                pool = None
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        ordered = [outcomes[p] for p in paths if p in outcomes]
+        ctx.metrics.setdefault("repair_engine", []).append(
+            {
+                "label": self.label,
+                "files": len(paths),
+                "changed": sum(1 for o in ordered if o.changed),
+                "waves": len(waves),
+                "workers": workers,
+                "elapsed": round(time.monotonic() - start, 3),
+            }
+        )
+        return ordered
+
+    def _current_content(self, path: str) -> str:
+        content = self.ctx.generated_files.get(path, "")
+        if content:
+            return content
+        abs_path = self.ctx.project_root / path
+        try:
+            if abs_path.exists():
+                return abs_path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            pass
+        return ""
+
+    @staticmethod
+    def _repair_one(
+        repair_fn: Callable[[str, str, Any], Optional[str]], path: str, content: str, payload: Any
+    ) -> RepairOutcome:
+        start = time.monotonic()
+        outcome = RepairOutcome(path, content)
+        try:
+            outcome.repaired = repair_fn(path, content, payload)
+        except PipelineCancelledError:
+            raise
+        except Exception as e:
+            outcome.error = str(e)
+        outcome.elapsed = time.monotonic() - start
+        return outcome
@@ -20,6 +20,7 @@ from typing import Any, Dict, List, Optional
 
 from backend.agents.auto_agent_phases.base_phase import BasePhase
 from backend.agents.auto_agent_phases.phase_context import PhaseContext
+from backend.agents.auto_agent_phases.repair_engine import RepairEngine
 
 _MAX_REVIEW_CYCLES_LARGE = 3  # I2: large (>8B) models — was 2
 _MAX_REVIEW_CYCLES_SMALL = 2  # compact path (≤8B): unchanged
@@ -503,7 +504,10 @@ class SeniorReviewPhase(BasePhase):
     # ----------------------------------------------------------------
 
     def _fix_issues(self, ctx: PhaseContext, issues: List[Dict[str, Any]]) -> int:
-        """Apply CodePatcher to each file that has issues. Returns count of patched files."""
+        """Apply CodePatcher to each file that has issues (concurrently, via RepairEngine).
+
+        Returns count of patched files.
+        """
         from backend.utils.domains.auto_generation.utilities.code_patcher import CodePatcher
 
         # Group issues by file
@@ -513,25 +517,7 @@ class SeniorReviewPhase(BasePhase):
             if fp:
                 by_file.setdefault(fp, []).append(issue)
 
-        patcher = CodePatcher(
-            llm_client=ctx.llm_manager.get_client("coder"),
-            logger=ctx.logger,
-        )
-
-        fixed = 0
-        for file_path, file_issues in by_file.items():
-            current_content = ctx.generated_files.get(file_path, "")
-            if not current_content:
-                abs_path = ctx.project_root / file_path
-                if abs_path.exists():
-                    try:
-                        current_content = abs_path.read_text(encoding="utf-8", errors="replace")
-                    except OSError:
-                        pass
-            if not current_content:
-                ctx.logger.warning(f"[SeniorReview] Cannot fix '{file_path}': file not found")
-                continue
-
+        def fix(file_path: str, current_content: str, file_issues: List[Dict[str, Any]]) -> Optional[str]:
             # Combine all issues for this file into a single patch call
             issues_to_fix = [
                 {
@@ -541,24 +527,31 @@ class SeniorReviewPhase(BasePhase):
                 }
                 for i in file_issues
             ]
+            patcher = CodePatcher(
+                llm_client=ctx.llm_manager.get_client("coder"),
+                logger=ctx.logger,
+            )
+            return patcher.edit_existing_file(
+                file_path=file_path,
+                current_content=current_content,
+                readme=ctx.project_description[:400],
+                issues_to_fix=issues_to_fix,
+                edit_strategy="search_replace",
+            )
 
-            try:
-                patched = patcher.edit_existing_file(
-                    file_path=file_path,
-                    current_content=current_content,
-                    readme=ctx.project_description[:400],
-                    issues_to_fix=issues_to_fix,
-                    edit_strategy="search_replace",
-                )
-                if patched and patched != current_content:
-                    self._write_file(ctx, file_path, patched)
-                    if ctx.run_logger:
-                        ctx.run_logger.log_file_written(
-                            self.phase_id, file_path, len(patched), "ok", "senior review fix"
-                        )
-                    fixed += 1
-                    ctx.logger.info(f"[SeniorReview] Patched '{file_path}' ({len(file_issues)} issue(s) addressed)")
-            except Exception as e:
-                ctx.logger.warning(f"[SeniorReview] Failed to patch '{file_path}': {e}")
+        fixed = 0
+        for outcome in RepairEngine(ctx, label="senior_review").run(by_file, fix, self._write_file):
+            file_path = outcome.file_path
+            if outcome.missing:
+                ctx.logger.warning(f"[SeniorReview] Cannot fix '{file_path}': file not found")
+            elif outcome.error:
+                ctx.logger.warning(f"[SeniorReview] Failed to patch '{file_path}': {outcome.error}")
+            elif outcome.changed:
+                if ctx.run_logger:
+                    ctx.run_logger.log_file_written(
+                        self.phase_id, file_path, len(outcome.repaired), "ok", "senior review fix"
+                    )
+                fixed += 1
+                ctx.logger.info(f"[SeniorReview] Patched '{file_path}' ({len(by_file[file_path])} issue(s) addressed)")
 
         return fixed
@@ -6,24 +6,92 @@ For each failing test, locates the relevant source file and patches it.
 I9: Max 5 iterations (large >8B) / 3 iterations (small ≤8B).
 After tests pass, a zero-LLM ruff check catches lint regressions from patches (I9).
 
+pytest runs are impact-based: after the first full run, an iteration re-runs the
+previously failed tests first, then only the test files that (transitively)
+import a file patched in the previous round, and the full suite only once as a
+confirmation when those pass.  The targeted runs are sharded across
+``ctx.test_shards`` pytest processes; full runs are a plain ``pytest`` so the
+project's own collection config decides what runs.  Per-iteration timings and the time saved against the last
+full run are recorded in ``ctx.metrics["test_run_iterations"]``.
+
 Skipped automatically for small models (<=8B) — see AutoAgent.SMALL_PHASE_ORDER.
 """
 
 from __future__ import annotations
 
+import concurrent.futures
 import json
 import re
 import subprocess
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Set
 
 from backend.agents.auto_agent_phases.base_phase import BasePhase
 from backend.agents.auto_agent_phases.phase_context import PhaseContext
+from backend.agents.auto_agent_phases.repair_engine import build_import_graph
 
 _MAX_ITERATIONS_LARGE = 5  # I9: large (>8B) models — was 3
 _MAX_ITERATIONS_SMALL = 3  # I9: small (≤8B) models — unchanged
 _PYTEST_TIMEOUT = 120
 _TEST_TIMEOUT = 120
+_PYTEST_ARGS = ["python", "-m", "pytest", "--tb=short", "-q", "--no-header"]
+
+
+def is_pytest_file(path: str) -> bool:
+    """True for files pytest collects by default (``test_*.py`` / ``*_test.py``)."""
+    name = Path(path).name
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def affected_tests(ctx: PhaseContext, test_files: Iterable[str], changed: Iterable[str]) -> List[str]:
+    """Return the test files whose outcome can depend on *changed* files.
+
+    A test is affected when it was changed itself or transitively imports a
+    changed file.  A changed ``conftest.py`` affects every test below its directory.
+    """
+    changed = set(changed)
+    tests = sorted(set(test_files))
+    graph = build_import_graph(ctx, list(ctx.generated_files))
+    conftest_dirs = [str(Path(p).parent) for p in changed if Path(p).name == "conftest.py"]
+    affected: List[str] = []
+    for test in tests:
+        if test in changed or any(d == "." or test.startswith(d + "/") for d in conftest_dirs):
+            affected.append(test)
+            continue
+        seen: Set[str] = set()
+        stack = list(graph.get(test, ()))
+        while stack:
+            dep = stack.pop()
+            if dep in seen:
+                continue
+            if dep in changed:
+                affected.append(test)
+                break
+            seen.add(dep)
+            stack.extend(graph.get(dep, ()))
+    return affected
+
+
+def shard_tests(targets: Sequence[str], shards: int, cost: Dict[str, int]) -> List[List[str]]:
+    """Split pytest *targets* (files or node ids) into at most *shards* balanced groups.
+
+    Node ids of the same file stay in one shard.  Files are assigned largest
+    first to the lightest shard (by ``cost``, e.g. line count); order within a
+    shard follows *targets*, so previously failed tests keep running first.
+    """
+    groups: Dict[str, List[str]] = {}
+    for target in targets:
+        groups.setdefault(target.split("::", 1)[0], []).append(target)
+    count = max(1, min(shards, len(groups)))
+    buckets: List[List[str]] = [[] for _ in range(count)]
+    loads = [0] * count
+    for file in sorted(groups, key=lambda f: (-cost.get(f, 1), f)):
+        i = loads.index(min(loads))
+        buckets[i].extend(groups[file])
+        loads[i] += max(1, cost.get(file, 1))
+    rank = {t: n for n, t in enumerate(targets)}
+    return [sorted(bucket, key=rank.__getitem__) for bucket in buckets if bucket]
 
 
 class TestRunPhase(BasePhase):
@@ -44,11 +112,26 @@ class TestRunPhase(BasePhase):
         ctx.logger.info(f"[TestRun] Using runner: {runner}")
 
         max_iters = _MAX_ITERATIONS_SMALL if ctx.is_small() else _MAX_ITERATIONS_LARGE
+        iterations: List[Dict] = []
+        ctx.metrics["test_run_iterations"] = iterations
+        full_seconds: Optional[float] = None  # duration of the latest full run
+        failures: List[Dict] = []
+        patched_files: List[str] = []
         for iteration in range(max_iters):
-            result = self._run_tests(ctx, runner)
+            start = time.monotonic()
+            if runner == "pytest" and patched_files:
+                result, stats = self._run_impacted(ctx, failures, patched_files)
+            else:
+                result, stats = self._run_tests(ctx, runner), {"mode": "full", "selected": None}
+            elapsed = time.monotonic() - start
             if result is None:
                 ctx.logger.info(f"[TestRun] {runner} not available, skipping")
                 return
+            self._record_iteration(ctx, iterations, iteration + 1, stats, elapsed, full_seconds)
+            if stats["mode"] == "full":
+                full_seconds = elapsed
+            elif stats.get("confirm_seconds") is not None:
+                full_seconds = stats["confirm_seconds"]
 
             if result["passed"]:
                 ctx.logger.info(f"[TestRun] All tests passed on iteration {iteration + 1}")
@@ -72,9 +155,11 @@ class TestRunPhase(BasePhase):
                 break
 
             patched = 0
+            before = dict(ctx.generated_files)
             for failure in failures[:3]:  # max 3 fixes per iteration
                 if self._patch_failure(ctx, failure):
                     patched += 1
+            patched_files = [p for p, c in ctx.generated_files.items() if before.get(p) != c]
             ctx.logger.info(f"[TestRun] Patched {patched} file(s)")
 
             if ctx.run_logger:
@@ -88,6 +173,55 @@ class TestRunPhase(BasePhase):
 
         ctx.metrics["tests_passed"] = False
 
+    def _run_impacted(self, ctx: PhaseContext, failures: List[Dict], patched_files: List[str]):
+        """Re-run failed tests, then tests affected by *patched_files*, then one full confirmation run.
+
+        Stops at the first stage that fails.  Returns ``(result, stats)``; ``result``
+        is ``None`` when pytest is unavailable.
+        """
+        failed_ids = list(dict.fromkeys(f"{f['file_path']}::{f['test_name']}" for f in failures if f.get("test_name")))
+        failed_ids = [t for t in failed_ids if t.split("::", 1)[0] in ctx.generated_files]
+        test_files = [p for p in ctx.generated_files if is_pytest_file(p)]
+        affected = affected_tests(ctx, test_files, patched_files)
+        stats: Dict = {"mode": "impact", "selected": len(failed_ids) + len(affected), "confirm_seconds": None}
+        ctx.logger.info(
+            f"[TestRun] Impact selection: {len(failed_ids)} failed test(s) first, "
+            f"{len(affected)}/{len(test_files)} affected test file(s)"
+        )
+
+        if failed_ids:
+            result = self._run_pytest(ctx, failed_ids)
+            if result is None or not result["passed"]:
+                return result, stats
+        if affected:
+            result = self._run_pytest(ctx, affected, deselect=failed_ids)
+            if result is None or not result["passed"]:
+                return result, stats
+
+        start = time.monotonic()
+        result = self._run_tests(ctx, "pytest")  # full confirmation run
+        stats["confirm_seconds"] = time.monotonic() - start
+        return result, stats
+
+    @staticmethod
+    def _record_iteration(
+        ctx: PhaseContext, iterations: List[Dict], iteration: int, stats: Dict, elapsed: float, full_seconds
+    ) -> None:
+        """Append per-iteration timing; ``saved_seconds`` is measured against the latest full run."""
+        saved = round(full_seconds - elapsed, 3) if stats["mode"] == "impact" and full_seconds is not None else 0.0
+        iterations.append(
+            {
+                "iteration": iteration,
+                "mode": stats["mode"],
+                "selected": stats["selected"],
+                "seconds": round(elapsed, 3),
+                "saved_seconds": saved,
+            }
+        )
+        ctx.metrics["test_time_saved_seconds"] = round(sum(i["saved_seconds"] for i in iterations), 3)
+        if saved:
+            ctx.logger.info(f"[TestRun] Iteration {iteration}: impact run saved {saved:.2f}s vs full run")
+
     def _post_success_ruff_check(self, ctx: PhaseContext) -> None:
         """I9: Zero-LLM ruff lint check after test success.
 
@@ -152,28 +286,58 @@ class TestRunPhase(BasePhase):
             return self._run_jest(ctx)
         return self._run_pytest(ctx)
 
-    def _run_pytest(self, ctx: PhaseContext) -> Optional[Dict]:
-        """Run pytest. Returns dict with passed/failures, or None if unavailable."""
-        try:
-            result = subprocess.run(
-                ["python", "-m", "pytest", "--tb=short", "-q", "--no-header"],
+    def _run_pytest(
+        self, ctx: PhaseContext, targets: Optional[List[str]] = None, deselect: Sequence[str] = ()
+    ) -> Optional[Dict]:
+        """Run pytest. Returns dict with passed/failures, or None if unavailable.
+
+        Without *targets* the whole suite runs as one plain ``pytest`` (project
+        config such as testpaths and conftest decides collection, and collecting
+        nothing is a failure).  Explicit test files (or node ids) are split
+        across up to ``ctx.test_shards`` concurrent pytest processes.
+        """
+        full = targets is None
+        if full:
+            shards = [[]]
+        else:
+            cost = {p: ctx.generated_files.get(p, "").count("\n") for p in ctx.generated_files}
+            shards = shard_tests(targets, ctx.test_shards, cost)
+            if not shards:
+                return {"passed": True, "failures": []}  # empty selection: nothing to run
+        extra = [arg for node in deselect for arg in ("--deselect", node)]
+        cmds = [_PYTEST_ARGS + (["-p", "no:cacheprovider"] if len(shards) > 1 else []) + extra + s for s in shards]
+
+        def run_shard(cmd: List[str]) -> subprocess.CompletedProcess:
+            return subprocess.run(
+                cmd,
                 cwd=str(ctx.project_root),
                 capture_output=True,
                 text=True,
                 timeout=_PYTEST_TIMEOUT,
             )
-            output = result.stdout + result.stderr
-            if result.returncode == 0:
-                return {"passed": True, "failures": []}
 
-            failures = self._parse_failures(output)
-            return {"passed": False, "failures": failures}
+        try:
+            if len(cmds) == 1:
+                results = [run_shard(cmds[0])]
+            else:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=len(cmds)) as pool:
+                    results = list(pool.map(run_shard, cmds))
         except FileNotFoundError:
             return None  # pytest not installed
         except subprocess.TimeoutExpired:
             ctx.logger.warning("[TestRun] pytest timed out")
             return {"passed": False, "failures": []}
 
+        # 5 = nothing collected, fine for an explicit selection that was fully deselected
+        ok_codes = (0,) if full else (0, 5)
+        if all(r.returncode in ok_codes for r in results):
+            return {"passed": True, "failures": []}
+        failures: List[Dict[str, str]] = []
+        for r in results:
+            if r.returncode not in ok_codes:
+                failures.extend(self._parse_failures(r.stdout + r.stderr))
+        return {"passed": False, "failures": failures}
+
     def _run_go_test(self, ctx: PhaseContext) -> Optional[Dict]:
         """Run `go test ./...`."""
         try:
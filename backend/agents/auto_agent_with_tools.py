@@ -18,10 +18,12 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from backend.utils.core.exceptions import PipelineCancelledError
 from backend.utils.domains.auto_generation.tools.project_creation_tools import ProjectCreationTools
 
 
@@ -71,6 +73,8 @@ class AutoAgentWithTools:
         # Metrics — populated during run()
         self._total_tokens: int = 0
         self._iteration_count: int = 0
+        self._project_name: str = ""
+        self._cancel_event: Optional[threading.Event] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -83,6 +87,7 @@ class AutoAgentWithTools:
         project_root: Optional[Path] = None,
         on_blueprint_ready: Optional[Callable[[Dict[str, Any]], bool]] = None,
         max_duration_seconds: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> Path:
         """Run the tool-calling agent loop. Returns project_root on completion.
 
@@ -97,9 +102,13 @@ class AutoAgentWithTools:
             max_duration_seconds: Soft wall-clock limit for the tool loop. When elapsed time
                 exceeds this value the current iteration finishes and the loop exits cleanly.
                 None = no limit. Typical values: 300 (easy), 720 (medium), 1500 (hard).
+            cancel_event: When set, the loop raises PipelineCancelledError before its
+                next LLM call.
         """
         if project_root is None:
             project_root = self.generated_projects_dir / project_name
+        self._project_name = project_name
+        self._cancel_event = cancel_event
 
         start_time = time.time()
         self._total_tokens = 0
@@ -200,6 +209,8 @@ class AutoAgentWithTools:
         last_had_tool_error = False  # True when the previous iteration had a tool that returned ok=False
 
         for iteration in range(self.MAX_ITERATIONS):
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                raise PipelineCancelledError(self._project_name)
             # ── Soft time limit check (before starting a new LLM call) ──────
             if max_duration_seconds is not None:
                 elapsed = time.time() - run_start_time
@@ -21,10 +21,6 @@ from backend.utils.core.llm.llm_response_parser import LLMResponseParser
 from backend.utils.core.llm.token_tracker import TokenTracker
 from backend.utils.core.memory.automatic_learning import AutomaticLearningSystem
 from backend.utils.core.memory.cross_reference_analyzer import CrossReferenceAnalyzer
-from backend.utils.core.system.concurrent_rate_limiter import (
-    ConcurrentGPUAwareRateLimiter,
-    SessionResourceManager,
-)
 from backend.utils.core.system.event_publisher import EventPublisher
 from backend.utils.core.system.permission_profiles import PermissionProfileManager, PolicyEnforcer
 
@@ -89,8 +85,6 @@ class CoreAgent(ABC):
         )
         chroma_db_path = str(self.ollash_root_dir / ".ollash" / "chroma_db")
         self.rag_context_selector = RAGContextSelector(self.config, chroma_db_path, None)
-        self.rate_limiter = ConcurrentGPUAwareRateLimiter(logger=self.logger)
-        self.session_resource_manager = SessionResourceManager()
         benchmark_dir = self.ollash_root_dir / ".ollash" / "benchmarks"
         benchmark_dir.mkdir(parents=True, exist_ok=True)
         self.benchmark_selector = AutoModelSelector(
@@ -122,10 +116,9 @@ class CoreAgent(ABC):
                 recorder=self.llm_recorder,
             )
 
-        self.logger.info(f"{logger_name} initialized with 6 architectural improvements and external LLM management.")
+        self.logger.info(f"{logger_name} initialized with 5 architectural improvements and external LLM management.")
         self.logger.info("  ✓ DependencyScanner (multi-language decoupling)")
         self.logger.info("  ✓ RAGContextSelector (semantic context via ChromaDB)")
-        self.logger.info("  ✓ ConcurrentGPUAwareRateLimiter (GPU resource management)")
         self.logger.info("  ✓ BenchmarkModelSelector (auto model optimization)")
         self.logger.info("  ✓ PermissionProfiles (fine-grained access control)")
         self.logger.info("  ✓ AutomaticLearningSystem (post-mortem pattern capture)")
@@ -44,6 +44,7 @@ from backend.utils.core.tools.tool_interface import ToolExecutor  # Concrete Too
 from backend.utils.core.tools.tool_registry import ToolRegistry
 from backend.utils.core.tools.tool_span_manager import ToolSpanManager  # NEW
 
+from backend.services.intent_router import MANDATORY_TOOLS, get_intent_router
 from backend.services.language_manager import LanguageManager
 
 # Initialize colorama
@@ -111,6 +112,9 @@ class DefaultAgent(CoreAgent, IntentRoutingMixin, ToolLoopMixin, ContextSummariz
         self._event_bridge = event_bridge
 
         self.max_iterations = self.tool_settings_config.max_iterations  # Get from tool_settings_config
+        # chat() closes the LLM client sessions when it returns; AgentPool turns this off because
+        # pooled agents share one LLMClientManager on a long-lived loop and keep its sessions open
+        self.close_sessions_after_chat = True
 
         self.logger.info(f"\n{Fore.GREEN}{'=' * 60}")
         self.logger.info("Default Agent Initialized")
@@ -251,6 +255,35 @@ class DefaultAgent(CoreAgent, IntentRoutingMixin, ToolLoopMixin, ContextSummariz
         self.logger.info(f"Ollama URL: {self.llm_models_config.ollama_url}")  # Access from llm_models_config
         self.logger.info(f"Default Model: {self.llm_models_config.default_model} (Initial)")
 
+    @property
+    def event_bridge(self):
+        return self._event_bridge
+
+    @event_bridge.setter
+    def event_bridge(self, bridge) -> None:
+        self._event_bridge = bridge
+
+    def reset_session(self, event_bridge=None, system_prompt: Optional[str] = None) -> None:
+        """Clear per-session state so a pooled agent can serve a new chat session.
+
+        Project-bound managers, the tool registry and the LLM clients are kept;
+        only conversation, plan, loop-detection and routing state is discarded.
+        """
+        self._event_bridge = event_bridge
+        if system_prompt:
+            self.system_prompt = system_prompt
+        self.conversation = []
+        self.domain_context_memory = self.memory_manager.get_domain_context_memory()
+        self.checkpoint_counter = 0
+        self.active_agent_type = "orchestrator"
+        self.active_tool_names = self._agent_tool_name_mappings[self.active_agent_type]
+        self._active_plan = []
+        self._current_step_index = 0
+        self._plan_goal = ""
+        self._failed_calls_tracker = {}
+        self._consecutive_planning_count = 0
+        self.loop_detector.reset()
+
     def _get_fallback_system_prompt(self) -> str:
         return """You are a disciplined coding agent.
 RULES:
@@ -274,7 +307,7 @@ RULES:
 
             system = prompts.get("prompt_engineering", {}).get("system", "")
             user_template = prompts.get("prompt_engineering", {}).get("user", "")
-            user = user_template.format(text=instruction)
+            user = PromptLoader.format_prompt(user_template, text=instruction)
 
             preprocess_client = await self.llm_manager.get_client("orchestration")  # Use llm_manager
             response, _ = await preprocess_client.achat(
@@ -344,8 +377,11 @@ RULES:
             # Prepare compact history for auditor (last 5 tool results)
             tool_history = [msg for msg in self.conversation if msg["role"] == "tool"][-5:]
 
-            user = user_template.format(
-                goal=user_instruction, plan=json.dumps(self._active_plan), history=json.dumps(tool_history)
+            user = PromptLoader.format_prompt(
+                user_template,
+                goal=user_instruction,
+                plan=json.dumps(self._active_plan),
+                history=json.dumps(tool_history),
             )
 
             response, _ = await client.achat(
@@ -368,10 +404,34 @@ RULES:
             self.logger.warning(f"Failed to perform mission audit: {e}")
             return {}
 
+    def _routing_embed_fn(self):
+        """Async embedding function for the intent router, or None when none is configured."""
+        try:
+            client = self.llm_manager.get_embedding_client()
+        except Exception:
+            return None
+        embed = getattr(client, "aget_embedding", None)
+        return embed if asyncio.iscoroutinefunction(embed) else None
+
+    async def _prepare_tool_routing(self, user_instruction: str) -> None:
+        """Warm the router's embeddings for this instruction (runs alongside the other pre-flight calls)."""
+        embed = self._routing_embed_fn()
+        if embed is None:
+            return
+        try:
+            summaries = self.tool_executor.tool_registry.get_tool_summaries()
+            await get_intent_router().prepare(user_instruction, summaries, embed)
+        except Exception as e:
+            self.logger.debug(f"Tool routing embeddings unavailable: {e}")
+
     async def _select_dynamic_tools(self, user_instruction: str) -> List[str]:
         """
         Intermediary step: Selects the most relevant tools for the current prompt
         to minimize context overhead.
+
+        The local router (lexical + embedding similarity over the tool summaries)
+        decides first; the orchestration model is only consulted when the
+        instruction gives it no signal, and its answer is memoized.
         """
         client = self.llm_manager.get_client("orchestration")
         if not client:
@@ -381,59 +441,65 @@ RULES:
             # 1. Get lightweight summaries of currently active toolset
             summaries = self.tool_executor.tool_registry.get_tool_summaries(self.active_tool_names)
 
-            # 2. Prepare Tool Selection Prompt
-            loader = PromptLoader()
-            prompts = loader.load_prompt_sync("core/services.yaml")
-
-            sel_def = prompts.get("tool_selection", {})
-            system = sel_def.get("system", "")
-            user_template = sel_def.get("user", "")
+            router = get_intent_router()
+            selected = router.select_tools(user_instruction, summaries)
+            if selected is None:
+                selected = await self._select_dynamic_tools_llm(client, user_instruction, summaries)
+                if selected is None:
+                    return self.active_tool_names
+                router.remember_tools(user_instruction, summaries, selected)
 
-            user = user_template.format(text=user_instruction, tools=json.dumps(summaries, indent=2))
+            # F33: Safety - Always ensure core orchestration and shell tools are present if they were in the original set
+            selected = list(selected)
+            for tool in MANDATORY_TOOLS:
+                if tool in self.active_tool_names and tool not in selected:
+                    selected.append(tool)
 
-            response, _ = await client.achat(
-                messages=[{"role": "system", "content": system}, {"role": "user", "content": user}], tools=[]
-            )
+            # Filter only valid tools from the active set
+            final_tools = [t for t in selected if t in self.active_tool_names]
 
-            if response and response.get("message") and response["message"].get("content"):
-                content = response["message"]["content"].strip()
-                # Clean potential markdown noise
-                clean_json, _ = LLMResponseParser.remove_think_blocks(content)
-                clean_json = clean_json.replace("```json", "").replace("```", "").strip()
-
-                try:
-                    selected = json.loads(clean_json)
-                except (json.JSONDecodeError, ValueError):
-                    # Fallback for Malformed JSON from some SMLs
-                    selected = [t for t in self.active_tool_names if t in clean_json]
-
-                if isinstance(selected, list):
-                    # F33: Safety - Always ensure core orchestration and shell tools are present if they were in the original set
-                    mandatory = [
-                        "plan_actions",
-                        "select_agent_type",
-                        "run_shell_command",
-                        "run_command",
-                        "analyze_project",
-                        "traceroute_host",
-                    ]
-                    for tool in mandatory:
-                        if tool in self.active_tool_names and tool not in selected:
-                            selected.append(tool)
-
-                    # Filter only valid tools from the active set
-                    final_tools = [t for t in selected if t in self.active_tool_names]
-
-                    self.logger.info(
-                        f"🎯 JIT Tool Selection: {len(final_tools)}/{len(self.active_tool_names)} tools enabled."
-                    )
-                    return final_tools
+            self.logger.info(f"🎯 JIT Tool Selection: {len(final_tools)}/{len(self.active_tool_names)} tools enabled.")
+            return final_tools
 
         except Exception as e:
             self.logger.warning(f"Tool Selection failed: {e}. Falling back to full toolset.")
 
         return self.active_tool_names
 
+    async def _select_dynamic_tools_llm(
+        self, client, user_instruction: str, summaries: List[Dict]
+    ) -> Optional[List[str]]:
+        """Ask the orchestration model to pick tools; returns None if its answer is unusable."""
+        # 2. Prepare Tool Selection Prompt
+        loader = PromptLoader()
+        prompts = loader.load_prompt_sync("core/services.yaml")
+
+        sel_def = prompts.get("tool_selection", {})
+        system = sel_def.get("system", "")
+        user_template = sel_def.get("user", "")
+
+        user = PromptLoader.format_prompt(user_template, text=user_instruction, tools=json.dumps(summaries, indent=2))
+
+        response, _ = await client.achat(
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}], tools=[]
+        )
+
+        if response and response.get("message") and response["message"].get("content"):
+            content = response["message"]["content"].strip()
+            # Clean potential markdown noise
+            clean_json, _ = LLMResponseParser.remove_think_blocks(content)
+            clean_json = clean_json.replace("```json", "").replace("```", "").strip()
+
+            try:
+                selected = json.loads(clean_json)
+            except (json.JSONDecodeError, ValueError):
+                # Fallback for Malformed JSON from some SMLs
+                selected = [t for t in self.active_tool_names if t in clean_json]
+
+            if isinstance(selected, list):
+                return selected
+        return None
+
     async def chat(self, instruction: str, auto_confirm: bool = False) -> str:
         correlation_id: Optional[str] = None
         start_turn_time = time.time()
@@ -473,8 +539,14 @@ RULES:
             shell_name = "PowerShell" if os_name == "Windows" else "Bash"
             os_info = f"Current Operating System: {os_name} {os_release}. ACTIVE SHELL: {shell_name}"
 
+            # Pre-flight: prompt standardization, intent routing and tool-routing embeddings are
+            # independent, so run them concurrently. Routing is usually answered locally.
             # Do NOT modify self.system_prompt permanently here to avoid cumulative corruption
-            current_system_prompt = await self.language_manager.standardize_prompt(self.system_prompt)
+            current_system_prompt, intent_for_this_turn, _ = await asyncio.gather(
+                self.language_manager.standardize_prompt(self.system_prompt),
+                self._classify_intent(english_instruction),  # Use mixin method
+                self._prepare_tool_routing(english_instruction),
+            )
             current_system_prompt = (
                 "# MANDATORY: DATA FRESHNESS\n"
                 "Technical data (IPs, processes, files, disk space) from conversation history may be STALE. Always run tools to get the CURRENT state if the user asks for it.\n\n"
@@ -497,9 +569,6 @@ RULES:
             if not self.conversation or self.conversation[-1]["role"] != "user":
                 self.conversation.append({"role": "user", "content": english_instruction})
 
-            # --- Intent Routing Mixin Usage ---
-            intent_for_this_turn = await self._classify_intent(english_instruction)  # Use mixin method
-
             # F31: Switch toolset to the classified intent IMMEDIATELY
 
             # F31: Switch toolset to the classified intent (or reset to orchestrator)
@@ -958,8 +1027,9 @@ RULES:
             self.logger.warning("Max iterations reached")
             return f"⚠️  Reached maximum iterations ({self.max_iterations})"
         finally:
-            # F33: Ensure all sessions are closed
-            await self.llm_manager.close_all_sessions_async()
+            # F33: Ensure all sessions are closed (unless the clients are shared with other turns on this loop)
+            if self.close_sessions_after_chat:
+                await self.llm_manager.close_all_sessions_async()
             if correlation_id:
                 self.kernel.end_interaction_context(correlation_id)
 
@@ -63,7 +63,7 @@ class ContextSummarizerMixin(ABC):
 
             system = prompts.get("context_summarization", {}).get("system", "")
             user_template = prompts.get("context_summarization", {}).get("user", "")
-            user = user_template.format(history=json.dumps(messages_to_summarize))
+            user = PromptLoader.format_prompt(user_template, history=json.dumps(messages_to_summarize))
 
             summary_response, _ = await summarizer_client.achat(
                 messages=[{"role": "system", "content": system}, {"role": "user", "content": user}], tools=[]
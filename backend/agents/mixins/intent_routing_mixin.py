@@ -1,6 +1,7 @@
 import logging
-from typing import Any
+from typing import Any, Optional
 
+from backend.services.intent_router import get_intent_router
 from backend.utils.core.llm.prompt_loader import PromptLoader
 from backend.utils.core.llm.llm_response_parser import LLMResponseParser
 
@@ -15,6 +16,39 @@ class IntentRoutingMixin:
     async def _classify_intent(self, instruction: str) -> str:
         """
         Classifies the user's intent to route to the appropriate specialist or model.
+
+        The local keyword router answers confident (or previously seen)
+        instructions without a model call; the LLM is only asked otherwise and
+        its answer is memoized for the next identical instruction.  A failed
+        LLM call routes to the orchestrator without being memoized.
+        """
+        router = get_intent_router()
+        decision = router.classify(instruction)
+        if decision.confidence >= router.min_confidence:
+            final_intent = decision.intent
+            logger.info(f"Classified intent locally ({decision.source}): '{final_intent}' ({decision.confidence:.2f})")
+        else:
+            final_intent = await self._classify_intent_llm(instruction)
+            if final_intent is None:
+                final_intent = "orchestrator"
+            else:
+                router.remember_intent(instruction, final_intent)
+
+        # F30: Publish routing event for real-time UI feedback
+        try:
+            if hasattr(self, "event_publisher") and self.event_publisher:
+                await self.event_publisher.publish(
+                    "routing", {"intent": final_intent, "message": f"Routing request to {final_intent} specialist..."}
+                )
+        except Exception as e:
+            logger.debug(f"Routing event could not be published: {e}")
+
+        return final_intent
+
+    async def _classify_intent_llm(self, instruction: str) -> Optional[str]:
+        """LLM fallback for instructions the local router is not confident about.
+
+        Returns ``None`` when the LLM could not be asked or gave no answer.
         """
         try:
             logger.info(f"Classifying intent for instruction: '{instruction[:50]}...'")
@@ -24,12 +58,12 @@ class IntentRoutingMixin:
 
             if not prompts:
                 logger.warning("Could not load core/services.yaml prompts for intent classification.")
-                return "orchestrator"
+                return None
 
             intent_def = prompts.get("intent_classification", {})
             system = intent_def.get("system", "")
             user_template = intent_def.get("user", "")
-            user = user_template.format(text=instruction)
+            user = PromptLoader.format_prompt(user_template, text=instruction)
 
             # Use orchestration client for classification
             client = self.llm_manager.get_client("orchestration")
@@ -44,7 +78,7 @@ class IntentRoutingMixin:
 
             if not response or "message" not in response:
                 logger.warning(f"Empty response from LLM during intent classification. Response: {response}")
-                return "orchestrator"
+                return None
 
             content = response.get("message", {}).get("content", "").lower()
             logger.debug(f"Raw intent classification response: {content}")
@@ -64,16 +98,10 @@ class IntentRoutingMixin:
             if final_intent == "orchestrator":
                 logger.info("Could not determine specific intent from LLM output, defaulting to 'orchestrator'.")
 
-            # F30: Publish routing event for real-time UI feedback
-            if hasattr(self, "event_publisher") and self.event_publisher:
-                await self.event_publisher.publish(
-                    "routing", {"intent": final_intent, "message": f"Routing request to {final_intent} specialist..."}
-                )
-
             return final_intent
         except Exception as e:
             logger.error(f"Intent classification failed with error: {e}", exc_info=True)
-            return "orchestrator"
+            return None
 
     def _select_model_for_intent(self, intent: str) -> Any:
         """
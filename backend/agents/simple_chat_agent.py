@@ -8,6 +8,7 @@ no file writes, no shell execution.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
@@ -427,7 +428,7 @@ class SimpleChatAgent:
 
         try:
             for iteration in range(_MAX_TOOL_ITERATIONS):
-                data, usage = self._call_ollama_raw(messages)
+                data, usage = await asyncio.to_thread(self._call_ollama_raw, messages)
                 total_tokens += usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
 
                 msg = data.get("message", {})
@@ -452,7 +453,7 @@ class SimpleChatAgent:
                         self.event_bridge.push_event("thinking", {"message": f"Using tool: {tool_name}..."})
 
                     logger.info(f"[SimpleChatAgent] Tool call: {tool_name}({args})")
-                    result = _dispatch_tool(tool_name, args)
+                    result = await asyncio.to_thread(_dispatch_tool, tool_name, args)
                     logger.info(f"[SimpleChatAgent] Tool result ({tool_name}): {result[:120]}")
 
                     messages.append(
@@ -75,6 +75,9 @@ async def _lifespan(app: FastAPI):
     automation_manager = getattr(app.state, "automation_manager", None)
     if automation_manager and hasattr(automation_manager, "stop"):
         automation_manager.stop()
+    project_job_manager = getattr(app.state, "project_job_manager", None)
+    if project_job_manager is not None:
+        project_job_manager.shutdown()
 
 
 def _init_app_state(app: FastAPI) -> None:
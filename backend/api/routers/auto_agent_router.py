@@ -8,14 +8,10 @@ subprocess shell=False, git URL validation.
 """
 
 import asyncio
-import io
-import json
-import os
 import re
 import shlex
 import shutil
 import subprocess
-import zipfile
 from pathlib import Path
 from typing import AsyncIterator, Dict, List, Optional
 
@@ -24,13 +20,18 @@ from fastapi import (
     BackgroundTasks,
     File,
     HTTPException,
+    Query,
     Request,
     UploadFile,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from backend.core.containers import main_container
+from backend.services.directory_snapshot import get_directory_snapshot_service
+from backend.services.project_job_manager import JobStatus, ProjectJob, ProjectJobManager
+from backend.utils.core.exceptions import ResourceExhaustionError
+from backend.utils.core.io.project_exporter import ProjectExporter
 
 router = APIRouter(tags=["auto_agent"])
 
@@ -107,85 +108,122 @@ class ProjectCreateRequest(BaseModel):
     enable_github_pages: bool = False
     feature_flags: Dict[str, bool] = {}
     generation_mode: str = Field(default="classic", pattern=r"^(classic|tools)$")
+    priority: int = Field(default=0, ge=-10, le=10)
+
+
+def _job_model(generation_mode: str) -> str:
+    """Model a job will load, used for per-model concurrency limits."""
+    from backend.core.config import config
+
+    role = "tool_agent" if generation_mode == "tools" else "coder"
+    return config.AGENT_ROLES.get(role) or config.DEFAULT_MODEL
+
+
+def _run_project_job(job: ProjectJob) -> None:
+    """Runs the selected agent for *job* in a job-manager worker thread."""
+    params = dict(job.params)
+    project_description = params.pop("project_description")
+    generation_mode = params.pop("generation_mode", "classic")
+    if generation_mode == "tools":
+        # AutoAgentWithTools is async — run it in a fresh event loop in this thread.
+        agent = main_container.auto_agent_module.auto_agent_with_tools()
+        agent.event_publisher = job.event_publisher
+        asyncio.run(agent.run(project_description, job.project_name, cancel_event=job.cancel_event))
+    else:
+        agent = main_container.auto_agent_module.auto_agent()
+        agent.event_publisher = job.event_publisher
+        # Pass only kwargs AutoAgent.run() accepts — request body has many legacy
+        # wizard fields (git_push, security_scanning_enabled, etc.) not used here.
+        run_kwargs = {k: params[k] for k in ("project_root", "skip_phases") if k in params and params[k] is not None}
+        if params.get("num_refine_loops") is not None:
+            run_kwargs["num_refine_loops"] = params["num_refine_loops"]
+        agent.run(project_description, job.project_name, cancel_event=job.cancel_event, **run_kwargs)
+
+
+def _get_job_manager(request: Request) -> ProjectJobManager:
+    """Lazily create the app-wide project job manager."""
+    mgr = getattr(request.app.state, "project_job_manager", None)
+    if mgr is None:
+        from backend.core.config import config
+
+        settings = config.TOOL_SETTINGS
+        mgr = ProjectJobManager(
+            _run_project_job,
+            request.app.state.event_publisher,
+            max_workers=settings.get("project_job_workers", 2),
+            per_model_limit=settings.get("project_job_per_model_limit", 1),
+            max_queue=settings.get("project_job_max_queue", 20),
+        )
+        request.app.state.project_job_manager = mgr
+    return mgr
 
 
 @router.post("/api/projects/create")
 async def create_project(
     request: Request,
-    background_tasks: BackgroundTasks,
     body: ProjectCreateRequest,
 ):
     """
-    Start the 22-phase AutoAgent pipeline as a background task.
-    Returns immediately with session info; progress streamed via /api/projects/stream/{name}.
+    Queue the AutoAgent pipeline on the project job manager.
+    Returns immediately with queue info; progress streamed via /api/projects/stream/{name}.
     """
-    event_publisher = request.app.state.event_publisher
-    chat_event_bridge = request.app.state.chat_event_bridge
-
-    # Extract fields from body for easier access or pass as dict
     params = body.model_dump()
-    project_description = params.pop("project_description")
     project_name = params.pop("project_name")
-    generation_mode = params.pop("generation_mode", "classic")
-
-    def _run_agent_sync():
-        """Runs the selected agent in a background thread."""
-        try:
-            if generation_mode == "tools":
-                # AutoAgentWithTools is async — run it in a fresh event loop in this thread.
-                agent = main_container.auto_agent_module.auto_agent_with_tools()
-                agent.event_publisher = event_publisher
-                asyncio.run(agent.run(project_description, project_name))
-            else:
-                agent = main_container.auto_agent_module.auto_agent()
-                agent.event_publisher = event_publisher
-                # Pass only kwargs AutoAgent.run() accepts — request body has many legacy
-                # wizard fields (git_push, security_scanning_enabled, etc.) not used here.
-                run_kwargs = {
-                    k: params[k] for k in ("project_root", "skip_phases") if k in params and params[k] is not None
-                }
-                if params.get("num_refine_loops") is not None:
-                    run_kwargs["num_refine_loops"] = params["num_refine_loops"]
-                agent.run(project_description, project_name, **run_kwargs)
-            chat_event_bridge.push_event("stream_end", {"message": f"Project '{project_name}' generated."})
-        except Exception as exc:
-            _logger = main_container.core.logging.logger()
-            _logger.error(f"Agent error: {exc}", exc_info=True)
-            chat_event_bridge.push_event("error", {"message": str(exc)})
-
-    import threading
-
-    threading.Thread(target=_run_agent_sync, daemon=True).start()
-    background_tasks.add_task(lambda: None)  # keep BackgroundTasks lifecycle intact
-    return {"status": "started", "project_name": project_name}
+    priority = params.pop("priority", 0)
+    mgr = _get_job_manager(request)
+    try:
+        job = mgr.submit(project_name, params, model=_job_model(params["generation_mode"]), priority=priority)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ResourceExhaustionError as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+    info = mgr.job_info(job.project_name) or {}
+    return {
+        "status": "started" if job.status == JobStatus.RUNNING else "queued",
+        "project_name": project_name,
+        "job_id": job.job_id,
+        "queue_position": info.get("queue_position"),
+        "eta_seconds": info.get("eta_seconds"),
+    }
+
+
+@router.get("/api/projects/jobs")
+async def list_project_jobs(request: Request):
+    """Running, queued and recently finished project-generation jobs."""
+    mgr = _get_job_manager(request)
+    return {"jobs": mgr.list_jobs(), "stats": mgr.stats()}
+
+
+@router.get("/api/projects/jobs/{project_name}")
+async def get_project_job(project_name: str, request: Request):
+    info = _get_job_manager(request).job_info(project_name)
+    if info is None:
+        raise HTTPException(status_code=404, detail="No job for this project.")
+    return info
+
+
+@router.post("/api/projects/jobs/{project_name}/cancel")
+async def cancel_project_job(project_name: str, request: Request):
+    """Cancel a queued job, or stop a running one after its current LLM call."""
+    if not _get_job_manager(request).cancel(project_name):
+        raise HTTPException(status_code=404, detail="No queued or running job for this project.")
+    return {"status": "cancelling", "project_name": project_name}
 
 
 @router.get("/api/projects/stream/{project_name}")
 async def stream_project_logs(project_name: str, request: Request):
     """SSE stream for real-time project generation logs."""
-    chat_event_bridge = request.app.state.chat_event_bridge
-    loop = asyncio.get_event_loop()
+    # Per-project stream when the project was submitted as a job; app-wide bridge otherwise
+    bridge = _get_job_manager(request).get_bridge(project_name) or request.app.state.chat_event_bridge
+    # Named SSE events so wizard.js addEventListener() listeners fire
+    channel = bridge.open_channel(named_events=True)
 
     async def _gen() -> AsyncIterator[str]:
-        # Use a sentinel to detect exhaustion — StopIteration must NOT be raised
-        # inside an async generator (PEP 479 / Python 3.7+).
-        _sentinel = object()
-        it = iter(chat_event_bridge.iter_events())
-        while True:
-            chunk = await loop.run_in_executor(None, next, it, _sentinel)
-            if chunk is _sentinel:
-                break
-            # Add named SSE event type prefix so wizard.js addEventListener() listeners fire.
-            # Keep-alive comments (": keepalive\n\n") pass through unchanged.
-            if chunk.startswith("data:"):
-                try:
-                    payload_str = chunk[5:].strip()
-                    event_type = json.loads(payload_str).get("type", "message")
-                    yield f"event: {event_type}\n{chunk}"
-                except (json.JSONDecodeError, AttributeError):
-                    yield chunk
-            else:
+        try:
+            async for chunk in channel:
                 yield chunk
+        finally:
+            await channel.aclose()
 
     return StreamingResponse(
         _gen(),
@@ -209,45 +247,41 @@ class FileSaveRequest(BaseModel):
 
 
 @router.get("/api/projects/{project_name}/files")
-async def list_project_files(project_name: str, request: Request):
-    """Return a nested file tree for a generated project."""
+async def list_project_files(
+    project_name: str,
+    request: Request,
+    path: str = "",
+    depth: Optional[int] = Query(default=None, ge=1, le=50),
+    offset: int = Query(default=0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1, le=5000),
+):
+    """Return a nested file tree for a generated project.
+
+    By default the whole tree is returned.  ``path`` selects a subdirectory,
+    ``depth`` limits expansion (unexpanded directories carry ``has_children``)
+    and ``offset``/``limit`` paginate its top-level items.
+    """
     ollash_root_dir = request.app.state.ollash_root_dir
     project_base = ollash_root_dir / "generated_projects" / "auto_agent_projects" / project_name
 
     if not project_base.is_dir():
         raise HTTPException(status_code=404, detail="Project not found.")
-
-    _SKIP_DIRS = {"__pycache__", "node_modules", ".venv", "venv", ".git"}
-
-    def _build_tree(path: Path) -> list:
-        items = []
+    if path:
         try:
-            for child in sorted(path.iterdir(), key=lambda p: (p.is_file(), p.name.lower())):
-                if child.name.startswith(".") or child.name in _SKIP_DIRS:
-                    continue
-                rel_path = child.relative_to(project_base).as_posix()
-                if child.is_dir():
-                    items.append(
-                        {
-                            "name": child.name,
-                            "path": rel_path,
-                            "type": "directory",
-                            "children": _build_tree(child),
-                        }
-                    )
-                else:
-                    items.append(
-                        {
-                            "name": child.name,
-                            "path": rel_path,
-                            "type": "file",
-                        }
-                    )
-        except PermissionError:
-            pass
-        return items
-
-    return {"status": "success", "files": _build_tree(project_base)}
+            if not _safe_resolve(project_base, path).is_dir():
+                raise HTTPException(status_code=404, detail="Directory not found.")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid path.")
+
+    tree = await asyncio.to_thread(
+        get_directory_snapshot_service().tree,
+        project_base,
+        rel_path=path.strip("/"),
+        depth=depth,
+        offset=offset,
+        limit=limit,
+    )
+    return {"status": "success", "files": tree["files"], "total": tree["total"], "offset": offset, "limit": limit}
 
 
 @router.post("/api/projects/{project_name}/file")
@@ -412,35 +446,36 @@ async def clone_project(body: CloneRequest, request: Request):
 # ---------------------------------------------------------------------------
 
 
+def _get_project_exporter(request: Request) -> ProjectExporter:
+    exporter = getattr(request.app.state, "project_exporter", None)
+    if exporter is None:
+        exporter = ProjectExporter(request.app.state.ollash_root_dir / ".ollash" / "export_cache")
+        request.app.state.project_exporter = exporter
+    return exporter
+
+
 @router.get("/api/projects/{project_name}/export")
 async def export_project_zip(project_name: str, request: Request):
+    """Download the project as a ZIP, streamed from a worker thread or served from the export cache."""
     ollash_root_dir = request.app.state.ollash_root_dir
     project_path = ollash_root_dir / "generated_projects" / "auto_agent_projects" / project_name
 
     if not project_path.is_dir():
         raise HTTPException(status_code=404, detail="Project not found.")
 
-    skip_dirs = {".git", "__pycache__", "node_modules", ".venv", "venv"}
-    memory_file = io.BytesIO()
-
-    with zipfile.ZipFile(memory_file, "w", zipfile.ZIP_DEFLATED) as zf:
-        for root, dirs, files in os.walk(project_path):
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-            for f in files:
-                if f.startswith(".") or f.endswith(".pyc"):
-                    continue
-                full_path = os.path.join(root, f)
-                arcname = os.path.relpath(full_path, project_path)
-                zf.write(full_path, arcname)
+    exporter = _get_project_exporter(request)
+    entries = await asyncio.to_thread(exporter.scan, project_path)
+    key = exporter.manifest_key(entries)
+    disposition = {"Content-Disposition": f"attachment; filename={project_name}.zip"}
 
-    memory_file.seek(0)
+    cached = exporter.cached_archive(project_name, key)
+    if cached is not None:
+        return FileResponse(cached, media_type="application/zip", headers=disposition)
 
-    from fastapi.responses import Response
-
-    return Response(
-        content=memory_file.read(),
+    return StreamingResponse(
+        exporter.stream(project_name, entries, key),
         media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={project_name}.zip"},
+        headers=disposition,
     )
 
 
@@ -454,18 +489,23 @@ async def export_project_zip(project_name: str, request: Request):
 async def list_projects(request: Request):
     ollash_root_dir = request.app.state.ollash_root_dir
     projects_dir = ollash_root_dir / "generated_projects" / "auto_agent_projects"
-    projects = []
-    if projects_dir.exists():
-        for p in sorted(projects_dir.iterdir()):
-            if p.is_dir():
-                projects.append(
-                    {
-                        "name": p.name,
-                        "path": str(p),
-                        "modified": p.stat().st_mtime,
-                    }
-                )
-    return {"projects": projects}
+
+    def _collect() -> list:
+        # The cached listing only tracks the parent's mtime, so re-stat each
+        # project directory to keep "modified" current (one stat per project).
+        projects = []
+        for entry in sorted(get_directory_snapshot_service().list_dir(projects_dir), key=lambda e: e.name):
+            if not entry.is_dir:
+                continue
+            path = projects_dir / entry.name
+            try:
+                modified = path.stat().st_mtime
+            except OSError:
+                continue
+            projects.append({"name": entry.name, "path": str(path), "modified": modified})
+        return projects
+
+    return {"projects": await asyncio.to_thread(_collect)}
 
 
 @router.delete("/api/projects/{project_name}")
@@ -5,13 +5,15 @@ Long-running chat tasks run as background asyncio tasks.
 SSE uses StreamingResponse with async generator.
 """
 
-import asyncio
 from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from backend.api.deps import get_optional_user_dep
+from backend.services.chat_turn_scheduler import ChatQueueFullError, ChatTurnInProgressError
+
 
 router = APIRouter(tags=["chat"])
 
@@ -50,12 +52,20 @@ class ChatRequest(BaseModel):
 # ---------------------------------------------------------------------------
 
 
+def _user_key(request: Request, user: Optional[dict]) -> str:
+    """Key for per-user turn limits: the authenticated user, else the client address."""
+    if user:
+        return f"user:{user['user_id']}"
+    return f"client:{request.client.host if request.client else 'unknown'}"
+
+
 @router.post("/api/chat")
 async def send_chat(
     payload: ChatRequest,
     request: Request,
+    user: Optional[dict] = Depends(get_optional_user_dep),
 ):
-    """Initiate a chat turn. send_message() starts a thread and returns immediately."""
+    """Initiate a chat turn. send_message() queues it on the turn scheduler and returns immediately."""
     mgr = _get_session_manager(request)
 
     session_id = payload.session_id
@@ -66,10 +76,35 @@ async def send_chat(
             project_path=payload.project_path,
         )
 
-    # Call synchronously — it just starts a background thread, so it returns instantly.
+    # Call synchronously — it only queues the turn, so it returns instantly.
     # This ensures the fresh bridge is set before the response reaches the client.
-    mgr.send_message(session_id, payload.message)
-    return {"status": "started", "session_id": session_id}
+    try:
+        turn = mgr.send_message(session_id, payload.message, user_key=_user_key(request, user))
+    except ChatQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ChatTurnInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    status = "queued" if turn.position else "started"
+    return {"status": status, "session_id": session_id, "turn_id": turn.turn_id, "position": turn.position}
+
+
+@router.get("/api/chat/sessions/{session_id}/turn")
+async def get_turn_status(session_id: str, request: Request):
+    """State, queue position and timings of the session's latest turn."""
+    mgr = _get_session_manager(request)
+    session = mgr.get_session(session_id)
+    if session is None or session.turn is None:
+        raise HTTPException(status_code=404, detail="No turn for this session.")
+    return session.turn.to_dict()
+
+
+@router.post("/api/chat/sessions/{session_id}/cancel")
+async def cancel_turn(session_id: str, request: Request):
+    """Cancel the session's queued or running turn."""
+    mgr = _get_session_manager(request)
+    if not mgr.cancel_turn(session_id):
+        raise HTTPException(status_code=404, detail="No active turn for this session.")
+    return {"status": "cancelled", "session_id": session_id}
 
 
 @router.get("/api/chat/stream/{session_id}")
@@ -81,23 +116,14 @@ async def stream_chat(session_id: str, request: Request):
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found.")
 
+    channel = session.bridge.open_channel()
+
     async def _event_gen() -> AsyncIterator[str]:
-        # iter_events() is a sync generator in the bridge; wrap with asyncio
-        loop = asyncio.get_event_loop()
-        bridge = session.bridge
-        it = iter(bridge.iter_events())
-
-        def _get_next(iterator):
-            try:
-                return next(iterator)
-            except StopIteration:
-                return None
-
-        while True:
-            chunk = await loop.run_in_executor(None, _get_next, it)
-            if chunk is None:
-                break
-            yield chunk
+        try:
+            async for chunk in channel:
+                yield chunk
+        finally:
+            await channel.aclose()
 
     return StreamingResponse(
         _event_gen(),
@@ -114,6 +140,20 @@ async def list_sessions(background_tasks: BackgroundTasks, request: Request):
     return {"sessions": [dict(s) for s in sessions]}
 
 
+@router.get("/api/chat/pool")
+async def agent_pool_stats(request: Request):
+    """Warm agent pool metrics (construction time, reuse, idle shells)."""
+    mgr = _get_session_manager(request)
+    return mgr.agent_pool.stats()
+
+
+@router.get("/api/chat/scheduler")
+async def turn_scheduler_stats(request: Request):
+    """Turn scheduler metrics: running/queued turns and queue time vs model time."""
+    mgr = _get_session_manager(request)
+    return mgr.scheduler.stats()
+
+
 @router.delete("/api/chat/sessions")
 async def delete_all_sessions(request: Request):
     """Delete all chat sessions and their history."""
@@ -36,7 +36,7 @@ def record_phase(phase_name: str, duration_s: float, success: bool, tier: str =
 
 @router.get("/")
 async def metrics_index():
-    return {"status": "ok", "endpoints": ["/llm", "/agent"]}
+    return {"status": "ok", "endpoints": ["/llm", "/agent", "/models"]}
 
 
 @router.get("/llm")
@@ -85,6 +85,14 @@ async def get_llm_metrics():
     return {"summary": stats, "by_model": models, "recent": entries[-20:]}
 
 
+@router.get("/models")
+async def get_model_residency():
+    """Model residency scheduler stats (swaps, swap latency, queue) per Ollama host."""
+    from backend.utils.core.llm.model_scheduler import all_model_schedulers
+
+    return {"hosts": {url: scheduler.stats() for url, scheduler in all_model_schedulers().items()}}
+
+
 @router.get("/agent")
 async def get_agent_metrics():
     """Phase execution stats."""
@@ -10,6 +10,7 @@ PUT  /api/pipelines/{id}            — update pipeline
 DELETE /api/pipelines/{id}          — delete pipeline (builtin protected)
 POST /api/pipelines/{id}/run        — execute pipeline, SSE stream of events
 GET  /api/pipelines/{id}/runs       — list past runs
+GET  /api/pipelines/{id}/runs/{run_id}/events?after=N — run events after cursor N
 """
 
 from __future__ import annotations
@@ -358,6 +359,28 @@ def list_runs(
     return store.list_runs(pipeline_id)
 
 
+@router.get("/{pipeline_id}/runs/{run_id}/events")
+def get_run_events(
+    pipeline_id: int,
+    run_id: int,
+    after: int = 0,
+    limit: int = 500,
+    user: dict = Depends(get_current_user_dep),
+) -> dict[str, Any]:
+    """Incremental read of a run's events; pass the returned ``next_cursor`` as ``after`` to tail."""
+    store = _store()
+    run = store.get_run_summary(run_id)
+    if run is None or run["pipeline_id"] != pipeline_id:
+        raise HTTPException(404, detail="Run not found")
+    events = store.get_events(run_id, after=after, limit=max(1, min(limit, 5000)))
+    return {
+        "run_id": run_id,
+        "status": run["status"],
+        "events": events,
+        "next_cursor": events[-1]["seq"] if events else after,
+    }
+
+
 @router.post("/{pipeline_id}/run")
 def run_pipeline(
     pipeline_id: int,
@@ -378,11 +401,15 @@ def run_pipeline(
         return f"data: {json.dumps(data)}\n\n"
 
     def _generate() -> Generator[str, None, None]:
+        with store.event_writer(run_id) as run_log:
+            yield from _stream(run_log)
+
+    def _stream(run_log) -> Generator[str, None, None]:
         phases = pipeline["phases"]
         total = len(phases)
 
         yield _sse({"type": "run_started", "run_id": run_id, "total_phases": total, "pipeline": pipeline["name"]})
-        store.append_log(run_id, {"type": "run_started", "ts": time.time()})
+        run_log.append({"type": "run_started", "ts": time.time()})
 
         for idx, phase_id in enumerate(phases):
             # Check for client disconnect
@@ -419,13 +446,15 @@ def run_pipeline(
                 event["error"] = phase_result.get("error", "Unknown error")
 
             yield _sse(event)
-            store.append_log(run_id, {**event, "ts": time.time()})
+            run_log.append({**event, "ts": time.time()})
 
             if not phase_result["success"]:
+                run_log.flush()
                 store.finish_run(run_id, "failed")
                 yield _sse({"type": "run_finished", "run_id": run_id, "status": "failed"})
                 return
 
+        run_log.flush()
         store.finish_run(run_id, "completed")
         yield _sse({"type": "run_finished", "run_id": run_id, "status": "completed"})
 
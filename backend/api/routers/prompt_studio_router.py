@@ -61,7 +61,7 @@ async def load_role_prompt(role: str, request: Request):
 
     # 1. Try DB
     if repo:
-        active = repo.get_active_prompt(role)
+        active = await repo.get_active_prompt(role)
         if active:
             return {"role": role, "prompt": active, "source": "database"}
 
@@ -108,7 +108,7 @@ async def migrate_to_db(request: Request):
                         data = json.load(fh)
                         content = data.get("prompt") or data.get("system_prompt") or json.dumps(data, indent=2)
 
-                    repo.save_prompt(role, content, is_active=True)
+                    await repo.save_prompt(role, content, is_active=True)
                     count += 1
 
         return {"status": "success", "migrated": count}
@@ -124,7 +124,7 @@ async def save_prompt(payload: SavePromptRequest, request: Request):
         raise HTTPException(status_code=503, detail="Repository not available")
 
     try:
-        prompt_id = repo.save_prompt(payload.role, payload.prompt, is_active=True)
+        prompt_id = await repo.save_prompt(payload.role, payload.prompt, is_active=True)
         return {"success": True, "id": prompt_id, "message": f"Prompt for '{payload.role}' saved and activated."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -135,7 +135,7 @@ async def get_history(role: str, request: Request):
     """Get version history for a role from the DB."""
     repo = get_prompt_repo(request)
     if repo:
-        history = repo.get_history(role)
+        history = await repo.get_history(role)
         return {"history": history}
     return {"history": []}
 
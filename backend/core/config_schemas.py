@@ -194,6 +194,7 @@ class BenchmarkConfig(BaseModel):
 
 # --- Tool Settings Configuration Schema ---
 class RateLimitingConfig(BaseModel):
+    enabled: bool = Field(False, description="Whether OllamaClient calls go through the shared per-backend limiter.")
     requests_per_minute: PositiveInt = 60
     max_tokens_per_minute: PositiveInt = 100000
 
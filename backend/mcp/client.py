@@ -2,9 +2,14 @@
 
 Supports two transports:
   stdio  — spawns external MCP server as a subprocess; communicates via
-           stdin/stdout (newline-delimited JSON-RPC).
+           stdin/stdout (newline-delimited JSON-RPC).  A dedicated reader
+           thread dispatches responses to per-request futures by JSON-RPC id,
+           so many calls can be in flight on one connection.
   http   — connects to an HTTP MCP endpoint (GET /sse + POST /messages).
-           (Simplified: polls tools/list via POST for now.)
+           (Simplified: polls tools/list via POST for now.)  Requests go
+           through a pooled keep-alive session.
+
+``tools/list`` results are cached for ``_TOOLS_TTL`` seconds.
 
 Usage inside Ollash agents
 --------------------------
@@ -22,6 +27,7 @@ persisted server store when first accessed (lazy init).
 
 from __future__ import annotations
 
+import concurrent.futures
 import logging
 import os
 import subprocess
@@ -34,6 +40,7 @@ from backend.mcp.protocol import (
     decode,
     encode,
     mcp_tool_to_ollash,
+    notification,
     request,
     tool_result,
 )
@@ -43,6 +50,11 @@ logger = logging.getLogger(__name__)
 _DB_PATH = Path(os.environ.get("OLLASH_ROOT_DIR", ".ollash")) / "mcp.db"
 _CONNECT_TIMEOUT = 10  # seconds
 _CALL_TIMEOUT = 30  # seconds
+_TOOLS_TTL = 300  # seconds a tools/list result is reused
+_HTTP_POOL_SIZE = 8  # keep-alive connections (and concurrent requests) per HTTP server
+
+# Shared by all HTTP connections; the stdio transport needs no threads per call
+_http_executor = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="mcp-http")
 
 
 # ---------------------------------------------------------------------------
@@ -51,7 +63,10 @@ _CALL_TIMEOUT = 30  # seconds
 
 
 class MCPConnection:
-    """Manages one live connection to an external MCP server."""
+    """Manages one live connection to an external MCP server.
+
+    Thread-safe: requests from any number of threads may be in flight at once.
+    """
 
     def __init__(self, config: dict[str, Any]) -> None:
         self.name: str = config["name"]
@@ -61,9 +76,14 @@ class MCPConnection:
         self.env: dict[str, str] = config.get("env", {})
 
         self._proc: subprocess.Popen | None = None
-        self._lock = threading.Lock()
+        self._io_threads: list[threading.Thread] = []  # stdout reader + stderr drain of _proc
+        self._lock = threading.Lock()  # guards ids, pending futures and stdin writes
+        self._connect_lock = threading.Lock()
         self._req_counter = 0
+        self._pending: dict[int, concurrent.futures.Future] = {}
+        self._http_session = None
         self._tools: list[dict] | None = None  # cached MCP-format tools
+        self._tools_fetched_at = 0.0
         self._connected = False
 
     # ------------------------------------------------------------------
@@ -72,12 +92,18 @@ class MCPConnection:
 
     def connect(self) -> bool:
         """Open the connection. Returns True on success."""
-        if self.transport == "stdio":
-            return self._connect_stdio()
-        if self.transport == "http":
-            return self._connect_http()
-        logger.error("[MCP client] Unknown transport: %s", self.transport)
-        return False
+        with self._connect_lock:
+            if self.is_connected:
+                return True
+            if self.transport == "stdio":
+                return self._connect_stdio()
+            if self.transport == "http":
+                return self._connect_http()
+            logger.error("[MCP client] Unknown transport: %s", self.transport)
+            return False
+
+    def _ensure_connected(self) -> bool:
+        return self.is_connected or self.connect()
 
     def _connect_stdio(self) -> bool:
         if not self.command:
@@ -85,13 +111,20 @@ class MCPConnection:
             return False
         try:
             env = {**os.environ, **self.env}
-            self._proc = subprocess.Popen(
+            proc = subprocess.Popen(
                 self.command,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 env=env,
             )
+            self._proc = proc
+            self._io_threads = [
+                threading.Thread(target=self._read_loop, args=(proc,), daemon=True, name=f"mcp-reader-{self.name}"),
+                threading.Thread(target=self._drain_stderr, args=(proc,), daemon=True, name=f"mcp-stderr-{self.name}"),
+            ]
+            for thread in self._io_threads:
+                thread.start()
             # Send initialize
             resp = self._rpc(
                 "initialize",
@@ -100,45 +133,54 @@ class MCPConnection:
                     "capabilities": {},
                     "clientInfo": {"name": "ollash", "version": "1.0.0"},
                 },
+                timeout=_CONNECT_TIMEOUT,
             )
             if resp and "result" in resp:
                 self._connected = True
+                self._notify("notifications/initialized")
                 logger.info("[MCP client/%s] Connected via stdio", self.name)
                 return True
-            return False
+            logger.error("[MCP client/%s] initialize failed: %s", self.name, resp)
         except Exception as exc:
             logger.error("[MCP client/%s] Connection failed: %s", self.name, exc)
-            return False
+        self._stop_process()
+        return False
 
     def _connect_http(self) -> bool:
         """Verify HTTP endpoint is reachable with a tools/list call."""
         try:
-            import requests as req
-
-            r = req.post(
-                self.url,
-                json=request("tools/list", req_id=1),
-                timeout=_CONNECT_TIMEOUT,
-                headers={"Content-Type": "application/json"},
-            )
-            r.raise_for_status()
-            data = r.json()
+            data = self._post_http(request("tools/list", req_id=self._next_id()), _CONNECT_TIMEOUT)
             if "result" in data:
                 self._connected = True
+                self._store_tools(data["result"].get("tools", []))
                 logger.info("[MCP client/%s] Connected via HTTP", self.name)
                 return True
         except Exception as exc:
             logger.error("[MCP client/%s] HTTP connection failed: %s", self.name, exc)
         return False
 
-    def disconnect(self) -> None:
-        if self._proc:
+    def _stop_process(self) -> None:
+        """Terminate the stdio server (if any) and join its reader threads."""
+        proc, self._proc = self._proc, None
+        threads, self._io_threads = self._io_threads, []
+        if proc:
             try:
-                self._proc.terminate()
-                self._proc.wait(timeout=3)
+                proc.terminate()
+                proc.wait(timeout=3)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait(timeout=3)
             except Exception:
                 pass
-            self._proc = None
+        for thread in threads:
+            thread.join(timeout=3)
+        self._fail_pending()
+
+    def disconnect(self) -> None:
+        self._stop_process()
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
         self._connected = False
         self._tools = None
 
@@ -148,55 +190,145 @@ class MCPConnection:
             return self._connected and self._proc is not None and self._proc.poll() is None
         return self._connected
 
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting a response."""
+        with self._lock:
+            return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # stdio reader
+    # ------------------------------------------------------------------
+
+    def _read_loop(self, proc: subprocess.Popen) -> None:
+        """Dispatch every response line to the future registered under its id."""
+        try:
+            for line in proc.stdout:  # type: ignore[union-attr]
+                if not line.strip():
+                    continue
+                try:
+                    msg = decode(line)
+                except ValueError:
+                    logger.debug("[MCP client/%s] Ignoring non-JSON output: %r", self.name, line[:200])
+                    continue
+                if "method" in msg:
+                    continue  # server notification or server→client request (unsupported)
+                with self._lock:
+                    future = self._pending.pop(msg.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(msg)
+        except (OSError, ValueError):
+            pass
+        finally:
+            # Requests to a newer process (after reconnect) must not be failed here
+            if self._proc is proc:
+                self._connected = False
+                self._fail_pending()
+
+    def _drain_stderr(self, proc: subprocess.Popen) -> None:
+        # An undrained stderr pipe eventually blocks the server process
+        try:
+            for line in proc.stderr:  # type: ignore[union-attr]
+                logger.debug("[MCP client/%s] stderr: %s", self.name, line.decode("utf-8", "replace").rstrip())
+        except (OSError, ValueError):
+            pass
+
+    def _fail_pending(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_result(None)
+
     # ------------------------------------------------------------------
     # RPC helpers
     # ------------------------------------------------------------------
 
     def _next_id(self) -> int:
-        self._req_counter += 1
-        return self._req_counter
-
-    def _rpc(self, method: str, params: dict | None = None) -> dict | None:
-        req_id = self._next_id()
-        msg = request(method, params, req_id)
+        with self._lock:
+            self._req_counter += 1
+            return self._req_counter
 
+    def _submit(self, method: str, params: dict | None = None) -> concurrent.futures.Future:
+        """Send a request; the returned future resolves to the response dict (or None)."""
         if self.transport == "stdio":
-            return self._rpc_stdio(msg)
+            return self._submit_stdio(method, params)
         if self.transport == "http":
-            return self._rpc_http(msg)
-        return None
+            msg = request(method, params, self._next_id())
+            return _http_executor.submit(self._rpc_http, msg)
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        future.set_result(None)
+        return future
+
+    def _submit_stdio(self, method: str, params: dict | None) -> concurrent.futures.Future:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        proc = self._proc
+        if proc is None:
+            future.set_result(None)
+            return future
+        with self._lock:
+            self._req_counter += 1
+            req_id = self._req_counter
+            self._pending[req_id] = future
+            try:
+                proc.stdin.write(encode(request(method, params, req_id)))  # type: ignore[union-attr]
+                proc.stdin.flush()  # type: ignore[union-attr]
+            except Exception as exc:
+                self._pending.pop(req_id, None)
+                logger.error("[MCP client/%s] RPC error: %s", self.name, exc)
+                future.set_result(None)
+        future.req_id = req_id  # type: ignore[attr-defined]
+        return future
 
-    def _rpc_stdio(self, msg: dict) -> dict | None:
-        if not self._proc:
-            return None
+    def _notify(self, method: str, params: dict | None = None) -> None:
+        if self.transport != "stdio" or self._proc is None:
+            return
         with self._lock:
             try:
-                self._proc.stdin.write(encode(msg))  # type: ignore[union-attr]
+                self._proc.stdin.write(encode(notification(method, params)))  # type: ignore[union-attr]
                 self._proc.stdin.flush()  # type: ignore[union-attr]
-                # Read response line with timeout via poll
-                deadline = time.time() + _CALL_TIMEOUT
-                while time.time() < deadline:
-                    line = self._proc.stdout.readline()  # type: ignore[union-attr]
-                    if line:
-                        return decode(line)
-                    time.sleep(0.01)
-                logger.warning("[MCP client/%s] Timeout waiting for response", self.name)
             except Exception as exc:
-                logger.error("[MCP client/%s] RPC error: %s", self.name, exc)
-        return None
+                logger.debug("[MCP client/%s] Notification %s failed: %s", self.name, method, exc)
 
-    def _rpc_http(self, msg: dict) -> dict | None:
+    def _abandon(self, future: concurrent.futures.Future) -> None:
+        """Forget a timed-out request and tell the server to stop working on it."""
+        req_id = getattr(future, "req_id", None)
+        if req_id is None:
+            return
+        with self._lock:
+            self._pending.pop(req_id, None)
+        self._notify("notifications/cancelled", {"requestId": req_id, "reason": "timeout"})
+
+    def _rpc(self, method: str, params: dict | None = None, timeout: float = _CALL_TIMEOUT) -> dict | None:
+        future = self._submit(method, params)
         try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            logger.warning("[MCP client/%s] Timeout waiting for response to %s", self.name, method)
+            self._abandon(future)
+            return None
+
+    def _get_http_session(self):
+        if self._http_session is None:
             import requests as req
+            from requests.adapters import HTTPAdapter
 
-            r = req.post(
-                self.url,
-                json=msg,
-                timeout=_CALL_TIMEOUT,
-                headers={"Content-Type": "application/json"},
-            )
-            r.raise_for_status()
-            return r.json()
+            session = req.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_HTTP_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["Content-Type"] = "application/json"
+            self._http_session = session
+        return self._http_session
+
+    def _post_http(self, msg: dict, timeout: float) -> dict:
+        r = self._get_http_session().post(self.url, json=msg, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def _rpc_http(self, msg: dict) -> dict | None:
+        try:
+            return self._post_http(msg, _CALL_TIMEOUT)
         except Exception as exc:
             logger.error("[MCP client/%s] HTTP RPC error: %s", self.name, exc)
         return None
@@ -205,27 +337,35 @@ class MCPConnection:
     # Tools
     # ------------------------------------------------------------------
 
+    def _cached_tools(self, force: bool) -> list[dict] | None:
+        if force or self._tools is None:
+            return None
+        if time.monotonic() - self._tools_fetched_at > _TOOLS_TTL:
+            return None
+        return self._tools
+
+    def _store_tools(self, tools: list[dict]) -> list[dict]:
+        self._tools = tools
+        self._tools_fetched_at = time.monotonic()
+        return tools
+
     def list_tools(self, force: bool = False) -> list[dict]:
-        """Return MCP-format tool list from the external server."""
-        if self._tools is not None and not force:
-            return self._tools
+        """Return MCP-format tool list from the external server (cached for ``_TOOLS_TTL`` seconds)."""
+        cached = self._cached_tools(force)
+        if cached is not None:
+            return cached
 
-        if not self.is_connected and not self.connect():
+        if not self._ensure_connected():
             return []
 
         resp = self._rpc("tools/list")
         if resp and "result" in resp:
-            self._tools = resp["result"].get("tools", [])
-            return self._tools
+            return self._store_tools(resp["result"].get("tools", []))
 
         return []
 
-    def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> dict | None:
-        """Call a tool on the external server. Returns MCP tool_result dict or None."""
-        if not self.is_connected and not self.connect():
-            return None
-
-        resp = self._rpc("tools/call", {"name": tool_name, "arguments": arguments})
+    @staticmethod
+    def _call_result(resp: dict | None) -> dict | None:
         if resp and "result" in resp:
             return resp["result"]
         if resp and "error" in resp:
@@ -233,6 +373,13 @@ class MCPConnection:
             return tool_result(f"MCP error: {err.get('message', err)}", is_error=True)
         return None
 
+    def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> dict | None:
+        """Call a tool on the external server. Returns MCP tool_result dict or None."""
+        if not self._ensure_connected():
+            return None
+
+        return self._call_result(self._rpc("tools/call", {"name": tool_name, "arguments": arguments}))
+
 
 # ---------------------------------------------------------------------------
 # Connection manager (singleton)
@@ -345,15 +492,7 @@ class MCPClientManager:
 
     def call_tool_if_known(self, tool_name: str, arguments: dict[str, Any]) -> dict | None:
         """Call tool on the first external server that exposes it. Returns None if not found."""
-        if not self._tool_index:
-            self._build_tool_index()
-
-        server_name = self._tool_index.get(tool_name)
-        if server_name is None:
-            return None
-
-        with self._lock:
-            conn = self._connections.get(server_name)
+        conn = self._connection_for_tool(tool_name)
         if conn is None:
             return None
 
@@ -363,6 +502,15 @@ class MCPClientManager:
         """Public: route tool call to the right external server."""
         return self.call_tool_if_known(tool_name, arguments)
 
+    def _connection_for_tool(self, tool_name: str) -> MCPConnection | None:
+        if not self._tool_index:
+            self._build_tool_index()
+        server_name = self._tool_index.get(tool_name)
+        if server_name is None:
+            return None
+        with self._lock:
+            return self._connections.get(server_name)
+
     def tools_for_server(self, server_name: str) -> list[dict]:
         """Return MCP-format tools for one server."""
         with self._lock:
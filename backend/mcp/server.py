@@ -9,7 +9,14 @@ Supported methods
   ping                → {}
   tools/list          → {tools: [...]}
   tools/call          → {content: [{type: "text", text: "..."}], isError: bool}
-  notifications/cancelled → (ignored)
+  notifications/cancelled → drops the pending request (no response is sent)
+
+Concurrency
+-----------
+``tools/call`` requests run on a bounded worker pool (``OLLASH_MCP_WORKERS``,
+default 4; 1 = sequential) while the reader keeps answering ``initialize``,
+``ping`` and ``tools/list`` inline.  Responses are written as they complete,
+one whole line at a time, so they may arrive out of order (matched by id).
 
 Run
 ---
@@ -30,11 +37,13 @@ Claude Code / Cline config (.mcp.json):
 
 from __future__ import annotations
 
+import concurrent.futures
 import io
 import json
 import logging
 import os
 import sys
+import threading
 import traceback
 from pathlib import Path
 from typing import Any
@@ -192,12 +201,24 @@ class MCPServer:
     VERSION = "1.0.0"
     NAME = "ollash"
 
-    def __init__(self, stdin: io.RawIOBase | None = None, stdout: io.RawIOBase | None = None) -> None:
+    def __init__(
+        self,
+        stdin: io.RawIOBase | None = None,
+        stdout: io.RawIOBase | None = None,
+        max_workers: int | None = None,
+    ) -> None:
         self._in = stdin or sys.stdin.buffer
         self._out = stdout or sys.stdout.buffer
         self._executor = _ToolExecutor()
         self._initialized = False
         self._tools_cache: list[dict] | None = None
+        self._catalog: tuple[list[dict], dict, frozenset[str]] | None = None  # (source, payload, names)
+        self._catalog_lock = threading.Lock()
+        self._max_workers = max_workers if max_workers is not None else int(os.environ.get("OLLASH_MCP_WORKERS", 4))
+        self._write_lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+        self._inflight: dict[Any, concurrent.futures.Future] = {}
+        self._cancelled: set[Any] = set()
 
     # ------------------------------------------------------------------
     # Tool catalog
@@ -207,29 +228,43 @@ class MCPServer:
         if self._tools_cache is not None:
             return self._tools_cache
 
-        # Discover all Ollash tools
-        try:
-            from backend.utils.core.tools.tool_decorator import get_discovered_definitions
-            from backend.utils.core.tools.tool_registry import discover_tools
+        with self._catalog_lock:
+            if self._tools_cache is not None:
+                return self._tools_cache
 
-            discover_tools()
-            defs = get_discovered_definitions()
-            self._tools_cache = [ollash_tool_to_mcp(d) for d in defs]
-        except Exception as exc:
-            logger.warning("Could not load Ollash tools: %s", exc)
-            self._tools_cache = []
+            # Discover all Ollash tools
+            try:
+                from backend.utils.core.tools.tool_decorator import get_discovered_definitions
+                from backend.utils.core.tools.tool_registry import discover_tools
 
-        # Merge tools from connected external MCP servers
-        try:
-            from backend.mcp.client import mcp_client_manager
+                discover_tools()
+                defs = get_discovered_definitions()
+                tools = [ollash_tool_to_mcp(d) for d in defs]
+            except Exception as exc:
+                logger.warning("Could not load Ollash tools: %s", exc)
+                tools = []
 
-            for srv_tools in mcp_client_manager.all_tools().values():
-                self._tools_cache.extend(srv_tools)
-        except Exception:
-            pass
+            # Merge tools from connected external MCP servers
+            try:
+                from backend.mcp.client import mcp_client_manager
 
+                for srv_tools in mcp_client_manager.all_tools().values():
+                    tools.extend(srv_tools)
+            except Exception:
+                pass
+
+            self._tools_cache = tools
         return self._tools_cache
 
+    def _get_catalog(self) -> tuple[dict, frozenset[str]]:
+        """The ``tools/list`` result and the set of tool names, built once per tool list."""
+        tools = self._get_mcp_tools()
+        catalog = self._catalog
+        if catalog is None or catalog[0] is not tools:
+            catalog = (tools, {"tools": tools}, frozenset(t["name"] for t in tools))
+            self._catalog = catalog
+        return catalog[1], catalog[2]
+
     # ------------------------------------------------------------------
     # Message dispatch
     # ------------------------------------------------------------------
@@ -242,6 +277,8 @@ class MCPServer:
 
         # Notifications have no id → no response
         if req_id is None:
+            if method == "notifications/cancelled":
+                self._cancel_request(params.get("requestId"))
             return None
 
         try:
@@ -263,16 +300,16 @@ class MCPServer:
         return response(server_info(self.NAME, self.VERSION), req_id)
 
     def _handle_tools_list(self, params: dict, req_id: Any) -> dict:
-        tools = self._get_mcp_tools()
+        payload, _names = self._get_catalog()
         # Simple pagination: return all (no cursor logic needed for typical sizes)
-        return response({"tools": tools}, req_id)
+        return response(payload, req_id)
 
     def _handle_tools_call(self, params: dict, req_id: Any) -> dict:
         name = params.get("name", "")
         arguments = params.get("arguments") or {}
 
         # Check tool exists
-        known = {t["name"] for t in self._get_mcp_tools()}
+        _payload, known = self._get_catalog()
         if name not in known:
             return error_response(ERR_TOOL_NOT_FOUND, f"Tool '{name}' not found", req_id)
 
@@ -306,23 +343,72 @@ class MCPServer:
         # Send initialized notification after server starts
         self._send(notification("notifications/initialized"))
 
-        for raw_line in self._in:
-            raw_line = raw_line.strip() if isinstance(raw_line, bytes) else raw_line.strip().encode()
-            if not raw_line:
-                continue
-            try:
-                msg = decode(raw_line)
-            except json.JSONDecodeError as exc:
-                self._send_raw(error_response(-32700, f"Parse error: {exc}", None))
-                continue
+        pool = None
+        if self._max_workers > 1:
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="mcp-call")
+            pool.submit(self._get_catalog)  # warm the tool catalog while the client initializes
+
+        try:
+            for raw_line in self._in:
+                raw_line = raw_line.strip() if isinstance(raw_line, bytes) else raw_line.strip().encode()
+                if not raw_line:
+                    continue
+                try:
+                    msg = decode(raw_line)
+                except json.JSONDecodeError as exc:
+                    self._send_raw(error_response(-32700, f"Parse error: {exc}", None))
+                    continue
+
+                if pool is not None and msg.get("method") == "tools/call" and msg.get("id") is not None:
+                    self._submit(pool, msg)
+                    continue
+
+                resp = self.handle(msg)
+                if resp is not None:
+                    self._send(resp)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)  # finish (and answer) everything already accepted
 
+    # ------------------------------------------------------------------
+    # Concurrent dispatch
+    # ------------------------------------------------------------------
+
+    def _submit(self, pool: concurrent.futures.ThreadPoolExecutor, msg: dict) -> None:
+        with self._inflight_lock:
+            self._inflight[msg["id"]] = pool.submit(self._run_request, msg)
+
+    def _run_request(self, msg: dict) -> None:
+        req_id = msg["id"]
+        resp = None
+        try:
             resp = self.handle(msg)
-            if resp is not None:
-                self._send(resp)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(req_id, None)
+                cancelled = req_id in self._cancelled
+                self._cancelled.discard(req_id)
+        if resp is not None and not cancelled:
+            self._send(resp)
+
+    def _cancel_request(self, req_id: Any) -> None:
+        """Honour ``notifications/cancelled``: drop a queued call, or suppress a running call's response."""
+        with self._inflight_lock:
+            future = self._inflight.get(req_id)
+            if future is None:
+                return
+            if future.cancel():
+                self._inflight.pop(req_id, None)
+            else:
+                # Tools run synchronously and cannot be interrupted; just don't answer
+                self._cancelled.add(req_id)
+        logger.info("Request %s cancelled by client", req_id)
 
     def _send(self, msg: dict) -> None:
-        self._out.write(encode(msg))
-        self._out.flush()
+        data = encode(msg)
+        with self._write_lock:
+            self._out.write(data)
+            self._out.flush()
 
     def _send_raw(self, msg: dict) -> None:
         self._send(msg)
@@ -0,0 +1,211 @@
+"""Warm pool of reusable DefaultAgent shells for interactive chat sessions.
+
+Building a :class:`DefaultAgent` wires up a kernel, LLM clients, memory,
+project managers and a full tool registry, which makes a fresh agent per chat
+session expensive.  The pool splits that state in two:
+
+* **Shared** — one :class:`AgentKernel` per project root plus a single
+  ``LLMClientManager`` (HTTP sessions, model clients), ``LLMRecorder`` and
+  ``ToolSpanManager`` injected into every agent the pool builds.
+* **Per session** — conversation, plan, loop-detection and routing state,
+  cleared by :meth:`DefaultAgent.reset_session` when a shell is handed out.
+
+Released agents are parked (keyed by project root, since their file, git and
+tool managers are bound to it) and reused by the next session on the same
+project.  When the last idle shell for a project is taken, a spare is built in
+the background so the following session also starts warm.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+_log = logging.getLogger("ollash")
+
+
+class AgentPool:
+    """Hands out pre-initialised agents and takes them back when sessions end.
+
+    Args:
+        ollash_root_dir: Ollash installation root (used for the shared LLM clients).
+        max_idle: Maximum parked agents across all projects (least recently used are dropped).
+        warm_spares: Idle agents to keep ready per project once it has been used.
+        agent_factory: ``factory(project_root, shared) -> agent``; defaults to building a
+            :class:`DefaultAgent` with the shared components injected.
+    """
+
+    def __init__(
+        self,
+        ollash_root_dir: Path,
+        max_idle: int = 4,
+        warm_spares: int = 1,
+        agent_factory: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+    ):
+        self.ollash_root_dir = Path(ollash_root_dir)
+        self.max_idle = max_idle
+        self.warm_spares = warm_spares
+        self._factory = agent_factory or self._build_default_agent
+        self._idle: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._leased: Dict[int, str] = {}
+        self._warming: Dict[str, int] = {}
+        self._kernels: Dict[str, Any] = {}
+        self._shared: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._shared_lock = threading.Lock()
+
+        self.constructed = 0
+        self.reused = 0
+        self.construct_seconds = 0.0
+        self.last_construct_seconds = 0.0
+        self.last_acquire_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self, project_root: str, event_bridge=None, system_prompt: Optional[str] = None) -> Any:
+        """Return an agent for *project_root*, reusing a parked one when available."""
+        key = str(Path(project_root).resolve())
+        start = time.perf_counter()
+        with self._lock:
+            parked = self._idle.get(key)
+            agent = parked.pop() if parked else None
+            if parked is not None and not parked:
+                del self._idle[key]
+
+        if agent is None:
+            agent = self._construct(key)
+        else:
+            with self._lock:
+                self.reused += 1
+
+        agent.reset_session(event_bridge=event_bridge, system_prompt=system_prompt)
+        with self._lock:
+            self._leased[id(agent)] = key
+            self.last_acquire_seconds = time.perf_counter() - start
+        self.prewarm(key)
+        return agent
+
+    def release(self, agent: Any) -> None:
+        """Return a leased agent to the pool; agents the pool did not hand out are ignored."""
+        with self._lock:
+            key = self._leased.pop(id(agent), None)
+        if key is None:
+            return
+        try:
+            agent.reset_session()
+        except Exception as exc:
+            _log.warning(f"Discarding pooled agent that failed to reset: {exc}")
+            return
+        self._park(key, agent)
+
+    def prewarm(self, project_root: str) -> None:
+        """Build spare agents for *project_root* in the background, up to ``warm_spares``."""
+        key = str(Path(project_root).resolve())
+        with self._lock:
+            missing = self.warm_spares - len(self._idle.get(key, ())) - self._warming.get(key, 0)
+            missing = min(missing, self.max_idle - self.idle_count)
+            if missing <= 0:
+                return
+            self._warming[key] = self._warming.get(key, 0) + missing
+
+        for _ in range(missing):
+            threading.Thread(target=self._warm_one, args=(key,), daemon=True, name="agent-pool-warm").start()
+
+    @property
+    def idle_count(self) -> int:
+        return sum(len(agents) for agents in self._idle.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Construction-time and reuse metrics."""
+        with self._lock:
+            return {
+                "constructed": self.constructed,
+                "reused": self.reused,
+                "idle": self.idle_count,
+                "leased": len(self._leased),
+                "avg_construct_ms": round(1000 * self.construct_seconds / self.constructed, 2)
+                if self.constructed
+                else 0.0,
+                "last_construct_ms": round(1000 * self.last_construct_seconds, 2),
+                "last_acquire_ms": round(1000 * self.last_acquire_seconds, 2),
+            }
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _warm_one(self, key: str) -> None:
+        try:
+            agent = self._construct(key)
+            agent.reset_session()
+            self._park(key, agent)
+        except Exception as exc:
+            _log.warning(f"Could not prewarm agent for {key}: {exc}")
+        finally:
+            with self._lock:
+                self._warming[key] -= 1
+                if not self._warming[key]:
+                    del self._warming[key]
+
+    def _construct(self, key: str) -> Any:
+        start = time.perf_counter()
+        agent = self._factory(key, self._get_shared(key))
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.constructed += 1
+            self.construct_seconds += elapsed
+            self.last_construct_seconds = elapsed
+        _log.info(f"AgentPool built agent for {key} in {elapsed * 1000:.0f} ms")
+        return agent
+
+    def _park(self, key: str, agent: Any) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(agent)
+            self._idle.move_to_end(key)
+            while self.idle_count > self.max_idle:
+                oldest_key, agents = next(iter(self._idle.items()))
+                agents.pop(0)
+                if not agents:
+                    del self._idle[oldest_key]
+
+    def _get_shared(self, key: str) -> Dict[str, Any]:
+        """Components reused by every agent, plus the kernel for *key*'s project root."""
+        with self._shared_lock:
+            if self._shared is None:
+                from backend.core.kernel import AgentKernel
+                from backend.services.llm_client_manager import LLMClientManager
+                from backend.utils.core.llm.llm_recorder import LLMRecorder
+                from backend.utils.core.tools.tool_span_manager import ToolSpanManager
+
+                kernel = AgentKernel(ollash_root_dir=self.ollash_root_dir)
+                logger = kernel.get_logger()
+                recorder = LLMRecorder(logger=logger)
+                self._shared = {
+                    "llm_recorder": recorder,
+                    "tool_span_manager": ToolSpanManager(logger=logger),
+                    "llm_manager": LLMClientManager(
+                        config=kernel.get_llm_models_config(),
+                        tool_settings=kernel.get_tool_settings_config(),
+                        logger=logger,
+                        recorder=recorder,
+                    ),
+                }
+                self._kernels[str(self.ollash_root_dir.resolve())] = kernel
+            if key not in self._kernels:
+                from backend.core.kernel import AgentKernel
+
+                self._kernels[key] = AgentKernel(ollash_root_dir=Path(key))
+            return {**self._shared, "kernel": self._kernels[key]}
+
+    @staticmethod
+    def _build_default_agent(project_root: str, shared: Dict[str, Any]) -> Any:
+        from backend.agents.default_agent import DefaultAgent
+
+        agent = DefaultAgent(project_root=project_root, auto_confirm=False, **shared)
+        # The LLM clients are shared by every pooled agent; their HTTP sessions outlive a single turn
+        agent.close_sessions_after_chat = False
+        return agent
@@ -0,0 +1,260 @@
+"""Async per-subscriber SSE event channel.
+
+One :class:`AsyncEventChannel` is opened per connected SSE client.  Producers
+(agent threads, the EventPublisher bridge loop, or the channel's own event
+loop) call :meth:`AsyncEventChannel.publish`, which appends to a bounded buffer
+under a lock and schedules at most one wake-up of the consumer's loop via
+``loop.call_soon_threadsafe``.  The consumer iterates the channel with
+``async for`` and receives ready-to-write SSE text, so streaming never occupies
+an executor thread and every payload is serialized exactly once.
+
+Bursts of streaming events (``token``, ``stream_chunk``,
+``blackboard_stream_chunk``) that pile up while the client is writing are
+merged into a single event by concatenating their text field, and everything
+pending is flushed as one batched write.  When a slow client lets the buffer
+reach ``maxsize`` the oldest streaming chunk (or, failing that, the oldest
+non-terminal event) is dropped and the client is told how many events it
+missed; with ``overflow="disconnect"`` the client is cut off instead.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# event_type -> field concatenated when consecutive events of that type are merged
+COALESCE_FIELDS: Dict[str, str] = {
+    "token": "text",
+    "stream_chunk": "text",
+    "blackboard_stream_chunk": "chunk",
+}
+
+# Events that end a stream; never dropped or merged
+TERMINAL_EVENTS = frozenset({"stream_end"})
+
+OVERFLOW_POLICIES = ("drop_oldest", "disconnect")
+
+KEEPALIVE_FRAME = ": keepalive\n\n"
+
+
+def sanitize_event_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace coroutine values (which cannot be serialized) with a placeholder string."""
+    sanitized = {}
+    for k, v in data.items():
+        if hasattr(v, "__await__") or hasattr(v, "cr_code"):
+            sanitized[k] = f"[Pending Coroutine: {getattr(v, '__name__', 'unknown')}]"
+        else:
+            sanitized[k] = v
+    return sanitized
+
+
+def format_sse(event_type: str, data: Optional[Dict[str, Any]] = None, named: bool = False) -> str:
+    """Serialize one event as an SSE frame.
+
+    The payload is ``{**data, "type": event_type}``.  With *named*, an
+    ``event:`` line is added so browser ``addEventListener(type)`` handlers fire.
+    """
+    try:
+        # F33: Ensure event_type (as 'type') is the final word, avoiding collision with data
+        payload = json.dumps({**sanitize_event_data(data or {}), "type": event_type})
+    except Exception as e:
+        # Fallback for complex objects that still fail
+        event_type = "error"
+        payload = json.dumps({"type": "error", "message": f"Serialization error: {e}"})
+    if named:
+        return f"event: {event_type}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+class AsyncEventChannel:
+    """Bounded, coalescing event buffer consumed as an async iterator of SSE text.
+
+    Args:
+        loop: Event loop the consumer runs on (defaults to the running loop).
+        maxsize: Maximum number of buffered events before the overflow policy applies.
+        overflow: ``"drop_oldest"`` or ``"disconnect"``.
+        named_events: Emit ``event: <type>`` lines in SSE frames.
+        keepalive_interval: Seconds of silence before a keep-alive comment is sent.
+        on_close: Called once with the channel when it finishes.
+    """
+
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        maxsize: int = 1000,
+        overflow: str = "drop_oldest",
+        named_events: bool = False,
+        keepalive_interval: float = 15.0,
+        on_close: Optional[Callable[["AsyncEventChannel"], None]] = None,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self._loop = loop or asyncio.get_running_loop()
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+        self.named_events = named_events
+        self.keepalive_interval = keepalive_interval
+        self._on_close = on_close
+
+        self._buffer: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._lock = threading.Lock()
+        self._ready = asyncio.Event()
+        self._wakeup_pending = False
+        self._pending_drops = 0
+        self._ended = False  # terminal event buffered or overflow disconnect; no more input
+        self._finished = False  # consumer has delivered the end of the stream
+
+        self.published = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------------
+    # Producer side (any thread)
+    # ------------------------------------------------------------------
+
+    def publish(self, event_type: str, event_data: Optional[Dict[str, Any]] = None) -> bool:
+        """Buffer an event for the consumer. Returns False if the channel no longer accepts events."""
+        with self._lock:
+            if self._ended:
+                return False
+            self.published += 1
+            data = dict(event_data) if event_data else {}
+            if not self._coalesce_locked(event_type, data):
+                if len(self._buffer) >= self.maxsize and event_type not in TERMINAL_EVENTS:
+                    if self.overflow == "disconnect":
+                        self._buffer.clear()
+                        self._buffer.append(("error", {"message": "Event stream closed: client is not keeping up."}))
+                        self._ended = True
+                        self.dropped += 1
+                        self._schedule_wakeup_locked()
+                        return False
+                    self._drop_one_locked()
+                self._buffer.append((event_type, data))
+            if event_type in TERMINAL_EVENTS:
+                self._ended = True
+            self._schedule_wakeup_locked()
+        return True
+
+    def close(self) -> None:
+        """End the stream after everything already buffered has been delivered."""
+        self.publish("stream_end")
+
+    def _coalesce_locked(self, event_type: str, data: Dict[str, Any]) -> bool:
+        field_name = COALESCE_FIELDS.get(event_type)
+        if field_name is None or not self._buffer:
+            return False
+        last_type, last_data = self._buffer[-1]
+        if last_type != event_type:
+            return False
+        text, last_text = data.get(field_name), last_data.get(field_name)
+        if not isinstance(text, str) or not isinstance(last_text, str):
+            return False
+        # Only merge chunks that belong to the same logical stream
+        if last_data.keys() != data.keys() or any(last_data[k] != v for k, v in data.items() if k != field_name):
+            return False
+        last_data[field_name] = last_text + text
+        self.coalesced += 1
+        return True
+
+    def _drop_one_locked(self) -> None:
+        victim = None
+        for i, (event_type, _) in enumerate(self._buffer):
+            if event_type in COALESCE_FIELDS:
+                victim = i
+                break
+        if victim is None:
+            victim = next((i for i, (t, _) in enumerate(self._buffer) if t not in TERMINAL_EVENTS), None)
+        if victim is None:
+            return
+        del self._buffer[victim]
+        self.dropped += 1
+        self._pending_drops += 1
+
+    def _schedule_wakeup_locked(self) -> None:
+        if self._wakeup_pending:
+            return
+        self._wakeup_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            # Consumer loop is gone; nobody will read this channel again
+            self._ended = True
+
+    def _wake(self) -> None:
+        with self._lock:
+            self._wakeup_pending = False
+        self._ready.set()
+
+    # ------------------------------------------------------------------
+    # Consumer side (channel's event loop)
+    # ------------------------------------------------------------------
+
+    def _drain(self) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+        with self._lock:
+            events = list(self._buffer)
+            self._buffer.clear()
+            drops, self._pending_drops = self._pending_drops, 0
+        return events, drops
+
+    def __aiter__(self) -> "AsyncEventChannel":
+        return self
+
+    async def __anext__(self) -> str:
+        """Return all pending events as one batched SSE write (or a keep-alive comment)."""
+        if self._finished:
+            raise StopAsyncIteration
+        while True:
+            self._ready.clear()
+            events, drops = self._drain()
+            if events or drops:
+                break
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=self.keepalive_interval)
+            except asyncio.TimeoutError:
+                return KEEPALIVE_FRAME
+
+        frames = []
+        if drops:
+            frames.append(f": dropped {drops} events\n\n")
+        for event_type, data in events:
+            frames.append(format_sse(event_type, data, named=self.named_events))
+            if event_type in TERMINAL_EVENTS:
+                self._finish()
+                break
+        else:
+            if self._ended and not self._buffer:
+                # Overflow disconnect: the error frame was the last thing buffered
+                self._finish()
+        return "".join(frames)
+
+    async def aclose(self) -> None:
+        """Stop consuming (e.g. client disconnected); later publishes are ignored."""
+        with self._lock:
+            self._ended = True
+            self._buffer.clear()
+        self._finish()
+
+    def _finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        if self._on_close is not None:
+            try:
+                self._on_close(self)
+            except Exception:
+                pass
+
+    @property
+    def closed(self) -> bool:
+        return self._finished
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "buffered": buffered,
+        }
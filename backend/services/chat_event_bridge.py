@@ -1,8 +1,9 @@
-import json
 import queue
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from backend.services.async_event_channel import KEEPALIVE_FRAME, AsyncEventChannel, format_sse
 from backend.utils.core.system.event_publisher import EventPublisher
 
 
@@ -17,13 +18,21 @@ class ChatEvent:
 class ChatEventBridge:
     """Thread-safe bridge between DefaultAgent.chat() and an SSE endpoint.
 
-    The agent thread pushes events via push_event(); the Flask SSE
-    generator reads them via iter_events().
+    The agent thread pushes events via push_event().  Async SSE endpoints
+    attach an :class:`AsyncEventChannel` per client with open_channel(); every
+    open channel receives every event.  While no channel is attached, events
+    are buffered in ``event_queue`` (bounded, oldest dropped first) and handed
+    to the next channel that opens, or read by the legacy blocking
+    iter_events() generator.
     """
 
+    BACKLOG_MAXSIZE = 10_000
+
     def __init__(self, event_publisher: EventPublisher):
-        self.event_queue: queue.Queue[ChatEvent] = queue.Queue()
+        self.event_queue: queue.Queue[ChatEvent] = queue.Queue(maxsize=self.BACKLOG_MAXSIZE)
         self._closed = False
+        self._channels: List[AsyncEventChannel] = []
+        self._channels_lock = threading.Lock()
         self.event_publisher = event_publisher  # Store the event publisher
 
         # Subscribe to all relevant event types from the EventPublisher
@@ -78,10 +87,52 @@ class ChatEventBridge:
         self.event_publisher.subscribe("stream_chunk", self.push_event)
 
     def push_event(self, event_type: str, event_data: Optional[Dict[str, Any]] = None):
-        """Push an event onto the queue (called from the agent thread)."""
+        """Deliver an event to open channels, or buffer it (called from any thread)."""
         if self._closed:
             return
-        self.event_queue.put(ChatEvent(event_type=event_type, data=event_data or {}))
+        with self._channels_lock:
+            channels = list(self._channels)
+            if not channels:
+                self._enqueue_backlog(ChatEvent(event_type=event_type, data=event_data or {}))
+                return
+        for channel in channels:
+            channel.publish(event_type, event_data)
+
+    def _enqueue_backlog(self, event: ChatEvent) -> None:
+        while True:
+            try:
+                self.event_queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.event_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def open_channel(self, **channel_kwargs: Any) -> AsyncEventChannel:
+        """Attach a new async channel for one SSE client (call from the client's event loop).
+
+        Events buffered while nobody was listening are replayed into it first.
+        Keyword arguments are passed to :class:`AsyncEventChannel`.
+        """
+        channel = AsyncEventChannel(on_close=self._detach_channel, **channel_kwargs)
+        with self._channels_lock:
+            while True:
+                try:
+                    event = self.event_queue.get_nowait()
+                except queue.Empty:
+                    break
+                channel.publish(event.event_type, event.data)
+            if self._closed:
+                channel.close()
+            else:
+                self._channels.append(channel)
+        return channel
+
+    def _detach_channel(self, channel: AsyncEventChannel) -> None:
+        with self._channels_lock:
+            if channel in self._channels:
+                self._channels.remove(channel)
 
     def iter_events(self, timeout: float = 0.5):
         """Yield SSE-formatted strings. Blocks up to *timeout* seconds per poll.
@@ -93,25 +144,10 @@ class ChatEventBridge:
                 event = self.event_queue.get(timeout=timeout)
             except queue.Empty:
                 # Send a keep-alive comment to prevent connection timeout
-                yield ": keepalive\n\n"
+                yield KEEPALIVE_FRAME
                 continue
 
-            # Handle non-serializable data (like coroutines) to avoid 500 errors
-            sanitized_data = {}
-            for k, v in event.data.items():
-                if hasattr(v, "__await__") or hasattr(v, "cr_code"):  # Check if it's a coroutine
-                    sanitized_data[k] = f"[Pending Coroutine: {getattr(v, '__name__', 'unknown')}]"
-                else:
-                    sanitized_data[k] = v
-
-            try:
-                # F33: Ensure event_type (as 'type') is the final word, avoiding collision with data
-                payload_dict = {**sanitized_data, "type": event.event_type}
-                payload = json.dumps(payload_dict)
-                yield f"data: {payload}\n\n"
-            except Exception as e:
-                # Fallback for complex objects that still fail
-                yield f'data: {{"type": "error", "message": "Serialization error: {str(e)}"}}\n\n'
+            yield format_sse(event.event_type, event.data)
 
             if event.event_type == "stream_end":
                 break
@@ -119,6 +155,11 @@ class ChatEventBridge:
     def close(self):
         """Signal end of stream."""
         if not self._closed:
-            self._closed = True
-            # Put directly on queue — push_event() would bail because _closed is True.
-            self.event_queue.put(ChatEvent(event_type="stream_end"))
+            with self._channels_lock:
+                self._closed = True
+                channels = list(self._channels)
+                if not channels:
+                    # Put directly on queue — push_event() would bail because _closed is True.
+                    self._enqueue_backlog(ChatEvent(event_type="stream_end"))
+            for channel in channels:
+                channel.close()
@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import os
 import threading
 import uuid
 from dataclasses import dataclass
@@ -7,7 +7,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from backend.agents.simple_chat_agent import SimpleChatAgent
+from backend.services.agent_pool import AgentPool
 from backend.services.chat_event_bridge import ChatEventBridge
+from backend.services.chat_turn_scheduler import ChatTurn, ChatTurnInProgressError, ChatTurnScheduler
+from backend.services.directory_snapshot import get_directory_snapshot_service
 
 _log = logging.getLogger("ollash")
 
@@ -76,15 +79,14 @@ def _build_project_tree(project_path: str, max_files: int = 120) -> str:
     file_count = 0
     truncated = False
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = sorted(d for d in dirnames if d not in _EXCLUDE_DIRS)
-        rel_dir = Path(dirpath).relative_to(root)
-        indent = "  " * len(rel_dir.parts)
+    for rel_dir, _dirnames, filenames in get_directory_snapshot_service().walk(root, _EXCLUDE_DIRS):
+        parts = rel_dir.split("/") if rel_dir else []
+        indent = "  " * len(parts)
 
-        if rel_dir.parts:
-            lines.append(f"{indent[:-2]}{rel_dir.parts[-1]}/")
+        if parts:
+            lines.append(f"{indent[:-2]}{parts[-1]}/")
 
-        for fname in sorted(filenames):
+        for fname in filenames:
             if Path(fname).suffix.lower() not in _SOURCE_EXTS:
                 continue
             file_count += 1
@@ -143,7 +145,7 @@ class ChatSession:
     session_id: str
     agent: Union[SimpleChatAgent, "DefaultAgent"]  # type: ignore[name-defined]  # noqa: F821
     bridge: ChatEventBridge
-    thread: Optional[threading.Thread] = None
+    turn: Optional[ChatTurn] = None
 
 
 class ChatSessionManager:
@@ -158,6 +160,8 @@ class ChatSessionManager:
         self.sessions: Dict[str, ChatSession] = {}
         self._lock = threading.Lock()
         self.event_publisher = event_publisher
+        self.agent_pool = AgentPool(ollash_root_dir)
+        self.scheduler = ChatTurnScheduler()
         self._init_db()
 
     def _init_db(self):
@@ -213,17 +217,12 @@ class ChatSessionManager:
             resolved_root = project_path or str(self.ollash_root_dir)
 
             if mode == "coding":
-                from backend.agents.default_agent import DefaultAgent
                 from backend.services.project_index import ProjectIndex
 
                 # Build system prompt: role description + project tree + OLLASH.md
                 coding_prompt = system_prompt_override or _load_coding_system_prompt(resolved_root, self._prompts_base)
-                agent = DefaultAgent(
-                    project_root=resolved_root,
-                    event_bridge=bridge,
-                    auto_confirm=False,
-                    system_prompt_override=coding_prompt,
-                )
+                # Warm DefaultAgent shell from the pool (shared kernel, LLM clients and tools)
+                agent = self.agent_pool.acquire(resolved_root, event_bridge=bridge, system_prompt=coding_prompt)
 
                 # Build project index (background RAG) and inject into FileSystemTools
                 project_idx = ProjectIndex(resolved_root)
@@ -264,79 +263,116 @@ class ChatSessionManager:
             (session_id,),
         )
 
-    def send_message(self, session_id: str, message: str):
-        """Run agent.chat(message) in a background thread and persist to DB."""
+    def send_message(self, session_id: str, message: str, user_key: Optional[str] = None) -> ChatTurn:
+        """Queue ``agent.chat(message)`` on the shared turn scheduler and persist to DB.
+
+        Turns are admitted subject to the scheduler's global and per-user
+        limits (*user_key* defaults to the session id); while waiting, the
+        session's bridge receives ``queued`` events with the queue position.
+
+        Raises:
+            KeyError: Unknown session.
+            ChatTurnInProgressError: A turn is already queued or running for this session.
+            ChatQueueFullError: The wait queue is full.
+        """
         session = self.sessions.get(session_id)
         if session is None:
             raise KeyError(f"Session '{session_id}' not found.")
-
-        # Persist user message
-        self.db.execute(
-            "INSERT INTO chat_messages (session_id, role, content) VALUES (?, ?, ?)", (session_id, "user", message)
-        )
-
-        # Update session title based on first message if it's default
-        self.db.execute(
-            "UPDATE chat_sessions SET title = ? WHERE id = ? AND title LIKE 'New %'", (message[:30] + "...", session_id)
-        )
+        if session.turn is not None and not session.turn.done:
+            raise ChatTurnInProgressError(f"Session '{session_id}' already has a turn in progress.")
 
         # Create a fresh bridge for each message turn (the previous one is closed after each reply)
         fresh_bridge = ChatEventBridge(self.event_publisher)
+        # Set once the user message is stored, so a fast reply is never persisted before it
+        user_message_saved = threading.Event()
+
+        # Submit first: a full queue must leave neither the message nor the session's bridge behind
+        turn = self.scheduler.submit(
+            session_id,
+            lambda turn: self._run_turn(session, fresh_bridge, message, turn, user_message_saved),
+            user_key=user_key,
+            on_position=lambda position: fresh_bridge.push_event("queued", {"position": position}),
+        )
+        session.turn = turn
         session.bridge = fresh_bridge
-        session.agent.event_bridge = fresh_bridge
-
-        def _run():
-            import asyncio
+        try:
+            # Persist user message
+            self.db.execute(
+                "INSERT INTO chat_messages (session_id, role, content) VALUES (?, ?, ?)", (session_id, "user", message)
+            )
 
-            try:
-                # Robust event loop management for background thread
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-                # Use the thread-local loop to run the async chat
-                result = loop.run_until_complete(session.agent.chat(message))
-
-                import logging
-
-                logger = logging.getLogger("ollash")
-                logger.info(f"DEBUG: chat_session_manager result type: {type(result)}")
-                if isinstance(result, dict):
-                    logger.info(f"DEBUG: chat_session_manager result keys: {result.keys()}")
-
-                content = ""
-                metrics = {}
-                if isinstance(result, dict):
-                    content = result.get("text", "")
-                    metrics = result.get("metrics", {})
-                else:
-                    content = str(result)
-
-                logger.info(f"DEBUG: chat_session_manager final content length: {len(content)}")
-
-                # Persist assistant response
-                self.db.execute(
-                    "INSERT INTO chat_messages (session_id, role, content) VALUES (?, ?, ?)",
-                    (session_id, "assistant", content),
-                )
+            # Update session title based on first message if it's default
+            self.db.execute(
+                "UPDATE chat_sessions SET title = ? WHERE id = ? AND title LIKE 'New %'",
+                (message[:30] + "...", session_id),
+            )
+        finally:
+            user_message_saved.set()
+        return turn
 
-                # Trim oldest messages to stay within per-session history limit
-                self.db.execute(
-                    """DELETE FROM chat_messages WHERE session_id = ? AND id NOT IN (
-                        SELECT id FROM chat_messages WHERE session_id = ?
-                        ORDER BY id DESC LIMIT ?
-                    )""",
-                    (session_id, session_id, ChatSessionManager.MAX_MESSAGES_PER_SESSION),
-                )
+    def cancel_turn(self, session_id: str) -> bool:
+        """Cancel the session's queued or running turn. Returns False if there is none."""
+        session = self.sessions.get(session_id)
+        if session is None or session.turn is None:
+            return False
+        turn = session.turn
+        if not self.scheduler.cancel(turn.turn_id):
+            return False
+        # Reported here because a turn cancelled before it started never reaches _run_turn
+        session.bridge.push_event("cancelled", turn.to_dict())
+        session.bridge.close()
+        return True
+
+    async def _run_turn(
+        self,
+        session: ChatSession,
+        bridge: ChatEventBridge,
+        message: str,
+        turn: ChatTurn,
+        user_message_saved: threading.Event,
+    ) -> None:
+        """Run one chat turn on the scheduler loop, persisting and streaming the reply."""
+        session_id = session.session_id
+        session.agent.event_bridge = bridge
+        try:
+            result = await session.agent.chat(message)
 
-                session.bridge.push_event("final_answer", {"content": content, "metrics": metrics})
-            except Exception as e:
-                session.bridge.push_event("error", {"message": str(e)})
-            finally:
-                session.bridge.close()
+            content = ""
+            metrics = {}
+            if isinstance(result, dict):
+                content = result.get("text", "")
+                metrics = result.get("metrics", {})
+            else:
+                content = str(result)
+            metrics = {
+                **metrics,
+                "queue_ms": round(turn.queue_seconds * 1000, 1),
+                "model_ms": round(turn.model_seconds * 1000, 1),
+            }
+
+            await asyncio.to_thread(user_message_saved.wait)
+            await asyncio.to_thread(self._persist_reply, session_id, content)
+            bridge.push_event("final_answer", {"content": content, "metrics": metrics})
+        except Exception as e:
+            bridge.push_event("error", {"message": str(e)})
+        finally:
+            bridge.close()
+
+    def _persist_reply(self, session_id: str, content: str) -> None:
+        """Store the assistant reply and trim the session to its history limit."""
+        self.db.execute(
+            "INSERT INTO chat_messages (session_id, role, content) VALUES (?, ?, ?)",
+            (session_id, "assistant", content),
+        )
 
-        t = threading.Thread(target=_run, daemon=True)
-        session.thread = t
-        t.start()
+        # Trim oldest messages to stay within per-session history limit
+        self.db.execute(
+            """DELETE FROM chat_messages WHERE session_id = ? AND id NOT IN (
+                SELECT id FROM chat_messages WHERE session_id = ?
+                ORDER BY id DESC LIMIT ?
+            )""",
+            (session_id, session_id, ChatSessionManager.MAX_MESSAGES_PER_SESSION),
+        )
 
     def delete_empty_sessions(self):
         """Deletes sessions that have no messages."""
@@ -346,22 +382,31 @@ class ChatSessionManager:
         """)
 
     def delete_session(self, session_id: str):
+        self.cancel_turn(session_id)
         with self._lock:
-            self.sessions.pop(session_id, None)
+            self._release_agent(self.sessions.pop(session_id, None))
         self.db.execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,))
 
     def delete_all_sessions(self):
         """Delete all sessions from DB and clear in-memory sessions."""
         with self._lock:
+            for session in self.sessions.values():
+                self._release_agent(session)
             self.sessions.clear()
         self.db.execute("DELETE FROM chat_messages")
         self.db.execute("DELETE FROM chat_sessions")
 
     def _cleanup_finished(self):
-        """Remove sessions whose threads have completed."""
-        finished = [sid for sid, s in self.sessions.items() if s.thread is not None and not s.thread.is_alive()]
+        """Remove sessions whose last turn has completed."""
+        finished = [sid for sid, s in self.sessions.items() if s.turn is not None and s.turn.done]
         for sid in finished:
-            del self.sessions[sid]
+            self._release_agent(self.sessions.pop(sid))
+
+    def _release_agent(self, session: Optional[ChatSession]) -> None:
+        """Return a session's agent to the pool unless a turn is still running on it."""
+        if session is None or (session.turn is not None and not session.turn.done):
+            return
+        self.agent_pool.release(session.agent)
 
     @staticmethod
     def _inject_project_index(agent: Any, project_index: Any) -> None:
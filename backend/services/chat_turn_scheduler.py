@@ -0,0 +1,317 @@
+"""Bounded scheduling of chat turns on one shared background event loop.
+
+Chat turns used to run on a fresh daemon thread with a private event loop
+each, which gave unbounded threads, leaked loops and no backpressure.
+:class:`ChatTurnScheduler` owns a single loop thread instead and admits turns
+through a FIFO wait queue, subject to a global concurrency limit and a
+per-user limit (a user at their limit does not hold up the users queued
+behind them).  Queued turns are told their position whenever it changes,
+turns can be cancelled whether queued or running, and the time each turn
+spent waiting vs. running is recorded for capacity planning.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+_log = logging.getLogger("ollash")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class ChatQueueFullError(RuntimeError):
+    """Raised when the wait queue is at capacity."""
+
+
+class ChatTurnInProgressError(RuntimeError):
+    """Raised when a session already has a queued or running turn."""
+
+
+@dataclass
+class ChatTurn:
+    """One chat turn and its timing."""
+
+    turn_id: str
+    session_id: str
+    user_key: str
+    run: Callable[["ChatTurn"], Awaitable[Any]]
+    on_position: Optional[Callable[[int], None]] = None
+    state: str = QUEUED
+    position: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    task: Optional["asyncio.Task"] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    @property
+    def queue_seconds(self) -> float:
+        end = self.started_at or self.finished_at or time.monotonic()
+        return end - self.enqueued_at
+
+    @property
+    def model_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "turn_id": self.turn_id,
+            "session_id": self.session_id,
+            "state": self.state,
+            "position": self.position,
+            "queue_ms": round(self.queue_seconds * 1000, 1),
+            "model_ms": round(self.model_seconds * 1000, 1),
+        }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+class ChatTurnScheduler:
+    """Runs chat turns on a shared loop with global and per-user concurrency limits.
+
+    Args:
+        max_concurrent: Turns running at once across all users
+            (default ``OLLASH_CHAT_MAX_CONCURRENT`` or 4).
+        max_per_user: Turns running at once for a single user key
+            (default ``OLLASH_CHAT_MAX_PER_USER`` or 2).
+        max_queue: Turns allowed to wait; further submissions raise :class:`ChatQueueFullError`.
+        history_size: Finished turns kept for the timing metrics.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        max_queue: int = 64,
+        history_size: int = 500,
+    ):
+        self.max_concurrent = max_concurrent or int(os.environ.get("OLLASH_CHAT_MAX_CONCURRENT", "4"))
+        self.max_per_user = max_per_user or int(os.environ.get("OLLASH_CHAT_MAX_PER_USER", "2"))
+        self.max_queue = max_queue
+        self._queue: Deque[ChatTurn] = deque()
+        self._running: Dict[str, ChatTurn] = {}
+        self._per_user: Dict[str, int] = {}
+        self._turns: Dict[str, ChatTurn] = {}
+        self._history: Deque[ChatTurn] = deque(maxlen=history_size)
+        self._counts = {DONE: 0, FAILED: 0, CANCELLED: 0}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Loop management
+    # ------------------------------------------------------------------
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The shared event loop, started on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run_loop, args=(loop, ready), daemon=True, name="chat-turns"
+                )
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Cancel every turn and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            turns = list(self._queue) + list(self._running.values())
+        for turn in turns:
+            self.cancel(turn.turn_id)
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        session_id: str,
+        run: Callable[[ChatTurn], Awaitable[Any]],
+        user_key: Optional[str] = None,
+        on_position: Optional[Callable[[int], None]] = None,
+    ) -> ChatTurn:
+        """Queue ``run(turn)`` for execution on the shared loop and return its :class:`ChatTurn`.
+
+        *on_position* is called with the turn's 1-based queue position each
+        time it changes while the turn is waiting (from whichever thread
+        changed the queue, so it must be thread-safe).
+        """
+        loop = self.loop
+        turn = ChatTurn(
+            turn_id=uuid.uuid4().hex,
+            session_id=session_id,
+            user_key=user_key or session_id,
+            run=run,
+            on_position=on_position,
+        )
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                raise ChatQueueFullError(f"Chat queue is full ({self.max_queue} turns waiting).")
+            self._queue.append(turn)
+            self._turns[turn.turn_id] = turn
+        self._dispatch(loop)
+        return turn
+
+    def get_turn(self, turn_id: str) -> Optional[ChatTurn]:
+        return self._turns.get(turn_id)
+
+    def cancel(self, turn_id: str) -> bool:
+        """Cancel a queued or running turn. Returns False if it already finished."""
+        with self._lock:
+            turn = self._turns.get(turn_id)
+            if turn is None or turn.done:
+                return False
+            loop = self._loop
+            queued = turn.state == QUEUED
+            if queued:
+                self._queue.remove(turn)
+                self._finish(turn, CANCELLED)
+        if queued:
+            self._dispatch(loop)
+        else:
+            # Runs after the turn's own _start callback, so the task exists by then
+            loop.call_soon_threadsafe(self._cancel_task, turn)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and queue-time vs model-time per turn."""
+        with self._lock:
+            finished = [t for t in self._history if t.started_at is not None]
+            queue_ms = [t.queue_seconds * 1000 for t in finished]
+            model_ms = [t.model_seconds * 1000 for t in finished]
+            return {
+                "running": len(self._running),
+                "queued": len(self._queue),
+                "max_concurrent": self.max_concurrent,
+                "max_per_user": self.max_per_user,
+                "completed": self._counts[DONE],
+                "failed": self._counts[FAILED],
+                "cancelled": self._counts[CANCELLED],
+                "queue_ms": {
+                    "avg": round(sum(queue_ms) / len(queue_ms), 1) if queue_ms else 0.0,
+                    "p95": round(_percentile(queue_ms, 0.95), 1),
+                },
+                "model_ms": {
+                    "avg": round(sum(model_ms) / len(model_ms), 1) if model_ms else 0.0,
+                    "p95": round(_percentile(model_ms, 0.95), 1),
+                },
+            }
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Admit every queued turn that fits the limits, then report new queue positions.
+
+        Safe to call from any thread: admission happens under the lock and the
+        admitted turns are started on the loop thread.
+        """
+        moved: List[ChatTurn] = []
+        with self._lock:
+            waiting: Deque[ChatTurn] = deque()
+            for turn in self._queue:
+                if (
+                    len(self._running) < self.max_concurrent
+                    and self._per_user.get(turn.user_key, 0) < self.max_per_user
+                ):
+                    turn.state = RUNNING
+                    turn.position = 0
+                    turn.started_at = time.monotonic()
+                    self._running[turn.turn_id] = turn
+                    self._per_user[turn.user_key] = self._per_user.get(turn.user_key, 0) + 1
+                    loop.call_soon_threadsafe(self._start, turn)
+                else:
+                    waiting.append(turn)
+                    if turn.position != len(waiting):
+                        turn.position = len(waiting)
+                        moved.append(turn)
+            self._queue = waiting
+
+        for turn in moved:
+            self._notify_position(turn)
+
+    def _start(self, turn: ChatTurn) -> None:
+        turn.task = asyncio.get_running_loop().create_task(turn.run(turn))
+        # A done-callback (not try/finally in the coroutine) also covers tasks cancelled before they first run
+        turn.task.add_done_callback(lambda task: self._on_task_done(turn, task))
+
+    @staticmethod
+    def _cancel_task(turn: ChatTurn) -> None:
+        if turn.task is not None:
+            turn.task.cancel()
+
+    def _on_task_done(self, turn: ChatTurn, task: "asyncio.Task") -> None:
+        if task.cancelled():
+            state = CANCELLED
+        elif task.exception() is not None:
+            state = FAILED
+            _log.error(f"Chat turn {turn.turn_id} for session {turn.session_id} failed: {task.exception()}")
+        else:
+            state = DONE
+        with self._lock:
+            self._running.pop(turn.turn_id, None)
+            remaining = self._per_user.get(turn.user_key, 1) - 1
+            if remaining > 0:
+                self._per_user[turn.user_key] = remaining
+            else:
+                self._per_user.pop(turn.user_key, None)
+            self._finish(turn, state)
+        self._dispatch(task.get_loop())
+
+    def _finish(self, turn: ChatTurn, state: str) -> None:
+        """Record a finished turn. Caller holds ``_lock``."""
+        turn.state = state
+        turn.position = 0
+        turn.finished_at = time.monotonic()
+        self._counts[state] += 1
+        self._history.append(turn)
+        self._turns.pop(turn.turn_id, None)
+
+    @staticmethod
+    def _notify_position(turn: ChatTurn) -> None:
+        if turn.on_position is None:
+            return
+        try:
+            turn.on_position(turn.position)
+        except Exception as exc:
+            _log.debug(f"Queue position callback failed for turn {turn.turn_id}: {exc}")
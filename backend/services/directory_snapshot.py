@@ -0,0 +1,231 @@
+"""Shared, cached directory snapshots for file browsers and project listings.
+
+Directory listings are cached per absolute path together with the
+directory's ``st_mtime_ns``.  Adding, removing or renaming an entry bumps the
+mtime of its parent directory, so a cached listing is reused until its own
+directory changes; a listing checked less than ``revalidate_interval`` seconds
+ago is reused without even a ``stat()``.  Built trees are cached as well and
+stay valid while every directory they cover still maps to the same cached
+listing, so repeated UI refreshes of an unchanged project cost a handful of
+dictionary lookups instead of a full walk.
+
+All methods block on the filesystem; async callers should use
+``asyncio.to_thread``.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+DEFAULT_SKIP_DIRS = frozenset({"__pycache__", "node_modules", ".venv", "venv", ".git"})
+
+
+@dataclass(frozen=True)
+class DirEntry:
+    name: str
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+class _Listing:
+    __slots__ = ("mtime_ns", "entries", "checked_at")
+
+    def __init__(self, mtime_ns: int, entries: List[DirEntry], checked_at: float):
+        self.mtime_ns = mtime_ns
+        self.entries = entries
+        self.checked_at = checked_at
+
+
+class DirectorySnapshotService:
+    """Caches directory listings and rendered trees, invalidated by directory mtimes.
+
+    Args:
+        revalidate_interval: Seconds during which a listing is trusted without a ``stat()``.
+        max_dirs: Maximum cached directory listings (least recently used are dropped).
+        max_trees: Maximum cached rendered trees.
+    """
+
+    def __init__(self, revalidate_interval: float = 1.0, max_dirs: int = 50_000, max_trees: int = 256):
+        self.revalidate_interval = revalidate_interval
+        self.max_dirs = max_dirs
+        self.max_trees = max_trees
+        self._listings: "OrderedDict[str, _Listing]" = OrderedDict()
+        self._trees: "OrderedDict[Tuple, Tuple[List[Tuple[str, _Listing]], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.scans = 0  # directories actually read from disk
+
+    # ------------------------------------------------------------------
+    # Directory listings
+    # ------------------------------------------------------------------
+
+    def _listing(self, path: str) -> Optional[_Listing]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._listings.get(path)
+            if cached is not None:
+                self._listings.move_to_end(path)
+                if now - cached.checked_at < self.revalidate_interval:
+                    return cached
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._listings.pop(path, None)
+            return None
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            cached.checked_at = now
+            return cached
+
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append(DirEntry(entry.name, is_dir, 0 if is_dir else st.st_size, st.st_mtime))
+        except (PermissionError, NotADirectoryError):
+            entries = []
+        except FileNotFoundError:
+            return None
+        entries.sort(key=lambda e: (not e.is_dir, e.name.lower()))
+        listing = _Listing(mtime_ns, entries, now)
+        with self._lock:
+            self.scans += 1
+            self._listings[path] = listing
+            self._listings.move_to_end(path)
+            while len(self._listings) > self.max_dirs:
+                self._listings.popitem(last=False)
+        return listing
+
+    def list_dir(self, path: Path) -> List[DirEntry]:
+        """Entries of *path*, directories first, then case-insensitive name order."""
+        listing = self._listing(os.path.abspath(path))
+        return list(listing.entries) if listing is not None else []
+
+    def walk(
+        self, root: Path, skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS
+    ) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Like ``os.walk`` (top-down, sorted) but served from the listing cache.
+
+        Yields ``(rel_dir, dir_names, file_names)`` with ``rel_dir`` in POSIX form ("" for the root).
+        """
+        root = os.path.abspath(root)
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            listing = self._listing(os.path.join(root, rel) if rel else root)
+            if listing is None:
+                continue
+            dirs = sorted(e.name for e in listing.entries if e.is_dir and e.name not in skip_dirs)
+            files = sorted(e.name for e in listing.entries if not e.is_dir)
+            yield rel, dirs, files
+            stack.extend(f"{rel}/{d}" if rel else d for d in reversed(dirs))
+
+    # ------------------------------------------------------------------
+    # Trees
+    # ------------------------------------------------------------------
+
+    def tree(
+        self,
+        root: Path,
+        rel_path: str = "",
+        depth: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS,
+        skip_hidden: bool = True,
+    ) -> Dict[str, Any]:
+        """Nested tree of *rel_path* under *root*.
+
+        *depth* limits how many directory levels are expanded (``None`` = all);
+        unexpanded directories carry ``"has_children"`` so a UI can load them
+        lazily.  *offset*/*limit* paginate the top-level items.
+
+        Returns ``{"files": [...], "total": <top-level item count>}``.
+        """
+        root = os.path.abspath(root)
+        key = (root, rel_path, depth, skip_dirs, skip_hidden)
+        with self._lock:
+            cached = self._trees.get(key)
+        if cached is not None:
+            dependencies, result = cached
+            if all(self._listing(path) is listing for path, listing in dependencies):
+                with self._lock:
+                    if key in self._trees:
+                        self._trees.move_to_end(key)
+                return self._paginate(result, offset, limit)
+
+        dependencies: List[Tuple[str, _Listing]] = []
+
+        def _visible(rel: str) -> List[DirEntry]:
+            path = os.path.join(root, rel) if rel else root
+            listing = self._listing(path)
+            if listing is None:
+                return []
+            dependencies.append((path, listing))
+            return [
+                e for e in listing.entries if not (skip_hidden and e.name.startswith(".")) and e.name not in skip_dirs
+            ]
+
+        def _build(rel: str, remaining: Optional[int]) -> List[Dict[str, Any]]:
+            items = []
+            for entry in _visible(rel):
+                child_rel = f"{rel}/{entry.name}" if rel else entry.name
+                if entry.is_dir:
+                    item: Dict[str, Any] = {"name": entry.name, "path": child_rel, "type": "directory"}
+                    if remaining is None or remaining > 1:
+                        item["children"] = _build(child_rel, None if remaining is None else remaining - 1)
+                    else:
+                        item["has_children"] = bool(_visible(child_rel))
+                    items.append(item)
+                else:
+                    items.append({"name": entry.name, "path": child_rel, "type": "file"})
+            return items
+
+        files = _build(rel_path.strip("/"), depth)
+        result = {"files": files, "total": len(files)}
+        with self._lock:
+            self._trees[key] = (dependencies, result)
+            self._trees.move_to_end(key)
+            while len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+        return self._paginate(result, offset, limit)
+
+    @staticmethod
+    def _paginate(result: Dict[str, Any], offset: int, limit: Optional[int]) -> Dict[str, Any]:
+        files = result["files"]
+        if offset or limit is not None:
+            files = files[offset : None if limit is None else offset + limit]
+        return {"files": files, "total": result["total"]}
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Forget cached listings (all, or *path* and everything below it)."""
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+                self._trees.clear()
+                return
+            prefix = os.path.abspath(path)
+            for p in [p for p in self._listings if p == prefix or p.startswith(prefix + os.sep)]:
+                del self._listings[p]
+
+
+_service: Optional[DirectorySnapshotService] = None
+_service_lock = threading.Lock()
+
+
+def get_directory_snapshot_service() -> DirectorySnapshotService:
+    """Process-wide shared instance."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = DirectorySnapshotService()
+        return _service
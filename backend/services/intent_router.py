@@ -0,0 +1,349 @@
+"""
+Local fast-path routing for chat turns.
+
+``DefaultAgent.chat`` used to spend two orchestration-model round trips before
+doing any work: one to pick an intent label and one to pick the tools for the
+turn.  ``IntentRouter`` answers both questions locally:
+
+* **Intent** — a keyword classifier over the instruction (plus a few
+  structural hints such as IP addresses, file extensions or CVE ids).
+* **Tools** — IDF-weighted lexical overlap between the instruction and each
+  tool's name/description, blended with cosine similarity of embeddings of
+  the tool summaries once those have been computed in the background.
+
+Every decision carries a confidence; callers fall back to the LLM only below
+``min_confidence`` and feed the LLM's answer back via ``remember_*`` so the
+same (normalized) instruction never costs a model call twice.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[str], Awaitable[List[float]]]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_WS_RE = re.compile(r"\s+")
+
+
+def _stem(word: str) -> str:
+    """Crude plural folding so "processes"/"process" and "ports"/"port" match."""
+    if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+        if word.endswith("ies"):
+            return word[:-3] + "y"
+        return word[:-2] if word.endswith("ses") else word[:-1]
+    return word
+
+
+def _keywords(text: str) -> FrozenSet[str]:
+    return frozenset(_stem(w) for w in text.split())
+
+
+INTENT_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    "code": _keywords(
+        "code function class method bug debug refactor compile syntax python javascript typescript java "
+        "rust golang script test pytest unittest lint import module variable exception traceback "
+        "stacktrace implement repo git commit branch api endpoint json html css sql regex library"
+    ),
+    "network": _keywords(
+        "network ping traceroute dns ip ipv4 ipv6 latency port host hostname router subnet gateway "
+        "bandwidth http https tcp udp connectivity packet nslookup dig whois interface wifi vpn proxy url "
+        "domain"
+    ),
+    "system": _keywords(
+        "system process cpu ram memory disk kernel os service daemon uptime "
+        "hardware gpu driver logs syslog systemd install package storage partition mount "
+        "battery temperature users"
+    ),
+    "cybersecurity": _keywords(
+        "security vulnerability exploit cve malware virus encrypt encryption decrypt "
+        "password credential firewall audit pentest threat attack secure hash "
+        "certificate ssl tls permissions intrusion phishing scan nmap hardening"
+    ),
+}
+
+# Structural hints that are stronger than a single keyword
+_INTENT_PATTERNS: Dict[str, Tuple[re.Pattern, ...]] = {
+    "network": (
+        re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b"),
+        re.compile(r"\b[a-z0-9-]+\.(?:com|org|net|io|dev|es|edu|gov)\b"),
+    ),
+    "code": (re.compile(r"\b[\w/-]+\.(?:py|js|ts|tsx|jsx|java|go|rs|cpp|c|h|rb|php|cs)\b"), re.compile(r"`[^`]+`")),
+    "cybersecurity": (re.compile(r"\bcve-\d{4}-\d+\b"),),
+}
+
+_SMALL_TALK = _keywords("hi hello hey hola thanks thank gracias bye ok okay yes no who you")
+
+_STOPWORDS = frozenset(
+    (
+        "a an the and or of to in on for with is are be it this that my me i please can could would you "
+        "what how do does all from at by as if into about use using get show tell give make"
+    ).split()
+)
+
+MANDATORY_TOOLS = (
+    "plan_actions",
+    "select_agent_type",
+    "run_shell_command",
+    "run_command",
+    "analyze_project",
+    "traceroute_host",
+)
+
+
+def normalize_instruction(text: str) -> str:
+    """Memoization key: lowercase, collapsed whitespace, no trailing punctuation."""
+    return _WS_RE.sub(" ", text.lower()).strip().rstrip(".!?¿¡ ")
+
+
+def _tokens(text: str) -> List[str]:
+    return [_stem(word) for word in _WORD_RE.findall(text.lower()) if word not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    intent: str
+    confidence: float
+    source: str  # "keywords", "cache" or "llm"
+
+
+class IntentRouter:
+    """Keyword/embedding router with per-instruction memoization.
+
+    Args:
+        min_confidence: Decisions below this confidence should fall back to the LLM.
+        max_tools: Tool sets at or below this size are passed through unfiltered.
+        cache_size: Maximum memoized instructions per cache.
+    """
+
+    def __init__(self, min_confidence: float = 0.6, max_tools: int = 12, cache_size: int = 512):
+        self.min_confidence = min_confidence
+        self.max_tools = max_tools
+        self.cache_size = cache_size
+        self._intent_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._tool_cache: "OrderedDict[Tuple[str, FrozenSet[str]], List[str]]" = OrderedDict()
+        self._query_vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._tool_vectors: Dict[Tuple[str, str], List[float]] = {}
+        self._warming = False
+        self._warmup_tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.stats = {"intent_local": 0, "intent_cached": 0, "intent_llm": 0, "tools_local": 0, "tools_llm": 0}
+
+    # ------------------------------------------------------------------
+    # Memoization helpers
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, cache: OrderedDict, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key, value) -> None:
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Intent
+    # ------------------------------------------------------------------
+
+    def classify(self, instruction: str) -> RouteDecision:
+        """Classify *instruction* locally; check ``confidence`` before trusting it."""
+        key = normalize_instruction(instruction)
+        cached = self._cache_get(self._intent_cache, key)
+        if cached is not None:
+            self.stats["intent_cached"] += 1
+            return RouteDecision(cached, 1.0, "cache")
+
+        words = set(_tokens(key))
+        scores = {intent: float(len(words & keywords)) for intent, keywords in INTENT_KEYWORDS.items()}
+        for intent, patterns in _INTENT_PATTERNS.items():
+            scores[intent] += sum(1.0 for p in patterns if p.search(key))
+
+        best = max(scores, key=scores.get)
+        best_score = scores[best]
+        if best_score == 0:
+            # Short chit-chat needs no specialist
+            small_talk = len(words) <= 6 and words <= _SMALL_TALK
+            decision = RouteDecision("orchestrator", 0.9 if small_talk else 0.0, "keywords")
+        else:
+            share = best_score / sum(scores.values())
+            decision = RouteDecision(best, round(share * (1.0 - 0.5**best_score), 3), "keywords")
+        if decision.confidence >= self.min_confidence:
+            self.stats["intent_local"] += 1
+        return decision
+
+    def remember_intent(self, instruction: str, intent: str) -> None:
+        """Memoize an intent decided elsewhere (e.g. by the LLM fallback)."""
+        self.stats["intent_llm"] += 1
+        self._cache_put(self._intent_cache, normalize_instruction(instruction), intent)
+
+    # ------------------------------------------------------------------
+    # Tool selection
+    # ------------------------------------------------------------------
+
+    def select_tools(self, instruction: str, summaries: Sequence[Dict]) -> Optional[List[str]]:
+        """Pick the tools relevant to *instruction* from *summaries*.
+
+        Returns ``None`` when the instruction gives no usable signal, in which
+        case the caller should fall back to the LLM.  Mandatory tools are not
+        added here.
+        """
+        names = [s["name"] for s in summaries]
+        if len(names) <= self.max_tools:
+            return names
+
+        key = (normalize_instruction(instruction), frozenset(names))
+        cached = self._cache_get(self._tool_cache, key)
+        if cached is not None:
+            return list(cached)
+
+        scores = self._score_tools(key[0], summaries)
+        if scores is None:
+            return None
+
+        top = max(scores.values())
+        ranked = sorted(names, key=lambda n: -scores[n])
+        selected = [n for n in ranked if scores[n] >= 0.35 * top][: self.max_tools]
+        self.stats["tools_local"] += 1
+        self._cache_put(self._tool_cache, key, selected)
+        return list(selected)
+
+    def remember_tools(self, instruction: str, summaries: Sequence[Dict], selected: List[str]) -> None:
+        """Memoize a tool selection decided elsewhere (e.g. by the LLM fallback)."""
+        self.stats["tools_llm"] += 1
+        key = (normalize_instruction(instruction), frozenset(s["name"] for s in summaries))
+        self._cache_put(self._tool_cache, key, list(selected))
+
+    def _score_tools(self, query: str, summaries: Sequence[Dict]) -> Optional[Dict[str, float]]:
+        query_words = set(_tokens(query))
+        docs = {}
+        for s in summaries:
+            name_words = _tokens(s["name"].replace("_", " "))
+            docs[s["name"]] = (set(name_words), set(_tokens(s.get("description", ""))))
+
+        doc_freq: Dict[str, int] = {}
+        for name_words, desc_words in docs.values():
+            for word in name_words | desc_words:
+                doc_freq[word] = doc_freq.get(word, 0) + 1
+        n_docs = len(docs)
+
+        lexical = {}
+        for name, (name_words, desc_words) in docs.items():
+            score = 0.0
+            for word in query_words:
+                if word in name_words or word in desc_words:
+                    idf = math.log(1 + n_docs / doc_freq[word])
+                    score += idf * (2.0 if word in name_words else 1.0)
+            lexical[name] = score
+
+        semantic = self._semantic_scores(query, summaries)
+        lex_top = max(lexical.values())
+        if lex_top == 0 and semantic is None:
+            return None
+
+        scores = {}
+        for name, lex in lexical.items():
+            lex_norm = lex / lex_top if lex_top else 0.0
+            scores[name] = lex_norm if semantic is None else 0.5 * lex_norm + 0.5 * semantic[name]
+        return scores
+
+    def _semantic_scores(self, query: str, summaries: Sequence[Dict]) -> Optional[Dict[str, float]]:
+        """Centered cosine similarity scaled to [0, 1], or ``None`` if embeddings are not ready."""
+        with self._lock:
+            query_vec = self._query_vectors.get(query)
+            vectors = {s["name"]: self._tool_vectors.get(_summary_key(s)) for s in summaries}
+        if query_vec is None or any(v is None for v in vectors.values()):
+            return None
+        sims = {name: _cosine(query_vec, vec) for name, vec in vectors.items()}
+        mean = sum(sims.values()) / len(sims)
+        spread = max(sims.values()) - mean
+        if spread <= 1e-6:
+            return None
+        return {name: max(0.0, (sim - mean) / spread) for name, sim in sims.items()}
+
+    # ------------------------------------------------------------------
+    # Embeddings
+    # ------------------------------------------------------------------
+
+    def embeddings_ready(self, summaries: Sequence[Dict]) -> bool:
+        with self._lock:
+            return all(_summary_key(s) in self._tool_vectors for s in summaries)
+
+    async def prepare(self, instruction: str, summaries: Sequence[Dict], embed: EmbedFn) -> None:
+        """Precompute what ``select_tools`` can use for *instruction*.
+
+        Tool-summary embeddings are computed once, in a background task, so a
+        cold start never waits for them; once they exist the instruction is
+        embedded here (a single embedding call, memoized per instruction).
+        """
+        if not self.embeddings_ready(summaries):
+            self._schedule_warmup(summaries, embed)
+            return
+        key = normalize_instruction(instruction)
+        if self._cache_get(self._query_vectors, key) is None:
+            self._cache_put(self._query_vectors, key, await embed(key))
+
+    def _schedule_warmup(self, summaries: Sequence[Dict], embed: EmbedFn) -> None:
+        with self._lock:
+            if self._warming:
+                return
+            self._warming = True
+            missing = [s for s in summaries if _summary_key(s) not in self._tool_vectors]
+
+        async def _warm() -> None:
+            semaphore = asyncio.Semaphore(4)
+
+            async def _one(summary: Dict) -> None:
+                async with semaphore:
+                    vector = await embed(f"{summary['name'].replace('_', ' ')}: {summary.get('description', '')}")
+                with self._lock:
+                    self._tool_vectors[_summary_key(summary)] = vector
+
+            try:
+                await asyncio.gather(*(_one(s) for s in missing))
+                logger.debug(f"IntentRouter: embedded {len(missing)} tool summaries")
+            except Exception as e:
+                logger.debug(f"IntentRouter: tool summary embedding failed: {e}")
+            finally:
+                with self._lock:
+                    self._warming = False
+
+        task = asyncio.ensure_future(_warm())
+        self._warmup_tasks.add(task)  # the loop only keeps a weak reference
+        task.add_done_callback(self._warmup_tasks.discard)
+
+
+def _summary_key(summary: Dict) -> Tuple[str, str]:
+    return summary["name"], summary.get("description", "")
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a))
+    nb = math.sqrt(sum(y * y for y in b))
+    return dot / (na * nb) if na and nb else 0.0
+
+
+_router: Optional[IntentRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_intent_router() -> IntentRouter:
+    """Process-wide shared instance (memoized decisions are shared across sessions)."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = IntentRouter()
+        return _router
@@ -7,7 +7,7 @@ Handles automatic translation of inputs and ensuring outputs remain in English.
 
 import logging
 import re
-from typing import Any, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from backend.utils.core.llm.prompt_loader import PromptLoader
 
@@ -26,6 +26,8 @@ class LanguageManager:
 
     def __init__(self, llm_provider: Any) -> None:
         self.llm_provider = llm_provider
+        # System prompts rarely change between turns; translate each one once
+        self._standardized_prompts: Dict[str, str] = {}
 
     async def ensure_english_input(self, text: str) -> Tuple[str, str]:
         """
@@ -53,7 +55,7 @@ class LanguageManager:
 
             system = prompts.get("translation_standardization", {}).get("system", "")
             user_template = prompts.get("translation_standardization", {}).get("user", "")
-            user = user_template.format(text=text)
+            user = PromptLoader.format_prompt(user_template, text=text)
 
             # Use a faster model for translation if available, otherwise default
             client = self.llm_provider.get_client("orchestration")
@@ -114,6 +116,10 @@ class LanguageManager:
         if not is_likely_not_en:
             return system_prompt
 
+        cached = self._standardized_prompts.get(system_prompt)
+        if cached is not None:
+            return cached
+
         logger.warning("Spanish or non-English system prompt detected! Automatically translating to English...")
 
         prompt = [
@@ -127,7 +133,9 @@ class LanguageManager:
         try:
             client = self.llm_provider.get_client("orchestration")
             response, _ = await client.achat(prompt, tools=[])
-            return response.get("message", {}).get("content", system_prompt).strip()
+            translated = response.get("message", {}).get("content", system_prompt).strip()
+            self._standardized_prompts[system_prompt] = translated
+            return translated
         except Exception as e:
             logger.error(f"System prompt translation failed: {e}")
             return system_prompt
@@ -8,6 +8,7 @@ from backend.core.config_schemas import LLMModelsConfig, ToolSettingsConfig
 from backend.interfaces.imodel_provider import IModelProvider
 from backend.utils.core.system.agent_logger import AgentLogger
 from backend.utils.core.llm.llm_recorder import LLMRecorder
+from backend.utils.core.llm.model_scheduler import get_model_scheduler
 from backend.utils.core.llm.ollama_client import OllamaClient
 from backend.utils.core.llm.token_tracker import TokenTracker
 from backend.utils.core.system.execution_bridge import bridge
@@ -33,6 +34,8 @@ class LLMClientManager(IModelProvider):
         self.recorder = recorder
         self.token_tracker = token_tracker
         self.clients_by_model: Dict[str, OllamaClient] = {}
+        # One scheduler per Ollama host, shared across managers, so role switches are batched by model (opt-in)
+        self.model_scheduler = get_model_scheduler(str(config.ollama_url))
         # Use sync info to avoid async publish in constructor
         self.logger.info_sync("LLMClientManager initialized.")
 
@@ -79,6 +82,7 @@ class LLMClientManager(IModelProvider):
             config=self.tool_settings.model_dump(),  # Pass tool settings
             llm_recorder=self.recorder,
             token_tracker=self.token_tracker,
+            model_scheduler=self.model_scheduler,
         )
         if self.config.embedding:
             new_client.set_embedding_model(self.config.embedding)
@@ -152,6 +156,7 @@ class LLMClientManager(IModelProvider):
             config=self.tool_settings.model_dump(),
             llm_recorder=self.recorder,
             token_tracker=self.token_tracker,
+            model_scheduler=self.model_scheduler,
         )
         self.clients_by_model[vision_model] = new_client
         return new_client
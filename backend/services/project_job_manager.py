@@ -0,0 +1,351 @@
+"""Project-generation job manager.
+
+``POST /api/projects/create`` submits a :class:`ProjectJob` instead of starting
+a thread per request.  A fixed pool of worker threads pulls jobs from a
+priority queue (higher ``priority`` first, FIFO within a priority) and only
+starts a job when its model has a free slot, so concurrent submissions queue
+up instead of loading several pipelines onto the same Ollama host.
+
+Each job gets its own :class:`ProjectEventPublisher` and
+:class:`ChatEventBridge`, so ``/api/projects/stream/{project_name}`` shows a
+single project's events.  Events are still forwarded (tagged with
+``project_name``) to the application-wide publisher for global listeners.
+
+Cancellation removes a queued job immediately; a running job has its
+``cancel_event`` set, which the pipeline checks before every LLM call.
+"""
+
+import bisect
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.services.chat_event_bridge import ChatEventBridge
+from backend.utils.core.exceptions import PipelineCancelledError, ResourceExhaustionError
+from backend.utils.core.system.event_publisher import EventPublisher
+
+_log = logging.getLogger("ollash")
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+_ACTIVE_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class ProjectEventPublisher(EventPublisher):
+    """EventPublisher scoped to one project that also forwards to a parent publisher."""
+
+    def __init__(self, project_name: str, parent: Optional[EventPublisher] = None):
+        super().__init__()
+        self.project_name = project_name
+        self.parent = parent
+
+    async def publish(self, event_type: str, event_data: Dict[str, Any] = None, **kwargs: Any):
+        data = dict(event_data) if event_data else {}
+        data.update(kwargs)
+        await super().publish(event_type, data)
+        if self.parent is not None:
+            await self.parent.publish(event_type, {**data, "project_name": self.project_name})
+
+
+@dataclass
+class ProjectJob:
+    """One queued or running project-generation request."""
+
+    project_name: str
+    params: Dict[str, Any]
+    model: str
+    priority: int = 0
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    event_publisher: Optional[ProjectEventPublisher] = field(default=None, repr=False)
+    bridge: Optional[ChatEventBridge] = field(default=None, repr=False)
+    _seq: int = field(default=0, repr=False)
+
+    @property
+    def sort_key(self):
+        return (-self.priority, self._seq)
+
+
+class ProjectJobManager:
+    """Bounded worker pool + priority queue for AutoAgent runs.
+
+    Args:
+        runner: Called in a worker thread with the job; runs the pipeline using
+            ``job.event_publisher`` and ``job.cancel_event``.
+        event_publisher: Application-wide publisher that job events are forwarded to.
+        max_workers: Pipelines that may run at the same time.
+        per_model_limit: Pipelines that may run at the same time on one model.
+        max_queue: Queued jobs accepted before submissions are rejected.
+        default_duration_seconds: Run time assumed for ETAs until a model has history.
+    """
+
+    MAX_FINISHED_JOBS = 100
+
+    def __init__(
+        self,
+        runner: Callable[[ProjectJob], Any],
+        event_publisher: Optional[EventPublisher] = None,
+        max_workers: int = 2,
+        per_model_limit: int = 1,
+        max_queue: int = 20,
+        default_duration_seconds: float = 900.0,
+    ):
+        self.runner = runner
+        self.event_publisher = event_publisher
+        self.max_workers = max(1, max_workers)
+        self.per_model_limit = max(1, per_model_limit)
+        self.max_queue = max_queue
+        self.default_duration_seconds = default_duration_seconds
+
+        self._cond = threading.Condition()
+        self._queue: List[ProjectJob] = []  # sorted by ProjectJob.sort_key
+        self._running: Dict[str, ProjectJob] = {}
+        self._running_per_model: Dict[str, int] = {}
+        self._jobs: Dict[str, ProjectJob] = {}  # latest job per project name
+        self._avg_duration: Dict[str, float] = {}
+        self._seq = itertools.count(1)
+        self._workers: List[threading.Thread] = []
+        self._stopping = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, project_name: str, params: Dict[str, Any], model: str, priority: int = 0) -> ProjectJob:
+        """Queue a pipeline run.
+
+        Raises:
+            ValueError: A job for *project_name* is already queued or running.
+            ResourceExhaustionError: The queue is full.
+        """
+        with self._cond:
+            existing = self._jobs.get(project_name)
+            if existing is not None and existing.status in _ACTIVE_STATUSES:
+                raise ValueError(f"Project '{project_name}' is already {existing.status.value}.")
+            if len(self._queue) >= self.max_queue:
+                raise ResourceExhaustionError(
+                    "project_job_queue", f"{len(self._queue)} projects are already waiting; try again later"
+                )
+
+            job = ProjectJob(project_name=project_name, params=params, model=model, priority=priority)
+            job._seq = next(self._seq)
+            job.event_publisher = ProjectEventPublisher(project_name, self.event_publisher)
+            job.bridge = ChatEventBridge(job.event_publisher)
+            bisect.insort(self._queue, job, key=lambda j: j.sort_key)
+            self._jobs[project_name] = job
+            self._trim_finished_locked()
+            self._ensure_workers_locked()
+            self._cond.notify()
+            self._publish_queue_positions_locked()
+        return job
+
+    def cancel(self, project_name: str) -> bool:
+        """Cancel a queued job, or ask a running one to stop after its current LLM call."""
+        with self._cond:
+            job = self._jobs.get(project_name)
+            if job is None or job.status not in _ACTIVE_STATUSES:
+                return False
+            job.cancel_event.set()
+            if job.status == JobStatus.QUEUED:
+                self._queue.remove(job)
+                self._finish_locked(job, JobStatus.CANCELLED)
+                self._publish_queue_positions_locked()
+            else:
+                job.bridge.push_event("job_status", self._job_dict_locked(job, cancelling=True))
+        return True
+
+    def get_job(self, project_name: str) -> Optional[ProjectJob]:
+        return self._jobs.get(project_name)
+
+    def get_bridge(self, project_name: str) -> Optional[ChatEventBridge]:
+        job = self._jobs.get(project_name)
+        return job.bridge if job is not None else None
+
+    def job_info(self, project_name: str) -> Optional[Dict[str, Any]]:
+        with self._cond:
+            job = self._jobs.get(project_name)
+            return self._job_dict_locked(job) if job is not None else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Running jobs, then queued jobs in start order, then finished jobs (newest first)."""
+        with self._cond:
+            finished = sorted(
+                (j for j in self._jobs.values() if j.status not in _ACTIVE_STATUSES),
+                key=lambda j: j.finished_at or 0,
+                reverse=True,
+            )
+            ordered = list(self._running.values()) + list(self._queue) + finished
+            return [self._job_dict_locked(j) for j in ordered]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "running": len(self._running),
+                "running_per_model": dict(self._running_per_model),
+                "max_workers": self.max_workers,
+                "per_model_limit": self.per_model_limit,
+                "max_queue": self.max_queue,
+            }
+
+    def shutdown(self, cancel_running: bool = True, timeout: float = 5.0) -> None:
+        """Stop the workers. Queued jobs are cancelled; running ones optionally too."""
+        with self._cond:
+            self._stopping = True
+            for job in list(self._queue):
+                job.cancel_event.set()
+                self._finish_locked(job, JobStatus.CANCELLED)
+            self._queue.clear()
+            if cancel_running:
+                for job in self._running.values():
+                    job.cancel_event.set()
+            self._cond.notify_all()
+            workers = list(self._workers)
+        for worker in workers:
+            worker.join(timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _ensure_workers_locked(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop, daemon=True, name=f"ProjectJobWorker-{len(self._workers)}"
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_runnable_locked(self) -> Optional[ProjectJob]:
+        for job in self._queue:
+            if self._running_per_model.get(job.model, 0) < self.per_model_limit:
+                return job
+        return None
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while not self._stopping:
+                    job = self._next_runnable_locked()
+                    if job is not None:
+                        break
+                    self._cond.wait()
+                if job is None:
+                    return
+                self._queue.remove(job)
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                self._running[job.job_id] = job
+                self._running_per_model[job.model] = self._running_per_model.get(job.model, 0) + 1
+                job.bridge.push_event("job_status", self._job_dict_locked(job))
+                self._publish_queue_positions_locked()
+
+            status, error = JobStatus.COMPLETED, None
+            try:
+                self.runner(job)
+            except PipelineCancelledError:
+                status = JobStatus.CANCELLED
+            except Exception as exc:
+                _log.error(f"Project job '{job.project_name}' failed: {exc}", exc_info=True)
+                status, error = JobStatus.FAILED, str(exc)
+            if status == JobStatus.COMPLETED and job.cancel_event.is_set():
+                status = JobStatus.CANCELLED
+
+            with self._cond:
+                self._running.pop(job.job_id, None)
+                self._running_per_model[job.model] -= 1
+                if not self._running_per_model[job.model]:
+                    del self._running_per_model[job.model]
+                if status == JobStatus.COMPLETED:
+                    self._record_duration_locked(job.model, time.time() - job.started_at)
+                job.error = error
+                self._finish_locked(job, status)
+                self._cond.notify_all()
+                self._publish_queue_positions_locked()
+
+    def _finish_locked(self, job: ProjectJob, status: JobStatus) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        bridge = job.bridge
+        if status == JobStatus.COMPLETED:
+            bridge.push_event("stream_end", {"message": f"Project '{job.project_name}' generated."})
+        elif status == JobStatus.FAILED:
+            bridge.push_event("error", {"message": job.error or "Project generation failed."})
+        else:
+            bridge.push_event("job_status", self._job_dict_locked(job))
+        bridge.close()
+
+    def _trim_finished_locked(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status not in _ACTIVE_STATUSES]
+        excess = len(finished) - self.MAX_FINISHED_JOBS
+        if excess > 0:
+            for job in heapq.nsmallest(excess, finished, key=lambda j: j.finished_at or 0):
+                del self._jobs[job.project_name]
+
+    # ------------------------------------------------------------------
+    # Queue position and ETA
+    # ------------------------------------------------------------------
+
+    def _record_duration_locked(self, model: str, seconds: float) -> None:
+        previous = self._avg_duration.get(model)
+        self._avg_duration[model] = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+
+    def _eta_locked(self, job: ProjectJob) -> float:
+        """Seconds until queued *job* is expected to start, simulating its model's slots."""
+        avg = self._avg_duration.get(job.model, self.default_duration_seconds)
+        now = time.time()
+        slots = [max(0.0, avg - (now - j.started_at)) for j in self._running.values() if j.model == job.model]
+        capacity = min(self.per_model_limit, self.max_workers)
+        slots += [0.0] * max(0, capacity - len(slots))
+        heapq.heapify(slots)
+        for ahead in self._queue:
+            if ahead is job:
+                break
+            if ahead.model == job.model:
+                heapq.heapreplace(slots, slots[0] + avg)
+        return round(slots[0], 1)
+
+    def _job_dict_locked(self, job: ProjectJob, cancelling: bool = False) -> Dict[str, Any]:
+        info: Dict[str, Any] = {
+            "job_id": job.job_id,
+            "project_name": job.project_name,
+            "status": job.status.value,
+            "model": job.model,
+            "priority": job.priority,
+            "submitted_at": job.submitted_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "error": job.error,
+        }
+        if job.status == JobStatus.QUEUED:
+            info["queue_position"] = self._queue.index(job) + 1
+            info["eta_seconds"] = self._eta_locked(job)
+        elif job.status == JobStatus.RUNNING:
+            avg = self._avg_duration.get(job.model, self.default_duration_seconds)
+            info["eta_seconds"] = round(max(0.0, avg - (time.time() - job.started_at)), 1)
+        if cancelling:
+            info["cancelling"] = True
+        return info
+
+    def _publish_queue_positions_locked(self) -> None:
+        for job in self._queue:
+            job.bridge.push_event("job_status", self._job_dict_locked(job))
@@ -3,14 +3,33 @@ Real-Time Vulnerability Scanner
 
 AST-based and pattern-matching scanner that detects insecure code patterns
 during the CodeQuarantine phase and blocks generation on critical findings.
+
+Rules are compiled once per scanner into a ``_RuleEngine`` that prefilters each
+file by the literals every pattern requires, so a clean file costs one lowercase
+pass and a few substring searches.  ``scan_project`` caches results by content
+hash and fans large projects out over worker processes.
 """
 
+import hashlib
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.utils.core.system.agent_logger import AgentLogger
 
+try:
+    import re._constants as _sre
+    import re._parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
 
 @dataclass
 class Vulnerability:
@@ -295,62 +314,200 @@ LANGUAGE_MAP = {
 }
 
 
+# Non-ASCII characters that IGNORECASE matches against ASCII letters
+_ASCII_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+_MIN_LITERAL = 3
+_REPEATS = tuple(
+    op for op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT, getattr(_sre, "POSSESSIVE_REPEAT", None)) if op is not None
+)
+
+
+def _fold(text: str) -> str:
+    return text.lower() if text.isascii() else text.translate(_ASCII_FOLD).lower()
+
+
+def _required_literals(items) -> Optional[Tuple[str, ...]]:
+    """Lowercase ASCII literals of which every match must contain at least one, or None if unknown."""
+    best: Optional[Tuple[str, ...]] = None
+    run: List[str] = []
+
+    def consider(candidate: Optional[Tuple[str, ...]]) -> None:
+        nonlocal best
+        if candidate and min(map(len, candidate)) >= max(_MIN_LITERAL, min(map(len, best)) + 1 if best else 0):
+            best = candidate
+
+    for op, av in list(items) + [(None, None)]:
+        if op is _sre.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        consider(("".join(run),) if run else None)
+        run = []
+        if op is _sre.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op in _REPEATS and av[0] >= 1:
+            consider(_required_literals(av[2]))
+        elif op is _sre.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                literals = {literal for branch in branches for literal in branch}
+                consider(tuple(sorted(x for x in literals if not any(y != x and y in x for y in literals))))
+    return best
+
+
+def _literals_for(pattern: re.Pattern) -> Optional[Tuple[str, ...]]:
+    try:
+        return _required_literals(_sre_parse.parse(pattern.pattern, pattern.flags))
+    except Exception:  # private parser API; without literals the pattern simply always runs
+        return None
+
+
+class _RuleEngine:
+    """Precompiled rule set with a literal prefilter.
+
+    Every pattern is reduced to the literals any match must contain.  A file is
+    lowercased once and tested for those literals with substring search; only
+    patterns whose literals occur are run line by line, so findings and their
+    order are identical to checking every rule x pattern x line.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        # (compiled, required literals or None, rule) in rule-major order
+        self._compiled: List[Tuple[re.Pattern, Optional[Tuple[str, ...]], Dict[str, Any]]] = []
+        for rule in rules:
+            for pattern_str in rule.get("patterns", []):
+                try:
+                    pattern = re.compile(pattern_str, re.IGNORECASE)
+                except re.error:
+                    continue
+                self._compiled.append((pattern, _literals_for(pattern), rule))
+        self._by_language: Dict[str, list] = {}
+
+    def _entries(self, language: str) -> list:
+        entries = self._by_language.get(language)
+        if entries is None:
+            entries = [e for e in self._compiled if not language or language in e[2].get("languages", [])]
+            self._by_language[language] = entries
+        return entries
+
+    def scan(self, content: str, language: str) -> List[Vulnerability]:
+        folded = _fold(content)
+        candidates = [
+            (pattern, rule)
+            for pattern, literals, rule in self._entries(language)
+            if literals is None or any(literal in folded for literal in literals)
+        ]
+        if not candidates:
+            return []
+        lines = content.split("\n")
+        return [
+            Vulnerability(
+                severity=rule["severity"],
+                rule_id=rule["rule_id"],
+                description=rule["name"],
+                line_number=line_num,
+                code_snippet=line.strip()[:200],
+                cwe_id=rule.get("cwe_id"),
+                fix_suggestion=rule.get("fix", ""),
+            )
+            for pattern, rule in candidates
+            for line_num, line in enumerate(lines, 1)
+            if pattern.search(line)
+        ]
+
+
+# Worker-process state for parallel project scans
+_worker_engine: Optional[_RuleEngine] = None
+
+
+def _init_worker(rules: List[Dict[str, Any]]) -> None:
+    global _worker_engine
+    _worker_engine = _RuleEngine(rules)
+
+
+def _scan_serial(engine: _RuleEngine, pending: List[Tuple[str, str, str]]) -> List[Tuple[List[Vulnerability], float]]:
+    results = []
+    for _, content, language in pending:
+        start = time.perf_counter()
+        vulnerabilities = engine.scan(content, language)
+        results.append((vulnerabilities, (time.perf_counter() - start) * 1000))
+    return results
+
+
+def _scan_chunk(chunk: List[Tuple[str, str, str]]) -> List[Tuple[List[Vulnerability], float]]:
+    return _scan_serial(_worker_engine, chunk)
+
+
+def _language_for(file_path: str) -> str:
+    return LANGUAGE_MAP.get(Path(file_path).suffix.lower(), "")
+
+
 class VulnerabilityScanner:
     """Scans generated code for security vulnerabilities using pattern matching.
 
     Integrates with the CodeQuarantine phase to block files with critical
     vulnerabilities from being included in the generated project.
+
+    Args:
+        logger: Agent logger.
+        custom_rules: Extra rules appended to ``SECURITY_RULES``.
+        max_workers: Processes used by ``scan_project`` (default: CPU count, max 8).
+        parallel_threshold: Uncached files needed before ``scan_project`` uses processes.
+        cache_size: Content-hash result cache entries.
     """
 
-    def __init__(self, logger: AgentLogger, custom_rules: Optional[List[Dict]] = None):
+    def __init__(
+        self,
+        logger: AgentLogger,
+        custom_rules: Optional[List[Dict]] = None,
+        max_workers: Optional[int] = None,
+        parallel_threshold: int = 256,
+        cache_size: int = 20000,
+    ):
         self.logger = logger
         self.rules = SECURITY_RULES + (custom_rules or [])
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 8)
+        self.parallel_threshold = parallel_threshold
+        self.cache_size = cache_size
+        self._engine = _RuleEngine(self.rules)
+        self._cache: "OrderedDict[str, List[Vulnerability]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+
+    def _cache_key(self, content: str, language: str) -> str:
+        return hashlib.sha1(f"{language}\x00{content}".encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[List[Vulnerability]]:
+        with self._cache_lock:
+            found = self._cache.get(key)
+            if found is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            return found
+
+    def _cache_put(self, key: str, vulnerabilities: List[Vulnerability]) -> None:
+        with self._cache_lock:
+            self._cache[key] = vulnerabilities
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     def scan_file(self, file_path: str, content: str, language: str = "") -> ScanResult:
         """Scan a single file for vulnerabilities."""
-        import time
-
-        start = time.time()
+        start = time.perf_counter()
 
         if not language:
-            from pathlib import Path
+            language = _language_for(file_path)
 
-            ext = Path(file_path).suffix.lower()
-            language = LANGUAGE_MAP.get(ext, "")
-
-        vulnerabilities = []
-        lines = content.split("\n")
-
-        for rule in self.rules:
-            if language and language not in rule.get("languages", []):
-                continue
-
-            for pattern_str in rule.get("patterns", []):
-                try:
-                    pattern = re.compile(pattern_str, re.IGNORECASE)
-                    for line_num, line in enumerate(lines, 1):
-                        if pattern.search(line):
-                            vulnerabilities.append(
-                                Vulnerability(
-                                    severity=rule["severity"],
-                                    rule_id=rule["rule_id"],
-                                    description=rule["name"],
-                                    line_number=line_num,
-                                    code_snippet=line.strip()[:200],
-                                    cwe_id=rule.get("cwe_id"),
-                                    fix_suggestion=rule.get("fix", ""),
-                                )
-                            )
-                except re.error:
-                    continue
-
-        elapsed = (time.time() - start) * 1000
+        key = self._cache_key(content, language)
+        vulnerabilities = self._cache_get(key)
+        if vulnerabilities is None:
+            vulnerabilities = self._engine.scan(content, language)
+            self._cache_put(key, vulnerabilities)
 
         result = ScanResult(
             file_path=file_path,
             language=language,
-            vulnerabilities=vulnerabilities,
-            scan_time_ms=elapsed,
+            vulnerabilities=list(vulnerabilities),
+            scan_time_ms=(time.perf_counter() - start) * 1000,
         )
 
         if vulnerabilities:
@@ -361,14 +518,37 @@ class VulnerabilityScanner:
         return result
 
     def scan_project(self, files: Dict[str, str], block_on_critical: bool = True) -> ProjectScanReport:
-        """Scan all files in a project."""
+        """Scan all files in a project (in worker processes when many files are not cached)."""
+        results_by_path: Dict[str, ScanResult] = {}
+        pending: List[Tuple[str, str, str]] = []
+        for file_path, content in files.items():
+            language = _language_for(file_path)
+            cached = self._cache_get(self._cache_key(content, language))
+            if cached is not None:
+                results_by_path[file_path] = ScanResult(file_path, language, list(cached), 0.0)
+            else:
+                pending.append((file_path, content, language))
+
+        if len(pending) >= self.parallel_threshold and self.max_workers > 1:
+            scanned = self._scan_parallel(pending)
+        else:
+            scanned = _scan_serial(self._engine, pending)
+        for (file_path, content, language), (vulnerabilities, elapsed) in zip(pending, scanned):
+            self._cache_put(self._cache_key(content, language), vulnerabilities)
+            results_by_path[file_path] = ScanResult(file_path, language, list(vulnerabilities), elapsed)
+
         results = []
         blocked = []
         severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
 
-        for file_path, content in files.items():
-            result = self.scan_file(file_path, content)
+        for file_path in files:
+            result = results_by_path[file_path]
             results.append(result)
+            if result.vulnerabilities:
+                self.logger.info(
+                    f"Found {len(result.vulnerabilities)} vulnerabilities in {file_path} "
+                    f"(max severity: {result.max_severity})"
+                )
 
             for v in result.vulnerabilities:
                 severity_counts[v.severity] = severity_counts.get(v.severity, 0) + 1
@@ -394,3 +574,14 @@ class VulnerabilityScanner:
         self.logger.info(f"Project scan: {total_vulns} vulnerabilities in {len(files)} files, {len(blocked)} blocked")
 
         return report
+
+    def _scan_parallel(self, pending: List[Tuple[str, str, str]]) -> List[Tuple[List[Vulnerability], float]]:
+        workers = min(self.max_workers, max(1, len(pending) // 64))
+        size = max(1, -(-len(pending) // (workers * 4)))
+        chunks = [pending[i : i + size] for i in range(0, len(pending), size)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.rules,)) as pool:
+                return [item for chunk in pool.map(_scan_chunk, chunks) for item in chunk]
+        except (OSError, RuntimeError) as e:  # e.g. no process support in this environment
+            self.logger.warning(f"Parallel vulnerability scan unavailable ({e}); scanning serially")
+            return _scan_serial(self._engine, pending)
@@ -172,6 +172,14 @@ class PipelinePhaseError(PipelineError):
         super().__init__(f"Phase '{phase_name}' failed: {message}")
 
 
+class PipelineCancelledError(PipelineError):
+    """Raised when a running pipeline is cancelled (checked before each LLM call and phase)."""
+
+    def __init__(self, project_name: str):
+        self.project_name = project_name
+        super().__init__(f"Pipeline for '{project_name}' was cancelled")
+
+
 class FileValidationError(PipelineError):
     """Raised when a generated file fails validation."""
 
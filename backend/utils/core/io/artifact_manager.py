@@ -7,9 +7,16 @@ Sistema de renderizado dinámico de diferentes tipos de artefactos:
 - Listas de verificación (checklists)
 - Código
 - Comparativas
+
+Los artefactos se guardan en SQLite (``artifacts.db``) con una fila por artefacto,
+índices por tipo y fecha y el HTML renderizado cacheado en la propia fila, de modo
+que cada mutación actualiza solo su fila. Un ``artifacts.json`` previo se migra
+automáticamente la primera vez.
 """
 
 import json
+import sqlite3
+import threading
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from enum import Enum
@@ -77,9 +84,11 @@ class ArtifactManager:
         # Storage
         self.artifacts_dir = project_root / ".ollash" / "knowledge_workspace" / "artifacts"
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.artifacts_dir / "artifacts.db"
 
-        self.artifacts: Dict[str, Artifact] = {}
-        self._load_artifacts()
+        self._db_lock = threading.Lock()
+        self._db = self._connect()
+        self._migrate_json()
 
         self.logger.info("✓ ArtifactManager initialized")
 
@@ -119,8 +128,7 @@ class ArtifactManager:
                 created_at=self._get_timestamp(),
             )
 
-            self.artifacts[artifact_id] = artifact
-            self._save_artifacts()
+            self._insert(artifact)
 
             self.logger.info(f"✓ Created report: {title} (ID: {artifact_id})")
             return artifact_id
@@ -160,8 +168,7 @@ class ArtifactManager:
                 created_at=self._get_timestamp(),
             )
 
-            self.artifacts[artifact_id] = artifact
-            self._save_artifacts()
+            self._insert(artifact)
 
             self.logger.info(f"✓ Created {diagram_type} diagram: {title}")
             return artifact_id
@@ -214,8 +221,7 @@ class ArtifactManager:
                 created_at=self._get_timestamp(),
             )
 
-            self.artifacts[artifact_id] = artifact
-            self._save_artifacts()
+            self._insert(artifact)
 
             self.logger.info(f"✓ Created checklist: {title} with {len(items)} items")
             return artifact_id
@@ -264,8 +270,7 @@ class ArtifactManager:
                 created_at=self._get_timestamp(),
             )
 
-            self.artifacts[artifact_id] = artifact
-            self._save_artifacts()
+            self._insert(artifact)
 
             self.logger.info(f"✓ Created code artifact: {title} ({language})")
             return artifact_id
@@ -313,8 +318,7 @@ class ArtifactManager:
                 created_at=self._get_timestamp(),
             )
 
-            self.artifacts[artifact_id] = artifact
-            self._save_artifacts()
+            self._insert(artifact)
 
             self.logger.info(f"✓ Created comparison: {title} with {len(items)} items")
             return artifact_id
@@ -333,24 +337,35 @@ class ArtifactManager:
             HTML string para inyectar en el DOM
         """
         try:
-            artifact = self.artifacts.get(artifact_id)
-            if not artifact:
+            with self._db_lock:
+                row = self._db.execute("SELECT * FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+            if not row:
                 self.logger.warning(f"Artifact {artifact_id} not found")
                 return ""
+            if row["html"] is not None:
+                return row["html"]
 
+            artifact = self._row_to_artifact(row)
             if artifact.type == ArtifactType.REPORT.value:
-                return self._render_report_html(artifact)
+                html = self._render_report_html(artifact)
             elif artifact.type == ArtifactType.DIAGRAM.value:
-                return self._render_diagram_html(artifact)
+                html = self._render_diagram_html(artifact)
             elif artifact.type == ArtifactType.CHECKLIST.value:
-                return self._render_checklist_html(artifact)
+                html = self._render_checklist_html(artifact)
             elif artifact.type == ArtifactType.CODE.value:
-                return self._render_code_html(artifact)
+                html = self._render_code_html(artifact)
             elif artifact.type == ArtifactType.COMPARISON.value:
-                return self._render_comparison_html(artifact)
+                html = self._render_comparison_html(artifact)
             else:
                 return f"<p>Unknown artifact type: {artifact.type}</p>"
 
+            # Only cache if the artifact was not modified while rendering
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "UPDATE artifacts SET html = ? WHERE id = ? AND version = ?", (html, artifact_id, row["version"])
+                )
+            return html
+
         except Exception as e:
             self.logger.error(f"Error rendering artifact: {e}")
             return f"<p>Error rendering artifact: {e}</p>"
@@ -500,40 +515,74 @@ class ArtifactManager:
 
     def get_artifact(self, artifact_id: str) -> Optional[Artifact]:
         """Obtiene un artefacto por ID."""
-        return self.artifacts.get(artifact_id)
+        with self._db_lock:
+            row = self._db.execute("SELECT * FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+        return self._row_to_artifact(row) if row else None
 
-    def list_artifacts(self, artifact_type: Optional[str] = None) -> List[Artifact]:
-        """Lista todos los artefactos, opcionalmente filtrados por tipo."""
-        if artifact_type:
-            return [a for a in self.artifacts.values() if a.type == artifact_type]
-        return list(self.artifacts.values())
+    def list_artifacts(
+        self,
+        artifact_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Artifact]:
+        """
+        Lista artefactos en orden de creación, opcionalmente filtrados y paginados.
+
+        Args:
+            artifact_type: Filtra por tipo (``ArtifactType.value``)
+            limit: Máximo de artefactos a devolver (None = todos)
+            offset: Artefactos a saltar (paginación)
+            since: Solo creados en o después de este timestamp ISO
+            until: Solo creados antes de este timestamp ISO
+        """
+        where, params = self._filters(artifact_type, since, until)
+        sql = f"SELECT * FROM artifacts{where} ORDER BY created_at, rowid LIMIT ? OFFSET ?"
+        with self._db_lock:
+            rows = self._db.execute(sql, (*params, -1 if limit is None else limit, offset)).fetchall()
+        return [self._row_to_artifact(row) for row in rows]
+
+    def count_artifacts(
+        self, artifact_type: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None
+    ) -> int:
+        """Cuenta artefactos con los mismos filtros que ``list_artifacts``."""
+        where, params = self._filters(artifact_type, since, until)
+        with self._db_lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM artifacts{where}", params).fetchone()[0]
 
     def delete_artifact(self, artifact_id: str) -> bool:
         """Elimina un artefacto."""
-        if artifact_id in self.artifacts:
-            del self.artifacts[artifact_id]
-            self._save_artifacts()
+        with self._db_lock, self._db:
+            deleted = self._db.execute("DELETE FROM artifacts WHERE id = ?", (artifact_id,)).rowcount
+        if deleted:
             self.logger.info(f"Deleted artifact {artifact_id}")
-            return True
-        return False
+        return bool(deleted)
 
     def update_checklist_item(self, artifact_id: str, item_id: str, completed: bool) -> bool:
         """Actualiza el estado de un item de checklist."""
         try:
-            artifact = self.artifacts.get(artifact_id)
-            if not artifact or artifact.type != ArtifactType.CHECKLIST.value:
-                return False
-
-            for item in artifact.content.get("items", []):
-                if item["id"] == item_id:
-                    item["completed"] = completed
-
-                    # Actualizar contadores
-                    artifact.content["completed_items"] = sum(1 for i in artifact.content["items"] if i["completed"])
-                    artifact.updated_at = self._get_timestamp()
-
-                    self._save_artifacts()
-                    return True
+            with self._db_lock, self._db:
+                row = self._db.execute(
+                    "SELECT content FROM artifacts WHERE id = ? AND type = ?",
+                    (artifact_id, ArtifactType.CHECKLIST.value),
+                ).fetchone()
+                if not row:
+                    return False
+
+                content = json.loads(row["content"])
+                for item in content.get("items", []):
+                    if item["id"] == item_id:
+                        item["completed"] = completed
+
+                        # Actualizar contadores
+                        content["completed_items"] = sum(1 for i in content["items"] if i["completed"])
+                        self._db.execute(
+                            "UPDATE artifacts SET content = ?, updated_at = ?, version = version + 1, html = NULL "
+                            "WHERE id = ?",
+                            (json.dumps(content, ensure_ascii=False), self._get_timestamp(), artifact_id),
+                        )
+                        return True
 
             return False
 
@@ -541,6 +590,11 @@ class ArtifactManager:
             self.logger.error(f"Error updating checklist item: {e}")
             return False
 
+    def close(self) -> None:
+        """Cierra la conexión a la base de datos."""
+        with self._db_lock:
+            self._db.close()
+
     # ============ Métodos privados ============
 
     def _generate_id(self) -> str:
@@ -549,39 +603,102 @@ class ArtifactManager:
 
         return f"art_{uuid.uuid4().hex[:8]}"
 
-    def _save_artifacts(self):
-        """Guarda los artefactos a archivo."""
-        try:
-            data = {
-                "artifacts": {aid: artifact.to_dict() for aid, artifact in self.artifacts.items()},
-                "last_updated": self._get_timestamp(),
-            }
+    def _connect(self) -> sqlite3.Connection:
+        """Abre la base de datos de artefactos y crea el esquema si hace falta."""
+        db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        with db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "    id              TEXT PRIMARY KEY, "
+                "    type            TEXT NOT NULL, "
+                "    title           TEXT NOT NULL, "
+                "    content         TEXT NOT NULL, "
+                "    metadata        TEXT NOT NULL, "
+                "    created_at      TEXT NOT NULL, "
+                "    updated_at      TEXT, "
+                "    parent_decision TEXT, "
+                "    version         INTEGER NOT NULL DEFAULT 0, "
+                "    html            TEXT"
+                ")"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_type_created ON artifacts (type, created_at)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at)")
+        return db
 
-            artifacts_file = self.artifacts_dir / "artifacts.json"
-            with open(artifacts_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    @staticmethod
+    def _artifact_params(artifact: Artifact) -> tuple:
+        return (
+            artifact.id,
+            artifact.type,
+            artifact.title,
+            json.dumps(artifact.content, ensure_ascii=False),
+            json.dumps(artifact.metadata, ensure_ascii=False),
+            artifact.created_at,
+            artifact.updated_at,
+            artifact.parent_decision,
+        )
+
+    _INSERT_SQL = (
+        "INSERT OR REPLACE INTO artifacts "
+        "(id, type, title, content, metadata, created_at, updated_at, parent_decision) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def _insert(self, artifact: Artifact):
+        """Inserta (o reemplaza) la fila de un artefacto."""
+        with self._db_lock, self._db:
+            self._db.execute(self._INSERT_SQL, self._artifact_params(artifact))
+        self.logger.debug(f"Saved artifact {artifact.id}")
 
-            self.logger.debug("Saved artifacts")
-        except Exception as e:
-            self.logger.error(f"Error saving artifacts: {e}")
+    @staticmethod
+    def _row_to_artifact(row: sqlite3.Row) -> Artifact:
+        return Artifact(
+            id=row["id"],
+            type=row["type"],
+            title=row["title"],
+            content=json.loads(row["content"]),
+            metadata=json.loads(row["metadata"]),
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            parent_decision=row["parent_decision"],
+        )
 
-    def _load_artifacts(self):
-        """Carga los artefactos del archivo."""
+    @staticmethod
+    def _filters(artifact_type: Optional[str], since: Optional[str], until: Optional[str]) -> tuple:
+        clauses, params = [], []
+        if artifact_type:
+            clauses.append("type = ?")
+            params.append(artifact_type)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("created_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _migrate_json(self):
+        """Importa el antiguo ``artifacts.json`` (una sola vez) y lo renombra a ``.migrated``."""
+        artifacts_file = self.artifacts_dir / "artifacts.json"
+        if not artifacts_file.exists():
+            return
         try:
-            artifacts_file = self.artifacts_dir / "artifacts.json"
-            if not artifacts_file.exists():
-                return
-
             with open(artifacts_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
-            for aid, artifact_data in data.get("artifacts", {}).items():
-                artifact = Artifact(**artifact_data)
-                self.artifacts[aid] = artifact
-
-            self.logger.debug(f"Loaded {len(self.artifacts)} artifacts")
+            artifacts = [Artifact(**artifact_data) for artifact_data in data.get("artifacts", {}).values()]
+            with self._db_lock, self._db:
+                self._db.executemany(
+                    self._INSERT_SQL.replace("INSERT OR REPLACE", "INSERT OR IGNORE"),
+                    [self._artifact_params(a) for a in artifacts],
+                )
+            artifacts_file.replace(artifacts_file.with_name("artifacts.json.migrated"))
+            self.logger.info(f"Migrated {len(artifacts)} artifacts from artifacts.json to SQLite")
         except Exception as e:
-            self.logger.warning(f"Could not load artifacts: {e}")
+            self.logger.warning(f"Could not migrate artifacts: {e}")
 
     @staticmethod
     def _get_timestamp() -> str:
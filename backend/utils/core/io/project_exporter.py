@@ -0,0 +1,261 @@
+"""
+Streaming ZIP export with an on-disk cache.
+
+The archive is written by a worker thread into a small chunk writer whose
+output is handed to the event loop through a bounded ``asyncio.Queue``, so
+``StreamingResponse`` can send compressed bytes while later files are still
+being compressed and the event loop never runs zlib.  Only a few chunks are
+held in memory at any time.
+
+While streaming, the same bytes are teed into ``<cache_dir>/<project>-<key>.zip``.
+The key is a hash of the project's content manifest (relative path, size and
+mtime of every exported file), so an unchanged project is served straight from
+the cached file on the next download.  Only the newest archive per project is
+kept and the cache as a whole is capped at ``max_cache_bytes``.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import os
+import threading
+import uuid
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+DEFAULT_SKIP_DIRS = frozenset({".git", ".ollash", "__pycache__", "node_modules", ".venv", "venv"})
+
+# Already-compressed formats are stored instead of deflated again
+_STORED_SUFFIXES = frozenset(
+    {
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".webp",
+        ".ico",
+        ".zip",
+        ".gz",
+        ".tgz",
+        ".bz2",
+        ".xz",
+        ".7z",
+        ".jar",
+        ".whl",
+        ".woff",
+        ".woff2",
+        ".mp3",
+        ".mp4",
+        ".webm",
+        ".pdf",
+    }
+)
+
+_MANIFEST_VERSION = "1"
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class ExportEntry:
+    arcname: str
+    path: str
+    size: int
+    mtime_ns: int
+
+
+class _ChunkWriter:
+    """Write-only, unseekable file object that emits fixed-size chunks to *sink*."""
+
+    def __init__(self, sink: Callable[[bytes], None], chunk_size: int):
+        self._sink = sink
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._chunk_size:
+            self._sink(bytes(self._buffer[: self._chunk_size]))
+            del self._buffer[: self._chunk_size]
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._buffer:
+            self._sink(bytes(self._buffer))
+            self._buffer.clear()
+
+
+class _ExportAborted(Exception):
+    """Raised inside the writer thread when the client went away."""
+
+
+class ProjectExporter:
+    """Builds ZIP archives of generated projects and caches them by content manifest."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        skip_dirs: Iterable[str] = DEFAULT_SKIP_DIRS,
+        chunk_size: int = 256 * 1024,
+        queue_chunks: int = 8,
+        max_cache_bytes: int = 2 * 1024**3,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.skip_dirs = frozenset(skip_dirs)
+        self.chunk_size = chunk_size
+        self.queue_chunks = queue_chunks
+        self.max_cache_bytes = max_cache_bytes
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def scan(self, project_path: Path) -> List[ExportEntry]:
+        """List exported files (sorted). Blocking — call via ``asyncio.to_thread``."""
+        entries = []
+        for root, dirs, files in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in self.skip_dirs]
+            for f in files:
+                if f.startswith(".") or f.endswith(".pyc"):
+                    continue
+                full_path = os.path.join(root, f)
+                try:
+                    st = os.stat(full_path)
+                except OSError:
+                    continue
+                arcname = os.path.relpath(full_path, project_path).replace(os.sep, "/")
+                entries.append(ExportEntry(arcname, full_path, st.st_size, st.st_mtime_ns))
+        entries.sort(key=lambda e: e.arcname)
+        return entries
+
+    @staticmethod
+    def manifest_key(entries: List[ExportEntry]) -> str:
+        h = hashlib.sha256(_MANIFEST_VERSION.encode())
+        for e in entries:
+            h.update(f"{e.arcname}\0{e.size}\0{e.mtime_ns}\n".encode("utf-8", "surrogateescape"))
+        return h.hexdigest()[:24]
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def cache_path(self, project_name: str, key: str) -> Path:
+        return self.cache_dir / f"{project_name}-{key}.zip"
+
+    def cached_archive(self, project_name: str, key: str) -> Optional[Path]:
+        path = self.cache_path(project_name, key)
+        return path if path.is_file() else None
+
+    def _evict(self, project_name: str, keep: Path) -> None:
+        """Drop older archives of *project_name*, then the oldest archives beyond the size cap."""
+        try:
+            archives = [p for p in self.cache_dir.glob("*.zip") if p.is_file()]
+        except OSError:
+            return
+        for p in archives:
+            if p != keep and p.stem.rsplit("-", 1)[0] == project_name:
+                p.unlink(missing_ok=True)
+        remaining = [(p.stat().st_mtime, p.stat().st_size, p) for p in archives if p.exists()]
+        total = sum(size for _, size, _ in remaining)
+        for _, size, p in sorted(remaining):
+            if total <= self.max_cache_bytes:
+                break
+            if p != keep:
+                p.unlink(missing_ok=True)
+                total -= size
+
+    # ------------------------------------------------------------------
+    # Archive writing
+    # ------------------------------------------------------------------
+
+    def write_archive(self, entries: List[ExportEntry], fileobj) -> None:
+        """Write a ZIP of *entries* to *fileobj* (which need not be seekable)."""
+        with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zf:
+            for e in entries:
+                suffix = os.path.splitext(e.arcname)[1].lower()
+                compress = zipfile.ZIP_STORED if suffix in _STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+                try:
+                    zf.write(e.path, e.arcname, compress_type=compress)
+                except FileNotFoundError:
+                    continue  # deleted since scan()
+
+    async def stream(
+        self, project_name: str, entries: List[ExportEntry], key: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield the archive in chunks while a worker thread compresses it.
+
+        When *key* is given the archive is also written to the cache and only
+        published there once it is complete.
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=self.queue_chunks)
+        aborted = threading.Event()
+        cache_target = self.cache_path(project_name, key) if key else None
+        tmp_path = cache_target.with_name(f"{cache_target.name}.{uuid.uuid4().hex}.tmp") if cache_target else None
+
+        def _put(item) -> None:
+            # Blocks the writer thread while the queue is full (backpressure)
+            future = asyncio.run_coroutine_threadsafe(chunks.put(item), loop)
+            while True:
+                if aborted.is_set():
+                    future.cancel()
+                    raise _ExportAborted()
+                try:
+                    future.result(timeout=0.5)
+                    return
+                except concurrent.futures.TimeoutError:
+                    continue
+
+        def _produce() -> None:
+            cache_file = None
+            try:
+                if tmp_path is not None:
+                    try:
+                        self.cache_dir.mkdir(parents=True, exist_ok=True)
+                        cache_file = open(tmp_path, "wb")
+                    except OSError:
+                        cache_file = None
+
+                def _sink(chunk: bytes) -> None:
+                    if cache_file is not None:
+                        cache_file.write(chunk)
+                    _put(chunk)
+
+                writer = _ChunkWriter(_sink, self.chunk_size)
+                self.write_archive(entries, writer)
+                writer.close()
+                if cache_file is not None:
+                    cache_file.close()
+                    cache_file = None
+                    os.replace(tmp_path, cache_target)
+                    self._evict(project_name, cache_target)
+                _put(_DONE)
+            except _ExportAborted:
+                pass
+            except Exception as exc:  # surface the error to the consumer
+                try:
+                    _put(exc)
+                except Exception:
+                    pass
+            finally:
+                if cache_file is not None:
+                    cache_file.close()
+                if tmp_path is not None and tmp_path.exists():
+                    tmp_path.unlink(missing_ok=True)
+
+        producer = threading.Thread(target=_produce, daemon=True, name=f"zip-export-{project_name}")
+        producer.start()
+        try:
+            while True:
+                item = await chunks.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            aborted.set()
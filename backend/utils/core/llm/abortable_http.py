@@ -0,0 +1,126 @@
+"""
+backend/utils/core/llm/abortable_http.py
+Abortable blocking ``requests`` calls.
+
+``OllamaClient.achat`` runs ``requests`` on an executor thread, so cancelling the
+awaiting task alone leaves the HTTP call (and the GPU generation behind it)
+running.  ``AbortableHTTPAdapter`` tracks the urllib3 connection used by the
+call bound to an ``AbortHandle``; ``AbortHandle.abort()`` shuts that socket
+down from any thread.  The blocked call fails with a connection error and
+Ollama, seeing the client disconnect, stops generating.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_local = threading.local()
+
+
+class RequestAborted(Exception):
+    """Raised on the worker thread when its call was aborted before it was sent."""
+
+
+class AbortHandle:
+    """Abort switch for the HTTP call made on the thread that ``bind()``s it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self.aborted = False
+
+    @contextmanager
+    def bind(self) -> Iterator["AbortHandle"]:
+        previous = getattr(_local, "handle", None)
+        _local.handle = self
+        try:
+            yield self
+        finally:
+            _local.handle = previous
+            with self._lock:
+                self._conn = None
+
+    def check(self) -> None:
+        if self.aborted:
+            raise RequestAborted("request aborted")
+
+    def abort(self) -> None:
+        """Close the bound call's socket (or make it fail as soon as it connects)."""
+        with self._lock:
+            self.aborted = True
+            conn = self._conn
+        if conn is not None:
+            _shutdown(conn)
+
+    def _attach(self, conn) -> None:
+        with self._lock:
+            self._conn = conn
+            aborted = self.aborted
+        if aborted:
+            _shutdown(conn)
+
+
+def _current() -> Optional[AbortHandle]:
+    return getattr(_local, "handle", None)
+
+
+def _shutdown(conn) -> None:
+    sock = getattr(conn, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass  # already closed
+
+
+class _AbortableConnectionMixin:
+    def connect(self):
+        super().connect()
+        handle = _current()
+        if handle is not None:
+            handle._attach(self)
+
+
+class _AbortableHTTPConnection(_AbortableConnectionMixin, HTTPConnection):
+    pass
+
+
+class _AbortableHTTPSConnection(_AbortableConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _AbortablePoolMixin:
+    def _make_request(self, conn, *args, **kwargs):
+        handle = _current()
+        if handle is not None:
+            handle.check()
+            if getattr(conn, "sock", None) is not None:  # reused keep-alive connection
+                handle._attach(conn)
+        return super()._make_request(conn, *args, **kwargs)
+
+
+class _AbortableHTTPConnectionPool(_AbortablePoolMixin, HTTPConnectionPool):
+    ConnectionCls = _AbortableHTTPConnection
+
+
+class _AbortableHTTPSConnectionPool(_AbortablePoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _AbortableHTTPSConnection
+
+
+class AbortableHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose connections can be shut down through an ``AbortHandle``."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _AbortableHTTPConnectionPool,
+            "https": _AbortableHTTPSConnectionPool,
+        }
@@ -1,12 +1,102 @@
 import asyncio
 import json
-from typing import Any, Dict, List, Optional, Tuple
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from backend.utils.core.system.agent_logger import AgentLogger
 from backend.utils.core.system.event_publisher import EventPublisher
 from backend.utils.core.llm.llm_response_parser import LLMResponseParser
 from backend.utils.core.llm.ollama_client import OllamaClient
 
+_LATENCY_WINDOW = 200
+_FENCED_BLOCK = re.compile(r"```([\w+-]*)[ \t]*\n(.*?)```", re.DOTALL)
+
+
+def validate_candidate(role: str, response_data: Dict) -> bool:
+    """Cheap acceptance check for a candidate response.
+
+    Rejects error responses and empty answers, tool calls without a function name or
+    with unparseable arguments, fenced ``python`` blocks that do not compile and
+    fenced ``json`` blocks that do not parse.
+    """
+    if not isinstance(response_data, dict) or response_data.get("error"):
+        return False
+    message = response_data.get("message") or {}
+    content = message.get("content") or ""
+    tool_calls = message.get("tool_calls") or []
+    if not content.strip() and not tool_calls:
+        return False
+    for call in tool_calls:
+        function = (call.get("function") if isinstance(call, dict) else None) or {}
+        if not function.get("name"):
+            return False
+        arguments = function.get("arguments")
+        if isinstance(arguments, str):
+            try:
+                json.loads(arguments)
+            except ValueError:
+                return False
+    for lang, body in _FENCED_BLOCK.findall(content):
+        lang = lang.lower()
+        try:
+            if lang in ("python", "py"):
+                compile(body, f"<{role}>", "exec")
+            elif lang == "json":
+                json.loads(body)
+        except (SyntaxError, ValueError):
+            return False
+    return True
+
+
+@dataclass
+class AggregationPolicy:
+    """When ``ModelRouter.aroute_and_aggregate`` stops waiting for candidate models.
+
+    Modes:
+        ``all``: wait for every candidate (the original behaviour).
+        ``first_acceptable``: return the first response accepted by *validator*.
+        ``quorum``: stop once *quorum* responses are accepted and review those.
+
+    With *hedge_percentile* set (quorum modes only), candidates are started one at a
+    time: a backup starts when the running ones exceed that percentile of their past
+    latency (``hedge_delay`` seconds until ``hedge_min_samples`` are known), or at once
+    when one fails or is rejected.
+    """
+
+    mode: str = "all"
+    quorum: int = 2
+    validator: Optional[Callable[[str, Dict], bool]] = None  # defaults to validate_candidate
+    hedge_percentile: Optional[float] = None
+    hedge_delay: float = 10.0
+    hedge_min_samples: int = 5
+
+    def __post_init__(self):
+        if self.mode not in ("all", "first_acceptable", "quorum"):
+            raise ValueError(f"Unknown aggregation mode '{self.mode}'.")
+
+    @property
+    def needed(self) -> Optional[int]:
+        """Accepted responses required, or ``None`` to wait for all candidates."""
+        if self.mode == "first_acceptable":
+            return 1
+        if self.mode == "quorum":
+            return max(1, self.quorum)
+        return None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "AggregationPolicy":
+        """Build from the ``model_router`` section of the agent config."""
+        section = (config or {}).get("model_router") or {}
+        return cls(
+            mode=section.get("aggregation", "all"),
+            quorum=section.get("quorum", 2),
+            hedge_percentile=section.get("hedge_percentile"),
+            hedge_delay=section.get("hedge_delay", 10.0),
+            hedge_min_samples=section.get("hedge_min_samples", 5),
+        )
+
 
 class ModelRouter:
     """
@@ -33,6 +123,9 @@ class ModelRouter:
         if self.senior_reviewer_model_name not in self.llm_clients:
             raise ValueError(f"Senior reviewer model '{self.senior_reviewer_model_name}' not found in llm_clients.")
         self.senior_reviewer_client = self.llm_clients[self.senior_reviewer_model_name]
+        self.policy = AggregationPolicy.from_config(config)
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.last_aggregation: Dict[str, Any] = {}
 
     async def aroute_and_aggregate(
         self,
@@ -42,62 +135,30 @@ class ModelRouter:
         user_prompt_for_reviewer: str,  # A specific user prompt for the reviewer to evaluate
         task_description: str,  # Description of the task being performed
         options_override: Optional[Dict] = None,
+        policy: Optional[AggregationPolicy] = None,
     ) -> Tuple[Dict, List[Tuple[str, Dict]]]:
         """
         Asynchronously routes the prompt to multiple candidate models, aggregates their responses,
         and uses a Senior Reviewer to pick the best or synthesize.
 
+        *policy* (default: ``self.policy``) decides when to stop collecting: after every
+        candidate, after the first acceptable one, or after a quorum of acceptable ones,
+        optionally hedging by starting candidates one at a time. Candidates still running
+        when the policy is satisfied are cancelled.
+
         Returns the chosen response and a list of all raw candidate responses.
         """
-        candidate_responses: List[Tuple[str, Dict]] = []  # (model_role, raw_response_data)
-
-        tasks = []
-        roles_in_task_order = []
+        policy = policy or self.policy
+        roles = []
         for role in candidate_model_roles:
             if role not in self.llm_clients:
                 self.logger.warning(f"Model client for role '{role}' not found. Skipping.")
                 continue
+            roles.append(role)
 
-            roles_in_task_order.append(role)
-            client = self.llm_clients[role]
-            self.logger.info(f"  Routing prompt to specialist model: {role} ({client.model})")
-            await self.event_publisher.publish("tool_end", tool_name="model_router", model=client.model, role=role)
-
-            tasks.append(
-                client.achat(
-                    messages=messages,
-                    tools=tool_definitions,
-                    options_override=options_override,
-                )
-            )
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for i, role in enumerate(roles_in_task_order):
-            result = results[i]
-            client = self.llm_clients[role]
-            if isinstance(result, Exception):
-                self.logger.error(f"  Error getting response from model {client.model} (role: {role}): {result}")
-                await self.event_publisher.publish(
-                    "tool_output",
-                    tool_name="model_router",
-                    model=client.model,
-                    role=role,
-                    status="error",
-                    message=str(result),
-                )
-            else:
-                response_data, usage = result
-                candidate_responses.append((role, response_data))
-                await self.event_publisher.publish(
-                    "tool_output",
-                    tool_name="model_router",
-                    model=client.model,
-                    role=role,
-                    status="success",
-                    content=response_data["message"].get("content", "")[:200],
-                )
-            await self.event_publisher.publish("tool_end", tool_name="model_router", model=client.model, role=role)
+        candidate_responses = await self._collect_candidates(
+            roles, messages, tool_definitions, options_override, policy
+        )
 
         if not candidate_responses:
             raise RuntimeError("No candidate models provided a response.")
@@ -176,6 +237,146 @@ class ModelRouter:
         chosen_response_data = self._parse_reviewer_choice(choice_content, candidate_responses)
         return chosen_response_data, candidate_responses
 
+    async def _collect_candidates(
+        self,
+        roles: List[str],
+        messages: List[Dict],
+        tool_definitions: List[Dict],
+        options_override: Optional[Dict],
+        policy: AggregationPolicy,
+    ) -> List[Tuple[str, Dict]]:
+        """Run candidate models until *policy* is satisfied; cancel the rest.
+
+        Returns the responses to review, in candidate order: the accepted ones when the
+        quorum was reached, otherwise every successful response.
+        """
+        needed = len(roles) if policy.needed is None else min(policy.needed, len(roles))
+        validator = policy.validator or validate_candidate
+        hedging = policy.hedge_percentile is not None and policy.needed is not None
+        loop = asyncio.get_running_loop()
+
+        queue = deque(roles)
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        responses: List[Tuple[str, Dict]] = []
+        accepted: List[Tuple[str, Dict]] = []
+        report = {"policy": policy.mode, "launched": [], "hedged": 0, "cancelled": [], "latency_s": {}}
+        next_hedge_at = 0.0
+
+        async def launch() -> None:
+            nonlocal next_hedge_at
+            role = queue.popleft()
+            client = self.llm_clients[role]
+            self.logger.info(f"  Routing prompt to specialist model: {role} ({client.model})")
+            await self.event_publisher.publish("tool_end", tool_name="model_router", model=client.model, role=role)
+            task = asyncio.ensure_future(
+                client.achat(messages=messages, tools=tool_definitions, options_override=options_override)
+            )
+            running[task] = (role, loop.time())
+            report["launched"].append(role)
+            if hedging:
+                next_hedge_at = loop.time() + self._hedge_delay(policy, [r for r, _ in running.values()])
+
+        try:
+            for _ in range(needed if hedging else len(roles)):
+                await launch()
+
+            while running and len(accepted) < needed:
+                timeout = max(0.0, next_hedge_at - loop.time()) if hedging and queue else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.logger.info(f"  No acceptable response within the hedge delay; starting backup {queue[0]}.")
+                    report["hedged"] += 1
+                    await launch()
+                    continue
+
+                for task in sorted(done, key=lambda t: roles.index(running[t][0])):
+                    role, started = running.pop(task)
+                    client = self.llm_clients[role]
+                    elapsed = loop.time() - started
+                    report["latency_s"][role] = round(elapsed, 3)
+                    error = task.exception()
+                    if error is None:
+                        response_data, _usage = task.result()
+                        error = response_data.get("error")
+                    if error is not None:
+                        self.logger.error(f"  Error getting response from model {client.model} (role: {role}): {error}")
+                        await self.event_publisher.publish(
+                            "tool_output",
+                            tool_name="model_router",
+                            model=client.model,
+                            role=role,
+                            status="error",
+                            message=str(error),
+                        )
+                    else:
+                        self._record_latency(role, elapsed)
+                        responses.append((role, response_data))
+                        if policy.needed is None or validator(role, response_data):
+                            accepted.append((role, response_data))
+                        else:
+                            self.logger.info(f"  Candidate from {role} rejected by the validator.")
+                        await self.event_publisher.publish(
+                            "tool_output",
+                            tool_name="model_router",
+                            model=client.model,
+                            role=role,
+                            status="success",
+                            content=response_data["message"].get("content", "")[:200],
+                        )
+                    await self.event_publisher.publish(
+                        "tool_end", tool_name="model_router", model=client.model, role=role
+                    )
+
+                # Replace failed or rejected candidates with the next ones in line
+                while queue and len(accepted) + len(running) < needed:
+                    await launch()
+        finally:
+            losers = list(running)
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+            for task in losers:
+                role, _ = running.pop(task)
+                report["cancelled"].append(role)
+                self.logger.info(f"  Cancelled in-flight candidate {role}; policy '{policy.mode}' already satisfied.")
+                await self.event_publisher.publish(
+                    "tool_output",
+                    tool_name="model_router",
+                    model=self.llm_clients[role].model,
+                    role=role,
+                    status="cancelled",
+                )
+            self.last_aggregation = report
+
+        chosen = accepted[:needed] if len(accepted) >= needed else (accepted or responses)
+        return sorted(chosen, key=lambda item: roles.index(item[0]))
+
+    def _record_latency(self, role: str, seconds: float) -> None:
+        self._latencies.setdefault(role, deque(maxlen=_LATENCY_WINDOW)).append(seconds)
+
+    def _hedge_delay(self, policy: AggregationPolicy, roles: List[str]) -> float:
+        """Latency percentile of the running roles, or ``policy.hedge_delay`` until enough samples exist."""
+        samples = sorted(s for role in roles for s in self._latencies.get(role, ()))
+        if len(samples) < policy.hedge_min_samples:
+            return policy.hedge_delay
+        index = min(len(samples) - 1, int(policy.hedge_percentile / 100 * len(samples)))
+        return samples[index]
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-role latency distribution (seconds) of completed candidate calls."""
+        stats = {}
+        for role, window in self._latencies.items():
+            samples = sorted(window)
+            if samples:
+                stats[role] = {
+                    "count": len(samples),
+                    "p50": round(samples[len(samples) // 2], 3),
+                    "p95": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 3),
+                    "max": round(samples[-1], 3),
+                }
+        return stats
+
     def route_and_aggregate(
         self,
         messages: List[Dict],
@@ -0,0 +1,373 @@
+"""
+backend/utils/core/llm/model_scheduler.py
+Model-residency-aware scheduling of Ollama requests.
+
+On a single-GPU Ollama host every switch between role models (coder, planner,
+reviewer, ...) can unload one model and load another.  ``ModelScheduler`` sits
+between callers and the HTTP request: each request first takes a slot for its
+model, and slots are handed out so that queued work is batched by model.
+
+- Requests for a model believed to be resident are granted first (up to
+  ``max_parallel`` in flight per model).
+- A non-resident model is loaded when a residency slot is free or a resident
+  model goes idle.  Otherwise the least-busy resident model is drained and
+  swapped out once the oldest foreign request has waited ``max_wait`` seconds
+  or ``max_batch`` requests were granted past it, so no model starves.
+- The first request after a load runs alone.  Its load time (Ollama's
+  ``load_duration`` when reported, else its wall time) plus the explicit unload
+  of the evicted model is recorded as swap latency.
+
+A caller that gives up (a cancelled request, a hedged loser) ``withdraw``s its
+ticket: a queued ticket leaves the queue, and a slot granted but not yet
+claimed is handed back without evicting or unloading anything.
+
+Opt-in with ``OLLASH_MODEL_SCHEDULER=1``.  Residency defaults to
+``OLLASH_MAX_RESIDENT_MODELS``, else the host's ``OLLAMA_MAX_LOADED_MODELS``,
+else one model.
+
+Thread-safe; blocking ``acquire``/``wait`` are meant to run on worker threads.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Set
+
+_DEFAULT_MAX_RESIDENT = 1
+_DEFAULT_MAX_PARALLEL = 4
+_DEFAULT_MAX_BATCH = 8
+_DEFAULT_MAX_WAIT = 30.0
+_LATENCY_WINDOW = 200
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+@dataclass
+class ModelTicket:
+    """One request's slot for a model."""
+
+    model: str
+    seq: int
+    enqueued_at: float
+    granted: bool = False
+    claimed: bool = False  # returned to the caller by ``wait``
+    withdrawn: bool = False
+    released: bool = False
+    cold: bool = False
+    evicted: Optional[str] = None
+    granted_at: Optional[float] = None
+    unload_seconds: float = 0.0
+    load_seconds: Optional[float] = None  # set by the caller from the response, if known
+
+    @property
+    def wait_seconds(self) -> float:
+        return (self.granted_at or time.monotonic()) - self.enqueued_at
+
+
+class ModelScheduler:
+    """Hands out per-model request slots, preferring models believed to be resident.
+
+    Args:
+        max_resident: Models that may be resident at once (default: ``OLLASH_MAX_RESIDENT_MODELS``,
+            else ``OLLAMA_MAX_LOADED_MODELS``, else 1).
+        max_parallel: Concurrent requests per resident model.
+        max_batch: Requests granted to resident models while another model waits
+            before that model is swapped in.
+        max_wait: Seconds a request for a non-resident model may wait before a
+            resident model is drained for it.
+        unload_fn: Default ``fn(model)`` used to unload an evicted model.
+    """
+
+    def __init__(
+        self,
+        max_resident: Optional[int] = None,
+        max_parallel: Optional[int] = None,
+        max_batch: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        unload_fn: Optional[Callable[[str], None]] = None,
+    ):
+        if not max_resident:
+            host_limit = _env_int("OLLAMA_MAX_LOADED_MODELS", _DEFAULT_MAX_RESIDENT)
+            max_resident = _env_int("OLLASH_MAX_RESIDENT_MODELS", host_limit)
+        self.max_resident = max(1, max_resident)
+        self.max_parallel = max(1, max_parallel or _env_int("OLLASH_MODEL_PARALLEL", _DEFAULT_MAX_PARALLEL))
+        self.max_batch = max(1, max_batch or _env_int("OLLASH_MODEL_MAX_BATCH", _DEFAULT_MAX_BATCH))
+        if max_wait is None:
+            max_wait = float(os.environ.get("OLLASH_MODEL_MAX_WAIT", _DEFAULT_MAX_WAIT))
+        self.max_wait = max_wait
+        self.unload_fn = unload_fn
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: Dict[str, Deque[ModelTicket]] = {}
+        self._inflight: Dict[str, int] = {}
+        self._resident: "OrderedDict[str, float]" = OrderedDict()  # LRU order
+        self._loading: Set[str] = set()
+        self._draining: Optional[str] = None
+        self._bypassed = 0  # grants to resident models while a foreign request waits
+
+        self._grants: Dict[str, int] = {}
+        self._loads = 0
+        self._swaps = 0
+        self._forced_swaps = 0
+        self._swap_latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._swap_seconds_total = 0.0
+        self._load_seconds_total = 0.0
+        self._wait_seconds_total = 0.0
+
+    # ----------------------------------------------------------------
+    # Slots
+    # ----------------------------------------------------------------
+
+    def acquire(self, model: str, unload_fn: Optional[Callable[[str], None]] = None) -> ModelTicket:
+        """Block until *model* may be called; returns the ticket to pass to ``release``."""
+        ticket = self.enqueue(model)
+        self.wait(ticket, unload_fn)
+        return ticket
+
+    def enqueue(self, model: str) -> ModelTicket:
+        """Queue a request for *model* without waiting; pass the ticket to ``wait`` or ``withdraw``."""
+        with self._cond:
+            ticket = ModelTicket(model=model, seq=next(self._seq), enqueued_at=time.monotonic())
+            self._waiting.setdefault(model, deque()).append(ticket)
+            self._schedule()
+        return ticket
+
+    def wait(self, ticket: ModelTicket, unload_fn: Optional[Callable[[str], None]] = None) -> bool:
+        """Block until *ticket* is granted (True, the caller must ``release`` it) or withdrawn (False)."""
+        with self._cond:
+            while not (ticket.granted or ticket.withdrawn):
+                self._cond.wait()
+            if ticket.withdrawn:
+                return False
+            ticket.claimed = True
+            self._wait_seconds_total += ticket.wait_seconds
+
+        if ticket.evicted:
+            unload = unload_fn or self.unload_fn
+            if unload is not None:
+                start = time.monotonic()
+                try:
+                    unload(ticket.evicted)
+                except Exception:
+                    pass  # Ollama evicts on its own if the explicit unload fails
+                ticket.unload_seconds = time.monotonic() - start
+        return True
+
+    def withdraw(self, ticket: ModelTicket) -> None:
+        """Give up *ticket* from any thread; a later ``release`` of it is a no-op.
+
+        A queued ticket leaves the queue.  A slot granted but not yet claimed by
+        ``wait`` is handed back as if never granted, so the model it would have
+        evicted stays resident and is not unloaded.  A claimed slot is released.
+        """
+        with self._cond:
+            if ticket.withdrawn or ticket.released:
+                return
+            ticket.withdrawn = True
+            if not ticket.granted:
+                queue = self._waiting.get(ticket.model)
+                if queue and ticket in queue:
+                    queue.remove(ticket)
+            elif not ticket.claimed:
+                self._unwind(ticket)
+            else:
+                self._release(ticket)
+            self._schedule()
+
+    def release(self, ticket: ModelTicket) -> None:
+        """Free *ticket*'s slot; a cold ticket records the load (and swap) latency."""
+        with self._cond:
+            if ticket.released:
+                return
+            self._release(ticket)
+            self._schedule()
+
+    @contextmanager
+    def slot(self, model: str, unload_fn: Optional[Callable[[str], None]] = None) -> Iterator[ModelTicket]:
+        ticket = self.acquire(model, unload_fn)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    # ----------------------------------------------------------------
+    # Scheduling (called with the condition held)
+    # ----------------------------------------------------------------
+
+    def _release(self, ticket: ModelTicket) -> None:
+        ticket.released = True
+        model = ticket.model
+        self._inflight[model] = max(0, self._inflight.get(model, 0) - 1)
+        if ticket.cold:
+            self._loading.discard(model)
+            load = ticket.load_seconds
+            if load is None:
+                load = time.monotonic() - (ticket.granted_at or ticket.enqueued_at)
+            self._load_seconds_total += load
+            if ticket.evicted:
+                latency = ticket.unload_seconds + load
+                self._swap_latencies.append(latency)
+                self._swap_seconds_total += latency
+
+    def _unwind(self, ticket: ModelTicket) -> None:
+        """Undo the grant of an unclaimed ticket, including the load and eviction it implied."""
+        ticket.released = True
+        model = ticket.model
+        self._inflight[model] = max(0, self._inflight.get(model, 0) - 1)
+        self._grants[model] -= 1
+        if ticket.cold:
+            self._loading.discard(model)
+            self._resident.pop(model, None)
+            self._loads -= 1
+            if ticket.evicted:
+                # Still loaded on the host: nothing could be admitted in its place while *model* was loading
+                self._resident[ticket.evicted] = time.monotonic()
+                self._resident.move_to_end(ticket.evicted, last=False)
+                self._swaps -= 1
+
+    def _schedule(self) -> None:
+        while self._admit_foreign():
+            pass
+        foreign_waiting = any(q for m, q in self._waiting.items() if m not in self._resident)
+        for model in list(self._resident):
+            if model == self._draining or model in self._loading:
+                continue
+            queue = self._waiting.get(model)
+            while queue and self._inflight.get(model, 0) < self.max_parallel:
+                self._grant(queue.popleft())
+                self._resident.move_to_end(model)
+                if foreign_waiting:
+                    self._bypassed += 1
+        self._cond.notify_all()
+
+    def _admit_foreign(self) -> bool:
+        """Load the non-resident model with the oldest request, evicting if needed."""
+        foreign = [m for m, q in self._waiting.items() if q and m not in self._resident]
+        if not foreign:
+            return False
+        model = min(foreign, key=lambda m: self._waiting[m][0].seq)
+
+        victim: Optional[str] = None
+        if len(self._resident) >= self.max_resident:
+            if self._draining is None:
+                idle = [m for m in self._resident if self._is_idle(m) and not self._waiting.get(m)]
+                if idle:
+                    victim = idle[0]
+                elif self._starving(model):
+                    busy = [m for m in self._resident if m not in self._loading]
+                    if not busy:
+                        return False
+                    self._draining = min(busy, key=lambda m: len(self._waiting.get(m) or ()))
+                    self._forced_swaps += 1
+            if victim is None:
+                if self._draining is None or not self._is_idle(self._draining):
+                    return False
+                victim = self._draining
+            del self._resident[victim]
+            self._draining = None
+            self._swaps += 1
+
+        self._resident[model] = time.monotonic()
+        self._loading.add(model)
+        self._loads += 1
+        self._bypassed = 0
+        ticket = self._waiting[model].popleft()
+        ticket.cold = True
+        ticket.evicted = victim
+        self._grant(ticket)
+        return True
+
+    def _is_idle(self, model: str) -> bool:
+        return not self._inflight.get(model) and model not in self._loading
+
+    def _starving(self, model: str) -> bool:
+        oldest = self._waiting[model][0]
+        return time.monotonic() - oldest.enqueued_at >= self.max_wait or self._bypassed >= self.max_batch
+
+    def _grant(self, ticket: ModelTicket) -> None:
+        ticket.granted = True
+        ticket.granted_at = time.monotonic()
+        self._inflight[ticket.model] = self._inflight.get(ticket.model, 0) + 1
+        self._grants[ticket.model] = self._grants.get(ticket.model, 0) + 1
+
+    # ----------------------------------------------------------------
+    # Introspection
+    # ----------------------------------------------------------------
+
+    @property
+    def resident(self) -> List[str]:
+        with self._cond:
+            return list(self._resident)
+
+    def stats(self) -> dict:
+        with self._cond:
+            latencies = sorted(self._swap_latencies)
+            models = set(self._grants) | {m for m, q in self._waiting.items() if q}
+            grants = sum(self._grants.values())
+            return {
+                "resident": list(self._resident),
+                "draining": self._draining,
+                "loads": self._loads,
+                "load_seconds_total": round(self._load_seconds_total, 3),
+                "swaps": self._swaps,
+                "forced_swaps": self._forced_swaps,
+                "swap_latency_s": {
+                    "total": round(self._swap_seconds_total, 3),
+                    "avg": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                    "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else 0.0,
+                    "last": round(self._swap_latencies[-1], 3) if latencies else 0.0,
+                },
+                "grants": grants,
+                "avg_wait_ms": round(self._wait_seconds_total / grants * 1000, 1) if grants else 0.0,
+                "queued": sum(len(q) for q in self._waiting.values()),
+                "models": {
+                    m: {
+                        "grants": self._grants.get(m, 0),
+                        "in_flight": self._inflight.get(m, 0),
+                        "waiting": len(self._waiting.get(m) or ()),
+                    }
+                    for m in sorted(models)
+                },
+            }
+
+
+# ----------------------------------------------------------------
+# Per-host registry
+# ----------------------------------------------------------------
+
+_schedulers: Dict[str, ModelScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_model_scheduler(base_url: str) -> Optional[ModelScheduler]:
+    """Return the shared scheduler for the Ollama host at *base_url*.
+
+    Opt-in: returns ``None`` unless enabled with ``OLLASH_MODEL_SCHEDULER=1``, since
+    a scheduler that undercounts the host's resident models serializes calls to
+    models that could run side by side.
+    """
+    if os.environ.get("OLLASH_MODEL_SCHEDULER", "0").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    key = str(base_url).rstrip("/")
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = ModelScheduler()
+        return scheduler
+
+
+def all_model_schedulers() -> Dict[str, ModelScheduler]:
+    with _schedulers_lock:
+        return dict(_schedulers)
@@ -5,9 +5,11 @@ import requests
 import time
 import math
 from typing import Optional
+from backend.utils.core.llm.abortable_http import AbortableHTTPAdapter, AbortHandle, RequestAborted
 from backend.utils.core.llm.token_tracker import TokenTracker
 from backend.utils.core.system.execution_bridge import bridge
 from backend.utils.core.system.network_monitor import network_monitor as _net_monitor
+from backend.utils.core.system.rate_limiter import AdaptivePolicy, Budget, get_rate_limiter
 
 
 def _hash_embedding(text: str, dim: int = 384) -> list[float]:
@@ -19,6 +21,53 @@ def _hash_embedding(text: str, dim: int = 384) -> list[float]:
     return [x / norm for x in vec]
 
 
+def _load_seconds(data) -> Optional[float]:
+    """Model load time reported by Ollama (``load_duration``, nanoseconds), if any."""
+    value = data.get("load_duration") if isinstance(data, dict) else None
+    return value / 1e9 if isinstance(value, (int, float)) else None
+
+
+def _contention_seconds(wall_seconds: float, data) -> float:
+    """Wall time minus Ollama's generation and model-load time: server queueing + prompt eval + network.
+
+    Feeds the shared limiter's latency adaptation without penalising long generations or model swaps.
+    """
+    if not isinstance(data, dict):
+        return wall_seconds
+    busy_ns = sum(v for v in (data.get("eval_duration"), data.get("load_duration")) if isinstance(v, (int, float)))
+    return max(0.0, wall_seconds - busy_ns / 1e9)
+
+
+def _shared_rate_limiter(base_url: str, config):
+    """Backend-wide limiter built from ``rate_limiting`` / ``gpu_rate_limiter`` tool settings.
+
+    Opt-in: returns None unless ``rate_limiting.enabled`` is set.  ``gpu_rate_limiter.enabled``
+    only toggles the latency-adaptive RPM on top of the static budget.
+    """
+    limits = config.get("rate_limiting") if isinstance(config, dict) else None
+    if not isinstance(limits, dict) or not limits.get("enabled", False):
+        return None
+    gpu = config.get("gpu_rate_limiter") or {}
+    adaptive = None
+    if gpu.get("enabled", True):
+        defaults = AdaptivePolicy()
+        adaptive = AdaptivePolicy(
+            degradation_threshold_ms=gpu.get("degradation_threshold_ms", defaults.degradation_threshold_ms),
+            recovery_threshold_ms=gpu.get("recovery_threshold_ms", defaults.recovery_threshold_ms),
+            min_rpm=gpu.get("min_rpm", defaults.min_rpm),
+            ema_alpha=gpu.get("ema_alpha", defaults.ema_alpha),
+        )
+    return get_rate_limiter(
+        base_url,
+        Budget(rpm=limits.get("requests_per_minute"), tpm=limits.get("max_tokens_per_minute")),
+        adaptive=adaptive,
+    )
+
+
+def _estimate_tokens(messages) -> int:
+    return sum(len(m.get("content") or "") for m in messages if isinstance(m, dict)) // 4
+
+
 class OllamaClient:
     def __init__(
         self,
@@ -30,6 +79,7 @@ class OllamaClient:
         llm_recorder,
         model_health_monitor=None,
         token_tracker: Optional[TokenTracker] = None,
+        model_scheduler=None,
     ):
         self.base_url = str(url).rstrip("/")
         self.chat_url = f"{self.base_url}/api/chat"
@@ -40,10 +90,16 @@ class OllamaClient:
         self.token_tracker = token_tracker
         self.timeout = timeout
         self.http_session = requests.Session()
+        # Lets a cancelled achat() close its in-flight POST instead of leaving it running on the executor
+        self.http_session.mount("http://", AbortableHTTPAdapter())
+        self.http_session.mount("https://", AbortableHTTPAdapter())
         self._aiohttp_session = None
         self._aiohttp_session_lock = asyncio.Lock()
-        self._gpu_limiter_enabled = False
+        # Shared per-backend token-bucket limiter (None when rate limiting is disabled in tool settings)
+        self._rate_limiter = _shared_rate_limiter(self.base_url, config)
         self._embedding_model = "nomic-embed-text"  # overridable via set_embedding_model()
+        # Optional ModelScheduler shared by all clients of this Ollama host (batches calls by resident model)
+        self._model_scheduler = model_scheduler
 
     async def _get_aiohttp_session(self):
         # Check if current loop is different from session's loop
@@ -129,16 +185,41 @@ class OllamaClient:
             self._llm_recorder.record_request(self.model, messages, tools, opts)
 
         start_time = time.time()
+        tokens = _estimate_tokens(messages)
 
         # F33: Use synchronous requests in a thread pool to avoid aiohttp hangs
         loop = asyncio.get_event_loop()
+        abort = AbortHandle()
+        # Queued here so a cancellation can withdraw it even before the worker thread starts
+        ticket = self._model_scheduler.enqueue(self.model) if self._model_scheduler is not None else None
 
         def _do_post():
-            return self.http_session.post(self.chat_url, json=payload, timeout=self.timeout)
+            with abort.bind():
+                if ticket is None:
+                    return self._limited_post(payload, tokens, abort)
+                if not self._model_scheduler.wait(ticket, self.unload_model):
+                    raise RequestAborted("request withdrawn while queued for the model")
+                try:
+                    abort.check()  # cancelled while the evicted model was unloaded
+                    resp = self._limited_post(payload, tokens, abort)
+                    if ticket.cold:
+                        try:
+                            ticket.load_seconds = _load_seconds(resp.json())
+                        except ValueError:
+                            pass
+                    return resp
+                finally:
+                    self._model_scheduler.release(ticket)
 
         self.logger.debug(f"[OllamaClient] Sending POST to {self.chat_url}")
         try:
-            resp = await loop.run_in_executor(None, _do_post)
+            try:
+                resp = await loop.run_in_executor(None, _do_post)
+            except asyncio.CancelledError:
+                abort.abort()  # stop the generation on the server, not just the wait for it
+                if ticket is not None:
+                    self._model_scheduler.withdraw(ticket)
+                raise
             _net_monitor.record(self.chat_url, "POST", resp.status_code)
             self.logger.debug(f"[OllamaClient] Response status: {resp.status_code}")
 
@@ -200,6 +281,28 @@ class OllamaClient:
             llm_call_log.record(self.model, 0, 0, latency * 1000, False, str(e))
             raise
 
+    def _limited_post(self, payload, tokens: int, abort: AbortHandle):
+        """POST *payload* under a lease from the shared limiter (runs on the executor thread).
+
+        Called once the ModelScheduler slot, if any, is held, so the latency fed back to the
+        limiter covers only the request itself and not queueing for, or loading of, the model.
+        """
+        if self._rate_limiter is None:
+            return self.http_session.post(self.chat_url, json=payload, timeout=self.timeout)
+        lease = self._rate_limiter.acquire_blocking(self.model, tokens=tokens)
+        contention = None
+        try:
+            abort.check()  # cancelled while waiting for the limiter
+            start = time.time()
+            resp = self.http_session.post(self.chat_url, json=payload, timeout=self.timeout)
+            try:
+                contention = _contention_seconds(time.time() - start, resp.json())
+            except ValueError:
+                pass
+            return resp
+        finally:
+            self._rate_limiter.release(lease, contention)
+
     def chat(self, messages, tools=None, options_override=None, context=None):
         """Synchronous chat method. USES bridge.run internally for robust async management."""
         return bridge.run(self.achat(messages, tools, options_override, context))
@@ -250,6 +353,19 @@ class OllamaClient:
         request_timeout = aiohttp.ClientTimeout(total=self.timeout)
 
         data = {}
+        ticket = None
+        if self._model_scheduler is not None:
+            ticket = await self._acquire_model_ticket()
+        lease = None
+        # Lease taken after the model slot so limiter latency excludes scheduler queueing and model loads
+        if self._rate_limiter is not None:
+            try:
+                lease = await self._rate_limiter.acquire(self.model, tokens=_estimate_tokens(messages))
+            except BaseException:
+                if ticket is not None:
+                    self._model_scheduler.release(ticket)
+                raise
+        request_start = time.time()
         try:
             # Use chunks(1024) or similar if line-based reading hangs with some versions
             async with session.post(self.chat_url, json=payload, timeout=request_timeout) as resp:
@@ -314,6 +430,30 @@ class OllamaClient:
             if self._llm_recorder:
                 self._llm_recorder.record_response(self.model, {}, {}, latency, False, str(exc))
             raise
+        finally:
+            if ticket is not None:
+                if ticket.cold and isinstance(data, dict):
+                    ticket.load_seconds = _load_seconds(data)
+                self._model_scheduler.release(ticket)
+            if lease is not None:
+                done = isinstance(data, dict) and data.get("done")
+                self._rate_limiter.release(
+                    lease, _contention_seconds(time.time() - request_start, data) if done else None
+                )
+
+    async def _acquire_model_ticket(self):
+        """Wait for a ``ModelScheduler`` slot on a worker thread, withdrawing the ticket if cancelled.
+
+        Withdrawing wakes the worker, and a slot granted but not yet used is handed
+        back without evicting (or unloading) the resident model.
+        """
+        ticket = self._model_scheduler.enqueue(self.model)
+        try:
+            await asyncio.to_thread(self._model_scheduler.wait, ticket, self.unload_model)
+        except asyncio.CancelledError:
+            self._model_scheduler.withdraw(ticket)
+            raise
+        return ticket
 
     def set_session_context(self, context):
         self._session_context = context
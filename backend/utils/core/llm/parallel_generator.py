@@ -6,12 +6,14 @@ and maintaining proper context ordering.
 """
 
 import asyncio
+import os
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from backend.utils.core.system.agent_logger import AgentLogger
+from backend.utils.core.system.rate_limiter import AsyncRateLimiter, Budget, get_rate_limiter
 
 
 @dataclass
@@ -53,47 +55,6 @@ class GenerationResult:
             self.timestamp = datetime.now()
 
 
-class RateLimiter:
-    """
-    Token-bucket rate limiter for LLM API calls.
-    Prevents overwhelming the Ollama server.
-    """
-
-    def __init__(self, max_requests_per_minute: int = 10, max_concurrent: int = 3):
-        """
-        Initialize rate limiter.
-
-        Args:
-            max_requests_per_minute: Max requests per minute
-            max_concurrent: Max concurrent requests at once
-        """
-        self.max_concurrent = max_concurrent
-        self.min_interval = 60.0 / max_requests_per_minute  # seconds between requests
-        self.last_request_time = 0.0
-        self.active_requests = 0
-        self._lock = asyncio.Lock()
-
-    async def acquire(self) -> None:
-        """Wait until it's safe to make a request."""
-        async with self._lock:
-            # Wait for concurrent slots
-            while self.active_requests >= self.max_concurrent:
-                await asyncio.sleep(0.1)
-
-            # Wait for rate limit
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.min_interval:
-                await asyncio.sleep(self.min_interval - elapsed)
-
-            self.active_requests += 1
-            self.last_request_time = time.time()
-
-    async def release(self) -> None:
-        """Release a request slot."""
-        async with self._lock:
-            self.active_requests = max(0, self.active_requests - 1)
-
-
 class ParallelFileGenerator:
     """
     Orchestrates parallel generation of files using asyncio.
@@ -111,6 +72,7 @@ class ParallelFileGenerator:
         logger: AgentLogger,
         max_concurrent: int = 3,
         max_requests_per_minute: int = 10,
+        ollama_url: Optional[str] = None,
     ):
         """
         Initialize parallel generator.
@@ -119,9 +81,17 @@ class ParallelFileGenerator:
             logger: Logger instance
             max_concurrent: Max concurrent file generations
             max_requests_per_minute: Rate limit for LLM calls
+            ollama_url: Backend whose shared limiter the budget is registered on
+                (defaults to ``OLLAMA_URL``)
         """
         self.logger = logger
-        self.rate_limiter = RateLimiter(max_requests_per_minute, max_concurrent)
+        # Paced one request at a time (burst=1) under the backend's limiter, the one OllamaClient uses for that URL
+        backend_url = ollama_url or os.environ.get("OLLAMA_URL", "http://localhost:11434")
+        self.rate_limiter = AsyncRateLimiter(
+            get_rate_limiter(backend_url),
+            "parallel_generator",
+            Budget(rpm=max_requests_per_minute, max_concurrent=max_concurrent, burst=1),
+        )
         self.generation_fn: Optional[Callable] = None
         self.results: Dict[str, GenerationResult] = {}
         self.failed_files: List[str] = []
@@ -209,8 +179,9 @@ class ParallelFileGenerator:
 
             # Generate file with rate limiting
             start_time = time.time()
+            lease = None
             try:
-                await self.rate_limiter.acquire()
+                lease = await self.rate_limiter.acquire()
 
                 # Call the generation function
                 if asyncio.iscoroutinefunction(self.generation_fn):
@@ -261,7 +232,8 @@ class ParallelFileGenerator:
                 completed_files.add(task.file_path)
 
             finally:
-                await self.rate_limiter.release()
+                if lease is not None:
+                    await self.rate_limiter.release(lease)
 
     def _get_file_dependencies(self, file_path: str, dependency_order: List[str]) -> List[str]:
         """Get files that must be generated before this one."""
@@ -1,21 +1,77 @@
 import yaml
 import logging
 import json
+import os
+import string
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+_MAX_COMPILED_TEMPLATES = 1024
+
+
+class CompiledTemplate:
+    """A ``str.format`` template parsed once and rendered by concatenation.
+
+    Templates using format specs, conversions or attribute/index lookups fall
+    back to ``str.format``; rendering raises the same errors ``str.format`` would.
+    """
+
+    __slots__ = ("source", "fields", "_parts")
+
+    def __init__(self, source: str):
+        self.source = source
+        parts = []
+        simple = True
+        try:
+            for literal, field, spec, conversion in string.Formatter().parse(source):
+                if literal:
+                    parts.append((literal, None))
+                if field is not None:
+                    simple = simple and field.isidentifier() and not spec and not conversion
+                    parts.append((None, field))
+        except ValueError:
+            simple = False  # malformed braces: let str.format raise at render time
+        self._parts: Optional[Tuple[Tuple[Optional[str], Optional[str]], ...]] = tuple(parts) if simple else None
+        self.fields: FrozenSet[str] = frozenset(f for _, f in parts if f)
+
+    def render(self, **values: Any) -> str:
+        if self._parts is None:
+            return self.source.format(**values)
+        return "".join(literal if field is None else format(values[field]) for literal, field in self._parts)
+
+
+class _CachedFile:
+    __slots__ = ("path", "mtime_ns", "content", "checked_at")
+
+    def __init__(self, path: Path, mtime_ns: int, content: Any, checked_at: float):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.content = content
+        self.checked_at = checked_at
+
 
 class PromptLoader:
     """
     Utility class for loading centralized prompts from SQLite or YAML files.
     Ensures DB-first priority with filesystem fallback.
+
+    Both sources are cached so the hot path is a dictionary lookup:
+    DB prompts are cached per role and dropped whenever the repository's
+    ``generation`` counter changes (bumped on every save/rollback), and YAML
+    files are re-read only when their mtime changes (checked at most every
+    ``mtime_check_interval`` seconds).
     """
 
     _instance = None
-    _cache: Dict[str, Any] = {}
+    _cache: Dict[str, _CachedFile] = {}
+    _db_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+    _db_generation: Optional[int] = None
+    _templates: Dict[str, CompiledTemplate] = {}
     _repository = None
+    mtime_check_interval = 1.0
 
     def __new__(cls, prompts_dir: Optional[Path] = None):
         if cls._instance is None:
@@ -31,8 +87,7 @@ class PromptLoader:
         """Injects the PromptRepository for DB access."""
         self._repository = repository
 
-    async def _get_db_prompt(self, role: str) -> Optional[Dict[str, Any]]:
-        """Attempt to load a prompt dictionary from the database."""
+    def _get_repository(self):
         if not self._repository:
             # Try to lazy load from main container to avoid circular imports
             try:
@@ -42,20 +97,48 @@ class PromptLoader:
                     self._repository = main_container.core.prompt_repository()
                 elif hasattr(main_container, "prompt_repository"):
                     self._repository = main_container.prompt_repository()
-            except:
+            except Exception:
                 return None
+        return self._repository
 
-        if self._repository:
-            try:
-                text = await self._repository.get_active_prompt(role)
-                if text:
-                    # Try to parse as JSON if it looks like one, otherwise return as system prompt
-                    if text.strip().startswith("{") or text.strip().startswith("["):
-                        return json.loads(text)
-                    return {"system": text}
-            except Exception as e:
-                logger.debug(f"DB prompt load failed for {role}: {e}")
-        return None
+    async def _get_db_prompt(self, role: str) -> Optional[Dict[str, Any]]:
+        """Attempt to load a prompt dictionary from the database (cached per repository generation)."""
+        repository = self._get_repository()
+        if not repository:
+            return None
+
+        generation = getattr(repository, "generation", None)
+        cls = type(self)
+        if generation is not None:
+            if generation == cls._db_generation:
+                if role in cls._db_cache:
+                    return cls._db_cache[role]
+            else:
+                cls._db_cache = {}
+                cls._db_generation = generation
+
+        try:
+            text = await repository.get_active_prompt(role)
+        except Exception as e:
+            logger.debug(f"DB prompt load failed for {role}: {e}")
+            return None
+
+        content = None
+        if text:
+            # Try to parse as JSON if it looks like one, otherwise return as system prompt
+            if text.strip().startswith("{") or text.strip().startswith("["):
+                try:
+                    content = json.loads(text)
+                except ValueError as e:
+                    logger.debug(f"DB prompt for {role} is not valid JSON: {e}")
+                    return None
+            else:
+                content = {"system": text}
+
+        # Only cache if nothing was saved while we were querying
+        if generation is not None and getattr(repository, "generation", None) == generation:
+            cls._db_cache[role] = content
+        return content
 
     async def load_prompt(self, relative_path: str) -> Dict[str, Any]:
         """
@@ -68,21 +151,42 @@ class PromptLoader:
         if db_content:
             return db_content
 
-        # 2. Cache check for filesystem
-        if relative_path in self._cache:
-            return self._cache[relative_path]
-
-        # 3. Filesystem fallback
+        # 2. Filesystem (cached, mtime-validated)
         return self.load_prompt_sync(relative_path)
 
     def load_prompt_sync(self, relative_path: str) -> Dict[str, Any]:
         """
         Synchronous version of load_prompt.
-        SKIPS DB CHECK if not already in cache.
+        SKIPS DB CHECK; YAML content is cached until the file's mtime changes.
         """
-        if relative_path in self._cache:
-            return self._cache[relative_path]
+        cached = self._cache.get(relative_path)
+        if cached is not None:
+            now = time.monotonic()
+            if now - cached.checked_at < self.mtime_check_interval:
+                return cached.content
+            try:
+                if os.stat(cached.path).st_mtime_ns == cached.mtime_ns:
+                    cached.checked_at = now
+                    return cached.content
+            except OSError:
+                pass
+            logger.info(f"Prompt file changed on disk, reloading: {cached.path}")
+
+        file_path = self._resolve_path(relative_path)
+        if file_path is None:
+            return {}
+
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = yaml.safe_load(f)
+            self._cache[relative_path] = _CachedFile(file_path, mtime_ns, content, time.monotonic())
+            return content
+        except Exception as e:
+            logger.error(f"Error loading prompt file {file_path}: {e}")
+            return {}
 
+    def _resolve_path(self, relative_path: str) -> Optional[Path]:
         file_path = self.prompts_dir / relative_path
 
         if not file_path.exists():
@@ -106,16 +210,23 @@ class PromptLoader:
 
             if not file_path.exists():
                 logger.error(f"Prompt file not found: {file_path}. Current Dir: {Path.cwd()}")
-                return {}
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = yaml.safe_load(f)
-                self._cache[relative_path] = content
-                return content
-        except Exception as e:
-            logger.error(f"Error loading prompt file {file_path}: {e}")
-            return {}
+                return None
+        return file_path
+
+    @classmethod
+    def compile_template(cls, template: str) -> CompiledTemplate:
+        """Return the pre-parsed form of *template* (cached by its text)."""
+        compiled = cls._templates.get(template)
+        if compiled is None:
+            if len(cls._templates) >= _MAX_COMPILED_TEMPLATES:
+                cls._templates.clear()
+            compiled = cls._templates[template] = CompiledTemplate(template)
+        return compiled
+
+    @classmethod
+    def format_prompt(cls, template: str, **values: Any) -> str:
+        """Equivalent to ``template.format(**values)`` using the compiled-template cache."""
+        return cls.compile_template(template).render(**values)
 
     async def get_prompt(self, file_path: str, key: str) -> Optional[str]:
         """Helper to get a specific prompt string from a file."""
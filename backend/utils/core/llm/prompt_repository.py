@@ -13,6 +13,10 @@ logger = logging.getLogger(__name__)
 
 
 class PromptRepository:
+    # Bumped on every write that can change an active prompt. Shared by all
+    # instances so readers (e.g. PromptLoader) can cache until it changes.
+    _generation = 0
+
     def __init__(
         self,
         db_path: Optional[Path] = None,
@@ -28,6 +32,15 @@ class PromptRepository:
 
         self.db = AsyncDatabaseManager(self._session_factory)
 
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever an active prompt may have changed."""
+        return PromptRepository._generation
+
+    @staticmethod
+    def _bump_generation() -> None:
+        PromptRepository._generation += 1
+
     async def _init_db(self) -> None:
         """Initialize the prompts table (idempotent, call once at startup)."""
         await self.db.execute("""
@@ -61,23 +74,26 @@ class PromptRepository:
         )
         next_version = (row["max_ver"] or 0) + 1 if row else 1
 
-        if is_active:
+        try:
+            if is_active:
+                await self.db.execute(
+                    "UPDATE prompts SET is_active = 0 WHERE agent_role = :agent_role",
+                    {"agent_role": role},
+                )
+
             await self.db.execute(
-                "UPDATE prompts SET is_active = 0 WHERE agent_role = :agent_role",
-                {"agent_role": role},
+                "INSERT INTO prompts (agent_role, prompt_text, version, created_at, is_active) "
+                "VALUES (:agent_role, :prompt_text, :version, :created_at, :is_active)",
+                {
+                    "agent_role": role,
+                    "prompt_text": text,
+                    "version": next_version,
+                    "created_at": datetime.now().isoformat(),
+                    "is_active": 1 if is_active else 0,
+                },
             )
-
-        await self.db.execute(
-            "INSERT INTO prompts (agent_role, prompt_text, version, created_at, is_active) "
-            "VALUES (:agent_role, :prompt_text, :version, :created_at, :is_active)",
-            {
-                "agent_role": role,
-                "prompt_text": text,
-                "version": next_version,
-                "created_at": datetime.now().isoformat(),
-                "is_active": 1 if is_active else 0,
-            },
-        )
+        finally:
+            PromptRepository._bump_generation()
         result = await self.db.fetch_one(
             "SELECT id FROM prompts WHERE agent_role = :agent_role AND version = :version",
             {"agent_role": role, "version": next_version},
@@ -106,11 +122,14 @@ class PromptRepository:
         if not row:
             return
         role = row["agent_role"]
-        await self.db.execute(
-            "UPDATE prompts SET is_active = 0 WHERE agent_role = :agent_role",
-            {"agent_role": role},
-        )
-        await self.db.execute(
-            "UPDATE prompts SET is_active = 1 WHERE id = :prompt_id",
-            {"prompt_id": prompt_id},
-        )
+        try:
+            await self.db.execute(
+                "UPDATE prompts SET is_active = 0 WHERE agent_role = :agent_role",
+                {"agent_role": role},
+            )
+            await self.db.execute(
+                "UPDATE prompts SET is_active = 1 WHERE id = :prompt_id",
+                {"prompt_id": prompt_id},
+            )
+        finally:
+            PromptRepository._bump_generation()
@@ -3,14 +3,20 @@ Error Knowledge Base for Long-term Learning
 
 Stores and retrieves learned patterns from code generation failures
 to prevent repeating the same mistakes across projects.
+Backed by stdlib sqlite3 with an index on (language, error_type, score) so
+prompt-time lookups stay flat as the knowledge base grows.
 """
 
 import hashlib
+import heapq
 import json
+import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.utils.core.system.agent_logger import AgentLogger
 
@@ -60,6 +66,11 @@ class ErrorPattern:
         """Create from dictionary."""
         return cls(**data)
 
+    @property
+    def score(self) -> float:
+        """Relevance score used to rank patterns for prevention prompts."""
+        return self.frequency * (1 + len(self.tags) * 0.1)
+
 
 class ErrorKnowledgeBase:
     """
@@ -70,8 +81,17 @@ class ErrorKnowledgeBase:
     - Provide prevention tips to the LLM before generating files
     - Track error trends and patterns
     - Build immunity to common mistakes
+
+    Patterns are persisted one row at a time (upsert) in
+    ``{knowledge_dir}/error_patterns.db``.  Ranked lookups are served from an
+    in-memory top-k cache per language that is invalidated whenever a pattern
+    for that language is recorded.  A legacy ``.error_patterns.json`` file is
+    imported automatically the first time the database is created.
     """
 
+    # Number of ranked patterns kept per (language, error_type) cache entry
+    TOP_K_CACHE_SIZE = 20
+
     def __init__(self, knowledge_dir: Path, logger: AgentLogger, enable_persistence: bool = True):
         """
         Initialize error knowledge base.
@@ -85,13 +105,106 @@ class ErrorKnowledgeBase:
         self.logger = logger
         self.enable_persistence = enable_persistence
 
-        # In-memory storage
+        # In-memory mirror of the store (pattern_id -> ErrorPattern)
         self.patterns: Dict[str, ErrorPattern] = {}
         self.kb_file = self.knowledge_dir / ".error_patterns.json"
+        self.db_path = self.knowledge_dir / "error_patterns.db"
+
+        # (language, error_type or None) -> ranked patterns, at most TOP_K_CACHE_SIZE
+        self._top_k_cache: Dict[Tuple[str, Optional[str]], List[ErrorPattern]] = {}
+        self._lock = threading.RLock()
 
         if self.enable_persistence:
             self.knowledge_dir.mkdir(parents=True, exist_ok=True)
-            self._load_from_disk()
+            self._init_db()
+            self._load_from_db()
+            if not self.patterns and self.kb_file.exists():
+                self.import_json(self.kb_file)
+
+    # ------------------------------------------------------------------
+    # Internal sqlite3 helpers
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _conn(self):
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        """Create the patterns table and its ranking indexes (idempotent)."""
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS error_patterns (
+                    pattern_id TEXT PRIMARY KEY,
+                    error_type TEXT NOT NULL,
+                    affected_file_type TEXT DEFAULT '',
+                    description TEXT DEFAULT '',
+                    example_error TEXT DEFAULT '',
+                    prevention_tip TEXT DEFAULT '',
+                    solution_template TEXT DEFAULT '',
+                    language TEXT NOT NULL,
+                    frequency INTEGER NOT NULL DEFAULT 1,
+                    severity TEXT DEFAULT 'medium',
+                    last_encountered TEXT,
+                    tags TEXT DEFAULT '[]',
+                    score REAL NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_error_patterns_lang ON error_patterns(language, score DESC)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_error_patterns_lang_type "
+                "ON error_patterns(language, error_type, score DESC)"
+            )
+
+    @staticmethod
+    def _row_params(pattern: ErrorPattern) -> Dict[str, Any]:
+        data = pattern.to_dict()
+        data["tags"] = json.dumps(data["tags"])
+        data["score"] = pattern.score
+        return data
+
+    @staticmethod
+    def _pattern_from_row(row: sqlite3.Row) -> ErrorPattern:
+        data = {k: row[k] for k in row.keys() if k != "score"}
+        data["tags"] = json.loads(data.get("tags") or "[]")
+        return ErrorPattern.from_dict(data)
+
+    def _upsert_pattern(self, pattern: ErrorPattern) -> None:
+        """Write a single pattern row (insert or update in place)."""
+        if not self.enable_persistence:
+            return
+
+        data = self._row_params(pattern)
+        columns = ", ".join(data.keys())
+        placeholders = ", ".join(f":{k}" for k in data.keys())
+        updates = ", ".join(f"{k}=excluded.{k}" for k in data.keys() if k != "pattern_id")
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    f"INSERT INTO error_patterns ({columns}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(pattern_id) DO UPDATE SET {updates}",
+                    data,
+                )
+        except Exception as e:
+            self.logger.warning(f"Failed to persist error pattern {pattern.pattern_id}: {e}")
+
+    def _invalidate_cache(self, language: str) -> None:
+        for key in [k for k in self._top_k_cache if k[0] == language]:
+            del self._top_k_cache[key]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
 
     def record_error(
         self,
@@ -118,33 +231,35 @@ class ErrorKnowledgeBase:
         """
         pattern_id = self._generate_pattern_id(error_message, file_content)
 
-        # Check if pattern already exists
-        if pattern_id in self.patterns:
-            self.patterns[pattern_id].frequency += 1
-            self.patterns[pattern_id].last_encountered = datetime.now().isoformat()
-            self.logger.debug(f"Updated error pattern {pattern_id} (frequency: {self.patterns[pattern_id].frequency})")
-        else:
-            # Create new pattern
-            language = self._detect_language(file_path)
-            file_type = Path(file_path).suffix
-
-            pattern = ErrorPattern(
-                pattern_id=pattern_id,
-                error_type=error_type,
-                affected_file_type=file_type,
-                description=f"Error in {file_path}: {error_message[:200]}",
-                example_error=error_message[:500],
-                prevention_tip=self._generate_prevention_tip(error_type, error_message),
-                solution_template=solution or "Review error message and fix code",
-                language=language,
-                tags=self._generate_tags(error_type, error_message),
-            )
-
-            self.patterns[pattern_id] = pattern
-            self.logger.info(f"Recorded new error pattern: {pattern_id}")
-
-        if self.enable_persistence:
-            self._save_to_disk()
+        with self._lock:
+            # Check if pattern already exists
+            if pattern_id in self.patterns:
+                pattern = self.patterns[pattern_id]
+                pattern.frequency += 1
+                pattern.last_encountered = datetime.now().isoformat()
+                self.logger.debug(f"Updated error pattern {pattern_id} (frequency: {pattern.frequency})")
+            else:
+                # Create new pattern
+                language = self._detect_language(file_path)
+                file_type = Path(file_path).suffix
+
+                pattern = ErrorPattern(
+                    pattern_id=pattern_id,
+                    error_type=error_type,
+                    affected_file_type=file_type,
+                    description=f"Error in {file_path}: {error_message[:200]}",
+                    example_error=error_message[:500],
+                    prevention_tip=self._generate_prevention_tip(error_type, error_message),
+                    solution_template=solution or "Review error message and fix code",
+                    language=language,
+                    tags=self._generate_tags(error_type, error_message),
+                )
+
+                self.patterns[pattern_id] = pattern
+                self.logger.info(f"Recorded new error pattern: {pattern_id}")
+
+            self._invalidate_cache(pattern.language)
+            self._upsert_pattern(pattern)
 
         return pattern_id
 
@@ -165,26 +280,48 @@ class ErrorKnowledgeBase:
             max_results: Max patterns to return
 
         Returns:
-            List of relevant ErrorPatterns
+            List of relevant ErrorPatterns, highest score first
         """
-        candidates = []
+        if max_results <= 0:
+            return []
 
-        for pattern in self.patterns.values():
-            # Filter by language and file type
-            if pattern.language != language:
-                continue
+        key = (language, error_type or None)
+        with self._lock:
+            cached = self._top_k_cache.get(key)
+            if cached is not None and (max_results <= self.TOP_K_CACHE_SIZE or len(cached) < self.TOP_K_CACHE_SIZE):
+                return cached[:max_results]
 
-            if error_type and pattern.error_type != error_type:
-                continue
+            limit = max(max_results, self.TOP_K_CACHE_SIZE)
+            ranked = self._ranked_patterns(language, error_type, limit)
+            self._top_k_cache[key] = ranked[: self.TOP_K_CACHE_SIZE]
 
-            # Score based on relevance and frequency
-            score = pattern.frequency * (1 + len(pattern.tags) * 0.1)
-            candidates.append((score, pattern))
+        return ranked[:max_results]
 
-        # Sort by score descending
-        candidates.sort(key=lambda x: x[0], reverse=True)
+    def _ranked_patterns(self, language: str, error_type: Optional[str], limit: int) -> List[ErrorPattern]:
+        """Return up to *limit* patterns for *language*, ordered by score."""
+        if not self.enable_persistence:
+            candidates = (
+                p
+                for p in self.patterns.values()
+                if p.language == language and (not error_type or p.error_type == error_type)
+            )
+            return heapq.nlargest(limit, candidates, key=lambda p: p.score)
+
+        query = "SELECT pattern_id FROM error_patterns WHERE language = ?"
+        params: List[Any] = [language]
+        if error_type:
+            query += " AND error_type = ?"
+            params.append(error_type)
+        query += " ORDER BY score DESC LIMIT ?"
+        params.append(limit)
 
-        return [p for _, p in candidates[:max_results]]
+        try:
+            with self._conn() as conn:
+                rows = conn.execute(query, params).fetchall()
+        except Exception as e:
+            self.logger.warning(f"Failed to query error knowledge base: {e}")
+            return []
+        return [self.patterns[r["pattern_id"]] for r in rows if r["pattern_id"] in self.patterns]
 
     def get_prevention_warnings(
         self,
@@ -220,7 +357,7 @@ class ErrorKnowledgeBase:
         by_language = {}
         by_severity = {}
 
-        for pattern in self.patterns.values():
+        for pattern in list(self.patterns.values()):
             # By error type
             by_type[pattern.error_type] = by_type.get(pattern.error_type, 0) + pattern.frequency
 
@@ -230,7 +367,7 @@ class ErrorKnowledgeBase:
             # By severity
             by_severity[pattern.severity] = by_severity.get(pattern.severity, 0) + pattern.frequency
 
-        total_errors = sum(p.frequency for p in self.patterns.values())
+        total_errors = sum(p.frequency for p in list(self.patterns.values()))
 
         return {
             "total_patterns": len(self.patterns),
@@ -240,6 +377,58 @@ class ErrorKnowledgeBase:
             "by_severity": by_severity,
         }
 
+    def import_json(self, json_path: Optional[Path] = None) -> int:
+        """Import patterns from a legacy ``.error_patterns.json`` file.
+
+        Existing patterns with the same ID keep the higher frequency.
+
+        Args:
+            json_path: File to import (defaults to ``kb_file``)
+
+        Returns:
+            Number of patterns imported
+        """
+        json_path = Path(json_path) if json_path else self.kb_file
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to read legacy error knowledge base {json_path}: {e}")
+            return 0
+
+        imported: List[ErrorPattern] = []
+        with self._lock:
+            for pattern_id, pattern_data in data.get("patterns", {}).items():
+                try:
+                    pattern = ErrorPattern.from_dict(pattern_data)
+                except TypeError as e:
+                    self.logger.warning(f"Skipping malformed error pattern {pattern_id}: {e}")
+                    continue
+                existing = self.patterns.get(pattern.pattern_id)
+                if existing and existing.frequency >= pattern.frequency:
+                    continue
+                self.patterns[pattern.pattern_id] = pattern
+                imported.append(pattern)
+
+            if self.enable_persistence and imported:
+                rows = [self._row_params(p) for p in imported]
+                columns = list(rows[0].keys())
+                updates = ", ".join(f"{k}=excluded.{k}" for k in columns if k != "pattern_id")
+                try:
+                    with self._conn() as conn:
+                        conn.executemany(
+                            f"INSERT INTO error_patterns ({', '.join(columns)}) "
+                            f"VALUES ({', '.join(':' + k for k in columns)}) "
+                            f"ON CONFLICT(pattern_id) DO UPDATE SET {updates}",
+                            rows,
+                        )
+                except Exception as e:
+                    self.logger.warning(f"Failed to persist imported error patterns: {e}")
+            self._top_k_cache.clear()
+
+        self.logger.info(f"Imported {len(imported)} error patterns from {json_path}")
+        return len(imported)
+
     def _generate_pattern_id(self, error_msg: str, file_content: str) -> str:
         """Generate unique ID for error pattern."""
         combined = f"{error_msg[:100]}{file_content[:100]}"
@@ -298,35 +487,16 @@ class ErrorKnowledgeBase:
 
         return tags
 
-    def _save_to_disk(self) -> None:
-        """Persist knowledge base to disk."""
-        if not self.enable_persistence:
-            return
-
-        try:
-            data = {
-                "saved_at": datetime.now().isoformat(),
-                "patterns": {k: v.to_dict() for k, v in self.patterns.items()},
-            }
-
-            with open(self.kb_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, default=str)
-        except Exception as e:
-            self.logger.warning(f"Failed to save error knowledge base: {e}")
-
-    def _load_from_disk(self) -> None:
-        """Load knowledge base from disk."""
-        if not self.kb_file.exists():
-            return
-
+    def _load_from_db(self) -> None:
+        """Populate the in-memory mirror from the database."""
         try:
-            with open(self.kb_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            for pattern_id, pattern_data in data.get("patterns", {}).items():
-                self.patterns[pattern_id] = ErrorPattern.from_dict(pattern_data)
-
-            self.logger.info(f"Loaded {len(self.patterns)} error patterns from disk")
+            with self._conn() as conn:
+                rows = conn.execute("SELECT * FROM error_patterns").fetchall()
+            for row in rows:
+                pattern = self._pattern_from_row(row)
+                self.patterns[pattern.pattern_id] = pattern
+            if rows:
+                self.logger.info(f"Loaded {len(self.patterns)} error patterns from disk")
         except Exception as e:
             self.logger.warning(f"Failed to load error knowledge base: {e}")
             self.patterns = {}
@@ -0,0 +1,292 @@
+"""
+Journaled JSON Key-Value Store
+
+Write-behind persistence for small agent state files such as
+``.agent_memory.json``.  Mutations are appended to a JSON-lines journal
+(``<snapshot>.journal``) by a background thread that coalesces bursts of
+``set()`` calls into a single write.  Lists that only grew since the last
+flush (e.g. conversation history) are journaled as ``extend`` records holding
+just the new items, so a chat turn costs O(new messages) disk I/O instead of
+O(history).
+
+The journal is periodically compacted into the snapshot file, which stays a
+plain JSON object readable by older versions.  Snapshots are written to a
+temporary file, fsynced and atomically swapped in with ``os.replace``; every
+journal record carries a sequence number and the snapshot records the last
+sequence it contains, so a crash between the swap and the journal truncation
+never replays records twice.
+"""
+
+import atexit
+import json
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Reserved snapshot key holding the last journal sequence folded into it
+_SEQ_KEY = "__journal_seq__"
+
+_MISSING = object()
+
+_OPEN_STORES: "weakref.WeakSet[JournaledJSONStore]" = weakref.WeakSet()
+
+
+def _flush_open_stores() -> None:
+    for store in list(_OPEN_STORES):
+        try:
+            store.flush()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_open_stores)
+
+
+def _copy_value(value: Any) -> Any:
+    """Shallow-copy containers so later in-place mutation by callers is not raced by the flusher."""
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class JournaledJSONStore:
+    """Dict-like store persisted as a JSON snapshot plus an append-only journal.
+
+    Args:
+        snapshot_path: Path of the JSON snapshot (e.g. ``.agent_memory.json``).
+        logger: Logger instance.
+        flush_interval: Seconds to wait after the first pending write before
+            flushing, so bursts of ``set()`` calls are coalesced.
+        compact_threshold_bytes: Journal size that triggers compaction into
+            the snapshot.
+        write_behind: If False, every ``set()`` flushes synchronously.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        logger: Any,
+        flush_interval: float = 0.5,
+        compact_threshold_bytes: int = 1_000_000,
+        write_behind: bool = True,
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.name + ".journal")
+        self.logger = logger
+        self.flush_interval = flush_interval
+        self.compact_threshold_bytes = compact_threshold_bytes
+        self.write_behind = write_behind
+
+        self.data: Dict[str, Any] = {}
+        # What snapshot + journal currently represent on disk, per key
+        self._persisted: Dict[str, Any] = {}
+        self._dirty: Dict[str, Any] = {}
+        self._seq = 0
+        self._journal_bytes = 0
+
+        self._lock = threading.Lock()  # guards data / _dirty
+        self._io_lock = threading.Lock()  # serialises journal and snapshot writes
+        self._flush_requested = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load()
+        _OPEN_STORES.add(self)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Update *key* in memory and schedule it for a write-behind flush."""
+        with self._lock:
+            self.data[key] = value
+            self._dirty[key] = _copy_value(value)
+            if not self.write_behind or self._closed.is_set():
+                start_thread = False
+            else:
+                start_thread = self._thread is None
+                if start_thread:
+                    self._thread = threading.Thread(target=self._run, daemon=True, name="JournaledJSONStore")
+                self._flush_requested.set()
+
+        if not self.write_behind or self._closed.is_set():
+            self.flush()
+        elif start_thread:
+            self._thread.start()
+
+    def flush(self) -> None:
+        """Write all pending changes to the journal, compacting when it grows too large."""
+        with self._io_lock:
+            with self._lock:
+                pending, self._dirty = self._dirty, {}
+            records = self._build_records(pending)
+            if records:
+                self._append_journal(records)
+            if self._journal_bytes >= self.compact_threshold_bytes:
+                self._compact_locked()
+
+    def compact(self) -> None:
+        """Flush pending changes and fold the journal into a fresh snapshot."""
+        self.flush()
+        with self._io_lock:
+            self._compact_locked()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the background flusher."""
+        with self._lock:
+            self._closed.set()
+            thread = self._thread
+            self._flush_requested.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+        _OPEN_STORES.discard(self)
+
+    # ------------------------------------------------------------------
+    # Background flusher
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        """Coalesce writes for ``flush_interval`` then flush; exit once idle."""
+        while True:
+            self._flush_requested.wait()
+            # Let a burst of set() calls accumulate before writing
+            self._closed.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Error flushing memory journal {self.journal_path}: {e}")
+            with self._lock:
+                if not self._dirty or self._closed.is_set():
+                    self._thread = None
+                    return
+
+    # ------------------------------------------------------------------
+    # Journal and snapshot I/O
+    # ------------------------------------------------------------------
+
+    def _build_records(self, pending: Dict[str, Any]) -> List[Dict[str, Any]]:
+        records = []
+        for key, value in pending.items():
+            previous = self._persisted.get(key, _MISSING)
+            if previous is not _MISSING and previous == value:
+                continue
+            if (
+                isinstance(value, list)
+                and isinstance(previous, list)
+                and len(value) > len(previous)
+                and value[: len(previous)] == previous
+            ):
+                records.append({"op": "extend", "k": key, "v": value[len(previous) :]})
+            else:
+                records.append({"op": "set", "k": key, "v": value})
+            self._persisted[key] = value
+        return records
+
+    def _append_journal(self, records: List[Dict[str, Any]]) -> None:
+        lines = []
+        for record in records:
+            self._seq += 1
+            record["seq"] = self._seq
+            lines.append(json.dumps(record, ensure_ascii=False, default=str))
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            with open(self.journal_path, "ab") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_bytes += len(payload)
+        except Exception as e:
+            self.logger.error(f"Error writing memory journal {self.journal_path}: {e}")
+
+    def _compact_locked(self) -> None:
+        snapshot = dict(self._persisted)
+        snapshot[_SEQ_KEY] = self._seq
+        tmp_file = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(str(tmp_file), str(self.snapshot_path))  # Atomic on POSIX; best-effort on Windows
+            with open(self.journal_path, "wb"):
+                pass
+            self._journal_bytes = 0
+            self.logger.debug(f"Memory snapshot compacted to {self.snapshot_path}")
+        except Exception as e:
+            self.logger.error(f"Error compacting memory snapshot {self.snapshot_path}: {e}")
+        finally:
+            if tmp_file.exists():
+                tmp_file.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        snapshot_seq = 0
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    snapshot_seq = int(loaded.pop(_SEQ_KEY, 0))
+                    self._persisted = loaded
+                self.logger.info(f"Memory loaded from {self.snapshot_path}")
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Error decoding memory file {self.snapshot_path}: {e}")
+            except Exception as e:
+                self.logger.error(f"Unexpected error loading memory from {self.snapshot_path}: {e}")
+        else:
+            self.logger.info("No existing memory file found, starting with empty memory.")
+
+        self._seq = snapshot_seq
+        torn = self._replay_journal(snapshot_seq)
+        self.data = {k: _copy_value(v) for k, v in self._persisted.items()}
+
+        if torn:
+            # A partially written record would corrupt the next append; start a clean journal
+            with self._io_lock:
+                self._compact_locked()
+
+    def _replay_journal(self, snapshot_seq: int) -> bool:
+        """Apply journal records newer than the snapshot. Returns True if a torn record was found."""
+        if not self.journal_path.exists():
+            return False
+        try:
+            raw = self.journal_path.read_bytes()
+        except Exception as e:
+            self.logger.error(f"Error reading memory journal {self.journal_path}: {e}")
+            return False
+
+        self._journal_bytes = len(raw)
+        replayed = 0
+        for line in raw.decode("utf-8", errors="replace").splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                seq = int(record["seq"])
+                key = record["k"]
+                op = record["op"]
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                self.logger.warning(f"Ignoring torn record at end of memory journal {self.journal_path}")
+                return True
+            if seq <= snapshot_seq:
+                continue
+            if op == "extend" and isinstance(self._persisted.get(key), list):
+                self._persisted[key] = self._persisted[key] + record["v"]
+            else:
+                self._persisted[key] = record["v"]
+            self._seq = seq
+            replayed += 1
+
+        if replayed:
+            self.logger.info(f"Replayed {replayed} memory journal records from {self.journal_path}")
+        return False
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from backend.utils.core.memory.chroma_manager import ChromaClientManager
+from backend.utils.core.memory.journaled_store import JournaledJSONStore
 from backend.utils.core.preference_manager_extended import PreferenceManagerExtended
 
 
@@ -26,6 +27,7 @@ class MemoryManager:
         self.config = config or {}
         self.llm_recorder = llm_recorder  # Store llm_recorder
         self.memory: Dict[str, Any] = {}
+        self._store: Optional[JournaledJSONStore] = None
         self._load_memory()
 
         self.preference_manager = PreferenceManagerExtended(project_root / ".ollash" / "knowledge_workspace")
@@ -105,38 +107,35 @@ class MemoryManager:
     # ----------------------------------------------------------------
 
     def _load_memory(self):
-        """Loads memory from the .agent_memory.json file."""
-        if self.memory_file.exists():
-            try:
-                with open(self.memory_file, "r", encoding="utf-8") as f:
-                    self.memory = json.load(f)
-                self.logger.info(f"Memory loaded from {self.memory_file}")
-            except json.JSONDecodeError as e:
-                self.logger.error(f"Error decoding memory file {self.memory_file}: {e}")
-                self.memory = {}
-            except Exception as e:
-                self.logger.error(f"Unexpected error loading memory from {self.memory_file}: {e}")
-                self.memory = {}
-        else:
-            self.logger.info("No existing memory file found, starting with empty memory.")
+        """Loads memory from .agent_memory.json plus any pending journal records."""
+        self._store = JournaledJSONStore(
+            self.memory_file,
+            self.logger,
+            flush_interval=self.config.get("memory_flush_interval_seconds", 0.5),
+            compact_threshold_bytes=self.config.get("memory_journal_compact_bytes", 1_000_000),
+            write_behind=self.config.get("memory_write_behind", True),
+        )
+        self.memory = self._store.data
 
     def _save_memory(self):
-        """Saves current memory to the .agent_memory.json file."""
-        try:
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                json.dump(self.memory, f, indent=2)
-            self.logger.info(f"Memory saved to {self.memory_file}")
-        except Exception as e:
-            self.logger.error(f"Error saving memory to {self.memory_file}: {e}")
+        """Synchronously flushes pending memory changes to the journal."""
+        self._store.flush()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieves a value from memory."""
         return self.memory.get(key, default)
 
     def set(self, key: str, value: Any):
-        """Sets a value in memory and saves immediately."""
-        self.memory[key] = value
-        self._save_memory()
+        """Sets a value in memory; it is persisted by the write-behind journal flusher."""
+        self._store.set(key, value)
+
+    def flush(self) -> None:
+        """Flushes pending writes and compacts the journal into the snapshot file."""
+        self._store.compact()
+
+    def close(self) -> None:
+        """Flushes pending writes and stops the background flusher."""
+        self._store.close()
 
     # ----------------------------------------------------------------
     # Preference Management
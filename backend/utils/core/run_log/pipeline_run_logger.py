@@ -1,21 +1,146 @@
 """Append-only pipeline run logger for AutoAgent.
 
-Writes OLLASH_RUN_LOG.md into the generated project directory as the pipeline runs.
-The file is progressively flushed after every write so a mid-run crash leaves a
-readable partial log.
-
-Thread-safe: a single threading.Lock guards all _append() calls.
-CodeFillPhase uses a ThreadPoolExecutor, so concurrent log_llm_call() calls are
-expected and must not interleave partial writes.
+Writes OLLASH_RUN_LOG.md into the generated project directory as the pipeline runs,
+plus a machine-readable OLLASH_RUN_LOG.jsonl event stream next to it.
+
+By default every write is flushed immediately so a mid-run crash leaves a
+readable partial log.  With ``background_writer=True`` writes are handed to a
+dedicated writer thread through a bounded queue and flushed in batches, so
+CodeFill worker threads never block on disk I/O.
+
+In the JSONL stream, prompt and response bodies are stored once per content
+hash as ``blob`` records (optionally gzip/zstd compressed) and referenced from
+``llm_call`` events, so a system prompt repeated across hundreds of calls is
+stored a single time.  Use read_run_events() / summarize_phase_stats() to
+consume it.
+
+Thread-safe: a single threading.Lock guards all synchronous writes and shared
+counters.  CodeFillPhase uses a ThreadPoolExecutor, so concurrent
+log_llm_call() calls are expected and must not interleave partial writes.
 """
 
 from __future__ import annotations
 
+import base64
+import gzip
+import hashlib
+import json
+import queue
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import zstandard as _zstd
+except ImportError:  # optional dependency
+    _zstd = None
+
+_STOP = object()
+
+
+def _decode_blob(record: Dict[str, Any]) -> str:
+    """Return the text stored in a ``blob`` event record."""
+    encoding = record.get("encoding", "utf-8")
+    data = record.get("data", "")
+    if encoding == "utf-8":
+        return data
+    raw = base64.b64decode(data)
+    if encoding == "gzip+base64":
+        return gzip.decompress(raw).decode("utf-8")
+    if encoding == "zstd+base64":
+        if _zstd is None:
+            raise RuntimeError("zstandard is required to decode zstd-compressed run log blobs")
+        return _zstd.ZstdDecompressor().decompress(raw).decode("utf-8")
+    raise ValueError(f"Unknown blob encoding: {encoding}")
+
+
+def read_run_events(jsonl_path: Path, resolve_blobs: bool = False) -> List[Dict[str, Any]]:
+    """Read an OLLASH_RUN_LOG.jsonl stream.
+
+    Args:
+        jsonl_path: Path of the JSONL file.
+        resolve_blobs: If True, ``blob`` records are dropped and ``llm_call``
+            events get ``system``/``user``/``response`` text fields resolved
+            from their ``*_hash`` references.
+    """
+    events: List[Dict[str, Any]] = []
+    blobs: Dict[str, Dict[str, Any]] = {}
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line after a crash
+            if record.get("event") == "blob":
+                blobs[record["hash"]] = record
+                if resolve_blobs:
+                    continue
+            events.append(record)
+
+    if resolve_blobs:
+        for event in events:
+            if event.get("event") != "llm_call":
+                continue
+            for field_name in ("system", "user", "response"):
+                blob = blobs.get(event.get(f"{field_name}_hash", ""))
+                if blob is not None:
+                    event[field_name] = _decode_blob(blob)
+    return events
+
+
+def summarize_phase_stats(events: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Aggregate per-phase statistics from run events.
+
+    Returns:
+        phase_id → {label, status, elapsed_s, llm_calls, llm_ms, prompt_tokens,
+        completion_tokens, files_written}
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+
+    def _phase(phase_id: str) -> Dict[str, Any]:
+        return stats.setdefault(
+            phase_id,
+            {
+                "label": "",
+                "status": None,
+                "elapsed_s": 0.0,
+                "llm_calls": 0,
+                "llm_ms": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "files_written": 0,
+            },
+        )
+
+    for event in events:
+        kind = event.get("event")
+        phase_id = event.get("phase_id")
+        if phase_id is None:
+            continue
+        entry = _phase(str(phase_id))
+        if kind == "phase_start":
+            entry["label"] = event.get("label", "")
+        elif kind == "phase_end":
+            entry["label"] = event.get("label", entry["label"])
+            entry["status"] = event.get("status")
+            entry["elapsed_s"] = event.get("elapsed", 0.0)
+        elif kind == "phase_skipped":
+            entry["label"] = event.get("label", entry["label"])
+            entry["status"] = "skipped"
+        elif kind == "llm_call":
+            entry["llm_calls"] += 1
+            entry["llm_ms"] += event.get("elapsed_ms", 0.0)
+            entry["prompt_tokens"] += event.get("prompt_tokens", 0)
+            entry["completion_tokens"] += event.get("completion_tokens", 0)
+        elif kind == "file_written":
+            entry["files_written"] += 1
+    return stats
+
 
 class PipelineRunLogger:
     """Append-only run log for one AutoAgent pipeline execution.
@@ -29,15 +154,57 @@ class PipelineRunLogger:
     """
 
     LOG_FILENAME = "OLLASH_RUN_LOG.md"
+    EVENTS_FILENAME = "OLLASH_RUN_LOG.jsonl"
+
+    # Writer-thread batching
+    QUEUE_MAXSIZE = 10_000
+    BATCH_SIZE = 256
+    # Bodies at least this long are compressed when compress_prompts is set
+    COMPRESS_MIN_CHARS = 2048
 
-    def __init__(self, project_root: Path, project_name: str, project_description: str) -> None:
+    def __init__(
+        self,
+        project_root: Path,
+        project_name: str,
+        project_description: str,
+        background_writer: bool = False,
+        compress_prompts: Optional[str] = None,
+        structured_events: bool = True,
+    ) -> None:
+        """
+        Args:
+            background_writer: Hand writes to a dedicated thread via a bounded
+                queue and flush in batches instead of after every event.
+            compress_prompts: ``"gzip"`` or ``"zstd"`` to compress large prompt
+                and response blobs in the JSONL stream (zstd falls back to gzip
+                when ``zstandard`` is not installed).
+            structured_events: Also write the OLLASH_RUN_LOG.jsonl event stream.
+        """
         self._lock = threading.Lock()
         self._run_start_wall = datetime.now()
+        self._run_start_mono = time.monotonic()
+        self._closed = False
+
+        if compress_prompts not in (None, "gzip", "zstd"):
+            raise ValueError(f"Unsupported compress_prompts value: {compress_prompts!r}")
+        if compress_prompts == "zstd" and _zstd is None:
+            compress_prompts = "gzip"
+        self._compress = compress_prompts
+        self._seen_blobs: set[str] = set()
 
         project_root = Path(project_root)
         project_root.mkdir(parents=True, exist_ok=True)
         self._log_path = project_root / self.LOG_FILENAME
+        self._events_path = project_root / self.EVENTS_FILENAME
         self._fh = open(self._log_path, "w", encoding="utf-8")  # noqa: SIM115
+        self._events_fh = open(self._events_path, "w", encoding="utf-8") if structured_events else None  # noqa: SIM115
+
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        if background_writer:
+            self._queue = queue.Queue(maxsize=self.QUEUE_MAXSIZE)
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True, name="PipelineRunLogWriter")
+            self._writer.start()
 
         # Accumulated stats (all protected by _lock where mutated concurrently)
         self._phase_llm_counters: Dict[str, int] = {}  # phase_id → call counter
@@ -71,6 +238,7 @@ class PipelineRunLogger:
         self._append(
             f"# OLLASH_RUN_LOG — {project_name}\n\n**Run started:** {ts}  \n**Description:** {desc_preview}\n\n---\n\n"
         )
+        self._emit("run_start", project_name=project_name, description=project_description, started_at=ts)
 
     # ------------------------------------------------------------------
     # Pipeline-level events
@@ -91,6 +259,14 @@ class PipelineRunLogger:
         self._is_small = "small" in tier.lower()
         self._phase_order = phase_order
 
+        self._emit(
+            "pipeline_start",
+            phase_order=phase_order,
+            model=model_name,
+            tier=tier,
+            complexity=complexity,
+            num_refine_loops=num_refine_loops,
+        )
         phases_str = ", ".join(phase_order)
         self._append(
             "## Pipeline Configuration\n\n"
@@ -113,6 +289,13 @@ class PipelineRunLogger:
         errors: List[str],
     ) -> None:
         """Write ## Pipeline Summary and ## Auto-Insights sections."""
+        self._emit(
+            "pipeline_end",
+            elapsed=elapsed_seconds,
+            files_generated=files_generated,
+            total_tokens=total_tokens,
+            errors=errors,
+        )
         errors_md = ""
         if errors:
             errors_md = "\n**Errors:**\n" + "\n".join(f"- {e}" for e in errors) + "\n"
@@ -141,6 +324,7 @@ class PipelineRunLogger:
         ts = self._fmt_timestamp()
         with self._lock:
             self._phase_llm_counters[phase_id] = 0
+        self._emit("phase_start", phase_id=phase_id, label=phase_label)
         self._append(f"### Phase {phase_id}: {phase_label}\n\n**Started:** {ts}\n\n")
 
     def log_phase_end(
@@ -159,14 +343,34 @@ class PipelineRunLogger:
         icon = "✓" if status == "success" else "✗"
         elapsed_str = f"{elapsed:.2f}s" if elapsed else "—"
         llm_calls = self._phase_llm_counters.get(phase_id, 0)
+        self._emit(
+            "phase_end",
+            phase_id=phase_id,
+            label=phase_label,
+            elapsed=elapsed,
+            status=status,
+            llm_calls=llm_calls,
+            error=error_msg,
+        )
         error_str = f"  \n**Error:** {error_msg}" if error_msg else ""
         self._append(
             f"**Status:** {icon} {status} | **Elapsed:** {elapsed_str} | **LLM calls:** {llm_calls}"
             f"{error_str}\n\n---\n\n"
         )
 
+    def log_phase_diff(self, phase_id: str, diff: Dict[str, List[str]]) -> None:
+        """Write the files added/modified/removed by a phase (from its checkpoint manifest)."""
+        added = diff.get("added", [])
+        modified = diff.get("modified", [])
+        removed = diff.get("removed", [])
+        self._emit("phase_diff", phase_id=phase_id, added=added, modified=modified, removed=removed)
+        if not (added or modified or removed):
+            return
+        self._append(f"**Files changed:** {len(added)} added, {len(modified)} modified, {len(removed)} removed\n\n")
+
     def log_phase_skipped(self, phase_id: str, phase_label: str, reason: str) -> None:
         """Write a skipped-phase entry."""
+        self._emit("phase_skipped", phase_id=phase_id, label=phase_label, reason=reason)
         self._append(f"### Phase {phase_id}: {phase_label}\n\n**Status:** ⏭ skipped — {reason}\n\n---\n\n")
 
     # ------------------------------------------------------------------
@@ -198,6 +402,18 @@ class PipelineRunLogger:
         with self._lock:
             self._total_llm_ms += elapsed_ms
 
+        self._emit(
+            "llm_call",
+            phase_id=phase_id,
+            call_index=call_index,
+            role=role,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            elapsed_ms=elapsed_ms,
+            no_think=no_think,
+            _blobs={"system": system, "user": user, "response": response},
+        )
+
         no_think_str = "yes" if no_think else "no"
         think_note = " *(thinking disabled)*" if no_think else ""
 
@@ -240,6 +456,14 @@ class PipelineRunLogger:
             elif validation_status in ("retry_failed", "syntax_error"):
                 self._syntax_retry_failed += 1
 
+        self._emit(
+            "file_written",
+            phase_id=phase_id,
+            path=rel_path,
+            chars=char_count,
+            validation_status=validation_status,
+            validation_detail=validation_detail,
+        )
         icon = "✓" if validation_status in ("ok", "retry_ok") else "⚠"
         detail_str = f" ({validation_detail})" if validation_detail else ""
         self._append(
@@ -262,6 +486,12 @@ class PipelineRunLogger:
             self._cross_val_errors_auto_fixed = errors_auto_fixed
             self._cross_val_errors_remaining = len(remaining_errors)
 
+        self._emit(
+            "cross_file_errors",
+            errors_found=errors_found,
+            errors_auto_fixed=errors_auto_fixed,
+            remaining_errors=remaining_errors,
+        )
         if errors_found == 0:
             self._append("**Cross-File Validation:** ✓ No contract errors found.\n\n")
             return
@@ -291,6 +521,7 @@ class PipelineRunLogger:
 
     def log_patch_round_start(self, round_num: int, total_rounds: int) -> None:
         """Write Patch Round N/M heading."""
+        self._emit("patch_round_start", round=round_num, total_rounds=total_rounds)
         self._append(f"#### Patch Round {round_num}/{total_rounds}\n\n")
 
     def log_patch_fix(
@@ -302,6 +533,14 @@ class PipelineRunLogger:
         success: bool,
     ) -> None:
         """Write a single patch fix entry with optional diff."""
+        self._emit(
+            "patch_fix",
+            round=round_num,
+            path=file_path,
+            issue=issue_description,
+            diff_lines=len(diff_lines) if diff_lines else 0,
+            success=success,
+        )
         icon = "✓" if success else "✗"
         self._append(f"**{icon} Fix: `{file_path}`**  \n{issue_description}\n\n")
         if diff_lines:
@@ -314,6 +553,7 @@ class PipelineRunLogger:
             self._patch_rounds_logged += 1
             self._patch_fixes_total += fixes_applied
 
+        self._emit("patch_round_end", round=round_num, fixes_applied=fixes_applied)
         noun = "fix" if fixes_applied == 1 else "fixes"
         self._append(f"*Round {round_num} summary: {fixes_applied} {noun} applied*\n\n")
 
@@ -334,6 +574,15 @@ class PipelineRunLogger:
         with self._lock:
             self._review_final_status = status
 
+        self._emit(
+            "senior_review_cycle",
+            cycle=cycle_num,
+            status=status,
+            summary=summary,
+            issues_found=issues_found,
+            issues_fixed=issues_fixed,
+            issues=issues,
+        )
         icon = "✓" if status == "passed" else "✗"
         self._append(
             f"#### Review Cycle {cycle_num}\n\n"
@@ -368,6 +617,14 @@ class PipelineRunLogger:
             if iteration == 1 and not passed:
                 self._test_first_iteration_failed = True
 
+        self._emit(
+            "test_iteration",
+            iteration=iteration,
+            runner=runner,
+            passed=passed,
+            failures=failures,
+            patches_applied=patches_applied,
+        )
         icon = "✓" if passed else "✗"
         self._append(
             f"#### Test Iteration {iteration} ({runner})\n\n"
@@ -387,21 +644,48 @@ class PipelineRunLogger:
     # Finalization
     # ------------------------------------------------------------------
 
+    def flush(self) -> None:
+        """Block until every queued write has reached the files."""
+        if self._queue is not None and self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+        with self._lock:
+            for fh in (self._fh, self._events_fh):
+                if fh is None:
+                    continue
+                try:
+                    fh.flush()
+                except (OSError, ValueError):
+                    pass
+
     def close(self) -> None:
-        """Flush and close the file handle."""
+        """Drain the writer queue, flush and close the file handles."""
         with self._lock:
-            try:
-                self._fh.flush()
-                self._fh.close()
-            except (OSError, ValueError):
-                pass
+            if self._closed:
+                return
+            self._closed = True
+        if self._queue is not None and self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._lock:
+            for fh in (self._fh, self._events_fh):
+                if fh is None:
+                    continue
+                try:
+                    fh.flush()
+                    fh.close()
+                except (OSError, ValueError):
+                    pass
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
     def _append(self, text: str) -> None:
-        """Thread-safe append to log file, flush immediately."""
+        """Thread-safe append to the Markdown log (queued or flushed immediately)."""
+        if self._queue is not None:
+            if not self._closed:
+                self._queue.put(("md", text))
+            return
         with self._lock:
             try:
                 self._fh.write(text)
@@ -409,6 +693,96 @@ class PipelineRunLogger:
             except (OSError, ValueError):
                 pass  # File closed or disk error — don't crash the pipeline
 
+    def _emit(self, event: str, _blobs: Optional[Dict[str, str]] = None, **fields: Any) -> None:
+        """Append one event (plus any not-yet-seen body blobs) to the JSONL stream."""
+        if self._events_fh is None:
+            return
+        record: Dict[str, Any] = {
+            "event": event,
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "t": round(time.monotonic() - self._run_start_mono, 3),
+        }
+        record.update(fields)
+
+        # Hash, compress and serialise outside the lock. A blob that looks unseen here is
+        # encoded speculatively; the lock below decides which emitter actually writes it
+        # (the seen-set only grows, so a blob seen here is still seen there).
+        blob_lines: Dict[str, str] = {}
+        for name, body in (_blobs or {}).items():
+            digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:20]
+            record[f"{name}_hash"] = digest
+            if digest not in self._seen_blobs and digest not in blob_lines:
+                blob_lines[digest] = json.dumps(self._blob_record(digest, body), ensure_ascii=False)
+        record_line = json.dumps(record, ensure_ascii=False, default=str)
+
+        with self._lock:
+            lines = [line for digest, line in blob_lines.items() if digest not in self._seen_blobs]
+            self._seen_blobs.update(blob_lines)
+            lines.append(record_line)
+            text = "\n".join(lines) + "\n"
+
+            if self._queue is not None:
+                if not self._closed:
+                    # Enqueue under the lock so a blob always precedes its first reference
+                    self._queue.put(("jsonl", text))
+                return
+            try:
+                self._events_fh.write(text)
+                self._events_fh.flush()
+            except (OSError, ValueError):
+                pass
+
+    def _blob_record(self, digest: str, body: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"event": "blob", "hash": digest, "chars": len(body)}
+        if self._compress and len(body) >= self.COMPRESS_MIN_CHARS:
+            raw = body.encode("utf-8")
+            if self._compress == "zstd":
+                packed, encoding = _zstd.ZstdCompressor(level=6).compress(raw), "zstd+base64"
+            else:
+                packed, encoding = gzip.compress(raw, compresslevel=6), "gzip+base64"
+            record["encoding"] = encoding
+            record["data"] = base64.b64encode(packed).decode("ascii")
+        else:
+            record["encoding"] = "utf-8"
+            record["data"] = body
+        return record
+
+    def _writer_loop(self) -> None:
+        """Background writer: drain the queue in batches and flush once per batch."""
+        assert self._queue is not None
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            md_parts: List[str] = []
+            jsonl_parts: List[str] = []
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif item[0] == "md":
+                    md_parts.append(item[1])
+                else:
+                    jsonl_parts.append(item[1])
+            try:
+                if md_parts:
+                    self._fh.write("".join(md_parts))
+                    self._fh.flush()
+                if jsonl_parts and self._events_fh is not None:
+                    self._events_fh.write("".join(jsonl_parts))
+                    self._events_fh.flush()
+            except (OSError, ValueError):
+                pass  # File closed or disk error — don't crash the pipeline
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
     def _fmt_timestamp(self) -> str:
         """Return ISO-8601 local timestamp, seconds precision."""
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -199,6 +199,7 @@ class AlertManager:
                     subject=f"[{severity.upper()}] Ollash Alert: {title}",
                     to_email=None,  # Use subscribed emails
                     content=self._format_alert_email(alert_info),
+                    dedup_key=f"alert:{alert_id}:{severity}",  # repeated firings collapse into one email
                 )
 
             # Execute custom callback if registered
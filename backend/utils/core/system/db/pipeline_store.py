@@ -4,16 +4,27 @@ Schema
 ------
 pipelines : id, name, description, phases (JSON list), created_at, updated_at
 runs      : id, pipeline_id FK, project_path, status, started_at, finished_at,
-            log (JSON list of events)
+            log (legacy JSON list of events; migrated to run_events once)
+run_events: run_id FK, seq, ts, event (JSON) — append-only, keyed by (run_id, seq)
+
+Foreign keys are enforced on every connection, so deleting a pipeline cascades
+to its runs and their events.  ``PRAGMA user_version`` records the schema
+migrations already applied.
+
+Events are appended as rows, so a write costs O(1) regardless of run length,
+and clients tailing a run read incrementally with ``get_events(after=seq)``.
 """
 
 from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+_SCHEMA_VERSION = 1  # 1: legacy runs.log moved to run_events, orphaned rows purged
 
 
 class PipelineStore:
@@ -24,12 +35,17 @@ class PipelineStore:
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self._ensure_tables()
 
+    def _connect(self, **kwargs: Any) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, **kwargs)
+        conn.execute("PRAGMA foreign_keys=ON")  # off by default, per connection
+        return conn
+
     # ------------------------------------------------------------------
     # Schema
     # ------------------------------------------------------------------
 
     def _ensure_tables(self) -> None:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS pipelines (
                     id          INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,7 +65,41 @@ class PipelineStore:
                     finished_at  REAL,
                     log          TEXT NOT NULL DEFAULT '[]'
                 );
+                CREATE TABLE IF NOT EXISTS run_events (
+                    run_id  INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+                    seq     INTEGER NOT NULL,
+                    ts      REAL NOT NULL,
+                    event   TEXT NOT NULL,
+                    PRIMARY KEY (run_id, seq)
+                ) WITHOUT ROWID;
             """)
+            # WAL lets tailing readers proceed while a run is appending
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                self._migrate_legacy_logs(conn)
+                # Deletes used not to cascade: drop what they left behind
+                conn.execute("DELETE FROM runs WHERE pipeline_id NOT IN (SELECT id FROM pipelines)")
+                conn.execute("DELETE FROM run_events WHERE run_id NOT IN (SELECT id FROM runs)")
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _migrate_legacy_logs(conn: sqlite3.Connection) -> None:
+        """Move events from the legacy ``runs.log`` JSON column into ``run_events`` (run once per database)."""
+        legacy = conn.execute("SELECT id, started_at, log FROM runs WHERE log != '[]'").fetchall()
+        for run_id, started_at, log in legacy:
+            try:
+                events = json.loads(log)
+            except ValueError:
+                events = []
+            base = _last_seq(conn, run_id)
+            conn.executemany(
+                "INSERT INTO run_events (run_id, seq, ts, event) VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, base + i, _event_ts(event, started_at), json.dumps(event))
+                    for i, event in enumerate(events, 1)
+                ],
+            )
+            conn.execute("UPDATE runs SET log = '[]' WHERE id = ?", (run_id,))
 
     # ------------------------------------------------------------------
     # Pipelines CRUD
@@ -63,7 +113,7 @@ class PipelineStore:
         builtin: bool = False,
     ) -> dict[str, Any]:
         now = time.time()
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             cur = conn.execute(
                 "INSERT INTO pipelines (name, description, phases, builtin, created_at, updated_at)"
                 " VALUES (?, ?, ?, ?, ?, ?)",
@@ -73,7 +123,7 @@ class PipelineStore:
         return self.get_pipeline(new_id)  # type: ignore[arg-type]
 
     def get_pipeline(self, pipeline_id: int) -> dict[str, Any] | None:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("SELECT * FROM pipelines WHERE id = ?", (pipeline_id,)).fetchone()
         if row is None:
@@ -81,7 +131,7 @@ class PipelineStore:
         return self._row_to_pipeline(dict(row))
 
     def list_pipelines(self) -> list[dict[str, Any]]:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("SELECT * FROM pipelines ORDER BY builtin DESC, created_at ASC").fetchall()
         return [self._row_to_pipeline(dict(r)) for r in rows]
@@ -100,7 +150,7 @@ class PipelineStore:
         new_name = name if name is not None else pipeline["name"]
         new_desc = description if description is not None else pipeline["description"]
         new_phases = phases if phases is not None else pipeline["phases"]
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 "UPDATE pipelines SET name=?, description=?, phases=?, updated_at=? WHERE id=?",
                 (new_name, new_desc, json.dumps(new_phases), now, pipeline_id),
@@ -108,7 +158,7 @@ class PipelineStore:
         return self.get_pipeline(pipeline_id)
 
     def delete_pipeline(self, pipeline_id: int) -> bool:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             cur = conn.execute("DELETE FROM pipelines WHERE id = ? AND builtin = 0", (pipeline_id,))
         return cur.rowcount > 0
 
@@ -118,7 +168,7 @@ class PipelineStore:
 
     def create_run(self, pipeline_id: int, project_path: str = "") -> dict[str, Any]:
         now = time.time()
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             cur = conn.execute(
                 "INSERT INTO runs (pipeline_id, project_path, status, started_at, log)"
                 " VALUES (?, ?, 'running', ?, '[]')",
@@ -128,40 +178,78 @@ class PipelineStore:
         return self.get_run(run_id)  # type: ignore[arg-type]
 
     def get_run(self, run_id: int) -> dict[str, Any] | None:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
-        if row is None:
-            return None
-        return self._row_to_run(dict(row))
+            if row is None:
+                return None
+            return self._row_to_run(dict(row), self._load_logs(conn, [run_id]))
 
-    def append_log(self, run_id: int, event: dict[str, Any]) -> None:
-        with sqlite3.connect(self._db_path) as conn:
-            row = conn.execute("SELECT log FROM runs WHERE id = ?", (run_id,)).fetchone()
+    def get_run_summary(self, run_id: int) -> dict[str, Any] | None:
+        """Run metadata with ``event_count`` instead of the full ``log``."""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
             if row is None:
-                return
-            events: list = json.loads(row[0])
-            events.append(event)
-            conn.execute(
-                "UPDATE runs SET log = ? WHERE id = ?",
-                (json.dumps(events), run_id),
-            )
+                return None
+            summary = dict(row)
+            summary.pop("log", None)
+            summary["event_count"] = _last_seq(conn, run_id)
+        return summary
+
+    def append_log(self, run_id: int, event: dict[str, Any]) -> None:
+        self.append_events(run_id, [event])
+
+    def append_events(self, run_id: int, events: Iterable[dict[str, Any]]) -> int:
+        """Append *events* to a run in one transaction.  Returns the last sequence number (0 if none)."""
+        now = time.time()
+        with self._connect(isolation_level=None) as conn:
+            conn.execute("BEGIN IMMEDIATE")  # serialises sequence allocation between writers
+            try:
+                if conn.execute("SELECT 1 FROM runs WHERE id = ?", (run_id,)).fetchone() is None:
+                    conn.execute("ROLLBACK")
+                    return 0
+                seq = _last_seq(conn, run_id)
+                rows = []
+                for event in events:
+                    seq += 1
+                    rows.append((run_id, seq, _event_ts(event, now), json.dumps(event)))
+                conn.executemany("INSERT INTO run_events (run_id, seq, ts, event) VALUES (?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return seq
+
+    def get_events(self, run_id: int, after: int = 0, limit: int | None = None) -> list[dict[str, Any]]:
+        """Events of a run with ``seq > after``, oldest first; each carries its ``seq`` as the next cursor."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT seq, event FROM run_events WHERE run_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (run_id, after, -1 if limit is None else limit),
+            ).fetchall()
+        return [{**json.loads(event), "seq": seq} for seq, event in rows]
+
+    def event_writer(self, run_id: int, batch_size: int = 50, flush_interval: float = 0.5) -> RunEventWriter:
+        """Buffered writer that appends a run's events in batches."""
+        return RunEventWriter(self, run_id, batch_size, flush_interval)
 
     def finish_run(self, run_id: int, status: str = "completed") -> None:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 "UPDATE runs SET status = ?, finished_at = ? WHERE id = ?",
                 (status, time.time(), run_id),
             )
 
     def list_runs(self, pipeline_id: int, limit: int = 20) -> list[dict[str, Any]]:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 "SELECT * FROM runs WHERE pipeline_id = ? ORDER BY started_at DESC LIMIT ?",
                 (pipeline_id, limit),
             ).fetchall()
-        return [self._row_to_run(dict(r)) for r in rows]
+            logs = self._load_logs(conn, [r["id"] for r in rows])
+        return [self._row_to_run(dict(r), logs) for r in rows]
 
     # ------------------------------------------------------------------
     # Seed built-in pipelines
@@ -169,7 +257,7 @@ class PipelineStore:
 
     def seed_builtins(self) -> None:
         """Insert predefined pipelines once if the table is empty."""
-        with sqlite3.connect(self._db_path) as conn:
+        with self._connect() as conn:
             count = conn.execute("SELECT COUNT(*) FROM pipelines WHERE builtin=1").fetchone()[0]
         if count > 0:
             return
@@ -226,6 +314,79 @@ class PipelineStore:
         return row
 
     @staticmethod
-    def _row_to_run(row: dict) -> dict[str, Any]:
-        row["log"] = json.loads(row.get("log") or "[]")
+    def _load_logs(conn: sqlite3.Connection, run_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        logs: dict[int, list[dict[str, Any]]] = {run_id: [] for run_id in run_ids}
+        if run_ids:
+            rows = conn.execute(
+                f"SELECT run_id, event FROM run_events WHERE run_id IN ({','.join('?' * len(run_ids))})"
+                " ORDER BY run_id, seq",
+                run_ids,
+            )
+            for run_id, event in rows:
+                logs[run_id].append(json.loads(event))
+        return logs
+
+    @staticmethod
+    def _row_to_run(row: dict, logs: dict[int, list[dict[str, Any]]]) -> dict[str, Any]:
+        row["log"] = logs.get(row["id"], [])
         return row
+
+
+def _last_seq(conn: sqlite3.Connection, run_id: int) -> int:
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM run_events WHERE run_id = ?", (run_id,)).fetchone()[0]
+
+
+def _event_ts(event: Any, default: float | None) -> float:
+    ts = event.get("ts") if isinstance(event, dict) else None
+    return float(ts) if isinstance(ts, (int, float)) else float(default or 0.0)
+
+
+class RunEventWriter:
+    """Buffers a run's events and appends them in batches.
+
+    A batch is written when ``batch_size`` events are pending or when
+    ``flush_interval`` seconds have passed since the last write.  An event
+    arriving after an idle period is written at once, and a timer writes any
+    event still pending ``flush_interval`` seconds later, so tailing readers
+    see it promptly even if nothing follows.  Call :meth:`flush` (or use the
+    writer as a context manager) when the run ends.
+    """
+
+    def __init__(self, store: PipelineStore, run_id: int, batch_size: int = 50, flush_interval: float = 0.5) -> None:
+        self.store = store
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: list[dict[str, Any]] = []
+        self._last_flush = float("-inf")
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self.last_seq = 0
+
+    def append(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.append(event)
+            idle = time.monotonic() - self._last_flush
+            due = len(self._pending) >= self.batch_size or idle >= self.flush_interval
+            if not due and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval - idle, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:  # held while writing so batches land in append order
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, []
+            if pending:
+                self.last_seq = self.store.append_events(self.run_id, pending) or self.last_seq
+            self._last_flush = time.monotonic()
+
+    def __enter__(self) -> RunEventWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.flush()
@@ -0,0 +1,454 @@
+"""
+Email Outbox - Persistent, batched email delivery for NotificationManager.
+
+``EmailOutbox.enqueue`` only writes a row to a SQLite queue and returns; a
+background thread delivers the queue over a small pool of reused SMTP
+connections:
+
+- Each flush window, due messages with identical content are merged into one
+  message (recipient batching) and the batch is sent over pooled connections.
+- Identical notifications (same ``dedup_key``) are collapsed while pending and
+  suppressed for ``dedup_window`` seconds after one was sent.
+- Rows survive restarts; failed sends are retried with backoff.
+"""
+
+import hashlib
+import json
+import logging
+import smtplib
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_WINDOW = 1000
+
+
+def _summary(samples: Deque[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"avg": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "avg": round(sum(ordered) / len(ordered), 3),
+        "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class SMTPConnectionPool:
+    """Up to *size* logged-in SMTP connections, reused across sends.
+
+    Idle connections older than *max_idle* seconds are checked with ``NOOP``
+    before reuse; a connection that failed during a send is discarded.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        timeout: float = 30.0,
+        size: int = 2,
+        max_idle: float = 60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.size = max(1, size)
+        self.max_idle = max_idle
+        self.connections_opened = 0
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.user:
+                smtp.login(self.user, self.password or "")
+        except Exception:
+            smtp.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return smtp
+
+    def _take(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                smtp, idle_since = self._idle.pop()
+            if time.monotonic() - idle_since < self.max_idle:
+                return smtp
+            try:
+                if smtp.noop()[0] == 250:
+                    return smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            smtp.close()
+        return self._connect()
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        self._slots.acquire()
+        smtp = None
+        try:
+            smtp = self._take()
+            yield smtp
+        except BaseException:
+            if smtp is not None:  # state unknown after a failed send; do not reuse
+                smtp.close()
+            smtp = None
+            raise
+        finally:
+            if smtp is not None:
+                with self._lock:
+                    self._idle.append((smtp, time.monotonic()))
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+
+class EmailOutbox:
+    """
+    Persistent email queue delivered by a background thread.
+
+    Args:
+        pool: SMTP connection pool used for delivery.
+        from_email: Envelope sender.
+        from_header: ``From`` header (defaults to *from_email*).
+        db_path: SQLite file holding the queue.
+        flush_window: Seconds to collect messages after the first one is queued.
+        max_batch: Messages taken from the queue per flush.
+        dedup_window: Seconds an identical notification is suppressed after sending.
+        max_attempts: Send attempts before a message is marked failed.
+        retry_delay: Base backoff (seconds) between attempts.
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        from_email: str,
+        db_path: Path,
+        from_header: Optional[str] = None,
+        flush_window: float = 2.0,
+        max_batch: int = 200,
+        dedup_window: float = 300.0,
+        max_attempts: int = 5,
+        retry_delay: float = 30.0,
+    ):
+        self.pool = pool
+        self.from_email = from_email
+        self.from_header = from_header or from_email
+        self.db_path = Path(db_path)
+        self.flush_window = flush_window
+        self.max_batch = max_batch
+        self.dedup_window = dedup_window
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._deliver_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._last_sent: Dict[str, float] = {}
+
+        self._enqueue_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._delivery_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._counters = {
+            "enqueued": 0,
+            "deduplicated": 0,
+            "rate_limited": 0,
+            "sent_notifications": 0,
+            "sent_messages": 0,
+            "sent_recipients": 0,
+            "flushes": 0,
+            "send_errors": 0,
+            "failed": 0,
+        }
+
+    # ----------------------------------------------------------------
+    # Storage
+    # ----------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, dedup_key TEXT NOT NULL, subject TEXT NOT NULL,"
+                " html_body TEXT NOT NULL, recipients TEXT NOT NULL, duplicates INTEGER NOT NULL DEFAULT 0,"
+                " status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0,"
+                " next_attempt REAL NOT NULL, last_error TEXT, created_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_outbox_key ON outbox(dedup_key, status)")
+            db.execute("CREATE TABLE IF NOT EXISTS sent_keys (dedup_key TEXT PRIMARY KEY, sent_at REAL NOT NULL)")
+            db.commit()
+            cutoff = time.time() - self.dedup_window
+            self._last_sent = dict(db.execute("SELECT dedup_key, sent_at FROM sent_keys WHERE sent_at >= ?", (cutoff,)))
+            self._db = db
+        return self._db
+
+    def pending(self) -> int:
+        with self._db_lock:
+            return self._conn().execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    # ----------------------------------------------------------------
+    # Producer side
+    # ----------------------------------------------------------------
+
+    def enqueue(self, subject: str, html_body: str, recipients: List[str], dedup_key: Optional[str] = None) -> bool:
+        """Queue a notification; returns False when it was suppressed by the rate limit.
+
+        A pending notification with the same *dedup_key* (default: hash of subject,
+        body and recipients) absorbs this one, merging its recipients.
+        """
+        start = time.perf_counter()
+        key = (
+            dedup_key
+            or hashlib.sha1(
+                "\x00".join([subject, html_body, *sorted(recipients)]).encode("utf-8", "replace")
+            ).hexdigest()
+        )
+        now = time.time()
+        with self._db_lock:
+            db = self._conn()
+            last = self._last_sent.get(key)
+            if last is not None and now - last < self.dedup_window:
+                self._counters["rate_limited"] += 1
+                logger.debug(f"Notification '{subject}' suppressed: identical one sent {now - last:.0f}s ago")
+                return False
+            row = db.execute(
+                "SELECT id, recipients FROM outbox WHERE dedup_key = ? AND status = 'pending' LIMIT 1", (key,)
+            ).fetchone()
+            if row is not None:
+                merged = sorted(set(json.loads(row[1])) | set(recipients))
+                db.execute(
+                    "UPDATE outbox SET recipients = ?, duplicates = duplicates + 1 WHERE id = ?",
+                    (json.dumps(merged), row[0]),
+                )
+                self._counters["deduplicated"] += 1
+            else:
+                db.execute(
+                    "INSERT INTO outbox (dedup_key, subject, html_body, recipients, next_attempt, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, subject, html_body, json.dumps(sorted(set(recipients))), now, now),
+                )
+                self._counters["enqueued"] += 1
+            db.commit()
+            self._enqueue_ms.append((time.perf_counter() - start) * 1000)
+        self._ensure_worker()
+        self._wakeup.set()
+        return True
+
+    # ----------------------------------------------------------------
+    # Delivery
+    # ----------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker if a queue from a previous run exists (resumes pending mail)."""
+        if self.db_path.exists():
+            self._ensure_worker()
+            self._wakeup.set()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._stopping.clear()
+            self._worker = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=max(1.0, self.retry_delay))
+            if self._stopping.is_set():
+                break
+            self._wakeup.clear()
+            if self.flush_window > 0 and self._stopping.wait(self.flush_window):
+                break
+            try:
+                self.flush()
+            except Exception as e:  # keep the worker alive; rows stay queued
+                logger.error(f"Email outbox flush failed: {e}")
+
+    def flush(self) -> int:
+        """Deliver every due message now; returns the number of notifications sent."""
+        with self._deliver_lock:
+            sent = 0
+            while True:
+                batch = self._due_batch()
+                if not batch:
+                    return sent
+                self._counters["flushes"] += 1
+                delivered = self._deliver(batch)
+                sent += delivered
+                if delivered == 0:
+                    return sent  # everything failed; retry after backoff
+
+    def _due_batch(self) -> List[Dict[str, Any]]:
+        with self._db_lock:
+            rows = (
+                self._conn()
+                .execute(
+                    "SELECT id, dedup_key, subject, html_body, recipients, duplicates, attempts, created_at"
+                    " FROM outbox WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+                    (time.time(), self.max_batch),
+                )
+                .fetchall()
+            )
+        return [
+            {
+                "id": r[0],
+                "key": r[1],
+                "subject": r[2],
+                "html_body": r[3],
+                "recipients": json.loads(r[4]),
+                "duplicates": r[5],
+                "attempts": r[6],
+                "created_at": r[7],
+            }
+            for r in rows
+        ]
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> int:
+        # Recipient batching: notifications with identical content become one message
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for row in batch:
+            groups.setdefault((row["subject"], row["html_body"]), []).append(row)
+        chunks = [list(groups.items())[i :: self.pool.size] for i in range(min(self.pool.size, len(groups)))]
+        if len(chunks) == 1:
+            return self._send_chunk(chunks[0])
+        with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="email-outbox-send") as pool:
+            return sum(pool.map(self._send_chunk, chunks))
+
+    def _send_chunk(self, groups: List[Tuple[Tuple[str, str], List[Dict[str, Any]]]]) -> int:
+        sent = 0
+        remaining = list(groups)
+        try:
+            with self.pool.connection() as smtp:
+                while remaining:
+                    (subject, html_body), rows = remaining[0]
+                    recipients = sorted({r for row in rows for r in row["recipients"]})
+                    try:
+                        message = self._build_message(subject, html_body, recipients)
+                        smtp.send_message(message, self.from_email, recipients)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                        self._record_failure(rows, str(e))
+                        smtp.rset()
+                    else:
+                        self._record_sent(rows, len(recipients))
+                        sent += len(rows)
+                    remaining.pop(0)
+        except (smtplib.SMTPException, OSError) as e:
+            logger.warning(f"SMTP delivery failed, {len(remaining)} message(s) will be retried: {e}")
+            for _, rows in remaining:
+                self._record_failure(rows, str(e))
+        return sent
+
+    def _build_message(self, subject: str, html_body: str, recipients: List[str]) -> MIMEMultipart:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.from_header
+        # Merged recipients only appear in the SMTP envelope, never to each other
+        msg["To"] = recipients[0] if len(recipients) == 1 else "undisclosed-recipients:;"
+        msg.attach(MIMEText(html_body, "html"))
+        return msg
+
+    def _record_sent(self, rows: List[Dict[str, Any]], recipients: int) -> None:
+        now = time.time()
+        with self._db_lock:
+            db = self._conn()
+            db.executemany("DELETE FROM outbox WHERE id = ?", [(row["id"],) for row in rows])
+            db.executemany(
+                "INSERT OR REPLACE INTO sent_keys (dedup_key, sent_at) VALUES (?, ?)",
+                [(row["key"], now) for row in rows],
+            )
+            db.commit()
+            for row in rows:
+                self._last_sent[row["key"]] = now
+                self._delivery_ms.append((now - row["created_at"]) * 1000)
+            self._counters["sent_notifications"] += len(rows) + sum(row["duplicates"] for row in rows)
+            self._counters["sent_messages"] += 1
+            self._counters["sent_recipients"] += recipients
+
+    def _record_failure(self, rows: List[Dict[str, Any]], error: str) -> None:
+        now = time.time()
+        with self._db_lock:
+            db = self._conn()
+            for row in rows:
+                attempts = row["attempts"] + 1
+                if attempts >= self.max_attempts:
+                    db.execute(
+                        "UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                        (attempts, error[:500], row["id"]),
+                    )
+                    self._counters["failed"] += 1
+                    logger.error(f"Email '{row['subject']}' failed after {attempts} attempts: {error}")
+                else:
+                    db.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                        (attempts, now + self.retry_delay * (2 ** (attempts - 1)), error[:500], row["id"]),
+                    )
+            db.commit()
+            self._counters["send_errors"] += 1
+
+    # ----------------------------------------------------------------
+    # Lifecycle & metrics
+    # ----------------------------------------------------------------
+
+    def close(self, flush: bool = True) -> None:
+        """Stop the worker, optionally delivering what is due first, and close connections."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout=10)
+            self._worker = None
+        if flush and self.db_path.exists():
+            self.flush()
+        self.pool.close()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._db_lock:
+            return {
+                **self._counters,
+                "pending": self._conn().execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+                if self.db_path.exists()
+                else 0,
+                "connections_opened": self.pool.connections_opened,
+                "enqueue_ms": _summary(self._enqueue_ms),
+                "delivery_ms": _summary(self._delivery_ms),
+            }
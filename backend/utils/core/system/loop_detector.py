@@ -1,14 +1,42 @@
+import hashlib
 import json
+import re
+import zlib
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Deque, Dict, List, Optional
 
 import numpy as np
 
 from backend.utils.core.system.agent_logger import AgentLogger
 
+# MinHash parameters for the cheap (tool, args) pre-filter
+_MINHASH_PERMUTATIONS = 32
+_MINHASH_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(0x5EED)
+_MINHASH_A = _rng.integers(1, 2**31 - 1, size=_MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MINHASH_B = _rng.integers(0, 2**31 - 1, size=_MINHASH_PERMUTATIONS, dtype=np.uint64)
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _minhash(tokens: set) -> np.ndarray:
+    """MinHash signature of a token set (all-max for an empty set)."""
+    if not tokens:
+        return np.full(_MINHASH_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    x = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    # a < 2^31 and x < 2^32, so a*x + b stays below 2^64
+    return ((np.outer(_MINHASH_A, x) + _MINHASH_B[:, None]) % _MINHASH_PRIME).min(axis=1)
+
 
 class LoopDetector:
-    """Detects semantic loops and stagnation in agent tool-calling sequences."""
+    """Detects semantic loops and stagnation in agent tool-calling sequences.
+
+    Actions are fingerprinted once when recorded and kept in a bounded ring
+    buffer.  ``detect_loop`` first compares consecutive actions with an exact
+    fingerprint match and a MinHash estimate over (tool, args); only pairs
+    that are neither identical nor clearly different are embedded, and each
+    action's normalized embedding is computed at most once.
+    """
 
     def __init__(
         self,
@@ -17,34 +45,74 @@ class LoopDetector:
         threshold: int = 3,
         similarity_threshold: float = 0.95,
         stagnation_timeout_minutes: int = 2,
+        history_size: int = 50,
+        prefilter_similarity: float = 0.5,
+        max_result_chars: int = 2000,
+        embedding_cache_size: int = 256,
     ):
         self.logger = logger
         self.embedding_client = embedding_client
         self.threshold = threshold
         self.similarity_threshold = similarity_threshold
         self.stagnation_timeout = timedelta(minutes=stagnation_timeout_minutes)
+        # Consecutive actions whose MinHash (tool, args) similarity falls below this are
+        # treated as different without asking the embedding model
+        self.prefilter_similarity = prefilter_similarity
+        self.max_result_chars = max_result_chars
 
-        self.history: List[Dict] = []
+        self.history: Deque[Dict] = deque(maxlen=max(history_size, threshold))
         self.last_meaningful_action_time: datetime = datetime.now()
         self.progress_score: float = 0.0
 
-    def _get_action_embedding(self, action_data: Dict) -> List[float]:
-        """Generates an embedding for a given action (tool call and its result)."""
-        action_string = json.dumps(
+        # fingerprint -> normalized embedding, shared across turns
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embedding_cache_size = embedding_cache_size
+
+    def _action_string(self, action_data: Dict) -> str:
+        """Serializes an action for embedding, truncating large tool results."""
+        result = action_data["result"]
+        if not isinstance(result, str):
+            result = json.dumps(result, sort_keys=True, default=str)
+        return json.dumps(
             {
                 "tool_name": action_data["tool_name"],
                 "args": action_data["args"],
-                "result": action_data["result"],
+                "result": result[: self.max_result_chars],
             },
             sort_keys=True,
+            default=str,
         )
 
+    def _get_action_embedding(self, action_data: Dict) -> List[float]:
+        """Generates an embedding for a given action (tool call and its result)."""
         try:
-            return self.embedding_client.get_embedding(action_string)
+            return self.embedding_client.get_embedding(self._action_string(action_data))
         except Exception as e:
             self.logger.error(f"Failed to get embedding for action: {e}")
             return [0.0] * 384
 
+    def _normalized_embedding(self, action: Dict) -> np.ndarray:
+        """Returns the action's unit-length embedding, embedding it at most once."""
+        vector: Optional[np.ndarray] = action.get("_vector")
+        if vector is not None:
+            return vector
+
+        fingerprint = action["_fingerprint"]
+        vector = self._embedding_cache.get(fingerprint)
+        if vector is None:
+            vector = np.asarray(self._get_action_embedding(action), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+            self._embedding_cache[fingerprint] = vector
+            if len(self._embedding_cache) > self._embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+        else:
+            self._embedding_cache.move_to_end(fingerprint)
+
+        action["_vector"] = vector
+        return vector
+
     @staticmethod
     def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         """Calculates the cosine similarity between two vectors."""
@@ -61,15 +129,31 @@ class LoopDetector:
 
     def record_action(self, tool_name: str, args: Dict, result: Any):
         """Records a tool action for loop detection analysis."""
+        args_string = json.dumps(args, sort_keys=True, default=str)
+        result_string = result if isinstance(result, str) else json.dumps(result, sort_keys=True, default=str)
+        fingerprint = hashlib.sha1(f"{tool_name}\x00{args_string}\x00{result_string}".encode("utf-8")).hexdigest()
+        tokens = set(_TOKEN_RE.findall(f"{tool_name} {args_string}".lower()))
+
         self.history.append(
             {
                 "tool_name": tool_name,
                 "args": args,
                 "result": result,
                 "timestamp": datetime.now(),
+                "_fingerprint": fingerprint,
+                "_minhash": _minhash(tokens),
+                "_vector": None,
             }
         )
 
+    def _actions_similar(self, previous: Dict, current: Dict) -> bool:
+        if previous["_fingerprint"] == current["_fingerprint"]:
+            return True
+        if float(np.mean(previous["_minhash"] == current["_minhash"])) < self.prefilter_similarity:
+            return False
+        similarity = float(np.dot(self._normalized_embedding(previous), self._normalized_embedding(current)))
+        return similarity >= self.similarity_threshold
+
     def detect_loop(self) -> bool:
         """Detects loops based on semantic similarity and stagnation."""
         if len(self.history) < self.threshold:
@@ -82,16 +166,12 @@ class LoopDetector:
             self.logger.debug(f"Loop detection bypassed for tool: {last_action['tool_name']}")
             return False
 
-        # Semantic similarity loop detection
-        recent_actions = self.history[-self.threshold :]
-        recent_embeddings = [self._get_action_embedding(a) for a in recent_actions]
-
-        is_similar_streak = True
-        for i in range(len(recent_embeddings) - 1):
-            similarity = self._cosine_similarity(recent_embeddings[i], recent_embeddings[i + 1])
-            if similarity < self.similarity_threshold:
-                is_similar_streak = False
-                break
+        # Semantic similarity loop detection (newest pairs first: they are the likeliest to differ)
+        recent_actions = list(self.history)[-self.threshold :]
+        is_similar_streak = all(
+            self._actions_similar(recent_actions[i - 1], recent_actions[i])
+            for i in range(len(recent_actions) - 1, 0, -1)
+        )
 
         if is_similar_streak:
             self.logger.warning(
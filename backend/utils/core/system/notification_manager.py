@@ -1,13 +1,14 @@
 """Notification Manager - Handles multi-channel notifications (Email, UI, etc.)"""
 
+import html
 import logging
 import os
-import smtplib
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from pathlib import Path
 from typing import List, Optional
 
+from backend.utils.core.system.email_outbox import EmailOutbox, SMTPConnectionPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +29,27 @@ class NotificationManager:
 
         self._validate_smtp_config()
 
+        # Emails are queued and delivered in the background over pooled SMTP connections
+        self.outbox: Optional[EmailOutbox] = None
+        if self.smtp_enabled:
+            pool = SMTPConnectionPool(
+                self.smtp_server,
+                self.smtp_port,
+                user=self.smtp_user,
+                password=self.smtp_password,
+                starttls=os.environ.get("SMTP_STARTTLS", "1").strip().lower() not in ("0", "false", "no"),
+                size=int(os.environ.get("SMTP_POOL_SIZE", "2")),
+            )
+            self.outbox = EmailOutbox(
+                pool,
+                from_email=self.from_email,
+                from_header=f"{self.from_name} <{self.from_email}>",
+                db_path=Path(os.environ.get("OLLASH_EMAIL_OUTBOX", ".ollash/email_outbox.db")),
+                flush_window=float(os.environ.get("OLLASH_EMAIL_FLUSH_WINDOW", "2.0")),
+                dedup_window=float(os.environ.get("OLLASH_EMAIL_DEDUP_WINDOW", "300")),
+            )
+            self.outbox.start()
+
     def _validate_smtp_config(self):
         """Check if SMTP configuration is valid."""
         self.smtp_enabled = all([self.smtp_server, self.smtp_user, self.smtp_password, self.from_email])
@@ -216,19 +238,49 @@ class NotificationManager:
 
         return self._send_email(subject=subject, html_body=html_body, recipient_emails=recipient_emails)
 
+    def send_email(
+        self,
+        subject: str,
+        content: str,
+        to_email: Optional[str] = None,
+        dedup_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Send a plain-text notification (wrapped in the standard HTML template).
+
+        Args:
+            subject: Email subject
+            content: Plain-text body
+            to_email: Single recipient (uses subscribed if None)
+            dedup_key: Identical notifications sharing this key are collapsed and rate-limited
+
+        Returns:
+            bool: True if queued for delivery
+        """
+        recipient_emails = [to_email] if to_email else list(self.subscribed_emails)
+        html_body = self._build_html_email(
+            title=subject, content=f"<pre>{html.escape(content.strip())}</pre>", status="warning"
+        )
+        return self._send_email(
+            subject=subject, html_body=html_body, recipient_emails=recipient_emails, dedup_key=dedup_key
+        )
+
     # ==================== Private Methods ====================
 
-    def _send_email(self, subject: str, html_body: str, recipient_emails: List[str]) -> bool:
+    def _send_email(
+        self, subject: str, html_body: str, recipient_emails: List[str], dedup_key: Optional[str] = None
+    ) -> bool:
         """
-        Send email via SMTP.
+        Queue an email in the outbox; returns immediately.
 
         Args:
             subject: Email subject
             html_body: HTML body
             recipient_emails: List of recipient emails
+            dedup_key: Optional key for collapsing identical notifications
 
         Returns:
-            bool: True if sent successfully
+            bool: True if queued (False when SMTP is off or the notification was rate-limited)
         """
         if not self.smtp_enabled:
             logger.warning("SMTP not configured. Email notification skipped.")
@@ -239,27 +291,13 @@ class NotificationManager:
             return False
 
         try:
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{self.from_name} <{self.from_email}>"
-            msg["To"] = ", ".join(recipient_emails)
-
-            # Add HTML body
-            html_part = MIMEText(html_body, "html")
-            msg.attach(html_part)
-
-            # Send via SMTP
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
-
-            logger.info(f"Email sent successfully to {len(recipient_emails)} recipient(s)")
-            return True
+            queued = self.outbox.enqueue(subject, html_body, recipient_emails, dedup_key=dedup_key)
+            if queued:
+                logger.info(f"Email queued for {len(recipient_emails)} recipient(s)")
+            return queued
 
         except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+            logger.error(f"Failed to queue email: {e}")
             return False
 
     def _build_html_email(self, title: str, content: str, status: str = "info") -> str:
@@ -0,0 +1,525 @@
+"""Unified event-driven token-bucket rate limiter.
+
+One ``TokenBucketLimiter`` per backend (e.g. per Ollama URL, see
+``get_rate_limiter``) is shared by every subsystem that talks to it, so their
+budgets add up instead of each one oversubscribing the backend on its own.
+
+- Budgets: a backend-wide ``Budget`` plus optional per-key budgets (a model
+  name, or a subsystem such as ``parallel_generator``).  Each budget can limit
+  requests/minute, LLM tokens/minute and concurrency.
+- Waiters queue per key and are granted strictly in arrival order among the
+  keys whose own budget allows it, so a throttled model never blocks another.
+- No polling: grants happen on ``acquire``/``release``; when tokens are short a
+  single timer is armed for the exact refill instant.
+- Adaptive: ``record_latency`` keeps an EMA of response times and lowers the
+  effective backend RPM when it degrades, recovering once it improves.
+- ``AsyncRateLimiter`` and ``SyncRateLimiter`` are thin façades bound to one key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+_WAIT_WINDOW = 1000
+
+
+@dataclass
+class Budget:
+    """Limits for one scope.  ``None`` means unlimited.
+
+    ``burst`` is the request-bucket capacity; it defaults to ``rpm`` (a full
+    minute of requests, matching a 60-second sliding window).
+    """
+
+    rpm: Optional[float] = None
+    tpm: Optional[float] = None
+    max_concurrent: Optional[int] = None
+    burst: Optional[float] = None
+
+
+@dataclass
+class AdaptivePolicy:
+    """Latency-driven RPM adaptation (EMA of response times)."""
+
+    degradation_threshold_ms: float = 18000.0
+    recovery_threshold_ms: float = 5000.0
+    min_rpm: float = 30
+    ema_alpha: float = 0.3
+
+
+@dataclass
+class Lease:
+    """A granted acquisition; pass it back to ``release``."""
+
+    key: Optional[str]
+    tokens: int
+    wait_seconds: float
+    released: bool = False
+
+
+class _Bucket:
+    def __init__(self, per_minute: float, capacity: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, capacity)
+        self.level = self.capacity
+        self.stamp = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        if now > self.stamp:
+            self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+            self.stamp = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self.refill(now)
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate if self.rate > 0 else math.inf
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def set_rate(self, per_minute: float) -> None:
+        self.refill(time.monotonic())
+        self.rate = per_minute / 60.0
+
+
+class _Scope:
+    def __init__(self, budget: Budget):
+        self.in_flight = 0
+        self.grants = 0
+        self.configure(budget)
+
+    def configure(self, budget: Budget) -> None:
+        self.budget = budget
+        self.requests = _Bucket(budget.rpm, budget.burst or budget.rpm) if budget.rpm else None
+        self.tokens = _Bucket(budget.tpm, budget.tpm) if budget.tpm else None
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """0 if a request fits now, seconds until it does, or ``inf`` if it needs a release."""
+        if self.budget.max_concurrent is not None and self.in_flight >= self.budget.max_concurrent:
+            return math.inf
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def take(self, tokens: int) -> None:
+        self.in_flight += 1
+        self.grants += 1
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None and tokens:
+            self.tokens.take(tokens)
+
+
+@dataclass
+class _Waiter:
+    seq: int
+    key: Optional[str]
+    tokens: int
+    enqueued_at: float
+    wake: Callable[[], None]
+    lease: Optional[Lease] = None
+    cancelled: bool = False
+
+
+class TokenBucketLimiter:
+    """Shared limiter for one backend.  Thread-safe; usable from any event loop.
+
+    Args:
+        name: Backend name (usually the Ollama base URL).
+        budget: Backend-wide budget.
+        adaptive: Enables latency adaptation of the backend RPM.
+        logger: Optional logger for RPM adjustments.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        budget: Optional[Budget] = None,
+        adaptive: Optional[AdaptivePolicy] = None,
+        logger=None,
+    ):
+        self.name = name
+        self.logger = logger
+        self.configured = budget is not None
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._backend = _Scope(budget or Budget())
+        self._scopes: Dict[str, _Scope] = {}
+        self._queues: Dict[Optional[str], Deque[_Waiter]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._timer_deadline = math.inf
+        self._timer_gen = 0
+
+        self.adaptive = adaptive
+        self.effective_rpm = self._backend.budget.rpm
+        self._ema_ms = 0.0
+        self._model_ema_ms: Dict[str, float] = {}
+
+        self._waits: Deque[float] = deque(maxlen=_WAIT_WINDOW)
+        self._grants = 0
+        self._timeouts = 0
+        self._timer_wakeups = 0
+
+    # ----------------------------------------------------------------
+    # Configuration
+    # ----------------------------------------------------------------
+
+    def configure(self, budget: Optional[Budget] = None, adaptive: Optional[AdaptivePolicy] = None) -> None:
+        """Replace the backend budget and/or adaptive policy."""
+        with self._lock:
+            if budget is not None:
+                self._backend.configure(budget)
+                self.effective_rpm = budget.rpm
+                self.configured = True
+            if adaptive is not None:
+                self.adaptive = adaptive
+            self._dispatch()
+
+    def set_budget(self, key: str, budget: Budget) -> None:
+        """Set the budget for *key* (a model name or subsystem)."""
+        with self._lock:
+            scope = self._scopes.get(key)
+            if scope is None:
+                self._scopes[key] = _Scope(budget)
+            else:
+                scope.configure(budget)
+            self._dispatch()
+
+    # ----------------------------------------------------------------
+    # Acquire / release
+    # ----------------------------------------------------------------
+
+    async def acquire(self, key: Optional[str] = None, tokens: int = 0, timeout: Optional[float] = None) -> Lease:
+        """Wait (without blocking the loop) until the request fits every budget."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def wake() -> None:
+            try:
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+            except RuntimeError:
+                pass  # loop already closed; the waiter is gone
+
+        waiter = self._enqueue(key, tokens, wake)
+        if waiter.lease is not None:
+            return waiter.lease
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            lease = self._abandon(waiter)
+            if lease is None:
+                raise
+            return lease  # granted just as the timeout fired
+        except BaseException:
+            lease = self._abandon(waiter)
+            if lease is not None:
+                self.release(lease)
+            raise
+        return waiter.lease
+
+    def acquire_blocking(self, key: Optional[str] = None, tokens: int = 0, timeout: Optional[float] = None) -> Lease:
+        """Blocking variant of ``acquire`` for worker threads; raises ``TimeoutError``."""
+        event = threading.Event()
+        waiter = self._enqueue(key, tokens, event.set)
+        if waiter.lease is None and not event.wait(timeout):
+            lease = self._abandon(waiter)
+            if lease is None:
+                raise TimeoutError(f"rate limiter '{self.name}': no capacity for {key or 'request'} in {timeout}s")
+            return lease
+        return waiter.lease
+
+    def release(self, lease: Lease, latency: Optional[float] = None) -> None:
+        """Return *lease*'s concurrency slot; *latency* (seconds) feeds the adaptive policy."""
+        if latency is not None:
+            self.record_latency(latency, lease.key)
+        with self._lock:
+            if lease.released:
+                return
+            lease.released = True
+            self._backend.in_flight = max(0, self._backend.in_flight - 1)
+            scope = self._scopes.get(lease.key) if lease.key is not None else None
+            if scope is not None:
+                scope.in_flight = max(0, scope.in_flight - 1)
+            self._dispatch()
+
+    @asynccontextmanager
+    async def limit(self, key: Optional[str] = None, tokens: int = 0) -> AsyncIterator[Lease]:
+        lease = await self.acquire(key, tokens)
+        start = time.monotonic()
+        try:
+            yield lease
+        finally:
+            self.release(lease, time.monotonic() - start)
+
+    @contextmanager
+    def limit_sync(self, key: Optional[str] = None, tokens: int = 0) -> Iterator[Lease]:
+        lease = self.acquire_blocking(key, tokens)
+        start = time.monotonic()
+        try:
+            yield lease
+        finally:
+            self.release(lease, time.monotonic() - start)
+
+    # ----------------------------------------------------------------
+    # Adaptation
+    # ----------------------------------------------------------------
+
+    def record_latency(self, seconds: float, key: Optional[str] = None) -> None:
+        """Update the latency EMA and, with an adaptive policy, the effective backend RPM."""
+        elapsed_ms = seconds * 1000.0
+        with self._lock:
+            alpha = self.adaptive.ema_alpha if self.adaptive else 0.3
+            self._ema_ms = elapsed_ms if not self._ema_ms else alpha * elapsed_ms + (1 - alpha) * self._ema_ms
+            if key is not None:
+                prev = self._model_ema_ms.get(key)
+                self._model_ema_ms[key] = elapsed_ms if prev is None else alpha * elapsed_ms + (1 - alpha) * prev
+            base = self._backend.budget.rpm
+            if self.adaptive is None or not base or self._backend.requests is None:
+                return
+            old = self.effective_rpm
+            if self._ema_ms > self.adaptive.degradation_threshold_ms:
+                self.effective_rpm = max(min(self.adaptive.min_rpm, base), old * 0.75)
+            elif self._ema_ms < self.adaptive.recovery_threshold_ms:
+                self.effective_rpm = min(base, old * 1.10 + 1)
+            if self.effective_rpm != old:
+                self._backend.requests.set_rate(self.effective_rpm)
+                if self.logger:
+                    self.logger.debug(
+                        f"Rate limiter '{self.name}': {old:.0f} → {self.effective_rpm:.0f} RPM "
+                        f"(EMA response time {self._ema_ms:.0f}ms)"
+                    )
+                self._dispatch()
+
+    # ----------------------------------------------------------------
+    # Internals (``_lock`` held unless noted)
+    # ----------------------------------------------------------------
+
+    def _enqueue(self, key: Optional[str], tokens: int, wake: Callable[[], None]) -> _Waiter:
+        with self._lock:
+            waiter = _Waiter(next(self._seq), key, max(0, int(tokens)), time.monotonic(), wake)
+            self._queues.setdefault(key, deque()).append(waiter)
+            self._dispatch()
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> Optional[Lease]:
+        """Drop a waiter that stopped waiting; returns its lease if it was granted meanwhile."""
+        with self._lock:
+            if waiter.lease is not None:
+                return waiter.lease
+            waiter.cancelled = True
+            self._timeouts += 1
+            queue = self._queues.get(waiter.key)
+            if queue is not None:
+                try:
+                    queue.remove(waiter)
+                except ValueError:
+                    pass
+                if not queue:
+                    del self._queues[waiter.key]
+            self._dispatch()
+            return None
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        next_wait = math.inf
+        while True:
+            best: Optional[_Waiter] = None
+            for key, queue in list(self._queues.items()):
+                if not queue:
+                    del self._queues[key]
+                    continue
+                head = queue[0]
+                scope = self._scopes.get(key) if key is not None else None
+                wait = scope.wait_time(head.tokens, now) if scope is not None else 0.0
+                if wait > 0:
+                    next_wait = min(next_wait, wait)
+                elif best is None or head.seq < best.seq:
+                    best = head
+            if best is None:
+                break
+            wait = self._backend.wait_time(best.tokens, now)
+            if wait > 0:
+                next_wait = min(next_wait, wait)
+                break
+            self._grant(best, now)
+        if next_wait < math.inf:
+            self._arm_timer(now + next_wait)
+
+    def _grant(self, waiter: _Waiter, now: float) -> None:
+        self._queues[waiter.key].popleft()
+        self._backend.take(waiter.tokens)
+        scope = self._scopes.get(waiter.key) if waiter.key is not None else None
+        if scope is not None:
+            scope.take(waiter.tokens)
+        wait = now - waiter.enqueued_at
+        waiter.lease = Lease(waiter.key, waiter.tokens, wait)
+        self._waits.append(wait)
+        self._grants += 1
+        waiter.wake()
+
+    def _arm_timer(self, deadline: float) -> None:
+        if self._timer is not None and self._timer_deadline <= deadline:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_gen += 1
+        self._timer_deadline = deadline
+        self._timer = threading.Timer(max(0.0, deadline - time.monotonic()), self._on_timer, (self._timer_gen,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self, gen: int) -> None:  # runs without the lock
+        with self._lock:
+            if gen != self._timer_gen:
+                return  # superseded by an earlier deadline
+            self._timer = None
+            self._timer_deadline = math.inf
+            self._timer_wakeups += 1
+            self._dispatch()
+
+    # ----------------------------------------------------------------
+    # Introspection
+    # ----------------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            budget = self._backend.budget
+            return {
+                "name": self.name,
+                "rpm": budget.rpm,
+                "effective_rpm": round(self.effective_rpm, 1) if self.effective_rpm else None,
+                "tpm": budget.tpm,
+                "max_concurrent": budget.max_concurrent,
+                "in_flight": self._backend.in_flight,
+                "queued": sum(len(q) for q in self._queues.values()),
+                "grants": self._grants,
+                "timeouts": self._timeouts,
+                "timer_wakeups": self._timer_wakeups,
+                "ema_latency_ms": round(self._ema_ms, 1),
+                "wait_ms": {
+                    "avg": round(sum(waits) / len(waits) * 1000, 3) if waits else 0.0,
+                    "p95": round(waits[int(0.95 * (len(waits) - 1))] * 1000, 3) if waits else 0.0,
+                    "max": round(waits[-1] * 1000, 3) if waits else 0.0,
+                },
+                "scopes": {
+                    key: {
+                        "rpm": scope.budget.rpm,
+                        "max_concurrent": scope.budget.max_concurrent,
+                        "in_flight": scope.in_flight,
+                        "queued": len(self._queues.get(key) or ()),
+                        "grants": scope.grants,
+                        "ema_latency_ms": round(self._model_ema_ms.get(key, 0.0), 1),
+                    }
+                    for key, scope in sorted(self._scopes.items())
+                },
+            }
+
+
+# ----------------------------------------------------------------
+# Façades
+# ----------------------------------------------------------------
+
+
+class AsyncRateLimiter:
+    """Async façade bound to one key of a shared limiter (``await acquire()`` / ``await release()``)."""
+
+    def __init__(self, limiter: TokenBucketLimiter, key: str, budget: Optional[Budget] = None):
+        self.limiter = limiter
+        self.key = key
+        self.max_concurrent = (budget.max_concurrent if budget else None) or 1
+        if budget is not None:
+            limiter.set_budget(key, budget)
+        self._leases: Deque[Lease] = deque()
+
+    async def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> Lease:
+        lease = await self.limiter.acquire(self.key, tokens, timeout)
+        self._leases.append(lease)
+        return lease
+
+    async def release(self, lease: Optional[Lease] = None) -> None:
+        if lease is None:
+            if not self._leases:
+                return
+            lease = self._leases.popleft()
+        else:
+            try:
+                self._leases.remove(lease)
+            except ValueError:
+                pass
+        self.limiter.release(lease)
+
+    def limit(self, tokens: int = 0):
+        return self.limiter.limit(self.key, tokens)
+
+
+class SyncRateLimiter:
+    """Blocking façade bound to one key of a shared limiter, for worker threads."""
+
+    def __init__(self, limiter: TokenBucketLimiter, key: Optional[str] = None, budget: Optional[Budget] = None):
+        self.limiter = limiter
+        self.key = key
+        if budget is not None and key is not None:
+            limiter.set_budget(key, budget)
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> Lease:
+        return self.limiter.acquire_blocking(self.key, tokens, timeout)
+
+    def try_acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> Optional[Lease]:
+        """Like ``acquire`` but returns ``None`` on timeout."""
+        try:
+            return self.acquire(tokens, timeout)
+        except TimeoutError:
+            return None
+
+    def release(self, lease: Lease, latency: Optional[float] = None) -> None:
+        self.limiter.release(lease, latency)
+
+    def limit(self, tokens: int = 0):
+        return self.limiter.limit_sync(self.key, tokens)
+
+    def get_status(self) -> dict:
+        return self.limiter.stats()
+
+
+# ----------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str = "default", budget: Optional[Budget] = None, **kwargs) -> TokenBucketLimiter:
+    """Return the process-wide limiter for backend *name*, creating it on first use.
+
+    *budget* (and ``adaptive``) apply when the limiter is created or has no
+    budget yet, so the first caller that knows the backend's limits sets them;
+    use ``configure`` to change them later.
+    """
+    key = str(name).rstrip("/")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            return _limiters.setdefault(key, TokenBucketLimiter(key, budget, **kwargs))
+    if budget is not None and not limiter.configured:
+        limiter.configure(budget, kwargs.get("adaptive"))
+    return limiter
+
+
+def all_rate_limiters() -> List[TokenBucketLimiter]:
+    with _limiters_lock:
+        return list(_limiters.values())
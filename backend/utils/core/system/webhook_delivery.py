@@ -0,0 +1,602 @@
+"""
+Webhook delivery pipeline used by ``WebhookManager``.
+
+- One pooled ``aiohttp.ClientSession`` per event loop, shared by every endpoint.
+- ``enqueue()`` puts events on a bounded queue; a dispatcher task buffers them per
+  endpoint and sends one digest message per ``coalesce_window`` (or per
+  ``max_digest`` events), with at most one request in flight per endpoint.
+- A ``CircuitBreaker`` per endpoint stops calling an endpoint after repeated
+  failures and lets one trial request through after ``reset_timeout``.
+- Failed or short-circuited payloads (and queue overflow) go to a ``RetrySpool``,
+  a small SQLite table that is retried with exponential backoff, also after a
+  restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from backend.utils.core.system.webhook_manager import WebhookConfig, WebhookManager
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[4]
+_DIGEST_MAX_CHARS = 3500
+_PRIORITY_ORDER = ("low", "medium", "high", "critical")
+
+
+def _default_spool_path() -> Path:
+    """``OLLASH_WEBHOOK_SPOOL``, else ``<OLLASH_ROOT_DIR or .ollash>/webhook_spool.db``.
+
+    Relative paths are anchored at the project root, not the current working directory.
+    """
+    path = os.environ.get("OLLASH_WEBHOOK_SPOOL") or Path(os.environ.get("OLLASH_ROOT_DIR", ".ollash"))
+    path = Path(path)
+    if "OLLASH_WEBHOOK_SPOOL" not in os.environ:
+        path = path / "webhook_spool.db"
+    return _PROJECT_ROOT / path
+
+
+@dataclass
+class WebhookEvent:
+    """One notification waiting to be coalesced into a digest."""
+
+    webhook: str
+    message: str
+    title: Optional[str] = None
+    priority: Any = None  # MessagePriority
+    color: Optional[str] = None
+    fields: Optional[Dict[str, str]] = None
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class SpoolEntry:
+    id: int
+    webhook: str
+    payload: Dict[str, Any]
+    attempts: int
+    events: int
+
+
+class CircuitBreaker:
+    """Closed → open after ``failure_threshold`` consecutive failures → half-open after ``reset_timeout``."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def retry_at(self) -> float:
+        """Wall-clock time at which the next trial request is allowed."""
+        if self.opened_at is None:
+            return time.time()
+        return time.time() + max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def cancel_trial(self) -> None:
+        """Free the half-open trial slot after an attempt that ended without an outcome."""
+        self._trial_in_flight = False
+
+
+class RetrySpool:
+    """Durable SQLite spool of webhook payloads awaiting redelivery.
+
+    The database is only created when the first payload is spooled.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            if not create and not self.path.exists():
+                return None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS spool ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, webhook TEXT NOT NULL, payload TEXT NOT NULL,"
+                " events INTEGER NOT NULL DEFAULT 1, attempts INTEGER NOT NULL DEFAULT 0,"
+                " next_attempt REAL NOT NULL, last_error TEXT, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_spool_due ON spool(next_attempt)")
+            self._conn.commit()
+        return self._conn
+
+    def add(self, webhook: str, payload: Dict[str, Any], next_attempt: float, error: str = "", events: int = 1) -> None:
+        with self._lock:
+            conn = self._connect(create=True)
+            conn.execute(
+                "INSERT INTO spool (webhook, payload, events, next_attempt, last_error, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (webhook, json.dumps(payload), events, next_attempt, error[:500], time.time()),
+            )
+            conn.commit()
+
+    def due(self, now: float, limit: int = 100) -> List[SpoolEntry]:
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return []
+            rows = conn.execute(
+                "SELECT id, webhook, payload, attempts, events FROM spool WHERE next_attempt <= ?"
+                " ORDER BY next_attempt, id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [SpoolEntry(r[0], r[1], json.loads(r[2]), r[3], r[4]) for r in rows]
+
+    def reschedule(self, entry_id: int, attempts: int, next_attempt: float, error: str) -> None:
+        with self._lock:
+            conn = self._connect(create=True)
+            conn.execute(
+                "UPDATE spool SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                (attempts, next_attempt, error[:500], entry_id),
+            )
+            conn.commit()
+
+    def remove(self, entry_id: int) -> None:
+        with self._lock:
+            conn = self._connect(create=True)
+            conn.execute("DELETE FROM spool WHERE id = ?", (entry_id,))
+            conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            conn = self._connect(create=False)
+            return conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0] if conn is not None else 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class WebhookDeliveryPipeline:
+    """
+    Delivers payloads for a ``WebhookManager`` over a shared session, with per-endpoint
+    coalescing, circuit breakers and a durable retry spool.
+
+    Args:
+        manager: Owner of the webhook configs and payload builders.
+        queue_size: Bound of the outbound event queue; overflow is spooled.
+        coalesce_window: Seconds events for one endpoint are collected into a digest.
+        max_digest: Events per digest; a full buffer is sent immediately.
+        max_connections: Connection pool size of the shared session.
+        failure_threshold / reset_timeout: Circuit breaker settings per endpoint.
+        spool_path: SQLite spool file (default: ``OLLASH_WEBHOOK_SPOOL``, else ``webhook_spool.db``
+            under ``OLLASH_ROOT_DIR`` or the project's ``.ollash``).
+        spool_interval: Seconds between spool redelivery sweeps.
+        max_spool_attempts: Redelivery attempts before a spooled payload is dropped.
+    """
+
+    def __init__(
+        self,
+        manager: "WebhookManager",
+        queue_size: int = 1000,
+        coalesce_window: float = 1.0,
+        max_digest: int = 50,
+        max_connections: int = 20,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        spool_path: Optional[Path] = None,
+        spool_interval: float = 5.0,
+        max_spool_attempts: int = 10,
+    ):
+        self.manager = manager
+        self.queue_size = queue_size
+        self.coalesce_window = coalesce_window
+        self.max_digest = max_digest
+        self.max_connections = max_connections
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.spool = RetrySpool(spool_path or _default_spool_path())
+        self.spool_interval = spool_interval
+        self.max_spool_attempts = max_spool_attempts
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sends: Set[asyncio.Task] = set()
+        self._buffers: Dict[str, Deque[WebhookEvent]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._busy: Set[str] = set()
+        self._deferred: Set[str] = set()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._endpoint_stats: Dict[str, Dict[str, Any]] = {}
+        self._counters = {
+            "enqueued": 0,
+            "overflowed": 0,
+            "digests": 0,
+            "delivered_events": 0,
+            "failed_requests": 0,
+            "short_circuited": 0,
+            "spooled": 0,
+            "redelivered": 0,
+            "dropped": 0,
+        }
+
+    # ----------------------------------------------------------------
+    # Lifecycle
+    # ----------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._queue is not None:
+            return
+        leftover = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                leftover.append(self._queue.get_nowait())
+        self._retire(self._loop, self._session, self._tasks)
+        self._loop = loop
+        self._session = None
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        for event in leftover:
+            self._queue.put_nowait(event)
+        self._tasks = [loop.create_task(self._dispatch_loop()), loop.create_task(self._spool_loop())]
+
+    @staticmethod
+    def _retire(
+        loop: Optional[asyncio.AbstractEventLoop], session: Optional[aiohttp.ClientSession], tasks: List[asyncio.Task]
+    ) -> None:
+        """Cancel the workers and close the session left behind on a previous event loop.
+
+        Both belong to *loop*, so the work is handed to it; a closed loop took them down already.
+        """
+        if loop is None or loop.is_closed():
+            return
+        for task in tasks:
+            loop.call_soon_threadsafe(task.cancel)
+        if session is not None and not session.closed:
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or getattr(self._session, "_loop", loop) is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def aclose(self) -> None:
+        """Flush buffered events, wait for in-flight sends, then close the session and spool."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            while not self._queue.empty():
+                self._buffer(self._queue.get_nowait())
+            for name in list(self._buffers):
+                self._flush(name)
+            while self._sends:
+                await asyncio.gather(*list(self._sends), return_exceptions=True)
+                for name in list(self._buffers):
+                    self._flush(name)
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+        self._queue = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self.spool.close()
+
+    # ----------------------------------------------------------------
+    # Coalesced path
+    # ----------------------------------------------------------------
+
+    def enqueue(self, event: WebhookEvent) -> bool:
+        """Queue *event* for coalesced delivery (must run on the event loop).
+
+        Returns False when the queue is full; the event is then spooled instead of lost.
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+            self._counters["enqueued"] += 1
+            return True
+        except asyncio.QueueFull:
+            self._counters["overflowed"] += 1
+            webhook = self.manager.webhooks.get(event.webhook)
+            if webhook is not None:
+                self._spool(webhook, self._digest_payload(webhook, [event]), "queue full", events=1)
+            return False
+
+    async def put(self, event: WebhookEvent) -> None:
+        """Queue *event*, waiting for room when the queue is full (backpressure)."""
+        self._ensure_started()
+        await self._queue.put(event)
+        self._counters["enqueued"] += 1
+
+    async def _dispatch_loop(self) -> None:
+        queue = self._queue
+        while True:
+            self._buffer(await queue.get())
+            while not queue.empty():  # drain bursts without yielding per event
+                self._buffer(queue.get_nowait())
+
+    def _buffer(self, event: WebhookEvent) -> None:
+        name = event.webhook
+        buffer = self._buffers.setdefault(name, deque())
+        buffer.append(event)
+        if len(buffer) >= self.max_digest:
+            self._flush(name)
+        elif name not in self._timers:
+            self._timers[name] = self._loop.call_later(self.coalesce_window, self._flush, name)
+
+    def _flush(self, name: str) -> None:
+        handle = self._timers.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+        buffer = self._buffers.get(name)
+        if not buffer:
+            return
+        if name in self._busy:
+            self._deferred.add(name)  # sent as soon as the in-flight digest completes
+            return
+        events = [buffer.popleft() for _ in range(min(len(buffer), self.max_digest))]
+        if not buffer:
+            del self._buffers[name]
+        elif name not in self._timers:
+            self._timers[name] = self._loop.call_later(self.coalesce_window, self._flush, name)
+        self._busy.add(name)
+        task = self._loop.create_task(self._send_digest(name, events))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _send_digest(self, name: str, events: List[WebhookEvent]) -> None:
+        try:
+            webhook = self.manager.webhooks.get(name)
+            if webhook is None or not webhook.enabled:
+                self._counters["dropped"] += len(events)
+                return
+            payload = self._digest_payload(webhook, events)
+            self._counters["digests"] += 1
+            ok, error, retryable = await self._attempt(webhook, payload)
+            if ok:
+                self._counters["delivered_events"] += len(events)
+            elif retryable:
+                self._spool(webhook, payload, error, events=len(events))
+            else:
+                self._counters["dropped"] += len(events)
+        finally:
+            self._busy.discard(name)
+            if name in self._deferred:
+                self._deferred.discard(name)
+                self._flush(name)
+
+    def _digest_payload(self, webhook: "WebhookConfig", events: List[WebhookEvent]) -> Dict[str, Any]:
+        from backend.utils.core.system.webhook_manager import MessagePriority
+
+        if len(events) == 1:
+            e = events[0]
+            return self.manager._build_payload(
+                webhook.webhook_type,
+                message=e.message,
+                title=e.title,
+                priority=e.priority or MessagePriority.MEDIUM,
+                color=e.color,
+                fields=e.fields,
+            )
+        priority = max(
+            (e.priority or MessagePriority.MEDIUM for e in events), key=lambda p: _PRIORITY_ORDER.index(p.value)
+        )
+        titles = {e.title for e in events}
+        title = f"{titles.pop()} (x{len(events)})" if len(titles) == 1 and None not in titles else None
+        lines, size = [], 0
+        for i, e in enumerate(events):
+            line = f"• *{e.title}*: {e.message}" if e.title else f"• {e.message}"
+            if size + len(line) > _DIGEST_MAX_CHARS:
+                lines.append(f"… and {len(events) - i} more")
+                break
+            lines.append(line)
+            size += len(line) + 1
+        return self.manager._build_payload(
+            webhook.webhook_type,
+            message="\n".join(lines),
+            title=title or f"{len(events)} Ollash notifications",
+            priority=priority,
+            fields={"Events": str(len(events))},
+        )
+
+    # ----------------------------------------------------------------
+    # Direct path
+    # ----------------------------------------------------------------
+
+    async def deliver(self, webhook: "WebhookConfig", payload: Dict[str, Any]) -> bool:
+        """Send *payload* now, retrying with exponential backoff; spool it if every attempt fails."""
+        self._ensure_started()
+        error = ""
+        for attempt in range(max(1, webhook.retry_attempts)):
+            ok, error, retryable = await self._attempt(webhook, payload)
+            if ok:
+                return True
+            if not retryable or self._breaker(webhook.name).state != "closed":
+                break
+            if attempt < webhook.retry_attempts - 1:
+                wait_time = webhook.retry_delay_seconds * (2**attempt)
+                logger.warning(f"Retry {attempt + 1}/{webhook.retry_attempts} for {webhook.name} in {wait_time}s")
+                await asyncio.sleep(wait_time)
+        if retryable:
+            self._spool(webhook, payload, error)
+        logger.error(f"Failed to send to {webhook.name}: {error}")
+        return False
+
+    async def _attempt(self, webhook: "WebhookConfig", payload: Dict[str, Any]) -> Tuple[bool, str, bool]:
+        """One POST through the breaker: ``(delivered, error, retryable)``."""
+        breaker = self._breaker(webhook.name)
+        stats = self._endpoint(webhook.name)
+        if not breaker.allow():
+            self._counters["short_circuited"] += 1
+            return False, "circuit open", True
+        stats["last_attempt"] = time.time()
+        outcome: Optional[Tuple[bool, str, bool]] = None
+        try:
+            session = await self._get_session()
+            async with session.post(
+                webhook.webhook_url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=webhook.timeout_seconds),
+                headers=webhook.headers or {"Content-Type": "application/json"},
+            ) as response:
+                if 200 <= response.status < 300:
+                    outcome = True, "", True
+                else:
+                    text = await response.text()
+                    outcome = False, f"HTTP {response.status}", response.status == 429 or response.status >= 500
+                    self.manager._log_failed_delivery(webhook.name, response.status, text)
+        except asyncio.TimeoutError:
+            outcome = False, "Request timeout", True
+        except aiohttp.ClientError as e:
+            outcome = False, str(e) or type(e).__name__, True
+        finally:
+            if outcome is None:  # unexpected error or cancellation: a half-open breaker must not stay stuck
+                breaker.cancel_trial()
+        ok, error, retryable = outcome
+        if ok:
+            breaker.record_success()
+            stats["success_count"] += 1
+            return outcome
+        self._counters["failed_requests"] += 1
+        stats["failure_count"] += 1
+        stats["last_error"] = error
+        if retryable:
+            breaker.record_failure()
+        return False, error, retryable
+
+    # ----------------------------------------------------------------
+    # Spool
+    # ----------------------------------------------------------------
+
+    def _spool(self, webhook: "WebhookConfig", payload: Dict[str, Any], error: str, events: int = 1) -> None:
+        next_attempt = max(time.time() + webhook.retry_delay_seconds, self._breaker(webhook.name).retry_at)
+        try:
+            self.spool.add(webhook.name, payload, next_attempt, error, events)
+            self._counters["spooled"] += events
+        except sqlite3.Error as e:
+            self._counters["dropped"] += events
+            logger.error(f"Could not spool webhook payload for {webhook.name}: {e}")
+
+    async def _spool_loop(self) -> None:
+        while True:
+            try:
+                await self.redeliver_spooled()
+            except sqlite3.Error as e:
+                logger.warning(f"Webhook spool sweep failed: {e}")
+            await asyncio.sleep(self.spool_interval)
+
+    async def redeliver_spooled(self, limit: int = 100) -> int:
+        """Retry spooled payloads that are due; returns how many were delivered."""
+        entries = await asyncio.to_thread(self.spool.due, time.time(), limit)
+        delivered = 0
+        for entry in entries:
+            webhook = self.manager.webhooks.get(entry.webhook)
+            if webhook is None:
+                await asyncio.to_thread(self.spool.remove, entry.id)
+                self._counters["dropped"] += entry.events
+                continue
+            ok, error, retryable = await self._attempt(webhook, entry.payload)
+            attempts = entry.attempts + 1
+            if ok:
+                await asyncio.to_thread(self.spool.remove, entry.id)
+                self._counters["redelivered"] += entry.events
+                self._counters["delivered_events"] += entry.events
+                delivered += 1
+            elif not retryable or attempts >= self.max_spool_attempts:
+                await asyncio.to_thread(self.spool.remove, entry.id)
+                self._counters["dropped"] += entry.events
+                logger.error(f"Dropping spooled webhook payload for {webhook.name} after {attempts} attempts: {error}")
+            else:
+                backoff = webhook.retry_delay_seconds * (2 ** min(attempts, 10))
+                next_attempt = max(time.time() + backoff, self._breaker(webhook.name).retry_at)
+                await asyncio.to_thread(self.spool.reschedule, entry.id, attempts, next_attempt, error)
+        return delivered
+
+    # ----------------------------------------------------------------
+    # Introspection
+    # ----------------------------------------------------------------
+
+    def _breaker(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def _endpoint(self, name: str) -> Dict[str, Any]:
+        stats = self._endpoint_stats.get(name)
+        if stats is None:
+            stats = self._endpoint_stats[name] = {
+                "success_count": 0,
+                "failure_count": 0,
+                "last_attempt": None,
+                "last_error": None,
+            }
+        return stats
+
+    def endpoint_status(self, name: str) -> Dict[str, Any]:
+        return {
+            "circuit": self._breaker(name).state,
+            "buffered": len(self._buffers.get(name) or ()),
+            **self._endpoint(name),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "buffered": sum(len(b) for b in self._buffers.values()),
+            "in_flight": len(self._sends),
+            "spool_pending": self.spool.count(),
+            "endpoints": {name: self.endpoint_status(name) for name in self.manager.webhooks},
+        }
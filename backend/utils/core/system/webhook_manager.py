@@ -6,6 +6,9 @@ Extends NotificationManager with webhook-based communication for:
 - Discord servers
 - Microsoft Teams channels
 - Custom webhooks
+
+Delivery (pooled session, coalesced digests, circuit breakers, retry spool) lives
+in ``webhook_delivery.WebhookDeliveryPipeline``.
 """
 
 import asyncio
@@ -14,9 +17,10 @@ import os
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import aiohttp
+from backend.utils.core.system.webhook_delivery import WebhookDeliveryPipeline, WebhookEvent
 
 logger = logging.getLogger(__name__)
 
@@ -62,15 +66,23 @@ class WebhookManager:
     - Multi-platform support (Slack, Discord, Teams)
     - Automatic retry with exponential backoff
     - Rich message formatting
-    - Async request handling
+    - Async request handling over one pooled session
+    - Coalesced event digests (``publish_event``)
+    - Per-endpoint circuit breakers and a durable retry spool
     - Failed delivery logging
     """
 
-    def __init__(self):
-        """Initialize the webhook manager."""
+    def __init__(self, spool_path: Optional[Path] = None, **delivery_options: Any):
+        """Initialize the webhook manager.
+
+        Args:
+            spool_path: SQLite retry spool (defaults to ``.ollash/webhook_spool.db``).
+            **delivery_options: Passed to ``WebhookDeliveryPipeline`` (queue size, coalesce window, ...).
+        """
         self.webhooks: Dict[str, WebhookConfig] = {}
         self.failed_deliveries: List[Dict[str, Any]] = []
         self.max_failed_deliveries_log = 100  # Keep last 100 failures
+        self.delivery = WebhookDeliveryPipeline(self, spool_path=spool_path, **delivery_options)
         self._load_webhooks_from_env()
         logger.info("WebhookManager initialized")
 
@@ -198,7 +210,45 @@ class WebhookManager:
             fields=fields,
         )
 
-        return await self._send_with_retry(webhook, payload)
+        return await self.delivery.deliver(webhook, payload)
+
+    def publish_event(
+        self,
+        message: str,
+        title: Optional[str] = None,
+        priority: MessagePriority = MessagePriority.MEDIUM,
+        webhook_names: Optional[List[str]] = None,
+        color: Optional[str] = None,
+        fields: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        Queue an event for coalesced delivery (must be called from the event loop).
+
+        Bursts of events for one endpoint are sent as a single digest message.
+
+        Args:
+            message: Main message content
+            title: Optional title
+            priority: Message priority level
+            webhook_names: Target webhooks (default: all enabled webhooks)
+            color: Optional color for formatted messages
+            fields: Optional additional fields
+
+        Returns:
+            int: Number of endpoints the event was queued for
+        """
+        queued = 0
+        for name in webhook_names or list(self.webhooks):
+            webhook = self.webhooks.get(name)
+            if webhook is None or not webhook.enabled:
+                continue
+            event = WebhookEvent(name, message, title=title, priority=priority, color=color, fields=fields)
+            queued += self.delivery.enqueue(event)
+        return queued
+
+    async def aclose(self) -> None:
+        """Flush queued events and release the delivery session."""
+        await self.delivery.aclose()
 
     async def send_to_all_webhooks(
         self,
@@ -220,6 +270,7 @@ class WebhookManager:
             Dict: Mapping of webhook names to success status
         """
         results = {}
+        names = []
         tasks = []
 
         for name, webhook in self.webhooks.items():
@@ -233,13 +284,12 @@ class WebhookManager:
 
             payload = self._build_payload(webhook.webhook_type, message=message, title=title, priority=priority)
 
-            tasks.append(
-                self._send_with_retry(webhook, payload).then(lambda success, n=name: results.update({n: success}))
-            )
+            names.append(name)
+            tasks.append(self.delivery.deliver(webhook, payload))
 
         # Execute all sends concurrently
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        for name, outcome in zip(names, await asyncio.gather(*tasks, return_exceptions=True)):
+            results[name] = outcome is True
 
         return results if results else {name: False for name in self.webhooks.keys()}
 
@@ -263,101 +313,33 @@ class WebhookManager:
             color: Optional color for formatted messages
             fields: Optional additional fields
 
+        Inside a running event loop the message cannot be awaited without blocking the loop,
+        so it is handed to ``publish_event`` for coalesced background delivery instead.
+
         Returns:
-            bool: True if sent successfully
+            bool: True if sent successfully (or, inside a running loop, queued)
         """
         try:
             loop = asyncio.get_event_loop()
             if loop.is_running():
-                # If already in async context, use sync send
-                return self._send_webhook_sync_internal(webhook_name, message, title, priority, color, fields)
+                if webhook_name not in self.webhooks:
+                    logger.error(f"Webhook not found: {webhook_name}")
+                    return False
+                return self.publish_event(message, title, priority, [webhook_name], color, fields) > 0
             else:
                 return loop.run_until_complete(
-                    self.send_to_webhook(webhook_name, message, title, priority, color, fields)
+                    self._send_and_close(webhook_name, message, title, priority, color, fields)
                 )
         except RuntimeError:
             # No event loop, create one
-            return asyncio.run(self.send_to_webhook(webhook_name, message, title, priority, color, fields))
+            return asyncio.run(self._send_and_close(webhook_name, message, title, priority, color, fields))
 
-    def _send_webhook_sync_internal(
-        self,
-        webhook_name: str,
-        message: str,
-        title: Optional[str] = None,
-        priority: MessagePriority = MessagePriority.MEDIUM,
-        color: Optional[str] = None,
-        fields: Optional[Dict[str, str]] = None,
-    ) -> bool:
-        """Internal synchronous send using requests library."""
+    async def _send_and_close(self, *args) -> bool:
+        """Send on a short-lived loop, closing the loop-bound delivery session afterwards."""
         try:
-            import requests
-
-            if webhook_name not in self.webhooks:
-                return False
-
-            webhook = self.webhooks[webhook_name]
-            payload = self._build_payload(
-                webhook.webhook_type,
-                message=message,
-                title=title,
-                priority=priority,
-                color=color,
-                fields=fields,
-            )
-
-            response = requests.post(
-                webhook.webhook_url,
-                json=payload,
-                timeout=webhook.timeout_seconds,
-                headers=webhook.headers or {},
-            )
-
-            if response.status_code in (200, 201, 204):
-                logger.info(f"Message sent to {webhook_name}")
-                return True
-            else:
-                self._log_failed_delivery(webhook_name, response.status_code, response.text)
-                return False
-
-        except Exception as e:
-            logger.error(f"Failed to send to {webhook_name}: {e}")
-            self._log_failed_delivery(webhook_name, "exception", str(e))
-            return False
-
-    async def _send_with_retry(self, webhook: WebhookConfig, payload: Dict[str, Any]) -> bool:
-        """Send message to webhook with retry logic."""
-        last_error = None
-
-        for attempt in range(webhook.retry_attempts):
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        webhook.webhook_url,
-                        json=payload,
-                        timeout=aiohttp.ClientTimeout(seconds=webhook.timeout_seconds),
-                        headers=webhook.headers or {"Content-Type": "application/json"},
-                    ) as response:
-                        if response.status in (200, 201, 204):
-                            logger.info(f"Message sent to {webhook.name} (attempt {attempt + 1})")
-                            return True
-                        else:
-                            text = await response.text()
-                            self._log_failed_delivery(webhook.name, response.status, text)
-                            last_error = f"HTTP {response.status}"
-
-            except asyncio.TimeoutError:
-                last_error = "Request timeout"
-            except Exception as e:
-                last_error = str(e)
-
-            # Wait before retry (exponential backoff)
-            if attempt < webhook.retry_attempts - 1:
-                wait_time = webhook.retry_delay_seconds * (2**attempt)
-                logger.warning(f"Retry {attempt + 1}/{webhook.retry_attempts} for {webhook.name} in {wait_time}s")
-                await asyncio.sleep(wait_time)
-
-        logger.error(f"Failed to send to {webhook.name} after {webhook.retry_attempts} attempts: {last_error}")
-        return False
+            return await self.send_to_webhook(*args)
+        finally:
+            await self.delivery.aclose()
 
     # ==================== Message Format Builders ====================
 
@@ -522,8 +504,7 @@ class WebhookManager:
             name: {
                 "enabled": webhook.enabled,
                 "type": webhook.webhook_type.value,
-                "last_attempt": None,  # Would be tracked in production
-                "success_count": 0,  # Would be tracked in production
+                **self.delivery.endpoint_status(name),
             }
             for name, webhook in self.webhooks.items()
         }
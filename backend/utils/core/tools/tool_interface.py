@@ -47,7 +47,8 @@ class ToolExecutor(IToolExecutor):
         if asyncio.iscoroutinefunction(tool_func):
             result = await tool_func(**filtered_kwargs)
         else:
-            result = tool_func(**filtered_kwargs)
+            # Sync tools (file, git, subprocess) run on a worker thread so they never block the event loop
+            result = await asyncio.to_thread(tool_func, **filtered_kwargs)
             # F15: Extra safety check - if the result is a coroutine (async), await it
             if asyncio.iscoroutine(result):
                 result = await result
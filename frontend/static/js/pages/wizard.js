@@ -286,6 +286,20 @@ window.WizardModule = (function() {
             } catch (_) {}
         });
 
+        es.addEventListener('job_status', (e) => {
+            try {
+                const d = JSON.parse(e.data);
+                if (d.status === 'queued') {
+                    const eta = d.eta_seconds != null ? ` · ~${Math.ceil(d.eta_seconds / 60)} min` : '';
+                    setPhaseLabel(`En cola: posición ${d.queue_position}${eta}`);
+                } else if (d.status === 'running') {
+                    setPhaseLabel(d.cancelling ? 'Cancelando...' : 'Iniciando...');
+                } else if (d.status === 'cancelled') {
+                    logLine('Generación cancelada', 'error');
+                }
+            } catch (_) {}
+        });
+
         es.addEventListener('task_status_changed', (e) => {
             try {
                 const d = JSON.parse(e.data);
@@ -402,10 +416,14 @@ window.WizardModule = (function() {
                 throw new Error(msg);
             }
 
-            if (data.status === 'started') {
+            if (data.status === 'started' || data.status === 'queued') {
                 state.currentProjectName = formData.project_name;
                 showProgressPanel(formData.project_name);
-                logLine(`Proyecto "${formData.project_name}" iniciado...`, 'info');
+                if (data.status === 'queued') {
+                    logLine(`Proyecto "${formData.project_name}" en cola (posición ${data.queue_position})...`, 'info');
+                } else {
+                    logLine(`Proyecto "${formData.project_name}" iniciado...`, 'info');
+                }
                 startSSE(formData.project_name);
             } else {
                 throw new Error(data.message || 'Error desconocido');
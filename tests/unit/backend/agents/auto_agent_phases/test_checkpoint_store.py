@@ -0,0 +1,147 @@
+"""Unit tests for the content-addressed AutoAgent checkpoint store."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.agents.auto_agent_phases.checkpoint_store import CheckpointStore
+from backend.agents.auto_agent_phases.phase_context import PhaseContext
+
+
+def _make_ctx(project_root: Path) -> PhaseContext:
+    return PhaseContext(
+        project_name="TestProject",
+        project_description="A test project",
+        project_root=project_root,
+        llm_manager=MagicMock(),
+        file_manager=MagicMock(),
+        event_publisher=MagicMock(),
+        logger=MagicMock(),
+    )
+
+
+def _blob_count(project_root: Path) -> int:
+    return sum(1 for p in (project_root / ".ollash" / "objects").rglob("*") if p.is_file())
+
+
+@pytest.mark.unit
+class TestCheckpointStore:
+    def test_identical_content_stored_once(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        hashes, written = store.snapshot({"a.py": "x = 1\n", "b.py": "x = 1\n"})
+
+        assert written == 1
+        assert hashes["a.py"] == hashes["b.py"]
+        assert store.get(hashes["a.py"]) == "x = 1\n"
+
+    def test_corrupted_blob_is_rejected(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        digest, _ = store.put("original")
+        store._object_path(digest).write_text("tampered", encoding="utf-8")
+
+        assert store.get(digest) is None
+
+    def test_diff(self):
+        old = {"a.py": "1", "b.py": "2", "c.py": "3"}
+        new = {"a.py": "1", "b.py": "9", "d.py": "4"}
+        assert CheckpointStore.diff(old, new) == {"added": ["d.py"], "removed": ["c.py"], "modified": ["b.py"]}
+
+    def test_diff_manifests(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        first = store.write_manifest("3", store.snapshot({"a.py": "1"})[0])
+        second = store.write_manifest("4", store.snapshot({"a.py": "2", "b.py": "1"})[0])
+
+        assert store.list_manifests() == [first, second]
+        assert store.diff_manifests(first, second) == {"added": ["b.py"], "removed": [], "modified": ["a.py"]}
+
+    def test_prune_keeps_newest_manifests_and_their_blobs(self, tmp_path):
+        store = CheckpointStore(tmp_path, keep_manifests=2)
+        names = [
+            store.write_manifest(str(i), store.snapshot({"a.py": f"v{i}", "shared.py": "same"})[0]) for i in range(4)
+        ]
+
+        assert store.prune() == (2, 2)  # v0 and v1 are gone, the shared blob stays
+        assert store.list_manifests() == names[2:]
+        assert _blob_count(tmp_path) == 3
+        restored, missing = store.restore(store.load_manifest(names[-1])["files"])
+        assert restored == {"a.py": "v3", "shared.py": "same"} and not missing
+
+        # Sequence numbers keep increasing after pruning, so order is preserved
+        newest = store.write_manifest("4", store.snapshot({"a.py": "v0"})[0])
+        assert store.list_manifests()[-1] == newest and store.get(store.content_hash("v0")) == "v0"
+
+    def test_gc_removes_unreferenced_blobs(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        store.write_manifest("1", store.snapshot({"a.py": "kept"})[0])
+        orphan, _ = store.put("orphan")
+        (store._object_path(orphan).parent / "stale.tmp").write_text("x", encoding="utf-8")
+
+        assert store.gc() == 2
+        assert store.get(orphan) is None and store.get(store.content_hash("kept")) == "kept"
+        assert store.put("orphan") == (orphan, True)  # rewritten, not skipped as known
+
+
+@pytest.mark.unit
+class TestPhaseContextCheckpoint:
+    def test_checkpoint_writes_only_changed_blobs(self, tmp_path):
+        ctx = _make_ctx(tmp_path)
+        ctx.generated_files = {f"f{i}.py": f"value = {i}\n" for i in range(10)}
+        ctx.save_checkpoint(["3"])
+        assert _blob_count(tmp_path) == 10
+
+        ctx.generated_files["f0.py"] = "value = 100\n"
+        diff = ctx.save_checkpoint(["3", "4"])
+
+        assert diff == {"added": [], "removed": [], "modified": ["f0.py"]}
+        assert _blob_count(tmp_path) == 11
+
+    def test_object_store_is_bounded_by_retention(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("OLLASH_CHECKPOINT_KEEP", "3")
+        ctx = _make_ctx(tmp_path)
+        for phase in range(12):
+            ctx.generated_files = {"app.py": f"phase = {phase}\n", "lib.py": "shared\n"}
+            ctx.save_checkpoint([str(p) for p in range(phase + 1)])
+
+        assert len(ctx.checkpoint_store().list_manifests()) == 3
+        assert _blob_count(tmp_path) == 4  # three app.py versions + lib.py
+        resumed = _make_ctx(tmp_path)
+        resumed.apply_checkpoint_dict(PhaseContext.load_checkpoint(tmp_path))
+        assert resumed.generated_files["app.py"] == "phase = 11\n"
+
+    def test_resume_restores_exact_state_despite_disk_edits(self, tmp_path):
+        ctx = _make_ctx(tmp_path)
+        ctx.generated_files = {"app.py": "print('generated')\n"}
+        (tmp_path / "app.py").write_text("print('generated')\n", encoding="utf-8")
+        ctx.save_checkpoint(["4"])
+
+        (tmp_path / "app.py").write_text("print('half-wri", encoding="utf-8")
+
+        resumed = _make_ctx(tmp_path)
+        data = PhaseContext.load_checkpoint(tmp_path)
+        resumed.apply_checkpoint_dict(data)
+
+        assert data["completed_phases"] == ["4"]
+        assert resumed.generated_files == {"app.py": "print('generated')\n"}
+        resumed.logger.warning.assert_called()
+
+    def test_legacy_checkpoint_reads_from_disk(self, tmp_path):
+        (tmp_path / "app.py").write_text("on disk\n", encoding="utf-8")
+        ctx = _make_ctx(tmp_path)
+        ctx.apply_checkpoint_dict({"generated_file_paths": ["app.py"], "completed_phases": ["4"]})
+
+        assert ctx.generated_files == {"app.py": "on disk\n"}
+
+    def test_missing_blob_falls_back_to_disk(self, tmp_path):
+        ctx = _make_ctx(tmp_path)
+        ctx.generated_files = {"app.py": "checkpointed\n"}
+        ctx.save_checkpoint(["4"])
+        for blob in (tmp_path / ".ollash" / "objects").rglob("*"):
+            if blob.is_file():
+                blob.unlink()
+        (tmp_path / "app.py").write_text("on disk\n", encoding="utf-8")
+
+        resumed = _make_ctx(tmp_path)
+        resumed.apply_checkpoint_dict(PhaseContext.load_checkpoint(tmp_path))
+
+        assert resumed.generated_files == {"app.py": "on disk\n"}
@@ -222,3 +222,29 @@ class TestDescriptionComplexityM11:
         score_bonus = ctx2.description_complexity()
 
         assert score_bonus >= score_no_bonus + 1
+
+
+@pytest.mark.unit
+class TestPhaseContextCancellation:
+    def test_check_cancelled_without_event_is_noop(self):
+        _make_ctx().check_cancelled()
+
+    def test_llm_call_refused_after_cancel(self):
+        import threading
+
+        from backend.agents.auto_agent_phases.base_phase import BasePhase
+        from backend.utils.core.exceptions import PipelineCancelledError
+
+        class _Phase(BasePhase):
+            phase_id = "x"
+
+            def run(self, ctx):
+                self._llm_call(ctx, "system", "user")
+
+        ctx = _make_ctx()
+        ctx.cancel_event = threading.Event()
+        ctx.cancel_event.set()
+
+        with pytest.raises(PipelineCancelledError):
+            _Phase().execute(ctx)
+        ctx.llm_manager.get_client.return_value.chat.assert_not_called()
@@ -0,0 +1,168 @@
+"""Unit tests for RepairEngine — import-graph ordering, deterministic merging and a serial vs parallel benchmark."""
+
+import random
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.agents.auto_agent_phases.phase_context import FilePlan, PhaseContext
+from backend.agents.auto_agent_phases.repair_engine import RepairEngine, build_import_graph, repair_waves
+from backend.utils.core.exceptions import PipelineCancelledError
+
+
+def _make_ctx(files, tmp_path: Path, blueprint=None) -> PhaseContext:
+    ctx = PhaseContext(
+        project_name="Repair",
+        project_description="repair engine test",
+        project_root=tmp_path,
+        llm_manager=MagicMock(),
+        file_manager=MagicMock(),
+        event_publisher=MagicMock(),
+        logger=MagicMock(),
+    )
+    ctx.generated_files = dict(files)
+    ctx.blueprint = blueprint or []
+    return ctx
+
+
+def _write(ctx, rel, content):
+    ctx.generated_files[rel] = content
+
+
+@pytest.mark.unit
+class TestImportGraph:
+    def test_python_and_js_imports_are_resolved(self, tmp_path):
+        ctx = _make_ctx(
+            {
+                "app/main.py": "from app.models import User\nfrom .utils import slugify\nimport app.db\n",
+                "app/models.py": "from . import db\n",
+                "app/utils.py": "import re\n",
+                "app/db.py": "",
+                "web/main.js": "import { draw } from './render.js';\nconst cfg = require('../config');\n",
+                "web/render.js": "export function draw() {}\n",
+                "config.js": "module.exports = {};\n",
+            },
+            tmp_path,
+            blueprint=[FilePlan(path="app/utils.py", purpose="", imports=["app/db.py"])],
+        )
+        graph = build_import_graph(ctx, list(ctx.generated_files))
+        assert graph["app/main.py"] == {"app/models.py", "app/utils.py", "app/db.py"}
+        assert graph["app/models.py"] == {"app/db.py"}
+        assert graph["app/utils.py"] == {"app/db.py"}  # declared in the blueprint
+        assert graph["web/main.js"] == {"web/render.js", "config.js"}
+
+    def test_waves_put_imported_files_first_and_break_cycles(self):
+        graph = {"a": {"b"}, "b": {"c"}, "c": set(), "d": set(), "x": {"y"}, "y": {"x"}}
+        assert repair_waves(["a", "b", "c", "d"], graph) == [["c", "d"], ["b"], ["a"]]
+        # Imports of files that are not being repaired do not constrain the order
+        assert repair_waves(["a", "c"], graph) == [["a", "c"]]
+        assert repair_waves(["x", "y"], graph) == [["x"], ["y"]]
+
+
+@pytest.mark.unit
+class TestRepairEngine:
+    def test_importer_sees_repaired_dependency(self, tmp_path):
+        ctx = _make_ctx({"main.py": "from lib import api\n", "lib.py": "def api(): pass  # broken\n"}, tmp_path)
+        seen = {}
+
+        def repair(path, content, payload):
+            seen[path] = content
+            return content.replace("broken", "fixed")
+
+        outcomes = RepairEngine(ctx, max_workers=4).run({"main.py": 1, "lib.py": 1}, repair, _write)
+        assert [o.file_path for o in outcomes] == ["main.py", "lib.py"]  # job order
+        assert seen["lib.py"].endswith("# broken\n")
+        assert "fixed" in ctx.generated_files["lib.py"]
+        assert ctx.metrics["repair_engine"][0]["waves"] == 2
+
+    def test_results_merge_in_job_order_regardless_of_completion(self, tmp_path):
+        files = {f"f{i}.py": f"x = {i}\n" for i in range(12)}
+        ctx = _make_ctx(files, tmp_path)
+        writes = []
+
+        def repair(path, content, payload):
+            time.sleep(random.uniform(0, 0.02))
+            return content + "# fixed\n"
+
+        def write(ctx_, rel, content):
+            writes.append(rel)
+            ctx_.generated_files[rel] = content
+
+        RepairEngine(ctx, max_workers=6).run({p: None for p in files}, repair, write)
+        assert writes == list(files)
+
+    def test_errors_missing_files_and_noops_are_reported(self, tmp_path):
+        ctx = _make_ctx({"ok.py": "a\n", "boom.py": "b\n", "same.py": "c\n"}, tmp_path)
+
+        def repair(path, content, payload):
+            if path == "boom.py":
+                raise RuntimeError("llm down")
+            return content if path == "same.py" else "fixed\n"
+
+        outcomes = {
+            o.file_path: o
+            for o in RepairEngine(ctx).run({"ok.py": 0, "boom.py": 0, "same.py": 0, "gone.py": 0}, repair, _write)
+        }
+        assert outcomes["ok.py"].changed
+        assert outcomes["boom.py"].error == "llm down"
+        assert not outcomes["same.py"].changed and outcomes["same.py"].error is None
+        assert outcomes["gone.py"].missing
+
+    def test_concurrency_is_bounded(self, tmp_path):
+        files = {f"f{i}.js": "let x;\n" for i in range(10)}
+        ctx = _make_ctx(files, tmp_path)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def repair(path, content, payload):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return content
+
+        RepairEngine(ctx, max_workers=3).run({p: None for p in files}, repair, _write)
+        assert peak[0] == 3
+
+    def test_cancellation_propagates(self, tmp_path):
+        ctx = _make_ctx({"a.py": "a\n", "b.py": "b\n"}, tmp_path)
+
+        def repair(path, content, payload):
+            raise PipelineCancelledError("Repair")
+
+        with pytest.raises(PipelineCancelledError):
+            RepairEngine(ctx, max_workers=2).run({"a.py": 0, "b.py": 0}, repair, _write)
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestRepairEngineBenchmark:
+    """Serial vs parallel repair of 60 broken files against a mock LLM with fixed latency."""
+
+    FILES = 60
+    LATENCY = 0.02  # seconds per mocked LLM call
+
+    def _run(self, tmp_path, workers):
+        # Ten small modules, each imported by five feature files → two waves
+        files = {f"pkg/util{i}.py": "def helper():\n    pass  # TODO\n" for i in range(10)}
+        for i in range(self.FILES - 10):
+            files[f"pkg/feature{i}.py"] = f"from pkg.util{i % 10} import helper\n# TODO\n"
+        ctx = _make_ctx(files, tmp_path)
+
+        def mock_llm_repair(path, content, payload):
+            time.sleep(self.LATENCY)
+            return content.replace("TODO", "done")
+
+        outcomes = RepairEngine(ctx, max_workers=workers).run({p: None for p in files}, mock_llm_repair, _write)
+        assert sum(o.changed for o in outcomes) == self.FILES
+        return ctx
+
+    def test_parallel_repair_is_equivalent_to_serial(self, tmp_path):
+        serial_ctx = self._run(tmp_path, workers=1)
+        parallel_ctx = self._run(tmp_path, workers=8)
+        assert serial_ctx.generated_files == parallel_ctx.generated_files
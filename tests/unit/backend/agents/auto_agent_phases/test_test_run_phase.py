@@ -1,5 +1,6 @@
-"""Unit tests for TestRunPhase — I9 improvements."""
+"""Unit tests for TestRunPhase — I9 improvements, impact-based selection and sharding."""
 
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -10,6 +11,10 @@ from backend.agents.auto_agent_phases.test_run_phase import (
     TestRunPhase,
     _MAX_ITERATIONS_LARGE,
     _MAX_ITERATIONS_SMALL,
+    _PYTEST_ARGS,
+    affected_tests,
+    is_pytest_file,
+    shard_tests,
 )
 
 
@@ -136,3 +141,161 @@ def test_i9_ruff_check_skipped_for_non_python_project():
         TestRunPhase()._post_success_ruff_check(ctx)
 
     mock_sub.assert_not_called()
+
+
+# ----------------------------------------------------------------
+# Impact-based selection and sharding
+# ----------------------------------------------------------------
+
+_PROJECT = {
+    "app/calc.py": "def add(a, b):\n    return a - b\n",
+    "app/fmt.py": "from app.calc import add\n",
+    "app/io.py": "import json\n",
+    "tests/conftest.py": "",
+    "tests/test_calc.py": "from app.calc import add\n\ndef test_add(): assert add(1, 2) == 3\n",
+    "tests/test_fmt.py": "from app.fmt import add\n\ndef test_fmt(): pass\n",
+    "tests/test_io.py": "import app.io\n\ndef test_io(): pass\n",
+}
+
+
+@pytest.mark.unit
+def test_affected_tests_follow_transitive_imports_and_conftest():
+    ctx = _make_ctx()
+    ctx.generated_files = dict(_PROJECT)
+    tests = [p for p in _PROJECT if is_pytest_file(p)]
+
+    assert affected_tests(ctx, tests, ["app/calc.py"]) == ["tests/test_calc.py", "tests/test_fmt.py"]
+    assert affected_tests(ctx, tests, ["tests/test_io.py"]) == ["tests/test_io.py"]
+    assert affected_tests(ctx, tests, ["tests/conftest.py"]) == sorted(tests)
+    assert affected_tests(ctx, tests, ["README.md"]) == []
+
+
+@pytest.mark.unit
+def test_shard_tests_balances_files_and_keeps_node_ids_together():
+    targets = ["b.py::test_x", "a.py", "c.py", "b.py::test_y", "d.py"]
+    cost = {"a.py": 100, "b.py": 10, "c.py": 60, "d.py": 50}
+    shards = shard_tests(targets, 2, cost)
+
+    # a(100) → 0, c(60) → 1, d(50) → 1, b(10) → 0; each shard keeps the caller's order
+    assert shards == [["b.py::test_x", "a.py", "b.py::test_y"], ["c.py", "d.py"]]
+    assert shard_tests(["a.py"], 4, cost) == [["a.py"]]
+    assert shard_tests([], 4, cost) == []
+
+
+def _impact_phase(ctx, full_results, targeted_results, full_delay=0.0):
+    """Phase whose test runs are scripted; records every pytest invocation."""
+    calls = []
+    phase = TestRunPhase()
+
+    def fake_full(ctx_, runner):
+        calls.append(("full",))
+        time.sleep(full_delay)
+        return full_results.pop(0)
+
+    def fake_targeted(ctx_, targets=None, deselect=()):
+        calls.append(("targeted", list(targets), list(deselect)))
+        return targeted_results.pop(0)
+
+    def fake_patch(ctx_, failure):
+        ctx_.generated_files["app/calc.py"] += "# patched\n"
+        return True
+
+    phase._run_tests = fake_full
+    phase._run_pytest = fake_targeted
+    phase._patch_failure = fake_patch
+    phase._post_success_ruff_check = lambda ctx_: None
+    return phase, calls
+
+
+_CALC_FAILURE = {"file_path": "tests/test_calc.py", "test_name": "test_add", "error": "assert -1 == 3"}
+
+
+@pytest.mark.unit
+def test_impact_iteration_runs_failed_then_affected_then_one_full_confirmation():
+    ctx = _make_ctx()
+    ctx.generated_files = dict(_PROJECT)
+    passed = {"passed": True, "failures": []}
+    phase, calls = _impact_phase(
+        ctx,
+        full_results=[{"passed": False, "failures": [_CALC_FAILURE]}, passed],
+        targeted_results=[passed, passed],
+    )
+    phase.run(ctx)
+
+    assert calls == [
+        ("full",),
+        ("targeted", ["tests/test_calc.py::test_add"], []),
+        ("targeted", ["tests/test_calc.py", "tests/test_fmt.py"], ["tests/test_calc.py::test_add"]),
+        ("full",),
+    ]
+    assert ctx.metrics["tests_passed"] is True
+    assert [i["mode"] for i in ctx.metrics["test_run_iterations"]] == ["full", "impact"]
+    assert ctx.metrics["test_run_iterations"][1]["selected"] == 3
+
+
+@pytest.mark.unit
+def test_still_failing_tests_skip_the_rest_and_report_time_saved():
+    ctx = _make_ctx()
+    ctx.generated_files = dict(_PROJECT)
+    failing = {"passed": False, "failures": [_CALC_FAILURE]}
+    phase, calls = _impact_phase(
+        ctx,
+        full_results=[failing],
+        targeted_results=[failing] * (_MAX_ITERATIONS_LARGE - 1),
+        full_delay=0.05,
+    )
+    phase.run(ctx)
+
+    assert calls.count(("full",)) == 1
+    assert all(c[0] == "targeted" and c[1] == ["tests/test_calc.py::test_add"] for c in calls[1:])
+    iterations = ctx.metrics["test_run_iterations"]
+    assert len(iterations) == _MAX_ITERATIONS_LARGE
+    assert all(i["saved_seconds"] > 0 for i in iterations[1:])
+    assert ctx.metrics["test_time_saved_seconds"] == pytest.approx(sum(i["saved_seconds"] for i in iterations))
+    assert ctx.metrics["tests_passed"] is False
+
+
+@pytest.mark.unit
+def test_run_pytest_shards_across_processes_and_merges_failures():
+    ctx = _make_ctx()
+    ctx.generated_files = dict(_PROJECT)
+    ctx.test_shards = 2
+
+    def fake_run(cmd, **kwargs):
+        out = MagicMock()
+        out.stderr = ""
+        if "tests/test_calc.py" in cmd:
+            out.returncode = 1
+            out.stdout = "FAILED tests/test_calc.py::test_add - assert -1 == 3\n"
+        else:
+            out.returncode = 0
+            out.stdout = ""
+        return out
+
+    with patch("subprocess.run", side_effect=fake_run) as mock_run:
+        result = TestRunPhase()._run_pytest(ctx, ["tests/test_calc.py", "tests/test_fmt.py", "tests/test_io.py"])
+
+    cmds = [c.args[0] for c in mock_run.call_args_list]
+    assert len(cmds) == 2 and all("no:cacheprovider" in c for c in cmds)
+    assert sorted(t for c in cmds for t in c if t.startswith("tests/")) == [
+        "tests/test_calc.py",
+        "tests/test_fmt.py",
+        "tests/test_io.py",
+    ]
+    assert result == {"passed": False, "failures": [_CALC_FAILURE]}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("returncode, passed", [(0, True), (1, False), (5, False)])
+def test_full_run_is_one_plain_pytest_and_empty_collection_fails(returncode, passed):
+    ctx = _make_ctx()
+    ctx.generated_files = dict(_PROJECT)
+    ctx.test_shards = 4
+
+    with patch("subprocess.run", return_value=MagicMock(returncode=returncode, stdout="", stderr="")) as mock_run:
+        result = TestRunPhase()._run_pytest(ctx)
+
+    # One process, no explicit file list: the project's testpaths/conftest decide collection
+    assert mock_run.call_count == 1
+    assert mock_run.call_args.args[0] == _PYTEST_ARGS
+    assert result["passed"] is passed
@@ -47,8 +47,6 @@ def agent(mock_kernel):
         patch("backend.agents.core_agent.DependencyScanner") as mock_ds_cls,
         patch("backend.agents.core_agent.DependencyReconciler") as mock_rec_cls,
         patch("backend.agents.core_agent.RAGContextSelector") as mock_rag_cls,
-        patch("backend.agents.core_agent.ConcurrentGPUAwareRateLimiter"),
-        patch("backend.agents.core_agent.SessionResourceManager"),
         patch("backend.agents.core_agent.AutoModelSelector"),
         patch("backend.agents.core_agent.PermissionProfileManager"),
         patch("backend.agents.core_agent.PolicyEnforcer"),
@@ -68,8 +68,6 @@ def default_agent(mock_kernel, tmp_path):
             "backend.agents.core_agent.CrossReferenceAnalyzer",
             "backend.agents.core_agent.DependencyScanner",
             "backend.agents.core_agent.RAGContextSelector",
-            "backend.agents.core_agent.ConcurrentGPUAwareRateLimiter",
-            "backend.agents.core_agent.SessionResourceManager",
             "backend.agents.core_agent.AutoModelSelector",
             "backend.agents.core_agent.AutomaticLearningSystem",
             # Critical: OllamaClient accessed via LLMClientManager
@@ -143,3 +143,28 @@ class TestPipelineCRUD:
             pytest.skip("No builtin pipeline found")
         r = client.delete(f"/api/pipelines/{builtin['id']}", headers=headers)
         assert r.status_code == 404
+
+
+class TestRunEvents:
+    def test_events_are_read_incrementally_by_cursor(self, client):
+        from backend.api.routers import pipeline_router
+
+        headers = _auth_headers(client)
+        created = client.post(
+            "/api/pipelines", json={"name": "Tailed", "phases": ["VerificationPhase"]}, headers=headers
+        ).json()
+        store = pipeline_router._store()
+        run = store.create_run(created["id"])
+        store.append_events(run["id"], [{"type": "phase_done", "index": i} for i in range(5)])
+
+        url = f"/api/pipelines/{created['id']}/runs/{run['id']}/events"
+        first = client.get(url, params={"limit": 3}, headers=headers).json()
+        assert [e["index"] for e in first["events"]] == [0, 1, 2] and first["status"] == "running"
+        rest = client.get(url, params={"after": first["next_cursor"]}, headers=headers).json()
+        assert [e["index"] for e in rest["events"]] == [3, 4] and rest["next_cursor"] == 5
+        idle = client.get(url, params={"after": 5}, headers=headers).json()
+        assert idle["events"] == [] and idle["next_cursor"] == 5
+
+    def test_events_of_unknown_run_is_404(self, client):
+        headers = _auth_headers(client)
+        assert client.get("/api/pipelines/1/runs/999999/events", headers=headers).status_code == 404
@@ -0,0 +1,136 @@
+"""Tests for backend.mcp.client — multiplexed stdio transport and tools/list caching."""
+
+import concurrent.futures
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from backend.mcp import client as mcp_client
+from backend.mcp.client import MCPConnection
+
+pytestmark = pytest.mark.unit
+
+# A tiny MCP server: answers tools/call after `arguments.delay` seconds on its
+# own thread, so responses come back out of order, and counts tools/list calls.
+_FAKE_SERVER = textwrap.dedent(
+    """
+    import json, sys, threading, time
+
+    lock = threading.Lock()
+    lists = 0
+
+    def send(msg):
+        with lock:
+            sys.stdout.write(json.dumps(msg) + "\\n")
+            sys.stdout.flush()
+
+    def call(msg):
+        args = msg["params"]["arguments"]
+        time.sleep(args.get("delay", 0))
+        text = args.get("text", "")
+        send({"jsonrpc": "2.0", "id": msg["id"], "result": {"content": [{"type": "text", "text": text}]}})
+
+    for line in sys.stdin:
+        msg = json.loads(line)
+        if "id" not in msg:
+            continue
+        method = msg["method"]
+        if method == "initialize":
+            send({"jsonrpc": "2.0", "id": msg["id"], "result": {"serverInfo": {"name": "fake"}}})
+        elif method == "tools/list":
+            lists += 1
+            tools = [{"name": "echo", "description": "lists=%d" % lists}]
+            send({"jsonrpc": "2.0", "id": msg["id"], "result": {"tools": tools}})
+        elif method == "tools/call":
+            threading.Thread(target=call, args=(msg,), daemon=True).start()
+        else:
+            send({"jsonrpc": "2.0", "id": msg["id"], "error": {"code": -32601, "message": "nope"}})
+    """
+)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    script = tmp_path / "fake_mcp.py"
+    script.write_text(_FAKE_SERVER)
+    connection = MCPConnection({"name": "fake", "transport": "stdio", "command": [sys.executable, str(script)]})
+    assert connection.connect()
+    yield connection
+    connection.disconnect()
+
+
+def _text(result):
+    return result["content"][0]["text"]
+
+
+class TestStdioMultiplexing:
+    def test_concurrent_calls_from_threads_overlap(self, conn):
+        results = {}
+
+        def worker(i):
+            results[i] = _text(conn.call_tool("echo", {"text": f"r{i}", "delay": 0.4}))
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == {i: f"r{i}" for i in range(4)}
+        assert time.monotonic() - start < 1.2  # serialized would take >= 1.6s
+        assert conn.in_flight == 0
+
+    def test_responses_dispatch_by_id_out_of_order(self, conn):
+        slow = conn._submit("tools/call", {"name": "echo", "arguments": {"text": "slow", "delay": 0.3}})
+        fast = conn._submit("tools/call", {"name": "echo", "arguments": {"text": "fast", "delay": 0.0}})
+        done, _ = concurrent.futures.wait([slow, fast], timeout=2, return_when=concurrent.futures.FIRST_COMPLETED)
+        assert done == {fast}
+        assert (_text(slow.result(2)["result"]), _text(fast.result()["result"])) == ("slow", "fast")
+
+    def test_timeout_abandons_request(self, conn):
+        assert conn._rpc("tools/call", {"name": "echo", "arguments": {"delay": 1}}, timeout=0.05) is None
+        assert conn.in_flight == 0
+        # The connection is still usable afterwards
+        assert _text(conn.call_tool("echo", {"text": "ok"})) == "ok"
+
+    def test_error_response_is_returned(self, conn):
+        assert conn._rpc("unknown/method")["error"]["message"] == "nope"
+
+    def test_disconnect_fails_pending_requests(self, conn):
+        future = conn._submit("tools/call", {"name": "echo", "arguments": {"delay": 5}})
+        conn.disconnect()
+        assert future.result(timeout=1) is None
+
+
+class TestConnectFailure:
+    def test_failed_initialize_stops_the_process_and_reader_threads(self, monkeypatch):
+        refuse = (
+            "import json, sys\n"
+            "for line in sys.stdin:\n"
+            "    msg = json.loads(line)\n"
+            "    print(json.dumps({'jsonrpc': '2.0', 'id': msg['id'], 'error': {'code': 1, 'message': 'no'}}), flush=True)\n"
+        )
+        spawned = []
+        popen = subprocess.Popen
+        monkeypatch.setattr(subprocess, "Popen", lambda *a, **kw: spawned.append(popen(*a, **kw)) or spawned[-1])
+        connection = MCPConnection({"name": "refuses", "transport": "stdio", "command": [sys.executable, "-c", refuse]})
+
+        assert not connection.connect()
+        assert connection._proc is None and connection._io_threads == []
+        assert spawned[0].poll() is not None
+        assert not [t for t in threading.enumerate() if t.name.endswith("-refuses")]
+
+
+class TestToolsListCache:
+    def test_tools_list_is_cached_until_ttl(self, conn, monkeypatch):
+        assert conn.list_tools()[0]["description"] == "lists=1"
+        assert conn.list_tools()[0]["description"] == "lists=1"
+
+        monkeypatch.setattr(mcp_client, "_TOOLS_TTL", 0)
+        assert conn.list_tools()[0]["description"] == "lists=2"
+        assert conn.list_tools(force=True)[0]["description"] == "lists=3"
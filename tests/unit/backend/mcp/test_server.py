@@ -1,12 +1,13 @@
 """Tests for backend.mcp.server — MCPServer message dispatch."""
 
 import json
+import time
 from io import BytesIO
 from unittest.mock import patch
 
 import pytest
 
-from backend.mcp.protocol import encode, request
+from backend.mcp.protocol import encode, notification, request
 from backend.mcp.server import MCPServer
 
 pytestmark = pytest.mark.unit
@@ -141,3 +142,58 @@ class TestRunLoop:
         ids = [m.get("id") for m in parsed if "id" in m]
         assert 10 in ids
         assert 11 in ids
+
+
+class TestConcurrentDispatch:
+    @staticmethod
+    def _run(server, msgs):
+        server._in = BytesIO(b"".join(encode(m) for m in msgs))
+        server._out = BytesIO()
+        server.run()
+        lines = server._out.getvalue().decode().strip().split("\n")
+        return [json.loads(ln) for ln in lines if ln]
+
+    @staticmethod
+    def _slow_execute(name, arguments):
+        time.sleep(0.3)
+        return f"done {name}"
+
+    @pytest.fixture
+    def slow_server(self):
+        srv = MCPServer(max_workers=2)
+        srv._tools_cache = [{"name": "slow_tool", "description": "Slow", "inputSchema": {}}]
+        return srv
+
+    def test_slow_calls_overlap_and_do_not_block_ping(self, slow_server):
+        msgs = [
+            request("tools/call", {"name": "slow_tool", "arguments": {}}, req_id=1),
+            request("tools/call", {"name": "slow_tool", "arguments": {}}, req_id=2),
+            request("ping", req_id=3),
+        ]
+        start = time.monotonic()
+        with patch.object(slow_server._executor, "execute", side_effect=self._slow_execute):
+            parsed = self._run(slow_server, msgs)
+
+        assert time.monotonic() - start < 0.55  # sequential would take >= 0.6s
+        ids = [m["id"] for m in parsed if "id" in m]
+        assert ids[0] == 3
+        assert sorted(ids[1:]) == [1, 2]
+
+    def test_cancelled_requests_get_no_response(self, slow_server):
+        msgs = [
+            request("tools/call", {"name": "slow_tool", "arguments": {}}, req_id=1),
+            request("tools/call", {"name": "slow_tool", "arguments": {}}, req_id=2),
+            request("tools/call", {"name": "slow_tool", "arguments": {}}, req_id=3),
+            notification("notifications/cancelled", {"requestId": 3}),  # still queued
+            notification("notifications/cancelled", {"requestId": 1}),  # already running
+        ]
+        with patch.object(slow_server._executor, "execute", side_effect=self._slow_execute) as mock_exec:
+            parsed = self._run(slow_server, msgs)
+
+        assert [m["id"] for m in parsed if "id" in m] == [2]
+        assert mock_exec.call_count == 2
+
+    def test_tools_list_payload_is_built_once(self, slow_server):
+        first = slow_server.handle(request("tools/list", req_id=1))["result"]
+        second = slow_server.handle(request("tools/list", req_id=2))["result"]
+        assert first is second
@@ -0,0 +1,105 @@
+"""Unit tests for AgentPool (warm, resettable DefaultAgent shells)."""
+
+import threading
+import time
+
+import pytest
+
+from backend.services.agent_pool import AgentPool
+
+
+class _FakeAgent:
+    def __init__(self, project_root, shared):
+        self.project_root = project_root
+        self.shared = shared
+        self.event_bridge = None
+        self.system_prompt = "default"
+        self.conversation = []
+        self.resets = 0
+
+    def reset_session(self, event_bridge=None, system_prompt=None):
+        self.resets += 1
+        self.event_bridge = event_bridge
+        if system_prompt:
+            self.system_prompt = system_prompt
+        self.conversation = []
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.unit
+class TestAgentPool:
+    @pytest.fixture()
+    def pool(self, tmp_path, monkeypatch):
+        pool = AgentPool(tmp_path, max_idle=2, warm_spares=0, agent_factory=_FakeAgent)
+        monkeypatch.setattr(pool, "_get_shared", lambda key: {"llm_manager": "shared-llm", "kernel": key})
+        return pool
+
+    def test_released_agent_is_reset_and_reused(self, pool, tmp_path):
+        first = pool.acquire(str(tmp_path), event_bridge="bridge-1", system_prompt="coding")
+        assert (first.event_bridge, first.system_prompt) == ("bridge-1", "coding")
+        first.conversation.append({"role": "user", "content": "hi"})
+
+        pool.release(first)
+        second = pool.acquire(str(tmp_path), event_bridge="bridge-2")
+        assert second is first
+        assert second.conversation == [] and second.event_bridge == "bridge-2"
+        assert pool.stats()["constructed"] == 1 and pool.stats()["reused"] == 1
+
+    def test_agents_are_not_shared_across_project_roots(self, pool, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        agent_a = pool.acquire(str(tmp_path / "a"))
+        pool.release(agent_a)
+        agent_b = pool.acquire(str(tmp_path / "b"))
+        assert agent_b is not agent_a
+        assert agent_b.shared["llm_manager"] == agent_a.shared["llm_manager"]
+
+    def test_unknown_and_double_release_are_ignored(self, pool, tmp_path):
+        pool.release(object())
+        agent = pool.acquire(str(tmp_path))
+        pool.release(agent)
+        pool.release(agent)
+        assert pool.idle_count == 1
+
+    def test_idle_agents_are_bounded(self, pool, tmp_path):
+        agents = [pool.acquire(str(tmp_path)) for _ in range(3)]
+        for agent in agents:
+            pool.release(agent)
+        assert pool.idle_count == 2
+
+    def test_prewarm_builds_spare_in_background(self, pool, tmp_path):
+        pool.warm_spares = 1
+        pool.acquire(str(tmp_path))
+        assert _wait_for(lambda: pool.idle_count == 1)
+        stats = pool.stats()
+        assert stats["constructed"] == 2
+        assert stats["leased"] == 1
+        assert stats["avg_construct_ms"] >= 0.0
+
+    def test_construction_time_is_reported(self, tmp_path, monkeypatch):
+        def slow_factory(project_root, shared):
+            time.sleep(0.05)
+            return _FakeAgent(project_root, shared)
+
+        pool = AgentPool(tmp_path, warm_spares=0, agent_factory=slow_factory)
+        monkeypatch.setattr(pool, "_get_shared", lambda key: {})
+        pool.acquire(str(tmp_path))
+        assert pool.stats()["last_construct_ms"] >= 50
+
+    def test_concurrent_acquire_hands_out_distinct_agents(self, pool, tmp_path):
+        pool.release(pool.acquire(str(tmp_path)))
+        acquired = []
+        threads = [threading.Thread(target=lambda: acquired.append(pool.acquire(str(tmp_path)))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(agent) for agent in acquired}) == 4
@@ -0,0 +1,154 @@
+"""Unit tests for AsyncEventChannel and ChatEventBridge.open_channel()."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from backend.services.async_event_channel import AsyncEventChannel, format_sse
+from backend.services.chat_event_bridge import ChatEventBridge
+from backend.utils.core.system.event_publisher import EventPublisher
+
+
+def _payloads(text: str):
+    return [json.loads(line[len("data: ") :]) for line in text.splitlines() if line.startswith("data: ")]
+
+
+async def _collect(channel: AsyncEventChannel):
+    chunks = []
+    async for chunk in channel:
+        chunks.append(chunk)
+    return "".join(chunks)
+
+
+@pytest.mark.unit
+class TestFormatSse:
+    def test_named_frame(self):
+        assert format_sse("info", {"message": "hi"}, named=True) == (
+            'event: info\ndata: {"message": "hi", "type": "info"}\n\n'
+        )
+
+    def test_type_wins_over_data_and_coroutines_are_sanitized(self):
+        async def pending():
+            pass
+
+        coro = pending()
+        payload = _payloads(format_sse("final_answer", {"type": "x", "value": coro}))[0]
+        coro.close()
+        assert payload["type"] == "final_answer"
+        assert payload["value"].startswith("[Pending Coroutine")
+
+
+@pytest.mark.unit
+class TestAsyncEventChannel:
+    def test_token_bursts_are_coalesced_into_one_frame(self):
+        async def run():
+            channel = AsyncEventChannel()
+            for word in ("Hello", ", ", "world"):
+                channel.publish("token", {"text": word})
+            channel.publish("info", {"message": "done"})
+            channel.close()
+            return channel, await _collect(channel)
+
+        channel, text = asyncio.run(run())
+        assert _payloads(text) == [
+            {"text": "Hello, world", "type": "token"},
+            {"message": "done", "type": "info"},
+            {"type": "stream_end"},
+        ]
+        assert channel.coalesced == 2
+        assert channel.closed
+
+    def test_chunks_from_different_streams_are_not_merged(self):
+        async def run():
+            channel = AsyncEventChannel()
+            channel.publish("blackboard_stream_chunk", {"rel_path": "a.py", "chunk": "x"})
+            channel.publish("blackboard_stream_chunk", {"rel_path": "b.py", "chunk": "y"})
+            channel.close()
+            return await _collect(channel)
+
+        assert [p["rel_path"] for p in _payloads(asyncio.run(run()))[:2]] == ["a.py", "b.py"]
+
+    def test_slow_client_drops_oldest_stream_chunks(self):
+        async def run():
+            channel = AsyncEventChannel(maxsize=3)
+            channel.publish("info", {"message": "keep"})
+            for i in range(5):
+                channel.publish("stream_chunk", {"text": str(i), "stream": "stdout" if i % 2 else "stderr"})
+            channel.close()
+            return channel, await _collect(channel)
+
+        channel, text = asyncio.run(run())
+        payloads = _payloads(text)
+        assert payloads[0] == {"message": "keep", "type": "info"}
+        assert payloads[-1] == {"type": "stream_end"}
+        assert channel.dropped == 3
+        assert ": dropped 3 events" in text
+
+    def test_disconnect_policy_ends_stream(self):
+        async def run():
+            channel = AsyncEventChannel(maxsize=2, overflow="disconnect")
+            for i in range(3):
+                channel.publish("info", {"message": str(i)})
+            accepted = channel.publish("info", {"message": "late"})
+            return accepted, await _collect(channel)
+
+        accepted, text = asyncio.run(run())
+        assert accepted is False
+        assert [p["type"] for p in _payloads(text)] == ["error"]
+
+    def test_keepalive_when_idle(self):
+        async def run():
+            channel = AsyncEventChannel(keepalive_interval=0.01)
+            first = await channel.__anext__()
+            await channel.aclose()
+            return first
+
+        assert asyncio.run(run()) == ": keepalive\n\n"
+
+    def test_publish_from_other_thread(self):
+        async def run():
+            channel = AsyncEventChannel()
+
+            def produce():
+                for i in range(200):
+                    channel.publish("info", {"i": i})
+                channel.close()
+
+            threading.Thread(target=produce).start()
+            return await _collect(channel)
+
+        payloads = _payloads(asyncio.run(run()))
+        assert [p["i"] for p in payloads[:-1]] == list(range(200))
+
+
+@pytest.mark.unit
+class TestChatEventBridgeChannels:
+    def test_backlog_is_replayed_and_every_channel_gets_every_event(self):
+        async def run():
+            bridge = ChatEventBridge(EventPublisher())
+            bridge.push_event("info", {"message": "early"})
+            first = bridge.open_channel()
+            second = bridge.open_channel()
+            bridge.push_event("info", {"message": "live"})
+            bridge.close()
+            return bridge, await _collect(first), await _collect(second)
+
+        bridge, first, second = asyncio.run(run())
+        assert [p.get("message") for p in _payloads(first)] == ["early", "live", None]
+        assert [p.get("message") for p in _payloads(second)] == ["live", None]
+        assert bridge._channels == []
+        assert bridge.event_queue.empty()
+
+    def test_publisher_events_reach_channel(self):
+        async def run():
+            publisher = EventPublisher()
+            bridge = ChatEventBridge(publisher)
+            channel = bridge.open_channel(named_events=True)
+            await publisher.publish("phase_start", {"phase": "3"})
+            bridge.close()
+            return await _collect(channel)
+
+        text = asyncio.run(run())
+        assert text.startswith("event: phase_start\n")
@@ -1,11 +1,14 @@
 """Unit tests for ChatSessionManager — focused on delete_all_sessions / delete_session."""
 
+import asyncio
+import time
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
 
-from backend.services.chat_session_manager import ChatSessionManager
+from backend.services.chat_session_manager import ChatSession, ChatSessionManager
+from backend.services.chat_turn_scheduler import ChatQueueFullError, ChatTurnInProgressError, ChatTurnScheduler
 
 
 # ---------------------------------------------------------------------------
@@ -148,3 +151,70 @@ class TestDeleteAllSessionsEndpoint:
             response = c.get("/api/chat/sessions")
             assert response.status_code == 200
             assert response.json()["sessions"] == []
+
+
+def _wait_done(turn, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not turn.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.unit
+class TestSendMessageScheduling:
+    """send_message() runs turns on the shared scheduler loop instead of a thread per turn."""
+
+    @pytest.fixture()
+    def mgr(self, tmp_path):
+        mgr = _make_manager(tmp_path)
+        yield mgr
+        mgr.scheduler.shutdown()
+
+    @staticmethod
+    def _add_session(mgr: ChatSessionManager, session_id: str, chat) -> None:
+        agent = MagicMock()
+        agent.chat = chat
+        _seed_session(mgr, session_id)
+        mgr.sessions[session_id] = ChatSession(session_id=session_id, agent=agent, bridge=MagicMock())
+
+    def test_reply_is_persisted(self, mgr):
+        async def chat(message):
+            await asyncio.sleep(0.01)
+            return {"text": f"echo: {message}", "metrics": {"tokens": 3}}
+
+        self._add_session(mgr, "sched1", chat)
+        turn = mgr.send_message("sched1", "ping")
+        _wait_done(turn)
+
+        assert turn.state == "done"
+        history = [(row["role"], row["content"]) for row in mgr.get_session_history("sched1")]
+        assert ("assistant", "echo: ping") in history
+        assert mgr.scheduler.stats()["completed"] == 1
+
+    def test_second_message_while_busy_is_rejected_and_cancellable(self, mgr):
+        async def chat(message):
+            await asyncio.sleep(10)
+
+        self._add_session(mgr, "busy1", chat)
+        turn = mgr.send_message("busy1", "long task")
+        with pytest.raises(ChatTurnInProgressError):
+            mgr.send_message("busy1", "another")
+
+        assert mgr.cancel_turn("busy1")
+        _wait_done(turn)
+        assert turn.state == "cancelled"
+        assert not mgr.cancel_turn("busy1")
+
+    def test_full_queue_leaves_no_orphan_message(self, mgr):
+        async def chat(message):
+            return "never runs"
+
+        mgr.scheduler.shutdown()
+        mgr.scheduler = ChatTurnScheduler(max_queue=0)
+        self._add_session(mgr, "full1", chat)
+        old_bridge = mgr.sessions["full1"].bridge
+        with pytest.raises(ChatQueueFullError):
+            mgr.send_message("full1", "dropped")
+
+        history = [(row["role"], row["content"]) for row in mgr.get_session_history("full1")]
+        assert history == [("user", "Hola")]
+        assert mgr.sessions["full1"].bridge is old_bridge and mgr.sessions["full1"].turn is None
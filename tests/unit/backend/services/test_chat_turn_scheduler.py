@@ -0,0 +1,122 @@
+"""Unit tests for ChatTurnScheduler (bounded chat turns on a shared loop)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.services.chat_turn_scheduler import CANCELLED, DONE, FAILED, ChatQueueFullError, ChatTurnScheduler
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class _Gate:
+    """A turn body that blocks until released from the test thread."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.loops = []
+
+    async def __call__(self, turn):
+        self.loops.append(asyncio.get_running_loop())
+        while not self._event.is_set():
+            await asyncio.sleep(0.005)
+
+    def open(self):
+        self._event.set()
+
+
+@pytest.mark.unit
+class TestChatTurnScheduler:
+    @pytest.fixture()
+    def scheduler(self):
+        scheduler = ChatTurnScheduler(max_concurrent=2, max_per_user=1, max_queue=3)
+        yield scheduler
+        scheduler.shutdown()
+
+    def test_turns_share_one_loop(self, scheduler):
+        gate = _Gate()
+        gate.open()
+        turns = [scheduler.submit(f"s{i}", gate, user_key=f"u{i}") for i in range(3)]
+        assert _wait_for(lambda: all(t.done for t in turns))
+        assert len({id(loop) for loop in gate.loops}) == 1
+        assert scheduler.stats()["completed"] == 3
+
+    def test_global_limit_queues_with_positions(self, scheduler):
+        gate = _Gate()
+        positions = []
+        running = [scheduler.submit(f"s{i}", gate, user_key=f"u{i}") for i in range(2)]
+        waiting = scheduler.submit("s2", gate, user_key="u2", on_position=positions.append)
+        last = scheduler.submit("s3", gate, user_key="u3")
+
+        assert [t.position for t in running] == [0, 0]
+        assert (waiting.position, last.position) == (1, 2)
+        assert positions == [1]
+        assert scheduler.stats()["running"] == 2 and scheduler.stats()["queued"] == 2
+
+        gate.open()
+        assert _wait_for(lambda: all(t.done for t in running + [waiting, last]))
+        assert waiting.state == DONE and waiting.queue_seconds > 0
+
+    def test_per_user_limit_does_not_block_other_users(self, scheduler):
+        gate = _Gate()
+        first = scheduler.submit("a1", gate, user_key="alice")
+        second = scheduler.submit("a2", gate, user_key="alice")
+        bob = scheduler.submit("b1", gate, user_key="bob")
+        assert first.position == 0 and second.position == 1
+        assert bob.position == 0  # admitted past alice's waiting turn
+        gate.open()
+        assert _wait_for(lambda: second.done)
+
+    def test_full_queue_is_rejected(self, scheduler):
+        gate = _Gate()
+        for i in range(4):  # one running, three waiting
+            scheduler.submit(f"s{i}", gate, user_key="same")
+        with pytest.raises(ChatQueueFullError):
+            scheduler.submit("s4", gate, user_key="same")
+        gate.open()
+
+    def test_cancel_queued_and_running_turns(self, scheduler):
+        gate = _Gate()
+        running = scheduler.submit("s0", gate, user_key="u")
+        queued = scheduler.submit("s1", gate, user_key="u")
+        assert _wait_for(lambda: gate.loops)
+
+        assert scheduler.cancel(queued.turn_id)
+        assert queued.state == CANCELLED and queued.started_at is None
+        assert scheduler.cancel(running.turn_id)
+        assert _wait_for(lambda: running.state == CANCELLED)
+        assert not scheduler.cancel(running.turn_id)
+        assert scheduler.stats()["cancelled"] == 2
+
+    def test_failures_are_recorded_and_free_the_slot(self, scheduler):
+        async def boom(turn):
+            raise ValueError("model down")
+
+        failed = scheduler.submit("s0", boom, user_key="u")
+        assert _wait_for(lambda: failed.done)
+        assert failed.state == FAILED
+
+        gate = _Gate()
+        gate.open()
+        after = scheduler.submit("s1", gate, user_key="u")
+        assert _wait_for(lambda: after.state == DONE)
+
+    def test_queue_and_model_time_metrics(self, scheduler):
+        async def work(turn):
+            await asyncio.sleep(0.05)
+
+        turns = [scheduler.submit(f"s{i}", work, user_key="u") for i in range(2)]
+        assert _wait_for(lambda: all(t.done for t in turns))
+        stats = scheduler.stats()
+        assert stats["model_ms"]["avg"] >= 40
+        assert stats["queue_ms"]["p95"] >= 40  # the second turn waited for the first
+        assert turns[1].to_dict()["queue_ms"] >= 40
@@ -0,0 +1,80 @@
+"""Unit tests for DirectorySnapshotService (cached directory listings and trees)."""
+
+import os
+
+import pytest
+
+from backend.services.directory_snapshot import DirectorySnapshotService
+
+
+def _touch_dir(path, delta_ns):
+    """Move a directory's mtime so the change is visible on coarse-grained filesystems."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta_ns))
+
+
+@pytest.mark.unit
+class TestDirectorySnapshotService:
+    @pytest.fixture()
+    def project(self, tmp_path):
+        root = tmp_path / "proj"
+        (root / "src" / "pkg").mkdir(parents=True)
+        (root / "src" / "pkg" / "mod.py").write_text("x = 1\n")
+        (root / "src" / "main.py").write_text("print('hi')\n")
+        (root / "README.md").write_text("# proj\n")
+        (root / ".env").write_text("SECRET=1")
+        (root / "node_modules").mkdir()
+        (root / "node_modules" / "dep.js").write_text("x")
+        (root / "docs").mkdir()
+        return root
+
+    @pytest.fixture()
+    def service(self):
+        return DirectorySnapshotService(revalidate_interval=0)
+
+    def test_full_tree_matches_legacy_format(self, service, project):
+        tree = service.tree(project)
+        assert tree["total"] == 3
+        names = [item["name"] for item in tree["files"]]
+        assert names == ["docs", "src", "README.md"]
+        src = tree["files"][1]
+        assert src["type"] == "directory"
+        assert [c["path"] for c in src["children"]] == ["src/pkg", "src/main.py"]
+        assert src["children"][0]["children"] == [{"name": "mod.py", "path": "src/pkg/mod.py", "type": "file"}]
+
+    def test_unchanged_tree_is_served_from_cache(self, service, project):
+        first = service.tree(project)
+        scans = service.scans
+        assert service.tree(project) == first
+        assert service.scans == scans
+
+    def test_new_file_invalidates_tree(self, service, project):
+        service.tree(project)
+        (project / "src" / "pkg" / "new.py").write_text("")
+        _touch_dir(project / "src" / "pkg", 1_000_000_000)
+
+        pkg = service.tree(project)["files"][1]["children"][0]
+        assert [c["name"] for c in pkg["children"]] == ["mod.py", "new.py"]
+
+    def test_depth_limit_marks_unexpanded_directories(self, service, project):
+        files = service.tree(project, depth=1)["files"]
+        docs, src = files[0], files[1]
+        assert "children" not in src and src["has_children"] is True
+        assert docs["has_children"] is False
+
+        sub = service.tree(project, rel_path="src", depth=1)["files"]
+        assert [c["path"] for c in sub] == ["src/pkg", "src/main.py"]
+
+    def test_pagination(self, service, project):
+        page = service.tree(project, offset=1, limit=1)
+        assert page["total"] == 3
+        assert [item["name"] for item in page["files"]] == ["src"]
+
+    def test_walk_is_sorted_and_skips_excluded(self, service, project):
+        walked = list(service.walk(project, frozenset({"node_modules"})))
+        assert [rel for rel, _, _ in walked] == ["", "docs", "src", "src/pkg"]
+        assert walked[0][2] == [".env", "README.md"]
+
+    def test_missing_directory(self, service, tmp_path):
+        assert service.list_dir(tmp_path / "missing") == []
+        assert service.tree(tmp_path / "missing") == {"files": [], "total": 0}
@@ -0,0 +1,107 @@
+"""Unit tests for IntentRouter (local intent and tool routing)."""
+
+import asyncio
+
+import pytest
+
+from backend.agents.mixins import intent_routing_mixin
+from backend.agents.mixins.intent_routing_mixin import IntentRoutingMixin
+from backend.services.intent_router import IntentRouter, normalize_instruction
+
+SUMMARIES = [
+    {"name": "ping_host", "description": "Send ICMP echo requests to a host to check latency."},
+    {"name": "traceroute_host", "description": "Trace the network path to a remote host."},
+    {"name": "read_file", "description": "Read the contents of a file in the project."},
+    {"name": "write_file", "description": "Write content to a file in the project."},
+    {"name": "run_tests", "description": "Run the project's unit tests with pytest."},
+    {"name": "list_processes", "description": "List running processes with CPU and memory usage."},
+    {"name": "check_disk_usage", "description": "Report disk usage per partition."},
+    {"name": "scan_ports", "description": "Scan open ports on a host for security auditing."},
+]
+
+
+@pytest.mark.unit
+class TestIntentRouter:
+    @pytest.fixture()
+    def router(self):
+        return IntentRouter(max_tools=3)
+
+    @pytest.mark.parametrize(
+        "instruction,intent",
+        [
+            ("ping google.com and report the latency", "network"),
+            ("Fix the bug in src/parser.py and run pytest", "code"),
+            ("Which processes are using the most CPU and memory?", "system"),
+            ("Check CVE-2021-44228 exposure and audit the firewall", "cybersecurity"),
+        ],
+    )
+    def test_keyword_classification(self, router, instruction, intent):
+        decision = router.classify(instruction)
+        assert decision.intent == intent
+        assert decision.confidence >= router.min_confidence
+
+    def test_small_talk_routes_to_orchestrator(self, router):
+        decision = router.classify("Hello, thanks!")
+        assert decision.intent == "orchestrator"
+        assert decision.confidence >= router.min_confidence
+
+    def test_ambiguous_instruction_is_not_confident(self, router):
+        assert router.classify("Summarize what we discussed yesterday about the roadmap").confidence == 0.0
+        assert router.classify("check the port of the python service").confidence < router.min_confidence
+
+    def test_llm_decisions_are_memoized_by_normalized_instruction(self, router):
+        router.remember_intent("Summarize the roadmap.", "code")
+        decision = router.classify("  summarize   the ROADMAP ")
+        assert (decision.intent, decision.source) == ("code", "cache")
+        assert normalize_instruction("Hi there!?") == "hi there"
+
+    def test_lexical_tool_selection(self, router):
+        selected = router.select_tools("trace the path to host example.org", SUMMARIES)
+        assert selected[0] == "traceroute_host"
+        assert len(selected) <= 3
+        assert "write_file" not in selected
+
+    def test_tool_selection_without_signal_defers_to_llm(self, router):
+        assert router.select_tools("summarize our conversation", SUMMARIES) is None
+        router.remember_tools("summarize our conversation", SUMMARIES, ["read_file"])
+        assert router.select_tools("Summarize our conversation.", SUMMARIES) == ["read_file"]
+
+    def test_small_toolsets_pass_through(self, router):
+        assert router.select_tools("anything", SUMMARIES[:2]) == ["ping_host", "traceroute_host"]
+
+    def test_embeddings_are_warmed_in_background_then_used(self, router):
+        # Toy embedding: one dimension per concept, each with a few synonyms
+        concepts = [("latency", "slow", "echo"), ("file",), ("disk",), ("security",)]
+
+        async def embed(text):
+            text = text.lower()
+            return [1.0 if any(word in text for word in words) else 0.0 for words in concepts] + [0.1]
+
+        async def run():
+            await router.prepare("how slow is my connection", SUMMARIES, embed)
+            assert not router.embeddings_ready(SUMMARIES)  # cold start never waits
+            assert len(router._warmup_tasks) == 1  # strongly referenced while it runs
+            for _ in range(100):
+                await asyncio.sleep(0)
+                if router.embeddings_ready(SUMMARIES):
+                    break
+            await router.prepare("why is everything so slow", SUMMARIES, embed)
+
+        asyncio.run(run())
+        assert router.embeddings_ready(SUMMARIES) and not router._warmup_tasks
+        # No lexical overlap with any tool, but the embedding points at ping_host
+        assert router.select_tools("why is everything so slow", SUMMARIES)[0] == "ping_host"
+
+    def test_failed_llm_classification_is_not_memoized(self, router, monkeypatch):
+        class Agent(IntentRoutingMixin):
+            answers = [None, "network"]
+
+            async def _classify_intent_llm(self, instruction):
+                return self.answers.pop(0)
+
+        monkeypatch.setattr(intent_routing_mixin, "get_intent_router", lambda: router)
+        agent = Agent()
+        assert asyncio.run(agent._classify_intent("summarize our conversation")) == "orchestrator"
+        assert router.classify("summarize our conversation").source == "keywords"
+        assert asyncio.run(agent._classify_intent("summarize our conversation")) == "network"
+        assert router.classify("summarize our conversation").intent == "network"
@@ -0,0 +1,141 @@
+"""Unit tests for ProjectJobManager (queued AutoAgent runs)."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from backend.services.project_job_manager import JobStatus, ProjectJobManager
+from backend.utils.core.exceptions import PipelineCancelledError, ResourceExhaustionError
+
+
+class _BlockingRunner:
+    """Runner whose jobs block until released; records start order."""
+
+    def __init__(self):
+        self.started = []
+        self.release = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, job):
+        with self._lock:
+            self.started.append(job.project_name)
+            event = self.release.setdefault(job.project_name, threading.Event())
+        while not event.wait(0.01):
+            if job.cancel_event.is_set():
+                raise PipelineCancelledError(job.project_name)
+
+    def finish(self, name):
+        with self._lock:
+            self.release.setdefault(name, threading.Event()).set()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not met")
+
+
+def _stream_types(bridge):
+    async def collect():
+        channel = bridge.open_channel()
+        text = ""
+        async for chunk in channel:
+            text += chunk
+        return [json.loads(line[6:])["type"] for line in text.splitlines() if line.startswith("data: ")]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.unit
+class TestProjectJobManager:
+    @pytest.fixture()
+    def runner(self):
+        return _BlockingRunner()
+
+    @pytest.fixture()
+    def manager(self, runner):
+        mgr = ProjectJobManager(runner, max_workers=2, per_model_limit=1, max_queue=3)
+        yield mgr
+        for name in list(runner.release) + ["a", "b", "c", "d"]:
+            runner.finish(name)
+        mgr.shutdown()
+
+    def test_per_model_limit_queues_second_job(self, manager, runner):
+        manager.submit("a", {}, model="m1")
+        manager.submit("b", {}, model="m1")
+        manager.submit("c", {}, model="m2")
+        _wait_for(lambda: len(runner.started) == 2)
+
+        assert sorted(runner.started) == ["a", "c"]
+        info = manager.job_info("b")
+        assert info["status"] == "queued"
+        assert info["queue_position"] == 1
+        assert info["eta_seconds"] > 0
+
+        runner.finish("a")
+        _wait_for(lambda: "b" in runner.started)
+        assert manager.get_job("a").status == JobStatus.COMPLETED
+
+    def test_higher_priority_starts_first(self, manager, runner):
+        manager.submit("a", {}, model="m1")
+        _wait_for(lambda: runner.started == ["a"])
+        manager.submit("b", {}, model="m1", priority=0)
+        manager.submit("c", {}, model="m1", priority=5)
+
+        assert [j["project_name"] for j in manager.list_jobs()[:3]] == ["a", "c", "b"]
+        runner.finish("a")
+        _wait_for(lambda: len(runner.started) == 2)
+        assert runner.started[1] == "c"
+
+    def test_admission_control(self, manager, runner):
+        manager.submit("a", {}, model="m1")
+        with pytest.raises(ValueError):
+            manager.submit("a", {}, model="m1")
+        _wait_for(lambda: runner.started == ["a"])
+        for name in ("b", "c", "d"):
+            manager.submit(name, {}, model="m1")
+        with pytest.raises(ResourceExhaustionError):
+            manager.submit("e", {}, model="m1")
+
+    def test_cancel_queued_and_running(self, manager, runner):
+        manager.submit("a", {}, model="m1")
+        manager.submit("b", {}, model="m1")
+        _wait_for(lambda: runner.started == ["a"])
+
+        assert manager.cancel("b")
+        assert manager.get_job("b").status == JobStatus.CANCELLED
+        assert manager.cancel("a")
+        _wait_for(lambda: manager.get_job("a").status == JobStatus.CANCELLED)
+        assert runner.started == ["a"]
+        assert not manager.cancel("a")
+
+    def test_each_project_has_its_own_stream(self, manager, runner):
+        manager.submit("a", {}, model="m1")
+        manager.submit("c", {}, model="m2")
+        _wait_for(lambda: len(runner.started) == 2)
+        manager.get_job("a").bridge.push_event("info", {"message": "only a"})
+        runner.finish("a")
+        runner.finish("c")
+        _wait_for(lambda: manager.get_job("c").status == JobStatus.COMPLETED)
+
+        a_types = _stream_types(manager.get_bridge("a"))
+        c_types = _stream_types(manager.get_bridge("c"))
+        assert [t for t in a_types if t != "job_status"] == ["info", "stream_end"]
+        assert [t for t in c_types if t != "job_status"] == ["stream_end"]
+
+    def test_failure_is_reported(self):
+        def failing(job):
+            raise RuntimeError("boom")
+
+        mgr = ProjectJobManager(failing)
+        mgr.submit("x", {}, model="m")
+        _wait_for(lambda: mgr.get_job("x").status == JobStatus.FAILED)
+        assert mgr.job_info("x")["error"] == "boom"
+        assert _stream_types(mgr.get_bridge("x"))[-2:] == ["error", "stream_end"]
+        mgr.shutdown()
@@ -0,0 +1,135 @@
+"""Unit tests for VulnerabilityScanner's literal-prefilter engine, result cache and a 5,000-file scan."""
+
+import random
+import re
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.utils.core.analysis.vulnerability_scanner import LANGUAGE_MAP, SECURITY_RULES, VulnerabilityScanner
+
+VULNERABLE_LINES = {
+    ".py": [
+        'cursor.execute(f"SELECT * FROM users WHERE id={uid}")',
+        "result = eval(user_input)",
+        'subprocess.call(cmd, shell=True)  # password = "hunter2secret"',
+        "data = pickle.loads(blob)",
+        "requests.get(url, verify=False)",
+        'API_KEY = "sk-abcdefghijklmnop"',
+    ],
+    ".js": [
+        "element.innerHTML = userInput;",
+        "const fn = new Function(body);",
+        'db.query("SELECT * FROM t WHERE id=" + id)',
+    ],
+}
+CLEAN_LINES = [
+    "def handler(request):",
+    "    total = sum(item.price for item in request.items)",
+    "    return {'total': total, 'count': len(request.items)}",
+    "# process the queue in batches",
+    "    for index, value in enumerate(values):",
+    "        logger.info('processed %s', value)",
+    "const items = list.map((x) => x * 2);",
+    "    if not payload:",
+    "        raise ValueError('empty payload')",
+]
+
+
+def _legacy_scan(rules, file_path, content):
+    """The previous algorithm: recompile per file, every rule x pattern x line."""
+    language = LANGUAGE_MAP.get(Path(file_path).suffix.lower(), "")
+    found = []
+    lines = content.split("\n")
+    for rule in rules:
+        if language and language not in rule.get("languages", []):
+            continue
+        for pattern_str in rule.get("patterns", []):
+            try:
+                pattern = re.compile(pattern_str, re.IGNORECASE)
+            except re.error:
+                continue
+            for line_num, line in enumerate(lines, 1):
+                if pattern.search(line):
+                    found.append((rule["rule_id"], line_num, line.strip()[:200]))
+    return found
+
+
+def _synthetic_repo(n_files, lines_per_file=40, vulnerable_ratio=0.1, seed=3):
+    rng = random.Random(seed)
+    files = {}
+    for i in range(n_files):
+        ext = ".py" if i % 4 else ".js"
+        lines = [rng.choice(CLEAN_LINES) + f"  # {i}" for _ in range(lines_per_file)]
+        if rng.random() < vulnerable_ratio:
+            lines[rng.randrange(lines_per_file)] = rng.choice(VULNERABLE_LINES[ext])
+        files[f"pkg/mod_{i}{ext}"] = "\n".join(lines)
+    return files
+
+
+def _findings(result):
+    return [(v.rule_id, v.line_number, v.code_snippet) for v in result.vulnerabilities]
+
+
+@pytest.mark.unit
+class TestVulnerabilityScanner:
+    def test_matches_the_rule_by_rule_reference(self):
+        scanner = VulnerabilityScanner(MagicMock())
+        content = "\n".join(VULNERABLE_LINES[".py"] + CLEAN_LINES)
+        for path in ("app.py", "app.js", "notes.unknown"):
+            result = scanner.scan_file(path, content)
+            assert _findings(result) == _legacy_scan(SECURITY_RULES, path, content)
+        assert _findings(scanner.scan_file("app.py", content))  # sanity: something was found
+
+    def test_project_scan_matches_reference_serial_and_parallel(self):
+        files = _synthetic_repo(300, vulnerable_ratio=0.5)
+        expected = {path: _legacy_scan(SECURITY_RULES, path, content) for path, content in files.items()}
+        for threshold in (10_000, 1):
+            scanner = VulnerabilityScanner(MagicMock(), max_workers=2, parallel_threshold=threshold)
+            report = scanner.scan_project(files, block_on_critical=True)
+            assert [r.file_path for r in report.file_results] == list(files)
+            assert {r.file_path: _findings(r) for r in report.file_results} == expected
+            assert report.total_vulnerabilities == sum(len(v) for v in expected.values())
+            assert report.blocked_files == [r.file_path for r in report.file_results if r.has_critical]
+
+    def test_invalid_and_conflicting_custom_patterns_are_tolerated(self):
+        custom = [
+            {"rule_id": "C1", "name": "broken", "severity": "low", "languages": ["python"], "patterns": [r"([a-"]},
+            {"rule_id": "C2", "name": "n1", "severity": "low", "languages": ["python"], "patterns": [r"(?P<x>todo)"]},
+            {"rule_id": "C3", "name": "n2", "severity": "low", "languages": ["python"], "patterns": [r"(?P<x>fixme)"]},
+        ]
+        scanner = VulnerabilityScanner(MagicMock(), custom_rules=custom)
+        content = "# TODO: later\n# fixme\nresult = eval(x)"
+        assert _findings(scanner.scan_file("a.py", content)) == _legacy_scan(SECURITY_RULES + custom, "a.py", content)
+
+    def test_unchanged_content_is_served_from_the_cache(self):
+        scanner = VulnerabilityScanner(MagicMock())
+        files = {"a.py": "x = eval(user_input)", "b.py": "x = eval(user_input)", "c.py": "print('ok')"}
+        scanner.scan_project(files)
+        assert scanner.cache_hits == 0
+        report = scanner.scan_project(files)
+        assert scanner.cache_hits == 3 and report.total_vulnerabilities == 2
+        assert scanner.scan_file("elsewhere.py", "x = eval(user_input)").vulnerabilities[0].rule_id == "SEC-002"
+        assert scanner.cache_hits == 4
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestVulnerabilityScannerBenchmark:
+    """A 5,000-file synthetic repository: serial, multi-process and cached scans agree."""
+
+    def test_scan_modes_agree_on_a_large_repo(self):
+        files = _synthetic_repo(5000)
+
+        serial = VulnerabilityScanner(MagicMock(), parallel_threshold=10**9)
+        expected = serial.scan_project(files, block_on_critical=False)
+
+        parallel = VulnerabilityScanner(MagicMock(), parallel_threshold=1)
+        report = parallel.scan_project(files, block_on_critical=False)
+        cached = parallel.scan_project(files, block_on_critical=False)
+
+        assert report.files_scanned == 5000 and report.total_vulnerabilities > 0
+        for result in (report, cached):
+            assert [_findings(r) for r in result.file_results] == [_findings(r) for r in expected.file_results]
+        assert parallel.cache_hits == 5000
@@ -0,0 +1,124 @@
+"""Unit tests for the SQLite-backed ArtifactManager, plus a mutation run at 10k artifacts."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.utils.core.io.artifact_manager import ArtifactManager, ArtifactType
+
+
+def _legacy_artifact(i):
+    return {
+        "id": f"art_{i:08x}",
+        "type": ArtifactType.CHECKLIST.value if i % 2 else ArtifactType.REPORT.value,
+        "title": f"Artifact {i}",
+        "content": {
+            "items": [{"id": f"t{j}", "label": f"Task {j}", "completed": False, "category": None} for j in range(5)],
+            "total_items": 5,
+            "completed_items": 0,
+        },
+        "metadata": {"interactive": True},
+        "created_at": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}.{i:06d}",
+        "updated_at": None,
+        "parent_decision": None,
+    }
+
+
+def _write_legacy_json(root, n):
+    artifacts_dir = root / ".ollash" / "knowledge_workspace" / "artifacts"
+    artifacts_dir.mkdir(parents=True)
+    data = {"artifacts": {a["id"]: a for a in map(_legacy_artifact, range(n))}, "last_updated": "x"}
+    (artifacts_dir / "artifacts.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return artifacts_dir, data
+
+
+@pytest.fixture()
+def make_manager(tmp_path):
+    managers = []
+
+    def make():
+        manager = ArtifactManager(tmp_path, MagicMock())
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+@pytest.mark.unit
+class TestArtifactManager:
+    def test_artifacts_persist_across_instances(self, make_manager):
+        first = make_manager()
+        checklist = first.create_checklist("Release", [{"id": "a", "label": "Tag"}, {"id": "b", "label": "Ship"}])
+        code = first.create_code_artifact("Snippet", "print(1)\nprint(2)")
+        assert first.update_checklist_item(checklist, "b", True)
+        assert not first.update_checklist_item(code, "b", True)
+        first.close()
+
+        second = make_manager()
+        artifact = second.get_artifact(checklist)
+        assert artifact.content["completed_items"] == 1 and artifact.updated_at
+        assert second.get_artifact(code).content["lines"] == 2
+        assert second.delete_artifact(code) and not second.delete_artifact(code)
+        assert second.get_artifact(code) is None
+
+    def test_listing_is_filtered_and_paginated(self, make_manager):
+        manager = make_manager()
+        ids = [manager.create_report(f"Report {i}", []) for i in range(2)]
+        ids.append(manager.create_diagram("Flow", "graph TD; A-->B"))
+        ids += [manager.create_report(f"Report {i}", []) for i in range(2, 5)]
+        reports = manager.list_artifacts(ArtifactType.REPORT.value)
+        assert [a.id for a in reports] == ids[:2] + ids[3:]
+        assert [a.id for a in manager.list_artifacts(limit=2, offset=1)] == ids[1:3]
+        assert manager.count_artifacts() == 6 and manager.count_artifacts(ArtifactType.DIAGRAM.value) == 1
+        middle = manager.get_artifact(ids[3]).created_at
+        assert [a.id for a in manager.list_artifacts(since=middle)] == ids[3:]
+        assert [a.id for a in manager.list_artifacts(until=middle)] == ids[:3]
+
+    def test_rendered_html_is_cached_until_the_artifact_changes(self, make_manager):
+        manager = make_manager()
+        checklist = manager.create_checklist("Deploy", [{"id": "x", "label": "Migrate"}])
+        renders = MagicMock(side_effect=manager._render_checklist_html)
+        manager._render_checklist_html = renders
+        first = manager.render_artifact_html(checklist)
+        assert manager.render_artifact_html(checklist) == first and renders.call_count == 1
+        manager.update_checklist_item(checklist, "x", True)
+        updated = manager.render_artifact_html(checklist)
+        assert renders.call_count == 2 and "checked" in updated and "1/1" in updated
+        assert manager.render_artifact_html("missing") == ""
+
+    def test_legacy_json_is_migrated_once(self, tmp_path, make_manager):
+        artifacts_dir, data = _write_legacy_json(tmp_path, 25)
+        manager = make_manager()
+        assert manager.count_artifacts() == 25
+        assert not (artifacts_dir / "artifacts.json").exists()
+        assert (artifacts_dir / "artifacts.json.migrated").exists()
+        assert manager.get_artifact("art_00000007").to_dict() == data["artifacts"]["art_00000007"]
+        assert [a.id for a in manager.list_artifacts()] == list(data["artifacts"])
+        manager.close()
+        assert make_manager().count_artifacts() == 25
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestArtifactManagerBenchmark:
+    """Create / toggle / delete and paging with 10,000 artifacts migrated from the legacy JSON store."""
+
+    N = 10_000
+
+    def test_mutations_at_10k_artifacts(self, tmp_path, make_manager):
+        _write_legacy_json(tmp_path, self.N)
+        manager = make_manager()
+        assert manager.count_artifacts() == self.N
+
+        for i in range(200):
+            new_id = manager.create_checklist(f"New {i}", [{"id": "a", "label": "A"}])
+            assert manager.update_checklist_item(f"art_{2 * i + 1:08x}", "t0", True)
+            assert manager.delete_artifact(new_id)
+
+        page = manager.list_artifacts(ArtifactType.CHECKLIST.value, limit=50, offset=2000)
+        assert len(page) == 50
+        assert manager.count_artifacts() == self.N
+        assert manager.get_artifact("art_00000001").content["completed_items"] == 1
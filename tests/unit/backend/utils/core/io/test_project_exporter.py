@@ -0,0 +1,93 @@
+"""Unit tests for ProjectExporter (streaming, cached ZIP export)."""
+
+import asyncio
+import io
+import os
+import zipfile
+
+import pytest
+
+from backend.utils.core.io.project_exporter import ProjectExporter
+
+
+def _make_project(root):
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "main.py").write_text("print('hi')\n" * 500)
+    (root / "logo.png").write_bytes(os.urandom(50_000))
+    (root / ".env").write_text("SECRET=1")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("x")
+    return root
+
+
+async def _collect(exporter, name, entries, key=None):
+    return b"".join([chunk async for chunk in exporter.stream(name, entries, key)])
+
+
+@pytest.mark.unit
+class TestProjectExporter:
+    @pytest.fixture()
+    def project(self, tmp_path):
+        return _make_project(tmp_path / "proj")
+
+    @pytest.fixture()
+    def exporter(self, tmp_path):
+        return ProjectExporter(tmp_path / "cache", chunk_size=4096, queue_chunks=2)
+
+    def test_scan_skips_hidden_and_vendor_dirs(self, exporter, project):
+        assert [e.arcname for e in exporter.scan(project)] == ["logo.png", "src/main.py"]
+
+    def test_scan_skips_ollash_state(self, exporter, project):
+        objects = project / ".ollash" / "objects" / "ab"
+        objects.mkdir(parents=True)
+        (objects / "cdef0123").write_text("checkpoint blob")
+        (project / ".ollash" / "checkpoint.json").write_text("{}")
+        arcnames = [e.arcname for e in exporter.scan(project)]
+        assert not any(a.startswith(".ollash/") for a in arcnames)
+        assert arcnames == ["logo.png", "src/main.py"]
+
+    def test_stream_produces_valid_zip_in_chunks(self, exporter, project):
+        entries = exporter.scan(project)
+
+        async def run():
+            chunks = [c async for c in exporter.stream("proj", entries)]
+            return chunks
+
+        chunks = asyncio.run(run())
+        assert len(chunks) > 1
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+            assert zf.read("src/main.py") == (project / "src" / "main.py").read_bytes()
+            assert zf.getinfo("logo.png").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo("src/main.py").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_cache_is_keyed_by_manifest(self, exporter, project):
+        entries = exporter.scan(project)
+        key = exporter.manifest_key(entries)
+        assert exporter.cached_archive("proj", key) is None
+
+        data = asyncio.run(_collect(exporter, "proj", entries, key))
+        cached = exporter.cached_archive("proj", key)
+        assert cached is not None and cached.read_bytes() == data
+
+        (project / "src" / "main.py").write_text("changed\n")
+        new_entries = exporter.scan(project)
+        new_key = exporter.manifest_key(new_entries)
+        assert new_key != key
+
+        asyncio.run(_collect(exporter, "proj", new_entries, new_key))
+        assert exporter.cached_archive("proj", new_key) is not None
+        assert exporter.cached_archive("proj", key) is None  # older archive evicted
+
+    def test_abandoned_stream_leaves_no_cache_entry(self, exporter, project):
+        entries = exporter.scan(project)
+        key = exporter.manifest_key(entries)
+
+        async def run():
+            gen = exporter.stream("proj", entries, key)
+            await gen.__anext__()
+            await gen.aclose()
+            await asyncio.sleep(0.6)
+
+        asyncio.run(run())
+        assert exporter.cached_archive("proj", key) is None
+        assert list((exporter.cache_dir).glob("*.tmp")) == []
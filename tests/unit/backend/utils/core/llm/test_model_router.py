@@ -0,0 +1,216 @@
+"""Unit tests for ModelRouter aggregation policies — early exit, quorum, hedging and cancellation."""
+
+import asyncio
+import random
+import socket
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.utils.core.llm.model_router import AggregationPolicy, ModelRouter, validate_candidate
+from backend.utils.core.llm.ollama_client import OllamaClient
+
+
+def _response(content):
+    return {"message": {"content": content}}
+
+
+class _FakeClient:
+    """Answers *content* after *delay* seconds; records starts and cancellations."""
+
+    def __init__(self, model, delay, content=None, jitter=None):
+        self.model = model
+        self.delay = delay
+        self.content = content if content is not None else f"answer from {model}"
+        self.jitter = jitter
+        self.started = 0
+        self.cancelled = 0
+        self.reviewed = None
+
+    async def achat(self, messages, tools=None, options_override=None):
+        self.started += 1
+        self.reviewed = messages
+        delay = self.delay + (self.jitter() if self.jitter else 0.0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return _response(self.content), {}
+
+
+def _router(clients, policy=None):
+    reviewer = _FakeClient("reviewer", 0)
+    reviewer.content = clients[next(iter(clients))].content  # picks the first candidate
+    publisher = MagicMock()
+    publisher.publish = AsyncMock()
+    router = ModelRouter(
+        dict(clients, reviewer=reviewer),
+        MagicMock(),
+        MagicMock(),
+        publisher,
+        "reviewer",
+        {"model_router": policy} if policy else {},
+    )
+    return router, reviewer
+
+
+async def _route(router, roles, policy=None):
+    return await router.aroute_and_aggregate([{"role": "user", "content": "q"}], roles, [], "q", "task", policy=policy)
+
+
+@pytest.mark.unit
+class TestAggregationPolicies:
+    async def test_all_waits_for_every_candidate_and_reviews(self):
+        clients = {"a": _FakeClient("a", 0.01), "b": _FakeClient("b", 0.05)}
+        router, reviewer = _router(clients)
+        chosen, candidates = await _route(router, ["a", "b"])
+        assert [role for role, _ in candidates] == ["a", "b"]
+        assert reviewer.started == 1 and chosen["message"]["content"] == "answer from a"
+        assert router.last_aggregation["cancelled"] == []
+
+    async def test_first_acceptable_returns_the_fastest_and_cancels_the_rest(self):
+        clients = {"slow": _FakeClient("slow", 5), "fast": _FakeClient("fast", 0.01)}
+        router, reviewer = _router(clients)
+        start = time.monotonic()
+        chosen, candidates = await _route(router, ["slow", "fast"], AggregationPolicy("first_acceptable"))
+        assert time.monotonic() - start < 1
+        assert chosen["message"]["content"] == "answer from fast"
+        assert clients["slow"].cancelled == 1
+        assert reviewer.started == 0  # a single accepted answer needs no review
+        assert router.last_aggregation["cancelled"] == ["slow"]
+
+    async def test_validator_rejects_a_broken_fast_answer(self):
+        clients = {
+            "fast": _FakeClient("fast", 0.01, "```python\ndef broken(:\n```"),
+            "ok": _FakeClient("ok", 0.05, "```python\ndef fine():\n    return 1\n```"),
+            "slow": _FakeClient("slow", 5),
+        }
+        router, _ = _router(clients)
+        chosen, _ = await _route(router, ["fast", "ok", "slow"], AggregationPolicy("first_acceptable"))
+        assert chosen is not None and "fine" in chosen["message"]["content"]
+        assert clients["slow"].cancelled == 1
+
+    async def test_quorum_reviews_the_first_k_accepted(self):
+        clients = {name: _FakeClient(name, delay) for name, delay in (("a", 0.01), ("b", 5), ("c", 0.03))}
+        router, reviewer = _router(clients)
+        _, candidates = await _route(router, ["a", "b", "c"], AggregationPolicy("quorum", quorum=2))
+        assert [role for role, _ in candidates] == ["a", "c"]
+        assert reviewer.started == 1 and clients["b"].cancelled == 1
+
+    async def test_falls_back_to_all_responses_when_none_is_acceptable(self):
+        clients = {"a": _FakeClient("a", 0.01, ""), "b": _FakeClient("b", 0.02, "```json\n{bad\n```")}
+        router, _ = _router(clients)
+        _, candidates = await _route(router, ["a", "b"], AggregationPolicy("first_acceptable"))
+        assert [role for role, _ in candidates] == ["a", "b"]
+
+    async def test_hedge_starts_a_backup_after_the_delay(self):
+        clients = {"primary": _FakeClient("primary", 5), "backup": _FakeClient("backup", 0.01)}
+        router, _ = _router(clients)
+        policy = AggregationPolicy("first_acceptable", hedge_percentile=95, hedge_delay=0.05)
+        start = time.monotonic()
+        chosen, _ = await _route(router, ["primary", "backup"], policy)
+        assert 0.05 <= time.monotonic() - start < 1
+        assert chosen["message"]["content"] == "answer from backup"
+        assert router.last_aggregation["hedged"] == 1 and clients["primary"].cancelled == 1
+
+    async def test_no_hedge_when_the_primary_is_fast(self):
+        clients = {"primary": _FakeClient("primary", 0.01), "backup": _FakeClient("backup", 0.01)}
+        router, _ = _router(clients)
+        policy = AggregationPolicy("first_acceptable", hedge_percentile=95, hedge_delay=1)
+        await _route(router, ["primary", "backup"], policy)
+        assert clients["backup"].started == 0 and router.last_aggregation["hedged"] == 0
+
+    async def test_hedge_delay_follows_the_latency_percentile(self):
+        router, _ = _router({"a": _FakeClient("a", 0)})
+        policy = AggregationPolicy("first_acceptable", hedge_percentile=90, hedge_delay=10, hedge_min_samples=5)
+        assert router._hedge_delay(policy, ["a"]) == 10
+        for ms in range(1, 21):
+            router._record_latency("a", ms / 1000)
+        assert router._hedge_delay(policy, ["a"]) == pytest.approx(0.019)
+        assert router.latency_stats()["a"]["count"] == 20
+
+    def test_policy_from_config(self):
+        policy = AggregationPolicy.from_config({"model_router": {"aggregation": "quorum", "quorum": 3}})
+        assert (policy.mode, policy.needed) == ("quorum", 3)
+        assert AggregationPolicy.from_config({}).needed is None
+        with pytest.raises(ValueError):
+            AggregationPolicy("fastest")
+
+    def test_validate_candidate(self):
+        assert validate_candidate("r", _response("plain text"))
+        assert not validate_candidate("r", _response("   "))
+        assert not validate_candidate("r", {"error": "timeout", "message": {"content": ""}})
+        call = {"function": {"name": "write_file", "arguments": '{"path": "a.py"}'}}
+        assert validate_candidate("r", {"message": {"content": "", "tool_calls": [call]}})
+        bad = {"function": {"name": "write_file", "arguments": "{oops"}}
+        assert not validate_candidate("r", {"message": {"content": "", "tool_calls": [bad]}})
+
+
+@pytest.mark.unit
+class TestOllamaCancellation:
+    def test_cancelled_achat_closes_the_connection(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        disconnected = threading.Event()
+
+        def serve():
+            conn, _ = server.accept()
+            with conn:
+                conn.settimeout(5)
+                try:
+                    while conn.recv(65536):  # request, then block until the client goes away
+                        pass
+                    disconnected.set()
+                except OSError:
+                    disconnected.set()
+
+        threading.Thread(target=serve, daemon=True).start()
+        logger = MagicMock()
+        logger.event_publisher = None
+        client = OllamaClient(f"http://127.0.0.1:{server.getsockname()[1]}", "coder", 30, logger, {}, None)
+
+        async def run():
+            task = asyncio.ensure_future(client.achat([{"role": "user", "content": "hi"}]))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        start = time.monotonic()
+        asyncio.run(run())
+        assert disconnected.wait(2), "the in-flight request was left running"
+        assert time.monotonic() - start < 3
+        client.http_session.close()
+        server.close()
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestAggregationBenchmark:
+    """Policies over simulated multi-model latency distributions (configurable per-model delay)."""
+
+    DELAYS = {"fast": 0.010, "medium": 0.030, "slow": 0.080}  # seconds; jitter is exponential
+    TRIALS = 40
+
+    async def _cancelled(self, policy):
+        """Candidates cancelled over TRIALS routed requests."""
+        rng = random.Random(7)
+        clients = {
+            name: _FakeClient(name, delay, jitter=lambda d=delay: rng.expovariate(1 / (d / 2)))
+            for name, delay in self.DELAYS.items()
+        }
+        router, _ = _router(clients)
+        for _ in range(self.TRIALS):
+            await _route(router, list(self.DELAYS), policy)
+        return sum(c.cancelled for c in clients.values())
+
+    async def test_only_early_exit_policies_cancel_candidates(self):
+        assert await self._cancelled(None) == 0
+        assert await self._cancelled(AggregationPolicy("quorum", quorum=2)) > 0
+        assert await self._cancelled(AggregationPolicy("first_acceptable")) > 0
+        hedged = AggregationPolicy("first_acceptable", hedge_percentile=90, hedge_delay=0.02)
+        assert await self._cancelled(hedged) > 0
@@ -0,0 +1,375 @@
+"""Unit tests for ModelScheduler — residency-aware batching, starvation bounds and swap metrics."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.utils.core.llm.model_scheduler import ModelScheduler, get_model_scheduler
+from backend.utils.core.llm.ollama_client import OllamaClient
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class _Caller(threading.Thread):
+    """Acquires a slot for *model*, records the grant order, holds it until released."""
+
+    def __init__(self, scheduler, model, order):
+        super().__init__(daemon=True)
+        self.scheduler, self.model, self.order = scheduler, model, order
+        self.granted = threading.Event()
+        self.done = threading.Event()
+        self.ticket = None
+
+    def run(self):
+        self.ticket = self.scheduler.acquire(self.model)
+        self.order.append(self.model)
+        self.granted.set()
+        self.done.wait(5)
+        self.scheduler.release(self.ticket)
+
+    def finish(self):
+        self.done.set()
+        self.join(5)
+
+
+def _start(scheduler, model, order):
+    caller = _Caller(scheduler, model, order)
+    caller.start()
+    return caller
+
+
+def _queued(scheduler, n):
+    return _wait_for(lambda: scheduler.stats()["queued"] == n)
+
+
+@pytest.mark.unit
+class TestModelScheduler:
+    def test_resident_model_is_preferred_over_older_foreign_requests(self):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=1, max_batch=8, max_wait=60)
+        order = []
+        first = _start(scheduler, "coder", order)
+        assert first.granted.wait(2)
+        waiters = []
+        for model in ("planner", "coder", "coder"):
+            waiters.append(_start(scheduler, model, order))
+            assert _queued(scheduler, len(waiters))
+
+        first.finish()
+        for caller in waiters[1:]:
+            assert caller.granted.wait(2)
+            caller.finish()
+        assert waiters[0].granted.wait(2)
+        waiters[0].finish()
+
+        assert order == ["coder", "coder", "coder", "planner"]
+        stats = scheduler.stats()
+        assert (stats["loads"], stats["swaps"], stats["forced_swaps"]) == (2, 1, 0)
+
+    def test_max_batch_bounds_how_long_a_foreign_model_waits(self):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=1, max_batch=2, max_wait=60)
+        order = []
+        current = _start(scheduler, "coder", order)
+        assert current.granted.wait(2)
+        waiters = [_start(scheduler, "planner", order)]
+        assert _queued(scheduler, 1)
+        for _ in range(4):
+            waiters.append(_start(scheduler, "coder", order))
+            assert _queued(scheduler, len(waiters))
+
+        for caller in waiters:
+            current.finish()
+            _wait_for(lambda: any(c.granted.is_set() and not c.done.is_set() for c in waiters))
+            current = next(c for c in waiters if c.granted.is_set() and not c.done.is_set())
+        current.finish()
+
+        # Two coder requests went past the planner, then the coder was drained and swapped out
+        assert order == ["coder", "coder", "coder", "planner", "coder", "coder"]
+        assert scheduler.stats()["forced_swaps"] == 1
+
+    def test_max_wait_drains_a_busy_resident_model(self):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=4, max_batch=100, max_wait=0)
+        order = []
+        busy = _start(scheduler, "coder", order)
+        assert busy.granted.wait(2)
+        planner = _start(scheduler, "planner", order)
+        assert _queued(scheduler, 1)
+        late_coder = _start(scheduler, "coder", order)
+        assert _queued(scheduler, 2)
+        assert not late_coder.granted.is_set()  # coder is draining
+
+        busy.finish()
+        assert planner.granted.wait(2)
+        planner.finish()
+        assert late_coder.granted.wait(2)
+        late_coder.finish()
+        assert order == ["coder", "planner", "coder"]
+
+    def test_cold_load_runs_alone_then_parallel(self):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=3)
+        order = []
+        cold = _start(scheduler, "coder", order)
+        assert cold.granted.wait(2) and cold.ticket.cold
+        others = [_start(scheduler, "coder", order) for _ in range(3)]
+        assert _queued(scheduler, 3)
+        cold.finish()
+        assert all(c.granted.wait(2) for c in others)
+        assert scheduler.stats()["models"]["coder"]["in_flight"] == 3
+        for c in others:
+            c.finish()
+
+    def test_several_resident_models_do_not_swap(self):
+        scheduler = ModelScheduler(max_resident=2)
+        for model in ("coder", "planner", "coder", "planner"):
+            with scheduler.slot(model):
+                pass
+        stats = scheduler.stats()
+        assert sorted(stats["resident"]) == ["coder", "planner"]
+        assert (stats["loads"], stats["swaps"]) == (2, 0)
+
+    def test_swap_unloads_the_evicted_model_and_records_latency(self):
+        unloaded = []
+        scheduler = ModelScheduler(max_resident=1, unload_fn=unloaded.append)
+        with scheduler.slot("coder") as ticket:
+            ticket.load_seconds = 0.5
+        with scheduler.slot("planner") as ticket:
+            ticket.load_seconds = 0.25
+        assert unloaded == ["coder"]
+        stats = scheduler.stats()
+        assert stats["swaps"] == 1
+        assert stats["swap_latency_s"]["last"] == pytest.approx(0.25, abs=0.01)
+        assert stats["load_seconds_total"] == pytest.approx(0.75, abs=0.01)
+
+    def test_registry_is_opt_in_and_per_host(self, monkeypatch):
+        monkeypatch.delenv("OLLASH_MODEL_SCHEDULER", raising=False)
+        assert get_model_scheduler("http://gpu-a:11434") is None
+        monkeypatch.setenv("OLLASH_MODEL_SCHEDULER", "1")
+        assert get_model_scheduler("http://gpu-a:11434/") is get_model_scheduler("http://gpu-a:11434")
+        assert get_model_scheduler("http://gpu-a:11434") is not get_model_scheduler("http://gpu-b:11434")
+
+    def test_residency_defaults_to_the_hosts_loaded_model_limit(self, monkeypatch):
+        monkeypatch.delenv("OLLASH_MAX_RESIDENT_MODELS", raising=False)
+        monkeypatch.setenv("OLLAMA_MAX_LOADED_MODELS", "3")
+        assert ModelScheduler().max_resident == 3
+        monkeypatch.setenv("OLLASH_MAX_RESIDENT_MODELS", "2")
+        assert ModelScheduler().max_resident == 2
+
+    def test_withdrawn_waiter_leaves_the_queue(self):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=1, max_wait=60)
+        hold = scheduler.acquire("coder")
+        ticket = scheduler.enqueue("planner")
+        waiter = threading.Thread(target=lambda: results.append(scheduler.wait(ticket)))
+        results = []
+        waiter.start()
+        scheduler.withdraw(ticket)
+        waiter.join(5)
+        assert results == [False] and scheduler.stats()["queued"] == 0
+        scheduler.release(hold)
+        assert scheduler.resident == ["coder"] and scheduler.stats()["loads"] == 1
+
+    def test_withdrawn_grant_does_not_evict_or_unload(self):
+        unloaded = []
+        scheduler = ModelScheduler(max_resident=1, max_parallel=1, max_wait=60, unload_fn=unloaded.append)
+        scheduler.release(scheduler.acquire("coder"))
+        ticket = scheduler.enqueue("planner")  # granted at once: coder is idle and gets evicted
+        assert ticket.granted and ticket.evicted == "coder"
+        scheduler.withdraw(ticket)
+        assert not scheduler.wait(ticket)
+        scheduler.release(ticket)  # no-op after withdraw
+        assert unloaded == [] and scheduler.resident == ["coder"]
+        stats = scheduler.stats()
+        assert stats["swaps"] == 0 and stats["loads"] == 1 and stats["models"]["planner"]["in_flight"] == 0
+        with scheduler.slot("coder") as warm:
+            assert not warm.cold
+
+
+# ----------------------------------------------------------------
+# Fake Ollama host with one GPU slot
+# ----------------------------------------------------------------
+
+
+class _FakeOllama:
+    """Holds one model at a time; loading costs LOAD seconds, unloading UNLOAD seconds."""
+
+    LOAD = 0.05
+    UNLOAD = 0.02
+    GENERATE = 0.01
+
+    def __init__(self):
+        self.loaded = None
+        self.loads = 0
+        self.unloads = 0
+        self._gpu = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                reply = fake.generate(body) if self.path == "/api/chat" else fake.unload(body)
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def generate(self, body):
+        load_ns = 0
+        with self._gpu:
+            if self.loaded != body["model"]:
+                if self.loaded is not None:
+                    time.sleep(self.UNLOAD)
+                    self.unloads += 1
+                time.sleep(self.LOAD)
+                self.loaded = body["model"]
+                self.loads += 1
+                load_ns = int(self.LOAD * 1e9)
+        time.sleep(self.GENERATE)
+        return {"message": {"content": "ok"}, "done": True, "load_duration": load_ns}
+
+    def unload(self, body):
+        with self._gpu:
+            if body.get("keep_alive") == 0 and self.loaded == body["model"]:
+                time.sleep(self.UNLOAD)
+                self.loaded = None
+                self.unloads += 1
+        return {"done": True}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def fake_ollama():
+    server = _FakeOllama()
+    yield server
+    server.close()
+
+
+def _clients(url, scheduler):
+    logger = MagicMock()
+    logger.event_publisher = None
+    return {
+        model: OllamaClient(url, model, 10, logger, {}, None, model_scheduler=scheduler)
+        for model in ("coder", "planner", "reviewer")
+    }
+
+
+def _interleaved_calls(clients, rounds=8, scheduler=None):
+    """One thread per request, submitted coder/planner/reviewer/coder/... like alternating phases.
+
+    With a *scheduler*, a placeholder model holds the GPU slot until every request
+    is queued, so batching does not depend on thread start-up timing.
+    """
+    hold = scheduler.acquire("warmup") if scheduler is not None else None
+    threads = []
+    for i in range(rounds):
+        for client in clients.values():
+            t = threading.Thread(target=lambda c=client: asyncio.run(c.achat([{"role": "user", "content": "hi"}])))
+            threads.append(t)
+            t.start()
+    if hold is not None:
+        assert _queued(scheduler, len(threads))
+        scheduler.release(hold)
+    for t in threads:
+        t.join(10)
+    for client in clients.values():
+        client.http_session.close()
+
+
+@pytest.mark.unit
+class TestModelSchedulerWithFakeOllama:
+    def test_scheduler_batches_by_model_and_reports_swaps(self, fake_ollama):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=4, max_batch=16, max_wait=60)
+        _interleaved_calls(_clients(fake_ollama.url, scheduler), scheduler=scheduler)
+
+        stats = scheduler.stats()
+        assert stats["grants"] == 25  # 24 requests + the warm-up placeholder
+        assert fake_ollama.loads == 3  # one load per model instead of one per switch
+        assert stats["swaps"] == 3
+        # Swap latency = explicit unload + the load_duration reported by the server
+        assert stats["swap_latency_s"]["avg"] >= _FakeOllama.LOAD
+        assert stats["swap_latency_s"]["avg"] < _FakeOllama.LOAD + 1.0
+
+    def test_rate_limiter_lease_is_taken_after_the_model_slot(self, fake_ollama):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=4, max_batch=16, max_wait=60)
+        logger = MagicMock()
+        logger.event_publisher = None
+        config = {"rate_limiting": {"enabled": True, "requests_per_minute": 6000}}
+        client = OllamaClient(fake_ollama.url, "coder", 10, logger, config, None, model_scheduler=scheduler)
+        limiter = client._rate_limiter
+        hold = scheduler.acquire("warmup")
+        caller = threading.Thread(target=lambda: asyncio.run(client.achat([{"role": "user", "content": "hi"}])))
+        caller.start()
+        assert _queued(scheduler, 1)
+        time.sleep(0.3)
+        assert limiter.stats()["grants"] == 0  # no lease while queued for the model
+        scheduler.release(hold)
+        caller.join(10)
+        client.http_session.close()
+
+        stats = limiter.stats()
+        assert stats["grants"] == 1 and stats["in_flight"] == 0
+        # Neither the 300ms scheduler wait nor the reported load_duration counts as contention
+        assert stats["ema_latency_ms"] < 300
+
+    async def test_cancelled_stream_does_not_leak_its_model_slot(self):
+        scheduler = ModelScheduler(max_resident=1, max_parallel=1, max_batch=16, max_wait=60)
+        logger = MagicMock()
+        logger.event_publisher = None
+        client = OllamaClient("http://127.0.0.1:9", "coder", 10, logger, {}, None, model_scheduler=scheduler)
+        client._get_aiohttp_session = AsyncMock(return_value=MagicMock())
+        hold = scheduler.acquire("coder")
+        stream = asyncio.ensure_future(client.stream_chat([{"role": "user", "content": "hi"}]))
+        assert await asyncio.to_thread(_queued, scheduler, 1)
+        stream.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await stream
+        assert scheduler.stats()["queued"] == 0  # withdrawn, not left to be granted later
+        scheduler.release(hold)
+        assert await asyncio.to_thread(_wait_for, lambda: scheduler.stats()["models"]["coder"]["in_flight"] == 0)
+        # The single slot is free again for the next caller
+        ticket = await asyncio.wait_for(asyncio.to_thread(scheduler.acquire, "coder"), 5)
+        scheduler.release(ticket)
+        client.http_session.close()
+
+    async def test_cancelled_chat_does_not_force_a_model_swap(self, fake_ollama):
+        unloaded = []
+        scheduler = ModelScheduler(max_resident=1, max_parallel=1, max_batch=16, max_wait=60)
+        client = _clients(fake_ollama.url, scheduler)["planner"]
+        client.unload_model = unloaded.append
+        hold = scheduler.acquire("coder")
+        chat = asyncio.ensure_future(client.achat([{"role": "user", "content": "hi"}]))
+        assert await asyncio.to_thread(_queued, scheduler, 1)
+        chat.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await chat
+        scheduler.release(hold)
+        await asyncio.sleep(0.1)
+        assert unloaded == [] and scheduler.resident == ["coder"] and fake_ollama.loads == 0
+        client.http_session.close()
+
+    def test_unscheduled_calls_thrash_the_fake_gpu(self, fake_ollama):
+        _interleaved_calls(_clients(fake_ollama.url, None))
+        assert fake_ollama.loads > 3
@@ -0,0 +1,118 @@
+"""Unit tests for PromptLoader's versioned DB cache, YAML mtime tracking and compiled templates."""
+
+import asyncio
+import os
+
+import pytest
+
+from backend.utils.core.llm.prompt_loader import CompiledTemplate, PromptLoader
+from backend.utils.core.llm.prompt_repository import PromptRepository
+
+
+class _FakeRepository:
+    """Minimal stand-in for PromptRepository with a generation counter."""
+
+    def __init__(self):
+        self.generation = 0
+        self.active = {}
+        self.queries = 0
+
+    async def get_active_prompt(self, role):
+        self.queries += 1
+        return self.active.get(role)
+
+    async def save_prompt(self, role, text, is_active=False):
+        self.active[role] = text
+        self.generation += 1
+
+
+@pytest.fixture()
+def loader(tmp_path):
+    saved = (PromptLoader._instance, PromptLoader._cache, PromptLoader._db_cache, PromptLoader._db_generation)
+    PromptLoader._instance = None
+    PromptLoader._cache = {}
+    PromptLoader._db_cache = {}
+    PromptLoader._db_generation = None
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "services.yaml").write_text("intent:\n  user: 'classify {text}'\n")
+    instance = PromptLoader(tmp_path)
+    yield instance
+    PromptLoader._instance, PromptLoader._cache, PromptLoader._db_cache, PromptLoader._db_generation = saved
+
+
+@pytest.mark.unit
+class TestPromptLoaderCache:
+    def test_db_is_queried_once_per_generation(self, loader):
+        repo = _FakeRepository()
+        loader.set_repository(repo)
+
+        async def run():
+            first = await loader.load_prompt("core/services.yaml")
+            second = await loader.load_prompt("core/services.yaml")
+            assert first == second == {"intent": {"user": "classify {text}"}}
+            assert repo.queries == 1  # negative result cached too
+
+            await repo.save_prompt("services", "Edited in Prompt Studio")
+            assert await loader.load_prompt("core/services.yaml") == {"system": "Edited in Prompt Studio"}
+            assert await loader.load_prompt("core/services.yaml") == {"system": "Edited in Prompt Studio"}
+            assert repo.queries == 2
+
+        asyncio.run(run())
+
+    def test_yaml_edits_are_picked_up_by_mtime(self, loader, tmp_path):
+        loader.mtime_check_interval = 0
+        path = tmp_path / "core" / "services.yaml"
+        assert loader.load_prompt_sync("core/services.yaml")["intent"]["user"] == "classify {text}"
+
+        path.write_text("intent:\n  user: 'route {text}'\n")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert loader.load_prompt_sync("core/services.yaml")["intent"]["user"] == "route {text}"
+
+    def test_yaml_cache_skips_stat_within_interval(self, loader, tmp_path):
+        loader.mtime_check_interval = 3600
+        first = loader.load_prompt_sync("core/services.yaml")
+        (tmp_path / "core" / "services.yaml").unlink()
+        assert loader.load_prompt_sync("core/services.yaml") is first
+
+
+@pytest.mark.unit
+class TestCompiledTemplate:
+    @pytest.mark.parametrize(
+        "template,values",
+        [
+            ("classify {text} now", {"text": "hello"}),
+            ('{{"json": true}} {a}{b}', {"a": 1, "b": [2]}),
+            ("{value:>5}|{value!r}", {"value": "x"}),
+            ("no fields", {}),
+        ],
+    )
+    def test_matches_str_format(self, template, values):
+        assert CompiledTemplate(template).render(**values) == template.format(**values)
+
+    def test_errors_match_str_format(self):
+        with pytest.raises(KeyError):
+            CompiledTemplate("{missing}").render()
+        with pytest.raises(ValueError):
+            CompiledTemplate("unbalanced {").render()
+
+    def test_templates_are_compiled_once(self):
+        assert PromptLoader.compile_template("x {y}") is PromptLoader.compile_template("x {y}")
+        assert PromptLoader.compile_template("x {y}").fields == {"y"}
+
+
+@pytest.mark.unit
+class TestPromptRepositoryGeneration:
+    def test_save_and_rollback_bump_generation(self, tmp_path):
+        async def run():
+            repo = PromptRepository(tmp_path / "prompts.db")
+            await repo._init_db()
+            start = repo.generation
+            first_id = await repo.save_prompt("coder", "v1", is_active=True)
+            await repo.save_prompt("coder", "v2", is_active=True)
+            assert repo.generation == start + 2
+            await repo.rollback(first_id)
+            assert repo.generation == start + 3
+            assert await repo.get_active_prompt("coder") == "v1"
+
+        asyncio.run(run())
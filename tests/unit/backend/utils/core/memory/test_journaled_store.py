@@ -0,0 +1,101 @@
+"""Unit tests for JournaledJSONStore (write-behind .agent_memory.json persistence)."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.utils.core.memory.journaled_store import JournaledJSONStore
+
+
+@pytest.mark.unit
+class TestJournaledJSONStore:
+    @pytest.fixture()
+    def path(self, tmp_path):
+        return tmp_path / ".agent_memory.json"
+
+    def _store(self, path, **kwargs):
+        kwargs.setdefault("write_behind", False)
+        return JournaledJSONStore(path, MagicMock(), **kwargs)
+
+    def _journal_records(self, store):
+        return [json.loads(line) for line in store.journal_path.read_text().splitlines() if line]
+
+    def test_set_and_reload(self, path):
+        store = self._store(path)
+        store.set("domain_context_memory", {"code": "python"})
+
+        reloaded = self._store(path)
+        assert reloaded.get("domain_context_memory") == {"code": "python"}
+
+    def test_loads_legacy_snapshot(self, path):
+        path.write_text(json.dumps({"conversation_history": [{"role": "user", "content": "hi"}]}, indent=2))
+        store = self._store(path)
+        assert store.get("conversation_history") == [{"role": "user", "content": "hi"}]
+
+    def test_growing_list_is_journaled_as_extend(self, path):
+        store = self._store(path)
+        history = [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+        store.set("conversation_history", history)
+        history.append({"role": "user", "content": "c"})
+        store.set("conversation_history", history)
+
+        records = self._journal_records(store)
+        assert [r["op"] for r in records] == ["set", "extend"]
+        assert records[1]["v"] == [{"role": "user", "content": "c"}]
+        assert self._store(path).get("conversation_history") == history
+
+    def test_unchanged_value_is_not_rewritten(self, path):
+        store = self._store(path)
+        store.set("domain_context_memory", {"a": "b"})
+        store.set("domain_context_memory", {"a": "b"})
+        assert len(self._journal_records(store)) == 1
+
+    def test_compaction_folds_journal_into_snapshot(self, path):
+        store = self._store(path, compact_threshold_bytes=200)
+        for i in range(20):
+            store.set("cumulative_summary", f"summary {i}")
+
+        assert path.exists()
+        assert store.journal_path.stat().st_size < 200
+        assert self._store(path).get("cumulative_summary") == "summary 19"
+
+    def test_snapshot_and_journal_overlap_is_not_replayed_twice(self, path):
+        store = self._store(path)
+        store.set("conversation_history", [1, 2])
+        store.set("conversation_history", [1, 2, 3])
+        journal = store.journal_path.read_bytes()
+        store.compact()
+        # Simulate a crash after the snapshot swap but before journal truncation
+        store.journal_path.write_bytes(journal)
+
+        assert self._store(path).get("conversation_history") == [1, 2, 3]
+
+    def test_torn_journal_tail_is_ignored_and_repaired(self, path):
+        store = self._store(path)
+        store.set("cumulative_summary", "kept")
+        with open(store.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "set", "k": "cumulative_summary", "v": "lo')
+
+        reloaded = self._store(path)
+        assert reloaded.get("cumulative_summary") == "kept"
+        reloaded.set("cumulative_summary", "after crash")
+        assert self._store(path).get("cumulative_summary") == "after crash"
+
+    def test_write_behind_coalesces_bursts(self, path):
+        store = self._store(path, write_behind=True, flush_interval=0.05)
+        for i in range(50):
+            store.set("cumulative_summary", f"summary {i}")
+        store.close()
+
+        records = self._journal_records(store)
+        assert len(records) < 50
+        assert self._store(path).get("cumulative_summary") == "summary 49"
+
+    def test_caller_mutation_after_set_is_not_persisted_until_next_set(self, path):
+        store = self._store(path, write_behind=True, flush_interval=0.05)
+        history = [1]
+        store.set("conversation_history", history)
+        history.append(2)
+        store.close()
+        assert self._store(path).get("conversation_history") == [1]
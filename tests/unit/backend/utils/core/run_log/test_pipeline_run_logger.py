@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import concurrent.futures
 import re
+import threading
 from pathlib import Path
 
 import pytest
@@ -571,3 +572,157 @@ class TestThreadSafety:
 
         assert len(set(indices)) == 20  # all unique
         assert set(indices) == set(range(1, 21))  # 1 through 20
+
+
+# ---------------------------------------------------------------------------
+# TestBackgroundWriter
+# ---------------------------------------------------------------------------
+
+
+class TestBackgroundWriter:
+    @pytest.mark.unit
+    def test_flush_drains_queue(self, tmp_path: Path) -> None:
+        logger = PipelineRunLogger(tmp_path, "P", "d", background_writer=True)
+        logger.log_phase_start("1", "Scan")
+        logger.flush()
+        assert "### Phase 1: Scan" in _read(tmp_path / PipelineRunLogger.LOG_FILENAME)
+        logger.close()
+
+    @pytest.mark.unit
+    def test_concurrent_writes_all_land_after_close(self, tmp_path: Path) -> None:
+        logger = PipelineRunLogger(tmp_path, "P", "d", background_writer=True)
+        logger.log_phase_start("4", "Code Fill")
+
+        def write_one(i: int) -> None:
+            logger.log_llm_call("4", logger._next_call_index("4"), "coder", "sys", f"u{i}", f"r{i}", 1, 2, 3.0)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(write_one, range(50)))
+        logger.close()
+
+        content = _read(tmp_path / PipelineRunLogger.LOG_FILENAME)
+        assert len(re.findall(r"#### LLM Call \d+", content)) == 50
+
+    @pytest.mark.unit
+    def test_close_twice_with_background_writer(self, tmp_path: Path) -> None:
+        logger = PipelineRunLogger(tmp_path, "P", "d", background_writer=True)
+        logger.close()
+        logger.close()
+
+
+# ---------------------------------------------------------------------------
+# TestStructuredEvents
+# ---------------------------------------------------------------------------
+
+
+class TestStructuredEvents:
+    @pytest.mark.unit
+    def test_events_written_as_jsonl(self, logger_at_tmp, tmp_path: Path) -> None:
+        from backend.utils.core.run_log.pipeline_run_logger import read_run_events
+
+        logger, _ = logger_at_tmp
+        logger.log_phase_start("2", "Blueprint")
+        logger.log_phase_end("2", "Blueprint", 1.5, "success")
+
+        kinds = [e["event"] for e in read_run_events(tmp_path / PipelineRunLogger.EVENTS_FILENAME)]
+        assert kinds == ["run_start", "phase_start", "phase_end"]
+
+    @pytest.mark.unit
+    def test_repeated_system_prompt_stored_once(self, logger_at_tmp, tmp_path: Path) -> None:
+        from backend.utils.core.run_log.pipeline_run_logger import read_run_events
+
+        logger, _ = logger_at_tmp
+        for i in range(5):
+            logger.log_llm_call("4", i + 1, "coder", "SHARED SYSTEM PROMPT", f"user {i}", f"resp {i}", 1, 2, 3.0)
+
+        events = read_run_events(tmp_path / PipelineRunLogger.EVENTS_FILENAME)
+        blobs = [e for e in events if e["event"] == "blob"]
+        calls = [e for e in events if e["event"] == "llm_call"]
+        assert len(calls) == 5
+        assert len({c["system_hash"] for c in calls}) == 1
+        assert sum(1 for b in blobs if b["data"] == "SHARED SYSTEM PROMPT") == 1
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("background", [False, True])
+    def test_compressed_blobs_round_trip(self, tmp_path: Path, background: bool) -> None:
+        from backend.utils.core.run_log.pipeline_run_logger import read_run_events
+
+        big_prompt = "def generated_function():\n    return 42\n" * 500
+        logger = PipelineRunLogger(tmp_path, "P", "d", background_writer=background, compress_prompts="gzip")
+        logger.log_llm_call("4", 1, "coder", big_prompt, "short", "ok", 1, 2, 3.0)
+        logger.close()
+
+        raw = read_run_events(tmp_path / PipelineRunLogger.EVENTS_FILENAME)
+        big_blob = next(e for e in raw if e["event"] == "blob" and e["chars"] == len(big_prompt))
+        assert big_blob["encoding"] == "gzip+base64"
+        assert len(big_blob["data"]) < len(big_prompt) / 10
+
+        call = next(
+            e for e in read_run_events(tmp_path / PipelineRunLogger.EVENTS_FILENAME, True) if e["event"] == "llm_call"
+        )
+        assert call["system"] == big_prompt
+        assert call["user"] == "short"
+
+    @pytest.mark.unit
+    def test_blobs_are_compressed_outside_the_lock(self, tmp_path: Path) -> None:
+        from backend.utils.core.run_log.pipeline_run_logger import read_run_events
+
+        class OwnedLock:
+            """Lock that remembers which thread holds it."""
+
+            def __init__(self):
+                self._lock = threading.Lock()
+                self.owner = None
+
+            def __enter__(self):
+                self._lock.acquire()
+                self.owner = threading.get_ident()
+
+            def __exit__(self, *exc):
+                self.owner = None
+                self._lock.release()
+
+        logger = PipelineRunLogger(tmp_path, "P", "d", compress_prompts="gzip")
+        logger._lock = OwnedLock()
+        encode = logger._blob_record
+        held = []
+
+        def checked_blob_record(digest, body):
+            held.append(logger._lock.owner == threading.get_ident())
+            return encode(digest, body)
+
+        logger._blob_record = checked_blob_record
+        shared = "SHARED PROMPT " * 500
+
+        def write_one(i: int) -> None:
+            logger.log_llm_call("4", i + 1, "coder", shared, f"user {i}", f"resp {i}", 1, 2, 3.0)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(write_one, range(40)))
+        logger.close()
+
+        assert held and not any(held)
+        events = read_run_events(tmp_path / PipelineRunLogger.EVENTS_FILENAME)
+        shared_blobs = [i for i, e in enumerate(events) if e["event"] == "blob" and e["chars"] == len(shared)]
+        first_ref = next(i for i, e in enumerate(events) if e["event"] == "llm_call")
+        assert len(shared_blobs) == 1 and shared_blobs[0] < first_ref
+
+    @pytest.mark.unit
+    def test_summarize_phase_stats(self, logger_at_tmp, tmp_path: Path) -> None:
+        from backend.utils.core.run_log.pipeline_run_logger import read_run_events, summarize_phase_stats
+
+        logger, _ = logger_at_tmp
+        logger.log_phase_start("4", "Code Fill")
+        logger.log_llm_call("4", 1, "coder", "s", "u1", "r1", 100, 50, 200.0)
+        logger.log_llm_call("4", 2, "coder", "s", "u2", "r2", 10, 5, 300.0)
+        logger.log_file_written("4", "app.py", 120)
+        logger.log_phase_end("4", "Code Fill", 2.0, "success")
+        logger.log_phase_skipped("7", "Tests", "small model")
+
+        stats = summarize_phase_stats(read_run_events(tmp_path / PipelineRunLogger.EVENTS_FILENAME))
+        assert stats["4"]["llm_calls"] == 2
+        assert stats["4"]["llm_ms"] == 500.0
+        assert stats["4"]["prompt_tokens"] == 110
+        assert stats["4"]["files_written"] == 1
+        assert stats["4"]["status"] == "success"
+        assert stats["7"]["status"] == "skipped"
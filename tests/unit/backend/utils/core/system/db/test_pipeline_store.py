@@ -1,5 +1,9 @@
 """Tests for PipelineStore — pipeline CRUD, run lifecycle, builtin seeding."""
 
+import json
+import sqlite3
+import time
+
 import pytest
 
 from backend.utils.core.system.db.pipeline_store import PipelineStore
@@ -50,6 +54,15 @@ class TestPipelineCRUD:
         assert deleted is True
         assert store.get_pipeline(p["id"]) is None
 
+    def test_delete_cascades_to_runs_and_events(self, store):
+        p = store.create_pipeline("Temp", ["SecurityScanPhase"])
+        run = store.create_run(p["id"])
+        store.append_events(run["id"], [{"type": "e"}] * 3)
+        assert store.delete_pipeline(p["id"])
+        assert store.get_run(run["id"]) is None
+        with sqlite3.connect(store._db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM run_events").fetchone()[0] == 0
+
     def test_delete_nonexistent_returns_false(self, store):
         assert store.delete_pipeline(9999) is False
 
@@ -134,3 +147,109 @@ class TestRunLifecycle:
         for _ in range(5):
             store.create_run(p["id"])
         assert len(store.list_runs(p["id"], limit=3)) == 3
+
+
+class TestRunEvents:
+    def test_get_events_after_cursor(self, store):
+        p = store.create_pipeline("P", ["SecurityScanPhase"])
+        run = store.create_run(p["id"])
+        assert store.append_events(run["id"], [{"type": "e", "n": i} for i in range(4)]) == 4
+        store.append_log(run["id"], {"type": "e", "n": 4})
+        assert [e["seq"] for e in store.get_events(run["id"])] == [1, 2, 3, 4, 5]
+        assert [e["n"] for e in store.get_events(run["id"], after=2, limit=2)] == [2, 3]
+        assert store.get_events(run["id"], after=5) == []
+        assert store.get_run(run["id"])["log"][4] == {"type": "e", "n": 4}
+        assert store.get_run_summary(run["id"])["event_count"] == 5
+
+    def test_append_to_unknown_run_is_ignored(self, store):
+        assert store.append_events(9999, [{"type": "e"}]) == 0
+        assert store.get_events(9999) == []
+
+    def test_event_writer_batches(self, store):
+        p = store.create_pipeline("P", ["SecurityScanPhase"])
+        run = store.create_run(p["id"])
+        with store.event_writer(run["id"], batch_size=3, flush_interval=60) as writer:
+            for i in range(5):
+                writer.append({"type": "e", "n": i})
+            # The first event is written at once, then one full batch
+            assert [e["n"] for e in store.get_events(run["id"])] == [0, 1, 2, 3]
+        assert [e["n"] for e in store.get_events(run["id"])] == [0, 1, 2, 3, 4]
+        assert writer.last_seq == 5
+
+    def test_event_writer_flushes_a_lone_event_on_a_timer(self, store):
+        p = store.create_pipeline("P", ["SecurityScanPhase"])
+        run = store.create_run(p["id"])
+        with store.event_writer(run["id"], batch_size=50, flush_interval=0.05) as writer:
+            writer.append({"type": "run_started"})
+            assert len(store.get_events(run["id"])) == 1  # nothing written before: not held back
+            writer.append({"type": "phase_done"})
+            deadline = time.monotonic() + 5
+            while len(store.get_events(run["id"])) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert [e["type"] for e in store.get_events(run["id"])] == ["run_started", "phase_done"]
+
+    def test_runs_keep_their_own_sequences(self, store):
+        p = store.create_pipeline("P", ["SecurityScanPhase"])
+        a, b = store.create_run(p["id"]), store.create_run(p["id"])
+        store.append_log(a["id"], {"run": "a"})
+        store.append_log(b["id"], {"run": "b"})
+        store.append_log(a["id"], {"run": "a"})
+        assert [e["seq"] for e in store.get_events(a["id"])] == [1, 2]
+        assert {r["id"]: len(r["log"]) for r in store.list_runs(p["id"])} == {a["id"]: 2, b["id"]: 1}
+
+    def test_legacy_log_column_is_migrated(self, tmp_path):
+        db_path = tmp_path / "legacy.db"
+        store = PipelineStore(db_path)
+        p = store.create_pipeline("P", ["SecurityScanPhase"])
+        run = store.create_run(p["id"])
+        legacy = [{"type": "run_started", "ts": 100.0}, {"type": "phase_done", "phase": "SecurityScanPhase"}]
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE runs SET log = ? WHERE id = ?", (json.dumps(legacy), run["id"]))
+            conn.execute("PRAGMA user_version = 0")  # as written before the migration existed
+
+        reopened = PipelineStore(db_path)
+        assert reopened.get_run(run["id"])["log"] == legacy
+        assert [e["seq"] for e in reopened.get_events(run["id"])] == [1, 2]
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT log FROM runs WHERE id = ?", (run["id"],)).fetchone()[0] == "[]"
+        PipelineStore(db_path)  # idempotent
+        assert len(reopened.get_events(run["id"])) == 2
+
+    def test_legacy_migration_runs_once_and_purges_orphans(self, tmp_path):
+        db_path = tmp_path / "legacy.db"
+        store = PipelineStore(db_path)
+        p = store.create_pipeline("P", ["SecurityScanPhase"])
+        run = store.create_run(p["id"])
+        with sqlite3.connect(db_path) as conn:  # a delete made without foreign keys enforced
+            conn.execute("INSERT INTO run_events (run_id, seq, ts, event) VALUES (999, 1, 0, '{}')")
+            conn.execute("PRAGMA user_version = 0")
+        PipelineStore(db_path)
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM run_events WHERE run_id = 999").fetchone()[0] == 0
+            conn.execute("UPDATE runs SET log = ? WHERE id = ?", (json.dumps([{"type": "late"}]), run["id"]))
+        PipelineStore(db_path)  # already migrated: the log column is no longer scanned
+        assert store.get_events(run["id"]) == []
+
+
+@pytest.mark.slow
+class TestRunEventsBenchmark:
+    """Appends and tail reads with 10,000 events already in the run."""
+
+    N = 10_000
+
+    def test_append_and_tail_at_10k_events(self, store):
+        p = store.create_pipeline("P", ["SecurityScanPhase"])
+        event = {"type": "phase_done", "phase": "SecurityScanPhase", "index": 0, "total": 1, "duration": 0.5}
+
+        run = store.create_run(p["id"])["id"]
+        store.append_events(run, [event] * self.N)
+        for _ in range(200):
+            store.append_log(run, event)
+        with store.event_writer(run, batch_size=100) as writer:
+            for _ in range(2000):
+                writer.append(event)
+
+        tail = store.get_events(run, after=self.N + 2000)
+        assert len(tail) == 200 and tail[-1]["seq"] == self.N + 2200
+        assert writer.last_seq == self.N + 2200
+        assert store.get_run_summary(run)["event_count"] == self.N + 2200
@@ -0,0 +1,266 @@
+"""Unit tests for EmailOutbox against a local SMTP stub, plus a check that enqueue never waits for delivery."""
+
+import asyncio
+import socketserver
+import threading
+import time
+
+import pytest
+
+from backend.utils.core.system.alert_manager import AlertManager
+from backend.utils.core.system.email_outbox import EmailOutbox, SMTPConnectionPool
+from backend.utils.core.system.notification_manager import NotificationManager
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply("220 stub ESMTP")
+        mail_from, rcpts = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb == "EHLO":
+                self._reply("250-stub")
+                self._reply("250 AUTH PLAIN")
+            elif verb == "HELO":
+                self._reply("250 stub")
+            elif verb == "AUTH":
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpts = command, []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpts.append(command.split(":", 1)[1].strip(" <>"))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data.append(chunk)
+                with server.lock:
+                    server.messages.append({"from": mail_from, "rcpts": list(rcpts), "data": b"".join(data)})
+                self._reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = []
+        self.lock = threading.Lock()
+        self.port = self.server_address[1]
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _FakeSMTP:
+    """In-process SMTP connection whose first send blocks until *gate* is set."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.sending = threading.Event()
+        self.sent = []
+
+    def send_message(self, message, from_addr, to_addrs):
+        self.sending.set()
+        self.gate.wait(5)
+        self.sent.append((message["Subject"], list(to_addrs)))
+
+    def noop(self):
+        return 250, b"OK"
+
+    def rset(self):
+        pass
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FakePool(SMTPConnectionPool):
+    def __init__(self):
+        super().__init__("fake", 25, starttls=False, size=1)
+        self.smtp = _FakeSMTP()
+
+    def _connect(self):
+        with self._lock:
+            self.connections_opened += 1
+        return self.smtp
+
+
+@pytest.fixture()
+def smtp_stub():
+    stub = _SMTPStub()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture()
+def make_outbox(tmp_path):
+    outboxes = []
+
+    def make(port, **options):
+        options.setdefault("flush_window", 0.05)
+        options.setdefault("retry_delay", 0.01)
+        pool = SMTPConnectionPool("127.0.0.1", port, starttls=False, timeout=5, size=options.pop("pool_size", 1))
+        outbox = EmailOutbox(pool, "ollash@example.com", tmp_path / "outbox.db", **options)
+        outboxes.append(outbox)
+        return outbox
+
+    yield make
+    for outbox in outboxes:
+        outbox.close(flush=False)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.unit
+class TestEmailOutbox:
+    def test_enqueue_returns_before_delivery_and_connections_are_reused(self, smtp_stub, make_outbox):
+        outbox = make_outbox(smtp_stub.port)
+        assert outbox.enqueue("first", "<p>1</p>", ["a@example.com"])
+        assert _wait_for(lambda: len(smtp_stub.messages) == 1)
+        assert outbox.enqueue("second", "<p>2</p>", ["a@example.com"])
+        assert _wait_for(lambda: len(smtp_stub.messages) == 2)
+        assert smtp_stub.connections == 1  # second flush reused the pooled connection
+        assert outbox.stats()["pending"] == 0
+
+    def test_identical_content_is_batched_into_one_message(self, smtp_stub, make_outbox):
+        outbox = make_outbox(smtp_stub.port, flush_window=10)
+        for i in range(20):
+            outbox.enqueue("Deploy done", "<p>v2</p>", [f"user{i}@example.com"])
+        for i in range(5):
+            outbox.enqueue(f"report {i}", "<p>r</p>", ["ops@example.com"])
+        assert outbox.flush() == 25
+        assert len(smtp_stub.messages) == 6
+        assert len(smtp_stub.messages[0]["rcpts"]) == 20
+        # Merged recipients are only in the envelope, not disclosed to each other
+        assert b"To: undisclosed-recipients:;" in smtp_stub.messages[0]["data"]
+        assert b"user7@example.com" not in smtp_stub.messages[0]["data"]
+        assert b"To: ops@example.com" in smtp_stub.messages[1]["data"]
+        assert smtp_stub.connections == 1
+        stats = outbox.stats()
+        assert (stats["sent_messages"], stats["sent_recipients"]) == (6, 25)
+
+    def test_identical_alerts_are_deduplicated_then_rate_limited(self, smtp_stub, make_outbox):
+        outbox = make_outbox(smtp_stub.port, flush_window=10, dedup_window=60)
+        for _ in range(50):
+            assert outbox.enqueue("CPU high", "<p>95%</p>", ["ops@example.com"], dedup_key="alert:cpu")
+        assert outbox.flush() == 1
+        assert not outbox.enqueue("CPU high", "<p>96%</p>", ["ops@example.com"], dedup_key="alert:cpu")
+        stats = outbox.stats()
+        assert (stats["deduplicated"], stats["rate_limited"], stats["sent_notifications"]) == (49, 1, 50)
+        assert len(smtp_stub.messages) == 1
+
+    def test_queue_survives_a_restart(self, tmp_path, make_outbox):
+        down = _SMTPStub()
+        port = down.port
+        down.stop()  # nothing listens: delivery fails, the row stays queued
+        outbox = make_outbox(port, flush_window=10)
+        outbox.enqueue("persist me", "<p>x</p>", ["a@example.com"])
+        assert outbox.flush() == 0
+        outbox.close(flush=False)
+
+        stub = _SMTPStub()
+        try:
+            restarted = make_outbox(stub.port, flush_window=10)
+            assert restarted.pending() == 1
+            time.sleep(0.02)  # past the retry backoff
+            assert restarted.flush() == 1
+            assert b"persist me" in stub.messages[0]["data"]
+        finally:
+            stub.stop()
+
+    def test_notification_and_alert_managers_use_the_outbox(self, smtp_stub, tmp_path, monkeypatch):
+        monkeypatch.setenv("SMTP_SERVER", "127.0.0.1")
+        monkeypatch.setenv("SMTP_PORT", str(smtp_stub.port))
+        monkeypatch.setenv("SMTP_USER", "ollash")
+        monkeypatch.setenv("SMTP_PASSWORD", "secret")
+        monkeypatch.setenv("SMTP_STARTTLS", "0")
+        monkeypatch.setenv("NOTIFICATION_FROM_EMAIL", "ollash@example.com")
+        monkeypatch.setenv("OLLASH_EMAIL_OUTBOX", str(tmp_path / "nm_outbox.db"))
+        monkeypatch.setenv("OLLASH_EMAIL_FLUSH_WINDOW", "0.05")
+        manager = NotificationManager()
+        try:
+            manager.subscribe_email("ops@example.com")
+            alerts = AlertManager(notification_manager=manager)
+            alert = {"name": "Disk", "severity": "critical", "current_value": 97, "threshold": 90}
+
+            async def fire():
+                return [await alerts.trigger_alert("disk", alert, channels=["email"]) for _ in range(30)]
+
+            start = time.perf_counter()
+            assert all(asyncio.run(fire()))
+            assert time.perf_counter() - start < 1.0  # callers never wait for SMTP
+            assert _wait_for(lambda: len(smtp_stub.messages) == 1)
+            time.sleep(0.1)
+            assert len(smtp_stub.messages) == 1  # 30 identical alerts, one email
+            assert smtp_stub.messages[0]["rcpts"] == ["ops@example.com"]
+        finally:
+            manager.outbox.close(flush=False)
+
+
+@pytest.mark.unit
+class TestEmailOutboxLatency:
+    """Enqueue never waits for SMTP: producers keep returning while delivery is stalled."""
+
+    def test_enqueue_does_not_wait_for_a_stalled_delivery(self, tmp_path):
+        pool = _FakePool()
+        # A long flush window keeps the worker idle, so delivery happens only via the explicit flush()
+        outbox = EmailOutbox(pool, "ollash@example.com", tmp_path / "outbox.db", flush_window=60)
+        try:
+            for i in range(100):
+                assert outbox.enqueue(f"build {i}", f"<p>{i % 4}</p>", [f"user{i % 5}@example.com"])
+            flusher = threading.Thread(target=outbox.flush)
+            flusher.start()
+            assert pool.smtp.sending.wait(5)  # delivery is now blocked inside SMTP
+
+            for i in range(100, 200):
+                assert outbox.enqueue(f"build {i}", f"<p>{i % 4}</p>", [f"user{i % 5}@example.com"])
+            stats = outbox.stats()
+            assert stats["sent_notifications"] == 0 and stats["pending"] == 200
+
+            pool.smtp.gate.set()
+            flusher.join(5)
+            outbox.flush()
+            stats = outbox.stats()
+        finally:
+            outbox.close(flush=False)
+
+        assert stats["sent_notifications"] == 200 and stats["pending"] == 0
+        assert stats["connections_opened"] == 1
+        assert [subject for subject, _ in pool.smtp.sent] == [f"build {i}" for i in range(200)]
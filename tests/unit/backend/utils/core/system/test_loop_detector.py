@@ -98,3 +98,36 @@ class TestLoopDetector:
 
         assert len(detector.history) == 0
         assert detector.progress_score == 0.0
+
+    def test_identical_actions_skip_embeddings(self, detector, mock_embedding_client):
+        detector.record_action("read_file", {"path": "a.py"}, {"ok": True, "content": "x" * 10_000})
+        detector.record_action("read_file", {"path": "a.py"}, {"ok": True, "content": "x" * 10_000})
+
+        assert detector.detect_loop() is True
+        mock_embedding_client.get_embedding.assert_not_called()
+
+    def test_dissimilar_args_skip_embeddings(self, detector, mock_embedding_client):
+        detector.record_action("list_directory", {"path": "src"}, "r1")
+        detector.record_action("run_command", {"command": "pytest -q"}, "r2")
+
+        assert detector.detect_loop() is False
+        mock_embedding_client.get_embedding.assert_not_called()
+
+    def test_each_action_embedded_once(self, mock_logger, mock_embedding_client):
+        mock_embedding_client.get_embedding.side_effect = None
+        mock_embedding_client.get_embedding.return_value = [0.5] * 384
+        detector = LoopDetector(mock_logger, mock_embedding_client, threshold=3, similarity_threshold=0.99)
+
+        for i in range(5):
+            detector.record_action("read_file", {"path": "src/module.py", "offset": 0}, f"result {i}")
+            detector.detect_loop()
+
+        assert mock_embedding_client.get_embedding.call_count == 5
+
+    def test_history_is_bounded(self, mock_logger, mock_embedding_client):
+        detector = LoopDetector(mock_logger, mock_embedding_client, threshold=3, history_size=10)
+        for i in range(100):
+            detector.record_action("tool", {"i": i}, "r")
+
+        assert len(detector.history) == 10
+        assert detector.history[-1]["args"] == {"i": 99}
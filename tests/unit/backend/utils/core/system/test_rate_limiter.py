@@ -0,0 +1,226 @@
+"""Unit tests for the unified token-bucket rate limiter."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.utils.core.llm.ollama_client import OllamaClient, _contention_seconds
+from backend.utils.core.llm.parallel_generator import GenerationTask, ParallelFileGenerator
+from backend.utils.core.system.rate_limiter import (
+    AdaptivePolicy,
+    AsyncRateLimiter,
+    Budget,
+    SyncRateLimiter,
+    TokenBucketLimiter,
+    get_rate_limiter,
+)
+
+
+async def _hold(limiter, key, order, hold=0.001, tokens=0):
+    lease = await limiter.acquire(key, tokens)
+    order.append(key)
+    await asyncio.sleep(hold)
+    limiter.release(lease)
+    return lease
+
+
+@pytest.mark.unit
+class TestTokenBucketLimiter:
+    async def test_uncontended_acquire_is_immediate(self):
+        limiter = TokenBucketLimiter("t", Budget(rpm=60, max_concurrent=2))
+        lease = await limiter.acquire("coder")
+        assert lease.wait_seconds < 0.01
+        assert limiter.stats()["in_flight"] == 1
+        limiter.release(lease)
+        limiter.release(lease)  # idempotent
+        assert limiter.stats()["in_flight"] == 0
+
+    async def test_rate_is_paced_by_timer_not_polling(self):
+        limiter = TokenBucketLimiter("t", Budget(rpm=1200, burst=1))  # one request every 50 ms
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.release(await limiter.acquire())
+        elapsed = time.monotonic() - start
+        assert 0.2 <= elapsed < 1.0
+        # One timer per refill instead of a sleep loop
+        assert limiter.stats()["timer_wakeups"] <= 6
+
+    async def test_per_key_budget_does_not_block_other_keys(self):
+        limiter = TokenBucketLimiter("t")
+        limiter.set_budget("planner", Budget(max_concurrent=1))
+        held = await limiter.acquire("planner")
+        blocked = asyncio.ensure_future(limiter.acquire("planner"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        coder = await asyncio.wait_for(limiter.acquire("coder"), 1)  # queued later, granted first
+        assert limiter.stats()["scopes"]["planner"]["queued"] == 1
+        limiter.release(held)
+        limiter.release(await asyncio.wait_for(blocked, 1))
+        limiter.release(coder)
+
+    async def test_backend_budget_is_shared_by_all_keys(self):
+        limiter = TokenBucketLimiter("t", Budget(max_concurrent=2))
+        leases = [await limiter.acquire(k) for k in ("coder", "planner")]
+        third = asyncio.ensure_future(limiter.acquire("reviewer"))
+        await asyncio.sleep(0.01)
+        assert not third.done()
+        limiter.release(leases[0])
+        limiter.release(await asyncio.wait_for(third, 1))
+        limiter.release(leases[1])
+
+    async def test_token_budget(self):
+        limiter = TokenBucketLimiter("t", Budget(tpm=6000))  # 100 tokens/s, bucket of 6000
+        limiter.release(await limiter.acquire(tokens=6000))
+        start = time.monotonic()
+        limiter.release(await limiter.acquire(tokens=10))
+        assert 0.05 <= time.monotonic() - start < 1.0
+
+    async def test_async_timeout_and_cancellation_leave_no_waiter(self):
+        limiter = TokenBucketLimiter("t", Budget(max_concurrent=1))
+        held = await limiter.acquire()
+        with pytest.raises(TimeoutError):
+            await limiter.acquire(timeout=0.02)
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.stats()["queued"] == 0 and limiter.stats()["timeouts"] == 2
+        limiter.release(held)
+        limiter.release(await asyncio.wait_for(limiter.acquire(), 1))
+
+    def test_sync_timeout(self):
+        limiter = TokenBucketLimiter("t", Budget(max_concurrent=1))
+        held = limiter.acquire_blocking()
+        with pytest.raises(TimeoutError):
+            limiter.acquire_blocking(timeout=0.02)
+        assert SyncRateLimiter(limiter).try_acquire(timeout=0.02) is None
+        limiter.release(held)
+
+    def test_latency_adapts_effective_rpm(self):
+        limiter = TokenBucketLimiter(
+            "t",
+            Budget(rpm=120),
+            adaptive=AdaptivePolicy(
+                degradation_threshold_ms=1000, recovery_threshold_ms=200, min_rpm=30, ema_alpha=1.0
+            ),
+        )
+        for _ in range(10):
+            limiter.record_latency(5.0, "coder")
+        assert limiter.effective_rpm == 30
+        for _ in range(30):
+            limiter.record_latency(0.05, "coder")
+        assert limiter.effective_rpm == 120
+        assert limiter.stats()["ema_latency_ms"] == pytest.approx(50, abs=1)
+
+    def test_registry_applies_the_first_known_budget(self):
+        name = "http://limiter-registry-test:11434"
+        bare = get_rate_limiter(name + "/")
+        assert not bare.configured
+        configured = get_rate_limiter(name, Budget(rpm=30))
+        assert configured is bare and configured.stats()["rpm"] == 30
+        assert get_rate_limiter(name, Budget(rpm=999)).stats()["rpm"] == 30
+
+
+@pytest.mark.unit
+class TestRateLimiterFacades:
+    def test_sync_facade_bounds_threads(self):
+        limiter = TokenBucketLimiter("t")
+        facade = SyncRateLimiter(limiter, "worker", Budget(max_concurrent=3))
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work():
+            with facade.limit():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.002)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(120)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        assert peak[0] == 3
+        assert facade.get_status()["grants"] == 120
+
+    async def test_parallel_generator_uses_the_shared_limiter(self):
+        url = "http://parallel-generator-test:11434"
+        generator = ParallelFileGenerator(MagicMock(), max_concurrent=2, max_requests_per_minute=6000, ollama_url=url)
+        assert isinstance(generator.rate_limiter, AsyncRateLimiter)
+        assert generator.rate_limiter.limiter is get_rate_limiter(url)
+        active, peak = [0], [0]
+
+        async def generate(path, context):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.005)
+            active[0] -= 1
+            return f"# {path}", True, None
+
+        tasks = [GenerationTask(file_path=f"f{i}.py", context={}) for i in range(8)]
+        results = await generator.generate_files(tasks, generate)
+        assert all(r.success for r in results.values()) and len(results) == 8
+        assert peak[0] <= 2
+        assert generator.rate_limiter.limiter.stats()["scopes"]["parallel_generator"]["in_flight"] == 0
+
+    def test_ollama_clients_of_one_backend_share_a_limiter(self):
+        limits = {"requests_per_minute": 60, "max_tokens_per_minute": 100000}
+        config = {"rate_limiting": dict(limits, enabled=True)}
+        url = "http://shared-limiter-test:11434"
+        a = OllamaClient(url, "coder", 30, MagicMock(), config, None)
+        b = OllamaClient(url + "/", "planner", 30, MagicMock(), config, None)
+        assert a._rate_limiter is b._rate_limiter is get_rate_limiter(url)
+        # Opt-in: the default tool settings leave OllamaClient unlimited
+        c = OllamaClient(url, "coder", 30, MagicMock(), {"rate_limiting": limits}, None)
+        assert c._rate_limiter is None
+        for client in (a, b, c):
+            client.http_session.close()
+
+    def test_contention_excludes_generation_and_model_load(self):
+        data = {"eval_duration": 2_000_000_000, "load_duration": 5_000_000_000}
+        assert _contention_seconds(7.5, data) == pytest.approx(0.5)
+        assert _contention_seconds(1.0, {"load_duration": 3_000_000_000}) == 0.0
+        assert _contention_seconds(1.5, None) == 1.5
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestRateLimiterBenchmark:
+    """Many uncontended acquires, and FIFO fairness under 150 concurrent waiters."""
+
+    async def test_repeated_acquire_release_leaves_nothing_held(self):
+        limiter = TokenBucketLimiter("bench", Budget(rpm=10**9, max_concurrent=64))
+        n = 5000
+        for _ in range(n):
+            limiter.release(await limiter.acquire("coder"))
+        for _ in range(n):
+            limiter.release(limiter.acquire_blocking("coder"))
+        stats = limiter.stats()
+        assert stats["grants"] == 2 * n and stats["in_flight"] == 0 and stats["queued"] == 0
+
+    async def test_fairness_under_150_waiters(self):
+        limiter = TokenBucketLimiter("bench", Budget(max_concurrent=4))
+        waiters = 150
+        order = []
+        await asyncio.gather(*(_hold(limiter, f"w{i:03d}", order) for i in range(waiters)))
+
+        # Strict FIFO: grants follow arrival order, nobody is overtaken
+        assert order == [f"w{i:03d}" for i in range(waiters)]
+        stats = limiter.stats()
+        assert stats["grants"] == waiters and stats["queued"] == 0
+
+    async def test_fairness_across_keys_under_rate_limit(self):
+        limiter = TokenBucketLimiter("bench", Budget(rpm=60000, burst=1))  # one grant per ms
+        keys = ("coder", "planner", "reviewer")
+        order = []
+        await asyncio.gather(*(_hold(limiter, keys[i % 3], order, hold=0) for i in range(150)))
+        # Arrival order is round-robin over the keys, and so is the grant order
+        assert order == [keys[i % 3] for i in range(150)]
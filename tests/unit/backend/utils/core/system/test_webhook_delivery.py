@@ -0,0 +1,231 @@
+"""Unit tests and a local-server benchmark for the webhook delivery pipeline."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from backend.utils.core.system.webhook_delivery import CircuitBreaker, _default_spool_path
+from backend.utils.core.system.webhook_manager import MessagePriority, WebhookManager, WebhookType
+
+
+class _Receiver:
+    """Local aiohttp webhook endpoint: ``/ok``, ``/fail`` (HTTP 500) and ``/slow`` (200 after 0.2 s)."""
+
+    def __init__(self):
+        self.payloads = []
+        self.requests = 0
+        app = web.Application()
+        app.router.add_post("/ok", self._ok)
+        app.router.add_post("/fail", self._fail)
+        app.router.add_post("/slow", self._slow)
+        self.server = TestServer(app)
+
+    async def _ok(self, request):
+        self.requests += 1
+        self.payloads.append(await request.json())
+        return web.Response(status=204)
+
+    async def _fail(self, request):
+        self.requests += 1
+        return web.Response(status=500, text="boom")
+
+    async def _slow(self, request):
+        self.requests += 1
+        await asyncio.sleep(0.2)
+        return web.Response(status=200)
+
+    def url(self, path):
+        return str(self.server.make_url(path))
+
+    def events(self):
+        """Events received: a digest carries its count in the ``Events`` field."""
+        return sum(int((p.get("fields") or {}).get("Events", 1)) for p in self.payloads)
+
+
+@pytest.fixture()
+async def receiver():
+    r = _Receiver()
+    await r.server.start_server()
+    yield r
+    await r.server.close()
+
+
+@pytest.fixture()
+def make_manager(tmp_path):
+    def make(**options):
+        options.setdefault("spool_path", tmp_path / "spool.db")
+        return WebhookManager(**options)
+
+    return make
+
+
+def _register(manager, name, url, retry_attempts=1):
+    assert manager.register_webhook(name, WebhookType.CUSTOM, url, retry_attempts=retry_attempts, retry_delay_seconds=0)
+
+
+@pytest.mark.unit
+class TestWebhookDelivery:
+    async def test_direct_sends_share_one_session(self, receiver, make_manager):
+        manager = make_manager()
+        _register(manager, "ok", receiver.url("/ok"))
+        assert await manager.send_to_webhook("ok", "one")
+        session = manager.delivery._session
+        assert await manager.send_to_webhook("ok", "two")
+        assert manager.delivery._session is session and receiver.requests == 2
+        assert manager.get_webhook_status()["ok"]["success_count"] == 2
+        await manager.aclose()
+
+    async def test_send_to_all_webhooks_fans_out_concurrently(self, receiver, make_manager):
+        manager = make_manager()
+        for i in range(3):
+            _register(manager, f"slow{i}", receiver.url("/slow"))
+        start = time.monotonic()
+        results = await manager.send_to_all_webhooks("deploy finished")
+        assert results == {"slow0": True, "slow1": True, "slow2": True}
+        assert time.monotonic() - start < 0.5  # three 0.2 s requests in parallel
+        await manager.aclose()
+
+    async def test_bursts_are_coalesced_into_digests(self, receiver, make_manager):
+        manager = make_manager(coalesce_window=0.05, max_digest=40)
+        _register(manager, "ok", receiver.url("/ok"))
+        for i in range(100):
+            assert manager.publish_event(f"event {i}", title="build", priority=MessagePriority.LOW) == 1
+        await manager.aclose()
+        assert receiver.events() == 100
+        assert receiver.requests <= 4  # full digests of 40 plus the remainder
+        assert receiver.payloads[0]["title"] == "build (x40)"
+
+    async def test_circuit_opens_and_spools_instead_of_calling(self, receiver, make_manager):
+        manager = make_manager(failure_threshold=2, reset_timeout=60)
+        _register(manager, "down", receiver.url("/fail"))
+        assert not await manager.send_to_webhook("down", "a")
+        assert not await manager.send_to_webhook("down", "b")
+        assert manager.get_webhook_status()["down"]["circuit"] == "open"
+        calls = receiver.requests
+        assert not await manager.send_to_webhook("down", "c")
+        assert receiver.requests == calls  # short-circuited
+        stats = manager.delivery.stats()
+        assert stats["short_circuited"] == 1 and stats["spool_pending"] == 3
+        await manager.aclose()
+
+    async def test_spool_survives_a_restart(self, receiver, make_manager):
+        failing = make_manager()
+        _register(failing, "hook", receiver.url("/fail"))
+        assert not await failing.send_to_webhook("hook", "lost?")
+        await failing.aclose()
+
+        recovered = make_manager()
+        _register(recovered, "hook", receiver.url("/ok"))
+        for entry in recovered.delivery.spool.due(float("inf")):
+            recovered.delivery.spool.reschedule(entry.id, entry.attempts, 0, "")
+        assert await recovered.delivery.redeliver_spooled() == 1
+        assert receiver.payloads[0]["message"] == "lost?"
+        assert recovered.delivery.stats()["spool_pending"] == 0
+        await recovered.aclose()
+
+    async def test_queue_is_bounded_and_overflow_is_spooled(self, receiver, make_manager):
+        manager = make_manager(queue_size=2)
+        _register(manager, "ok", receiver.url("/ok"))
+        accepted = [manager.publish_event(f"e{i}", webhook_names=["ok"]) for i in range(5)]
+        assert accepted == [1, 1, 0, 0, 0]
+        stats = manager.delivery.stats()
+        assert stats["overflowed"] == 3 and stats["spool_pending"] == 3
+        await manager.aclose()
+
+    def test_circuit_breaker_half_open_allows_one_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == "half_open"
+        assert breaker.allow() and not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+
+    async def test_unexpected_error_frees_the_half_open_trial(self, receiver, make_manager, monkeypatch):
+        manager = make_manager(failure_threshold=1, reset_timeout=0)
+        _register(manager, "hook", receiver.url("/ok"))
+        breaker = manager.delivery._breaker("hook")
+        breaker.record_failure()
+
+        async def broken_session():
+            raise RuntimeError("session factory exploded")
+
+        monkeypatch.setattr(manager.delivery, "_get_session", broken_session)
+        with pytest.raises(RuntimeError):
+            await manager.delivery._attempt(manager.webhooks["hook"], {"message": "x"})
+        assert breaker.state == "half_open" and breaker.allow()
+        await manager.aclose()
+
+    async def test_sync_send_inside_a_loop_is_queued_for_coalesced_delivery(self, receiver, make_manager):
+        manager = make_manager(coalesce_window=0.05)
+        _register(manager, "ok", receiver.url("/ok"))
+        assert all(manager.send_to_webhook_sync("ok", f"event {i}") for i in range(3))
+        assert not manager.send_to_webhook_sync("missing", "nobody")
+        await manager.aclose()
+        assert receiver.events() == 3 and receiver.requests == 1
+
+    def test_a_new_loop_retires_the_previous_loops_workers_and_session(self, make_manager):
+        manager = make_manager()
+        old_loop = asyncio.new_event_loop()
+        worker = threading.Thread(target=old_loop.run_forever)
+        worker.start()
+        try:
+
+            async def start():
+                manager.delivery._ensure_started()
+                return await manager.delivery._get_session()
+
+            session = asyncio.run_coroutine_threadsafe(start(), old_loop).result(5)
+            tasks = list(manager.delivery._tasks)
+
+            async def restart():
+                manager.delivery._ensure_started()
+                await manager.aclose()
+
+            asyncio.run(restart())
+            deadline = time.monotonic() + 5
+            while not (session.closed and all(t.done() for t in tasks)) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert session.closed and all(t.cancelled() for t in tasks)
+        finally:
+            old_loop.call_soon_threadsafe(old_loop.stop)
+            worker.join()
+            old_loop.close()
+
+    def test_default_spool_path_is_anchored_at_the_project_root(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("OLLASH_WEBHOOK_SPOOL", raising=False)
+        monkeypatch.delenv("OLLASH_ROOT_DIR", raising=False)
+        monkeypatch.chdir(tmp_path)
+        path = _default_spool_path()
+        assert path.is_absolute() and path.parent.name == ".ollash" and tmp_path not in path.parents
+        monkeypatch.setenv("OLLASH_WEBHOOK_SPOOL", str(tmp_path / "custom.db"))
+        assert _default_spool_path() == tmp_path / "custom.db"
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestWebhookDeliveryBenchmark:
+    """1000 events/s for a second against a local aiohttp server."""
+
+    RATE = 1000
+    SECONDS = 1.0
+
+    async def test_sustained_rate_is_delivered_in_digests(self, receiver, make_manager):
+        manager = make_manager(coalesce_window=0.1, max_digest=100, queue_size=5000)
+        for i in range(3):
+            _register(manager, f"hook{i}", receiver.url("/ok"))
+
+        total = int(self.RATE * self.SECONDS)
+        start = time.perf_counter()
+        for i in range(total):
+            assert manager.publish_event(f"event {i}", title="tick", webhook_names=[f"hook{i % 3}"]) == 1
+            if i % 10 == 9:  # 10 events per 10 ms slot
+                await asyncio.sleep(max(0.0, start + (i + 1) / self.RATE - time.perf_counter()))
+        await manager.aclose()
+
+        assert receiver.events() == total
+        assert receiver.requests <= total / 20
+        assert manager.delivery.stats()["spool_pending"] == 0
@@ -223,3 +223,73 @@ class TestKnowledgeBasePersistence:
         kb2 = ErrorKnowledgeBase(temp_kb_dir, logger_mock, enable_persistence=True)
 
         assert len(kb2.patterns) > 0
+
+    def test_persists_to_sqlite_not_json(self, temp_kb_dir, logger_mock):
+        """Recording writes a row to the SQLite store instead of rewriting JSON."""
+        kb = ErrorKnowledgeBase(temp_kb_dir, logger_mock, enable_persistence=True)
+        pattern_id = kb.record_error("test.py", "syntax", "SyntaxError", "code")
+        kb.record_error("test.py", "syntax", "SyntaxError", "code")
+
+        assert kb.db_path.exists()
+        assert not kb.kb_file.exists()
+
+        reloaded = ErrorKnowledgeBase(temp_kb_dir, logger_mock, enable_persistence=True)
+        assert reloaded.patterns[pattern_id].frequency == 2
+
+    def test_imports_legacy_json(self, temp_kb_dir, logger_mock):
+        """An existing .error_patterns.json is imported into a fresh database."""
+        import json
+
+        legacy = ErrorPattern(
+            pattern_id="legacy1",
+            error_type="import",
+            affected_file_type=".py",
+            description="Old error",
+            example_error="ImportError",
+            prevention_tip="Tip",
+            solution_template="Fix",
+            language="python",
+            frequency=7,
+            tags=["import"],
+        )
+        temp_kb_dir.mkdir(parents=True)
+        (temp_kb_dir / ".error_patterns.json").write_text(json.dumps({"patterns": {"legacy1": legacy.to_dict()}}))
+
+        kb = ErrorKnowledgeBase(temp_kb_dir, logger_mock, enable_persistence=True)
+        assert kb.patterns["legacy1"].frequency == 7
+
+        reloaded = ErrorKnowledgeBase(temp_kb_dir, logger_mock, enable_persistence=True)
+        assert reloaded.query_similar_errors("x.py", "python")[0].pattern_id == "legacy1"
+
+
+class TestRankedRetrieval:
+    """Test frequency-ordered retrieval and the per-language cache."""
+
+    @pytest.mark.parametrize("persist", [True, False])
+    def test_results_ordered_by_frequency(self, temp_kb_dir, logger_mock, persist):
+        kb = ErrorKnowledgeBase(temp_kb_dir, logger_mock, enable_persistence=persist)
+        rare = kb.record_error("a.py", "logic", "rare failure", "a")
+        common = kb.record_error("b.py", "logic", "common failure", "b")
+        for _ in range(4):
+            kb.record_error("b.py", "logic", "common failure", "b")
+
+        results = kb.query_similar_errors("c.py", "python", max_results=2)
+        assert [p.pattern_id for p in results] == [common, rare]
+
+    def test_cache_invalidated_on_write(self, error_kb):
+        first = error_kb.record_error("a.py", "logic", "first failure", "a")
+        assert [p.pattern_id for p in error_kb.query_similar_errors("x.py", "python")] == [first]
+
+        second = error_kb.record_error("b.py", "logic", "second failure", "b")
+        for _ in range(3):
+            error_kb.record_error("b.py", "logic", "second failure", "b")
+
+        ids = [p.pattern_id for p in error_kb.query_similar_errors("x.py", "python")]
+        assert ids == [second, first]
+
+    def test_other_language_cache_survives_write(self, error_kb):
+        error_kb.record_error("a.js", "logic", "js failure", "a")
+        error_kb.query_similar_errors("x.js", "javascript")
+        error_kb.record_error("a.py", "logic", "py failure", "a")
+
+        assert ("javascript", None) in error_kb._top_k_cache
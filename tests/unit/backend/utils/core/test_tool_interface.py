@@ -0,0 +1,45 @@
+"""Unit tests for ToolExecutor.execute_tool."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.utils.core.tools.tool_interface import ToolExecutor
+
+
+def _executor(tool_func) -> ToolExecutor:
+    registry = MagicMock()
+    registry.get_callable_tool_function.return_value = tool_func
+    return ToolExecutor(registry, MagicMock())
+
+
+@pytest.mark.unit
+class TestExecuteTool:
+    async def test_sync_tool_runs_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        release = threading.Event()
+
+        def slow_tool(path):
+            release.wait(5)
+            return {"thread": threading.get_ident(), "path": path}
+
+        pending = asyncio.ensure_future(_executor(slow_tool).execute_tool("read_file", path="a.py", stray=1))
+        # The loop keeps serving other coroutines while the blocking tool runs
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+        release.set()
+        result = await pending
+        assert result == {"thread": result["thread"], "path": "a.py"}
+        assert result["thread"] != loop_thread
+
+    async def test_async_tool_and_coroutine_results_are_awaited(self):
+        async def async_tool(x):
+            return x * 2
+
+        def wrapper_tool(x):
+            return async_tool(x)
+
+        assert await _executor(async_tool).execute_tool("t", x=2) == 4
+        assert await _executor(wrapper_tool).execute_tool("t", x=3) == 6